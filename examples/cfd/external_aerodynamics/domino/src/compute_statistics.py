@@ -105,6 +105,9 @@ def main(cfg: DictConfig) -> None:
             input_path=cfg.data.input_dir,
             target_keys=target_keys,
             max_samples=cfg.data.max_samples_for_statistics,
+            num_workers=cfg.data.get("statistics_num_workers", 0),
+            checkpoint_path=output_dir + "/statistics_checkpoint.pt",
+            distributed=dist.world_size > 1,
         )
         mean = {k: m.cpu().numpy() for k, m in mean.items()}
         std = {k: s.cpu().numpy() for k, s in std.items()}
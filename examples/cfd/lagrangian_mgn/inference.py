@@ -33,7 +33,10 @@ import torch
 from torch import Tensor
 from torch_geometric.loader import DataLoader as PyGDataLoader
 
-from physicsnemo.datapipes.gnn.lagrangian_dataset import graph_update
+from physicsnemo.datapipes.gnn.lagrangian_dataset import (
+    VerletNeighborList,
+    graph_update,
+)
 from physicsnemo.launch.utils import load_checkpoint
 
 from loggers import get_gpu_info, init_python_logging
@@ -80,6 +83,13 @@ class MGNRollout:
         self.dt = self.dataset.dt
         self.bounds = self.dataset.bounds
 
+        # Reuse the radius graph between rollout steps, if configured:
+        neighbor_skin = cfg.inference.get("neighbor_skin")
+        if neighbor_skin is not None:
+            self.neighbor_list = VerletNeighborList(self.radius, neighbor_skin)
+        else:
+            self.neighbor_list = None
+
         self.time_integrator = self.dataset.time_integrator
         self.compute_boundary_feature = self.dataset.compute_boundary_feature
         self.boundary_clamp = self.dataset.boundary_clamp
@@ -127,13 +137,15 @@ class MGNRollout:
                 gt_pos = []
                 node_type = []
                 position, vel_history, node_type = self.dataset.unpack_inputs(graph)
+                if self.neighbor_list is not None:
+                    self.neighbor_list.reset()
 
                 pred_pos.append(position)
                 gt_pos.append(position)
 
             graph.x = self.dataset.pack_inputs(position, vel_history, node_type)
             graph.pos = position
-            graph_update(graph, self.radius)
+            graph_update(graph, self.radius, self.neighbor_list)
 
             acceleration = self.model(graph.x, graph.edge_attr, graph)  # predict
 
@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the throughput of the diffusion samplers
+
+Generates ensembles with a small, randomly initialized CorrDiff diffusion model and
+reports the denoising steps per second of ``stochastic_sampler``,
+``deterministic_sampler`` and ``EDMSamplerEngine``::
+
+    python benchmark_sampler.py --device cpu --num-steps 18 --batch-size 4
+
+The model is small so that the overhead of the samplers, rather than the network,
+dominates the timings.
+"""
+
+import argparse
+import time
+from functools import partial
+
+import torch
+
+from physicsnemo.models.diffusion import EDMPrecondSuperResolution
+from physicsnemo.utils.diffusion import (
+    EDMSamplerEngine,
+    deterministic_sampler,
+    stochastic_sampler,
+)
+from physicsnemo.utils.patching import GridPatching2D
+
+
+def benchmark(sampler_fn, net, latents, img_lr, num_steps, repeats, device):
+    """Steps per second of a sampler, after a warm-up call"""
+    with torch.inference_mode():
+        sampler_fn(net, latents, img_lr)
+        if device.type == "cuda":
+            torch.cuda.synchronize()
+        start = time.perf_counter()
+        for _ in range(repeats):
+            sampler_fn(net, latents, img_lr)
+        if device.type == "cuda":
+            torch.cuda.synchronize()
+    return num_steps * repeats / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--num-steps", type=int, default=18)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--img-size", type=int, default=32)
+    parser.add_argument("--patch-size", type=int, default=None)
+    parser.add_argument("--channels", type=int, default=4)
+    parser.add_argument("--model-channels", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--compile", action="store_true", help="also benchmark capture='compile'"
+    )
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    device = torch.device(args.device)
+    # Conditioning channels: low-resolution input, positional embeddings, and
+    # the global low-resolution input with patching
+    img_in_channels = args.channels + 4
+    if args.patch_size:
+        img_in_channels += args.channels
+    net = (
+        EDMPrecondSuperResolution(
+            img_resolution=args.img_size,
+            img_in_channels=img_in_channels,
+            img_out_channels=args.channels,
+            model_type="SongUNetPosEmbd",
+            model_channels=args.model_channels,
+            channel_mult=[1, 2],
+            num_blocks=1,
+            attn_resolutions=[],
+            N_grid_channels=4,
+        )
+        .eval()
+        .to(device)
+    )
+    shape = (args.batch_size, args.channels, args.img_size, args.img_size)
+    latents = torch.randn(shape, device=device)
+    img_lr = torch.randn(shape, device=device)
+    patching = None
+    if args.patch_size:
+        patching = GridPatching2D(
+            img_shape=(args.img_size, args.img_size),
+            patch_shape=(args.patch_size, args.patch_size),
+        )
+
+    samplers = {
+        "stochastic_sampler": partial(
+            stochastic_sampler, num_steps=args.num_steps, patching=patching
+        ),
+        "deterministic_sampler (float64)": partial(
+            deterministic_sampler,
+            num_steps=args.num_steps,
+            sigma_max=800,
+            patching=patching,
+        ),
+        "deterministic_sampler (float32)": partial(
+            deterministic_sampler,
+            num_steps=args.num_steps,
+            sigma_max=800,
+            patching=patching,
+            dtype=torch.float32,
+        ),
+        "EDMSamplerEngine": EDMSamplerEngine(
+            num_steps=args.num_steps, patching=patching
+        ),
+    }
+    if args.compile:
+        samplers["EDMSamplerEngine (compile)"] = EDMSamplerEngine(
+            num_steps=args.num_steps, patching=patching, capture="compile"
+        )
+    if device.type == "cuda":
+        samplers["EDMSamplerEngine (cuda_graph)"] = EDMSamplerEngine(
+            num_steps=args.num_steps, patching=patching, capture="cuda_graph"
+        )
+
+    baseline = None
+    for name, sampler_fn in samplers.items():
+        steps_per_second = benchmark(
+            sampler_fn, net, latents, img_lr, args.num_steps, args.repeats, device
+        )
+        baseline = baseline or steps_per_second
+        print(
+            f"{name:<32} {steps_per_second:10.1f} steps/s "
+            f"{steps_per_second / baseline:6.2f}x"
+        )
@@ -34,7 +34,11 @@ from physicsnemo.experimental.models.diffusion.preconditioning import (
 )
 from physicsnemo.utils.patching import GridPatching2D
 from physicsnemo import Module
-from physicsnemo.utils.diffusion import deterministic_sampler, stochastic_sampler
+from physicsnemo.utils.diffusion import (
+    EDMSamplerEngine,
+    deterministic_sampler,
+    stochastic_sampler,
+)
 from physicsnemo.utils.corrdiff import (
     NetCDFWriter,
     get_time_from_range,
@@ -193,6 +197,17 @@ def main(cfg: DictConfig) -> None:
         )
     elif cfg.sampler.type == "stochastic":
         sampler_fn = partial(stochastic_sampler, patching=patching)
+    elif cfg.sampler.type == "engine":
+        # Reuses its buffers and schedule for all the batches of the generation
+        sampler_fn = EDMSamplerEngine(
+            num_steps=cfg.sampler.num_steps,
+            solver=cfg.sampler.solver,
+            patching=patching,
+            amp_dtype=getattr(torch, cfg.sampler.amp_dtype)
+            if cfg.sampler.amp_dtype
+            else None,
+            capture=cfg.sampler.capture,
+        )
     else:
         raise ValueError(f"Unknown sampling method {cfg.sampling.type}")
 
@@ -353,6 +368,7 @@ def main(cfg: DictConfig) -> None:
                     input_channels=dataset.input_channels(),
                     output_channels=dataset.output_channels(),
                     has_lead_time=has_lead_time,
+                    asynchronous=cfg.generation.perf.get("io_background_writer", False),
                 )
 
                 if cfg.generation.perf.io_synchronous:
@@ -455,6 +471,7 @@ def main(cfg: DictConfig) -> None:
                 writer_executor.shutdown()
 
     if dist.rank == 0:
+        writer.close()
         f.close()
     logger0.info("Generation Completed.")
 
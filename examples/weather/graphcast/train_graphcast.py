@@ -127,6 +127,8 @@ class GraphCastTrainer(BaseTrainer):
             use_cugraphops_processor=cfg.cugraphops_processor,
             use_cugraphops_decoder=cfg.cugraphops_decoder,
             recompute_activation=cfg.recompute_activation,
+            graph_cache_dir=cfg.graph_cache_dir,
+            sparse_attention=cfg.sparse_attention,
         )
 
         # set gradient checkpointing
@@ -14,10 +14,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
 import pathlib
+import struct
+import threading
 import time
+import zipfile
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from concurrent.futures import (
+    Future,
+    InvalidStateError,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import asdict, dataclass
 
 import numpy as np
 import torch
@@ -41,6 +53,9 @@ except ImportError:
 
 from physicsnemo.distributed import ShardTensor, ShardTensorSpec
 from physicsnemo.distributed.utils import compute_split_shapes
+from physicsnemo.utils.version_check import check_min_version
+
+ZARR_V3 = check_min_version("zarr", "3.0.0", hard_fail=False)
 
 # Abstractions:
 # - want to read npy/npz/.zarr/.stl/.vtp files
@@ -82,6 +97,14 @@ class BackendReader(ABC):
 
         self.is_volumetric = any(["volume" in key for key in self.keys_to_read])
 
+    def _keys_to_open(self) -> list[str]:
+        """
+        Keys to read, plus the volume mesh centers that size the volume slice.
+        """
+        if self.is_volumetric and "volume_mesh_centers" not in self.keys_to_read:
+            return [*self.keys_to_read, "volume_mesh_centers"]
+        return self.keys_to_read
+
     @abstractmethod
     def read_file(self, filename: pathlib.Path) -> dict[str, torch.Tensor]:
         """
@@ -109,6 +132,12 @@ class BackendReader(ABC):
         """
         pass
 
+    def close(self) -> None:
+        """
+        Release any resources held by the reader.  No-op by default.
+        """
+        pass
+
     def fill_optional_keys(
         self, data: dict[str, torch.Tensor]
     ) -> dict[str, torch.Tensor]:
@@ -230,29 +259,119 @@ class NpyFileReader(BackendReader):
         )
 
 
+def _mmap_npz_member(
+    filename: pathlib.Path, zip_info: zipfile.ZipInfo, mmap_mode: str
+) -> np.ndarray | None:
+    """
+    Memory-map one array of an uncompressed npz file.
+
+    Members of an npz written with ``np.savez`` are stored without
+    compression, so the raw array bytes sit contiguously in the zip file.
+    This locates them and maps them with ``np.memmap``.
+
+    Returns:
+        The mapped array, or None if the member is compressed, holds
+        objects or is a scalar, in which case it must be read normally.
+    """
+    if zip_info.compress_type != zipfile.ZIP_STORED:
+        return None
+
+    with open(filename, "rb") as f:
+        # Skip the zip local file header, 30 bytes plus name and extra field:
+        f.seek(zip_info.header_offset)
+        local_header = f.read(30)
+        name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+        f.seek(zip_info.header_offset + 30 + name_length + extra_length)
+
+        # Then parse the npy header of the member:
+        npy_version = np.lib.format.read_magic(f)
+        if npy_version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        data_offset = f.tell()
+
+    if dtype.hasobject or shape == ():
+        return None
+
+    return np.memmap(
+        filename,
+        dtype=dtype,
+        mode=mmap_mode,
+        offset=data_offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def _read_mapped(array: np.ndarray, selection: slice | None = None) -> torch.Tensor:
+    """
+    Copy (a slice of) a possibly memory-mapped array into a torch tensor.
+
+    For a mapped array only the pages covering ``selection`` are read.
+    """
+    if selection is not None:
+        array = array[selection]
+    return torch.from_numpy(np.array(array))
+
+
 class NpzFileReader(BackendReader):
     """
     Reader for npz files.
+
+    With ``mmap_mode`` set, the arrays of uncompressed npz files (as written
+    by ``np.savez``) are memory-mapped rather than loaded, and only the
+    requested volume slice is read from disk.  Compressed members fall back
+    to a regular load.
     """
 
     def __init__(
         self,
         keys_to_read: list[str] | None,
         keys_to_read_if_available: dict[str, torch.Tensor] | None,
+        mmap_mode: str | None = None,
     ) -> None:
         super().__init__(keys_to_read, keys_to_read_if_available)
+        self.mmap_mode = mmap_mode
 
-    def read_file(self, filename: pathlib.Path) -> dict[str, torch.Tensor]:
+    def _open_arrays(self, filename: pathlib.Path) -> dict[str, np.ndarray]:
         """
-        Read a file and return a dictionary of tensors.
+        Open the requested arrays, mapping them where possible.
         """
-        in_data = np.load(filename)
+        if self.mmap_mode is None:
+            in_data = np.load(filename)
+            keys_found = set(in_data.keys())
+        else:
+            with zipfile.ZipFile(filename) as zip_file:
+                members = {
+                    info.filename.removesuffix(".npy"): info
+                    for info in zip_file.infolist()
+                }
+            keys_found = set(members.keys())
 
-        keys_found = set(in_data.keys())
         keys_missing = set(self.keys_to_read) - keys_found
         if len(keys_missing) > 0:
             raise ValueError(f"Keys {keys_missing} not found in file {filename}")
 
+        if self.mmap_mode is None:
+            return in_data
+
+        arrays = {}
+        regular = None
+        for key in self._keys_to_open():
+            arrays[key] = _mmap_npz_member(filename, members[key], self.mmap_mode)
+            if arrays[key] is None:
+                if regular is None:
+                    regular = np.load(filename)
+                arrays[key] = regular[key]
+        return arrays
+
+    def read_file(self, filename: pathlib.Path) -> dict[str, torch.Tensor]:
+        """
+        Read a file and return a dictionary of tensors.
+        """
+        in_data = self._open_arrays(filename)
+
         # Make sure to select the slice outside of the loop.
         if self.is_volumetric:
             if self.volume_sampling_size is not None:
@@ -264,15 +383,12 @@ class NpzFileReader(BackendReader):
             else:
                 volume_slice = slice(0, in_data["volume_mesh_centers"].shape[0])
 
-        # This is a slower basic way to do this, to be improved:
         data = {}
         for key in self.keys_to_read:
             if "volume" not in key:
-                data[key] = torch.from_numpy(in_data[key][:])
+                data[key] = _read_mapped(in_data[key])
             else:
-                data[key] = torch.from_numpy(in_data[key][volume_slice])
-
-        # data = {key: torch.from_numpy(in_data[key][:]) for key in self.keys_to_read}
+                data[key] = _read_mapped(in_data[key], volume_slice)
 
         return self.fill_optional_keys(data)
 
@@ -283,24 +399,271 @@ class NpzFileReader(BackendReader):
 
     def set_volume_sampling_size(self, volume_sampling_size: int):
         """
-        This is not supported for npz files.
+        Set the volume sampling size.  Only supported with ``mmap_mode``,
+        otherwise the whole array is decompressed anyway.
         """
-        raise NotImplementedError(
-            "volume sampling directly from disk is not supported for npz files."
-        )
+        if self.mmap_mode is None:
+            raise NotImplementedError(
+                "volume sampling directly from disk is only supported for npz "
+                "files with mmap_mode set."
+            )
+        super().set_volume_sampling_size(volume_sampling_size)
+
+
+class NpyDirectoryReader(BackendReader):
+    """
+    Reader for the "npz-as-directory" layout: one directory per sample,
+    holding one ``<key>.npy`` file per array.
+
+    Each array is opened with ``np.load(..., mmap_mode=mmap_mode)``, so
+    only the data that is actually selected is read from disk.  This makes
+    volume sampling directly from disk cheap, and also allows reading only
+    this rank's slice of each array for domain parallel loading.
+    """
+
+    def __init__(
+        self,
+        keys_to_read: list[str] | None,
+        keys_to_read_if_available: dict[str, torch.Tensor] | None,
+        mmap_mode: str | None = "r",
+    ) -> None:
+        super().__init__(keys_to_read, keys_to_read_if_available)
+        self.mmap_mode = mmap_mode
+
+    def _open_arrays(self, dirname: pathlib.Path) -> dict[str, np.ndarray]:
+        keys_missing = [
+            key for key in self.keys_to_read if not (dirname / f"{key}.npy").exists()
+        ]
+        if len(keys_missing) > 0:
+            raise ValueError(f"Keys {set(keys_missing)} not found in file {dirname}")
+
+        return {
+            key: np.load(dirname / f"{key}.npy", mmap_mode=self.mmap_mode)
+            for key in self._keys_to_open()
+        }
+
+    def read_file(self, filename: pathlib.Path) -> dict[str, torch.Tensor]:
+        """
+        Read a directory and return a dictionary of tensors.
+        """
+        arrays = self._open_arrays(filename)
+
+        # Make sure to select the slice outside of the loop.
+        if self.is_volumetric:
+            if self.volume_sampling_size is not None:
+                volume_slice = self.select_random_sections_from_slice(
+                    0,
+                    arrays["volume_mesh_centers"].shape[0],
+                    self.volume_sampling_size,
+                )
+            else:
+                volume_slice = slice(0, arrays["volume_mesh_centers"].shape[0])
+
+        data = {}
+        for key in self.keys_to_read:
+            if "volume" not in key:
+                data[key] = _read_mapped(arrays[key])
+            else:
+                data[key] = _read_mapped(arrays[key], volume_slice)
+
+        return self.fill_optional_keys(data)
+
+    def read_file_sharded(
+        self, filename: pathlib.Path, device_mesh: torch.distributed.DeviceMesh
+    ) -> tuple[dict[str, torch.Tensor], dict[str, dict]]:
+        """
+        Read this rank's slice of each array and return the sharding specs.
+        """
+
+        # We need the coordinates of this GPU:
+        this_rank = device_mesh.get_local_rank()
+        domain_size = dist.get_world_size(group=device_mesh.get_group())
+
+        arrays = self._open_arrays(filename)
+
+        data = {}
+        specs = {}
+        for key in self.keys_to_read:
+            array_shape = arrays[key].shape
+            if array_shape == () or array_shape[0] < domain_size:
+                # Read scalars, and arrays smaller than the number of ranks,
+                # from every rank and use replicate sharding
+                data[key] = _read_mapped(arrays[key])
+                placement = [
+                    Replicate(),
+                ]
+                chunk_sizes = None
+            else:
+                # Read partially from the data and use Shard(0) sharding
+                chunk_start, chunk_stop, chunk_sizes = self._get_slice_boundaries(
+                    array_shape, this_rank, domain_size
+                )
+                data[key] = _read_mapped(arrays[key], slice(chunk_start, chunk_stop))
+                placement = [
+                    Shard(0),
+                ]
+
+                # Turn chunk sizes into a dict over mesh dim 0:
+                chunk_sizes = {0: chunk_sizes}
+
+            specs[key] = (placement, chunk_sizes)
+
+        # Patch in the optional keys:
+        data = self.fill_optional_keys(data)
+        for key in data.keys():
+            if key not in specs:
+                specs[key] = (
+                    [
+                        Replicate(),
+                    ],
+                    {},
+                )
+
+        return data, specs
+
+
+def _allocate_destination(
+    shape: tuple[int, ...], dtype: np.dtype, pin_memory: bool
+) -> torch.Tensor:
+    """
+    Allocate a CPU tensor to decode array data into.
+
+    When ``pin_memory`` is set, and CUDA is available, the buffer is
+    page-locked so the later host to device copy can be asynchronous
+    without an extra staging copy.
+    """
+    torch_dtype = torch.from_numpy(np.empty((), dtype=dtype)).dtype
+    pin_memory = pin_memory and torch.cuda.is_available()
+    return torch.empty(shape, dtype=torch_dtype, pin_memory=pin_memory)
+
+
+def _zarr_read_into(zarr_array, selection: slice, out: np.ndarray) -> None:
+    """
+    Decode ``zarr_array[selection]`` directly into ``out``.
+    """
+    if ZARR_V3:
+        # zarr 3 only accepts its own buffer type as an output:
+        out[...] = zarr_array[selection]
+    else:
+        zarr_array.get_basic_selection(selection, out=out)
 
 
 class ZarrFileReader(BackendReader):
     """
     Reader for zarr files.
+
+    Arrays are read concurrently on a thread pool.  Large arrays are further
+    split along their first dimension on chunk boundaries, so that several
+    threads decode different chunks of the same array at once.  Each piece
+    is decoded directly into a preallocated (and optionally pinned)
+    destination tensor.  When volume sampling is active, only the chunks
+    overlapping the sampled volume slice are read.
     """
 
     def __init__(
         self,
         keys_to_read: list[str] | None,
         keys_to_read_if_available: dict[str, torch.Tensor] | None,
+        max_workers: int = 8,
+        pin_memory: bool = False,
     ) -> None:
+        """
+        Args:
+            keys_to_read: Keys of the group to read.
+            keys_to_read_if_available: Optional keys, with default values.
+            max_workers: Number of threads used to read and decode chunks.
+                With 1, arrays are read serially on the calling thread.
+            pin_memory: Whether to decode into pinned host memory.
+        """
         super().__init__(keys_to_read, keys_to_read_if_available)
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.max_workers = max_workers
+        self.pin_memory = pin_memory
+        self._read_executor = None
+
+    def close(self) -> None:
+        """
+        Shut down the read thread pool, if it was started.
+        """
+        if self._read_executor is not None:
+            self._read_executor.shutdown(wait=True)
+            self._read_executor = None
+
+    def _split_selection(self, zarr_array, selection: slice) -> list[slice]:
+        """
+        Split a selection along dim 0 into pieces aligned to chunk boundaries.
+
+        At most ``max_workers`` pieces are produced, and each covers at least
+        one full chunk, so no chunk is decoded twice.
+        """
+        start, stop, _ = selection.indices(zarr_array.shape[0])
+        chunk_len = zarr_array.chunks[0]
+
+        first_chunk = start // chunk_len
+        last_chunk = (max(stop, start + 1) - 1) // chunk_len
+        n_chunks = last_chunk - first_chunk + 1
+        n_pieces = min(self.max_workers, n_chunks)
+        if n_pieces <= 1:
+            return [slice(start, stop)]
+
+        chunks_per_piece = -(-n_chunks // n_pieces)
+        pieces = []
+        piece_start = start
+        for chunk in range(first_chunk, last_chunk + 1, chunks_per_piece):
+            piece_stop = min(stop, (chunk + chunks_per_piece) * chunk_len)
+            pieces.append(slice(piece_start, piece_stop))
+            piece_start = piece_stop
+        return pieces
+
+    def _read_arrays(self, group, selections: dict[str, slice | None]):
+        """
+        Read ``group[key][selection]`` for every key, concurrently.
+
+        A selection of None reads the full array.
+
+        Returns:
+            A dictionary of key to CPU torch tensors.
+        """
+        data = {}
+        tasks = []
+        for key, selection in selections.items():
+            zarr_array = group[key]
+            if zarr_array.shape == ():
+                # Scalars are tiny, just read them:
+                data[key] = torch.from_numpy(np.array(zarr_array[...]))
+                continue
+
+            if selection is None:
+                selection = slice(0, zarr_array.shape[0])
+            start, stop, _ = selection.indices(zarr_array.shape[0])
+
+            out = _allocate_destination(
+                (stop - start,) + zarr_array.shape[1:],
+                zarr_array.dtype,
+                self.pin_memory,
+            )
+            data[key] = out
+            out_np = out.numpy()
+
+            for piece in self._split_selection(zarr_array, slice(start, stop)):
+                piece_out = out_np[piece.start - start : piece.stop - start]
+                tasks.append((zarr_array, piece, piece_out))
+
+        if self.max_workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                _zarr_read_into(*task)
+        else:
+            if self._read_executor is None:
+                self._read_executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            futures = [
+                self._read_executor.submit(_zarr_read_into, *task) for task in tasks
+            ]
+            # Propagate any read errors:
+            for future in futures:
+                future.result()
+
+        return data
 
     def read_file(self, filename: pathlib.Path) -> dict[str, torch.Tensor]:
         """
@@ -324,13 +687,10 @@ class ZarrFileReader(BackendReader):
             else:
                 volume_slice = slice(0, group["volume_mesh_centers"].shape[0])
 
-        # This is a slower basic way to do this, to be improved:
-        data = {}
-        for key in self.keys_to_read:
-            if "volume" not in key:
-                data[key] = torch.from_numpy(group[key][:])
-            else:
-                data[key] = torch.from_numpy(group[key][volume_slice])
+        selections = {
+            key: volume_slice if "volume" in key else None for key in self.keys_to_read
+        }
+        data = self._read_arrays(group, selections)
 
         return self.fill_optional_keys(data)
 
@@ -352,46 +712,38 @@ class ZarrFileReader(BackendReader):
         if len(missing_keys) > 0:
             raise ValueError(f"Keys {missing_keys} not found in file {filename}")
 
-        data = {}
+        selections = {}
         specs = {}
         for key in self.keys_to_read:
             # Open the array in zarr without reading it and get info:
             zarr_array = group[key]
             array_shape = zarr_array.shape
-            if array_shape == ():
-                # Read scalars from every rank and use replicate sharding
-                raw_data = torch.from_numpy(zarr_array[:])
+            if array_shape == () or array_shape[0] < domain_size:
+                # Read scalars, and arrays smaller than the number of ranks,
+                # from every rank and use replicate sharding
+                selections[key] = None
                 placement = [
                     Replicate(),
                 ]
                 chunk_sizes = None
             else:
                 target_dim = 0
-                if array_shape[target_dim] < domain_size:
-                    # If the array is smaller than the number of ranks,
-                    # again read and use replicate sharding:
-                    raw_data = torch.from_numpy(zarr_array[:])
-                    placement = [
-                        Replicate(),
-                    ]
-                    chunk_sizes = None
-                else:
-                    # Read partially from the data and use Shard(target_dim) sharding
-                    chunk_start, chunk_stop, chunk_sizes = self._get_slice_boundaries(
-                        zarr_array.shape, this_rank, domain_size
-                    )
-                    raw_data = torch.from_numpy(zarr_array[chunk_start:chunk_stop])
-                    placement = [
-                        Shard(target_dim),
-                    ]
+                # Read partially from the data and use Shard(target_dim) sharding
+                chunk_start, chunk_stop, chunk_sizes = self._get_slice_boundaries(
+                    zarr_array.shape, this_rank, domain_size
+                )
+                selections[key] = slice(chunk_start, chunk_stop)
+                placement = [
+                    Shard(target_dim),
+                ]
 
-                    # Turn chunk sizes into a dict over mesh dim 0:
-                    chunk_sizes = {0: chunk_sizes}
+                # Turn chunk sizes into a dict over mesh dim 0:
+                chunk_sizes = {0: chunk_sizes}
 
-            #
-            data[key] = raw_data
             specs[key] = (placement, chunk_sizes)
 
+        data = self._read_arrays(group, selections)
+
         # Patch in the optional keys:
         data = self.fill_optional_keys(data)
         for key in data.keys():
@@ -728,6 +1080,17 @@ else:
             )
 
 
+def is_npy_directory(file: pathlib.Path) -> bool:
+    """
+    Check if a file is a directory of .npy files (the "npz-as-directory" layout).
+    """
+    return (
+        file.is_dir()
+        and file.suffix != ".zarr"
+        and all(f.suffix == ".npy" for f in file.iterdir())
+    )
+
+
 def is_vtk_directory(file: pathlib.Path) -> bool:
     """
     Check if a file is a vtk directory.
@@ -737,6 +1100,137 @@ def is_vtk_directory(file: pathlib.Path) -> bool:
     )
 
 
+@dataclass
+class PrefetchStageStats:
+    """
+    Counters for one stage of the ``CAEDataset`` prefetch pipeline.
+
+    Attributes:
+        queued: Samples submitted to the stage but not started yet.
+        active: Samples currently being processed by the stage.
+        completed: Samples the stage has finished.
+        max_occupancy: Largest ``queued + active`` seen so far.
+        queue_wait_time: Total seconds samples spent waiting for a worker.
+        blocked_time: Total seconds workers spent blocked on the memory
+            budget before they could start (read stage only).
+        busy_time: Total seconds workers spent processing samples.
+    """
+
+    queued: int = 0
+    active: int = 0
+    completed: int = 0
+    max_occupancy: int = 0
+    queue_wait_time: float = 0.0
+    blocked_time: float = 0.0
+    busy_time: float = 0.0
+
+
+class _PinnedBufferPool:
+    """
+    Reusable pinned host buffers for staging host to device copies.
+
+    Buffers are bucketed by byte size, rounded up to a power of two, and
+    handed out as views of the requested shape and dtype, so samples of
+    slightly different shapes share buffers.  A buffer handed out by
+    ``acquire`` is returned with ``release_after``, together with the CUDA
+    event of the copy that reads from it; it only becomes available again
+    once that event has completed.
+
+    The pool keeps at most ``max_buffers_per_bucket`` free buffers per bucket
+    and owns at most ``max_bytes`` of pinned memory in total (unbounded if
+    None).  Free buffers of other buckets are dropped to make room, and a
+    request that still does not fit gets a buffer that is not kept once
+    released.
+    """
+
+    def __init__(self, max_buffers_per_bucket: int, max_bytes: int | None = None):
+        self.max_buffers_per_bucket = max_buffers_per_bucket
+        self.max_bytes = max_bytes
+        self._free = defaultdict(list)
+        self._pending = []
+        # Buffers handed out, by data pointer: (pooled buffer, kept by the pool)
+        self._in_use = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        """Pinned bytes owned by the pool, free or in use."""
+        return self._total_bytes
+
+    def _reclaim(self) -> None:
+        still_pending = []
+        for event, buffers in self._pending:
+            if event.query():
+                for buffer, pooled in buffers:
+                    if not pooled:
+                        continue
+                    free = self._free[buffer.numel()]
+                    if len(free) < self.max_buffers_per_bucket:
+                        free.append(buffer)
+                    else:
+                        self._total_bytes -= buffer.numel()
+            else:
+                still_pending.append((event, buffers))
+        self._pending = still_pending
+
+    def _evict(self, nbytes: int) -> None:
+        """Drop free buffers, largest first, until ``nbytes`` more fit."""
+        for bucket in sorted(self._free, reverse=True):
+            free = self._free[bucket]
+            while free and self._total_bytes + nbytes > self.max_bytes:
+                free.pop()
+                self._total_bytes -= bucket
+
+    def acquire(self, shape: torch.Size, dtype: torch.dtype) -> torch.Tensor:
+        nbytes = math.prod(shape) * dtype.itemsize
+        bucket = 1 << max(nbytes - 1, 0).bit_length()
+        with self._lock:
+            self._reclaim()
+            free = self._free[bucket]
+            if len(free) > 0:
+                buffer, pooled = free.pop(), True
+            else:
+                if self.max_bytes is not None:
+                    self._evict(bucket)
+                pooled = (
+                    self.max_bytes is None
+                    or self._total_bytes + bucket <= self.max_bytes
+                )
+                if pooled:
+                    self._total_bytes += bucket
+                buffer = None
+        if buffer is None:
+            buffer = torch.empty(bucket, dtype=torch.uint8, pin_memory=True)
+        staged = buffer[:nbytes].view(dtype).view(shape)
+        with self._lock:
+            self._in_use[staged.data_ptr()] = (buffer, pooled)
+        return staged
+
+    def release_after(self, event, buffers: list[torch.Tensor]) -> None:
+        if len(buffers) == 0:
+            return
+        with self._lock:
+            self._pending.append(
+                (event, [self._in_use.pop(b.data_ptr()) for b in buffers])
+            )
+
+
+def _sample_nbytes(data: dict[str, torch.Tensor]) -> int:
+    return sum(t.numel() * t.element_size() for t in data.values())
+
+
+def _resolve_future(future: Future, value=None, exception=None) -> None:
+    """Set the outcome of a preload, unless it was dropped meanwhile."""
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(value)
+    except InvalidStateError:
+        pass
+
+
 class CAEDataset:
     """
     Dataset reader for DrivaerML and similar datasets.  In general, this
@@ -748,6 +1242,8 @@ class CAEDataset:
     - If every file is a directory ending in .zarr, the zarr reader is used.
     - If every file is .npy, the .npy reader is used.
     - If every file is .npz, the .npz reader is used.
+    - If every file is a directory of .npy files, one per key, the
+      memory-mapped npy directory reader is used.
     - If every file is a directory without an extension, it's assumed to be .stl/.vtp/.vtu
 
     The user can optionally force one path with a parameter.
@@ -767,6 +1263,29 @@ class CAEDataset:
 
     Using the `__iter__` functionality will automatically enable preloading.
 
+    Set `mmap_mode` (for example "r") to memory-map uncompressed .npz files
+    instead of loading them; .npy directories are always memory-mapped, with
+    `mmap_mode` if given and "r" otherwise.  With memory-mapping, volume
+    sampling from disk only reads the sampled slice.
+
+    Zarr files are read with `read_workers` threads, which fetch and decode
+    the requested arrays (and the chunks of large arrays) concurrently.
+
+    Preloading runs as a two stage pipeline, each stage with its own thread
+    pool: a read stage (`preload_depth` workers; file IO and decoding happen
+    together inside the readers) and a host to device transfer stage
+    (`transfer_workers` workers).  If `preload_memory_limit` is set, each
+    read reserves the estimated size of its sample (the largest sample read
+    so far) before it starts, and does not start while that reservation would
+    take the samples in flight over the limit.  Preloaded samples hold their
+    budget until they are consumed, dropped with `drop_preloaded`, or
+    discarded by `reset`.  When `pin_memory` is set, transfers are staged
+    through a pool of reusable pinned buffers, capped at
+    `preload_memory_limit` bytes if that is set.  Use
+    `prefetch_metrics()` to inspect per-stage occupancy and wait times: a
+    large consumer wait means the pipeline is IO bound, a small one that the
+    consumer is compute bound.
+
     """
 
     def __init__(
@@ -780,6 +1299,10 @@ class CAEDataset:
         device_mesh: torch.distributed.DeviceMesh | None = None,
         placements: dict[str, torch.distributed.tensor.Placement] | None = None,
         consumer_stream: torch.cuda.Stream | None = None,
+        read_workers: int = 8,
+        transfer_workers: int = 1,
+        preload_memory_limit: int | None = None,
+        mmap_mode: str | None = None,
     ) -> None:
         if isinstance(data_dir, str):
             data_dir = pathlib.Path(data_dir)
@@ -799,12 +1322,15 @@ class CAEDataset:
             k: v.to(output_device) for k, v in keys_to_read_if_available.items()
         }
 
+        self.pin_memory = pin_memory
+        self.read_workers = read_workers
+        self.output_device = output_device
+        self.mmap_mode = mmap_mode
+
         self.file_reader, self._filenames = self._infer_file_type_and_filenames(
             data_dir
         )
 
-        self.pin_memory = pin_memory
-
         # Check the file names; some can be read well in parallel, while others
         # are not parallelizable.
 
@@ -831,6 +1357,35 @@ class CAEDataset:
         self._transfer_events = {}
         self.preload_depth = preload_depth
         self.preload_executor = ThreadPoolExecutor(max_workers=max(1, preload_depth))
+        self.transfer_executor = (
+            ThreadPoolExecutor(max_workers=max(1, transfer_workers))
+            if self.output_device.type == "cuda"
+            else None
+        )
+
+        # Bookkeeping for the memory budget and the pipeline metrics:
+        self.preload_memory_limit = preload_memory_limit
+        self._budget = threading.Condition()
+        self._in_flight_bytes = {}
+        self._sample_nbytes_estimate = None
+        # Indices the consumer is blocked on, their reads skip the budget:
+        self._awaited = set()
+        self._closed = False
+        self._stage_stats = {
+            "read": PrefetchStageStats(),
+            "transfer": PrefetchStageStats(),
+        }
+        self._consumer_wait_time = 0.0
+        self._stats_lock = threading.Lock()
+
+        self._pinned_pool = (
+            _PinnedBufferPool(
+                max_buffers_per_bucket=max(1, preload_depth) + 1,
+                max_bytes=preload_memory_limit,
+            )
+            if self.pin_memory and self.output_device.type == "cuda"
+            else None
+        )
 
         if consumer_stream is None and self.output_device.type == "cuda":
             consumer_stream = torch.cuda.current_stream()
@@ -842,7 +1397,8 @@ class CAEDataset:
         Set the indices for the dataset for this epoch.
         """
 
-        # TODO - this needs to block while anything is in the preprocess queue.
+        # Samples preloaded for the previous order may never be consumed:
+        self.reset()
 
         self.indices = indices
 
@@ -868,36 +1424,40 @@ class CAEDataset:
         # Note that for some of these, they could be functions
         # But others benefit from having a state, so we use classes:
 
+        # The constructor settings of the reader are kept, to build more
+        # readers of the same kind (see `compute_mean_std_min_max`):
         if all(file.suffix == ".npy" for file in files):
-            file_reader = NpyFileReader(
-                self._keys_to_read, self._keys_to_read_if_available
-            )
-            return file_reader, files
+            reader_type, self._reader_kwargs = NpyFileReader, {}
         elif all(file.suffix == ".npz" for file in files):
-            file_reader = NpzFileReader(
-                self._keys_to_read, self._keys_to_read_if_available
-            )
-            return file_reader, files
+            reader_type = NpzFileReader
+            self._reader_kwargs = {"mmap_mode": self.mmap_mode}
+        elif all(is_npy_directory(file) for file in files):
+            reader_type = NpyDirectoryReader
+            self._reader_kwargs = {
+                "mmap_mode": self.mmap_mode if self.mmap_mode is not None else "r"
+            }
         elif all(file.suffix == ".zarr" and file.is_dir() for file in files):
             if TENSORSTORE_AVAILABLE:
-                file_reader = TensorStoreZarrReader(
-                    self._keys_to_read, self._keys_to_read_if_available
-                )
+                reader_type, self._reader_kwargs = TensorStoreZarrReader, {}
             else:
-                file_reader = ZarrFileReader(
-                    self._keys_to_read, self._keys_to_read_if_available
-                )
-            return file_reader, files
+                reader_type = ZarrFileReader
+                self._reader_kwargs = {
+                    "max_workers": self.read_workers,
+                    # Decode straight into pinned memory if it goes to the GPU:
+                    "pin_memory": self.pin_memory and self.output_device.type == "cuda",
+                }
         elif all(is_vtk_directory(file) for file in files):
-            file_reader = VTKFileReader(
-                self._keys_to_read, self._keys_to_read_if_available
-            )
-            return file_reader, files
             # Each "file" here is a directory of .vtp, stl, etc.
+            reader_type, self._reader_kwargs = VTKFileReader, {}
         else:
             # TODO - support folders of stl, vtp, vtu.
             raise ValueError(f"Unsupported file type: {files[0]}")
 
+        file_reader = reader_type(
+            self._keys_to_read, self._keys_to_read_if_available, **self._reader_kwargs
+        )
+        return file_reader, files
+
     def _move_to_gpu(
         self, data: dict[str, torch.Tensor], idx: int
     ) -> dict[str, torch.Tensor]:
@@ -914,6 +1474,7 @@ class CAEDataset:
             return data
 
         result = {}
+        staging_buffers = []
 
         with torch.cuda.stream(self._data_loader_stream):
             for key in data.keys():
@@ -921,9 +1482,16 @@ class CAEDataset:
                     result[key] = data[key]
                     continue
                 if self.pin_memory:
-                    result[key] = (
-                        data[key].pin_memory().to(self.output_device, non_blocking=True)
-                    )
+                    if data[key].is_pinned():
+                        staged = data[key]
+                    else:
+                        # Reuse a pinned staging buffer rather than pinning anew:
+                        staged = self._pinned_pool.acquire(
+                            data[key].shape, data[key].dtype
+                        )
+                        staged.copy_(data[key])
+                        staging_buffers.append(staged)
+                    result[key] = staged.to(self.output_device, non_blocking=True)
                 else:
                     result[key] = data[key].to(self.output_device, non_blocking=True)
                 # Move to GPU if available
@@ -935,6 +1503,9 @@ class CAEDataset:
         transfer_event.record(self._data_loader_stream)
         self._transfer_events[idx] = transfer_event
 
+        if self._pinned_pool is not None:
+            self._pinned_pool.release_after(transfer_event, staging_buffers)
+
         return result
 
     def _convert_to_shard_tensors(
@@ -968,10 +1539,122 @@ class CAEDataset:
 
         return result
 
+    def _stage_start(self, stage: str, submitted_at: float) -> float:
+        now = time.perf_counter()
+        with self._stats_lock:
+            stats = self._stage_stats[stage]
+            stats.queued -= 1
+            stats.active += 1
+            stats.queue_wait_time += now - submitted_at
+        return now
+
+    def _stage_submit(self, stage: str) -> float:
+        with self._stats_lock:
+            stats = self._stage_stats[stage]
+            stats.queued += 1
+            stats.max_occupancy = max(stats.max_occupancy, stats.queued + stats.active)
+        return time.perf_counter()
+
+    def _stage_finish(self, stage: str, started_at: float) -> None:
+        with self._stats_lock:
+            stats = self._stage_stats[stage]
+            stats.active -= 1
+            stats.completed += 1
+            stats.busy_time += time.perf_counter() - started_at
+
+    def _fits_memory_budget(self) -> bool:
+        if self.preload_memory_limit is None or len(self._in_flight_bytes) == 0:
+            return True
+        if self._sample_nbytes_estimate is None:
+            # Nothing to estimate from until the first read completes
+            return False
+        in_flight = sum(self._in_flight_bytes.values())
+        return in_flight + self._sample_nbytes_estimate <= self.preload_memory_limit
+
+    def _reserve_memory_budget(self, idx: int, result: Future) -> bool:
+        """
+        Block until the sample fits the budget, then reserve its estimated size.
+
+        A read can always start if nothing is in flight, so a single sample
+        larger than the limit does not stall the pipeline, and so can the read
+        of a sample the consumer is waiting for, since the budget held by the
+        other samples is only released once they are consumed.
+
+        Returns:
+            False if the preload was dropped or the dataset closed meanwhile.
+        """
+        start = time.perf_counter()
+        with self._budget:
+            self._budget.wait_for(
+                lambda: self._closed
+                or result.cancelled()
+                or idx in self._awaited
+                or self._fits_memory_budget()
+            )
+            reserved = not (self._closed or result.cancelled())
+            if reserved:
+                self._in_flight_bytes[idx] = self._sample_nbytes_estimate or 0
+        with self._stats_lock:
+            self._stage_stats["read"].blocked_time += time.perf_counter() - start
+        return reserved
+
+    def _release_memory_budget(self, idx: int) -> None:
+        with self._budget:
+            self._in_flight_bytes.pop(idx, None)
+            self._budget.notify_all()
+
+    def _read_stage(
+        self, idx: int, submitted_at: float, result: Future
+    ) -> dict[str, torch.Tensor] | None:
+        if not self._reserve_memory_budget(idx, result):
+            with self._stats_lock:
+                self._stage_stats["read"].queued -= 1
+            return None
+        started_at = self._stage_start("read", submitted_at)
+        try:
+            data = self._read_file(self._filenames[idx])
+            if "stl_faces" in data:
+                data["stl_faces"] = data["stl_faces"].to(torch.int32)
+        finally:
+            self._stage_finish("read", started_at)
+
+        nbytes = _sample_nbytes(data)
+        with self._budget:
+            self._sample_nbytes_estimate = max(
+                nbytes, self._sample_nbytes_estimate or 0
+            )
+            # Replace the estimate, unless the preload was dropped meanwhile:
+            if not result.cancelled():
+                self._in_flight_bytes[idx] = nbytes
+            self._budget.notify_all()
+        return data
+
+    def _transfer_stage(
+        self,
+        idx: int,
+        data: dict[str, torch.Tensor],
+        submitted_at: float,
+        result: Future,
+    ) -> None:
+        started_at = self._stage_start("transfer", submitted_at)
+        try:
+            _resolve_future(result, value=self._move_to_gpu(data, idx))
+        except Exception as e:
+            _resolve_future(result, exception=e)
+        finally:
+            self._stage_finish("transfer", started_at)
+
     def preload(self, idx: int) -> None:
         """
-        Asynchronously preload the data for the given index (up to CPU, not GPU).
-        Only one preload operation is supported at a time.
+        Asynchronously preload the data for the given index.
+
+        The sample is read on the read stage thread pool, then handed to the
+        transfer stage, which moves it to the output device.  Any number of
+        samples can be in flight; the depth is bounded by the pools and by
+        `preload_memory_limit`.  Every preloaded index should eventually be
+        retrieved (with `get_preloaded` or `__getitem__`) or dropped (with
+        `drop_preloaded` or `reset`), since samples count against the memory
+        limit until then.
 
         Args:
             idx: Index of the sample to preload.
@@ -980,14 +1663,40 @@ class CAEDataset:
             # Skip items that are already in the queue
             return
 
-        def _preload_worker():
-            data = self._read_file(self._filenames[idx])
-            if "stl_faces" in data:
-                data["stl_faces"] = data["stl_faces"].to(torch.int32)
-            # Convert to torch tensors
-            return self._move_to_gpu(data, idx)
+        result = Future()
+        self._preload_queue[idx] = result
 
-        self._preload_queue[idx] = self.preload_executor.submit(_preload_worker)
+        read_future = self.preload_executor.submit(
+            self._read_stage, idx, self._stage_submit("read"), result
+        )
+
+        def _on_read_done(read_future: Future) -> None:
+            if read_future.cancelled():
+                result.cancel()
+                return
+            exc = read_future.exception()
+            if exc is not None:
+                _resolve_future(result, exception=exc)
+                return
+            data = read_future.result()
+            if data is None or result.cancelled():
+                # Dropped while reading, or the dataset was closed:
+                result.cancel()
+                return
+            submitted_at = self._stage_submit("transfer")
+            if self.transfer_executor is None:
+                # Nothing to transfer for CPU outputs:
+                self._transfer_stage(idx, data, submitted_at, result)
+                return
+            try:
+                self.transfer_executor.submit(
+                    self._transfer_stage, idx, data, submitted_at, result
+                )
+            except RuntimeError as e:
+                # The dataset was closed while this sample was in flight:
+                _resolve_future(result, exception=e)
+
+        read_future.add_done_callback(_on_read_done)
 
     def get_preloaded(self, idx: int) -> dict[str, torch.Tensor] | None:
         """
@@ -1004,13 +1713,74 @@ class CAEDataset:
         if idx not in self._preload_queue:
             return None
 
-        result = self._preload_queue[
-            idx
-        ].result()  # This will block until the result is ready
-        self._preload_queue.pop(idx)  # Clear the future after getting the result
+        start = time.perf_counter()
+        with self._budget:
+            self._awaited.add(idx)
+            self._budget.notify_all()
+        try:
+            result = self._preload_queue[
+                idx
+            ].result()  # This will block until the result is ready
+        finally:
+            self._preload_queue.pop(idx)  # Clear the future after getting the result
+            # The consumer owns the sample now, release its memory budget:
+            with self._budget:
+                self._awaited.discard(idx)
+            self._release_memory_budget(idx)
+            with self._stats_lock:
+                self._consumer_wait_time += time.perf_counter() - start
 
         return result
 
+    def drop_preloaded(self, idx: int) -> None:
+        """
+        Discard a preloaded sample that will not be consumed.
+
+        A read that has not started yet is skipped, and the memory budget held
+        by the sample is released.
+
+        Args:
+            idx: Index of the preloaded sample.
+        """
+        result = self._preload_queue.pop(idx, None)
+        if result is None:
+            return
+        with self._budget:
+            result.cancel()
+            self._in_flight_bytes.pop(idx, None)
+            self._budget.notify_all()
+        self._transfer_events.pop(idx, None)
+
+    def reset(self) -> None:
+        """
+        Discard every preloaded sample and release its memory budget.
+        """
+        for idx in list(self._preload_queue):
+            self.drop_preloaded(idx)
+
+    def prefetch_metrics(self) -> dict:
+        """
+        Snapshot of the prefetch pipeline metrics.
+
+        Returns:
+            A dictionary with one entry per stage ("read" and "transfer"),
+            each a dictionary of the `PrefetchStageStats` fields, plus:
+            - "in_flight_bytes": bytes of samples preloaded but not yet
+              consumed, estimated for samples still being read.
+            - "in_flight_samples": number of such samples.
+            - "consumer_wait_time": total seconds spent blocked in
+              `get_preloaded` waiting for samples.
+        """
+        with self._stats_lock:
+            metrics = {
+                stage: asdict(stats) for stage, stats in self._stage_stats.items()
+            }
+            metrics["consumer_wait_time"] = self._consumer_wait_time
+        with self._budget:
+            metrics["in_flight_bytes"] = sum(self._in_flight_bytes.values())
+            metrics["in_flight_samples"] = len(self._in_flight_bytes)
+        return metrics
+
     def __iter__(self):
         # When starting the iterator method, start loading the data
         # at idx = 0, idx = 1
@@ -1054,6 +1824,12 @@ class CAEDataset:
     def __len__(self):
         return len(self._filenames)
 
+    def source(self, idx: int) -> pathlib.Path:
+        """
+        Path of the file (or directory) sample `idx` is read from.
+        """
+        return self._filenames[idx]
+
     def _read_file(self, filename: pathlib.Path) -> dict[str, torch.Tensor]:
         """
         Read a file and return a dictionary of tensors.
@@ -1123,9 +1899,19 @@ class CAEDataset:
         """
         Explicitly close the dataset and cleanup resources, including the ThreadPoolExecutor.
         """
+        if hasattr(self, "_budget"):
+            # Wake up any reads blocked on the memory budget:
+            with self._budget:
+                self._closed = True
+                self._budget.notify_all()
         if hasattr(self, "preload_executor") and self.preload_executor is not None:
             self.preload_executor.shutdown(wait=True)
             self.preload_executor = None
+        if hasattr(self, "transfer_executor") and self.transfer_executor is not None:
+            self.transfer_executor.shutdown(wait=True)
+            self.transfer_executor = None
+        if hasattr(self, "file_reader"):
+            self.file_reader.close()
 
     def __del__(self):
         """
@@ -1134,142 +1920,252 @@ class CAEDataset:
         self.close()
 
 
+def _field_moments(field_data: torch.Tensor) -> dict[str, torch.Tensor | int]:
+    """
+    Count, mean and sum of squared deviations of one field, per channel.
+    """
+    field_data = field_data.to(torch.float64)
+    mean = field_data.mean(dim=0)
+    return {
+        "n": field_data.shape[0],
+        "mean": mean.cpu(),
+        "M2": ((field_data - mean) ** 2).sum(dim=0).cpu(),
+    }
+
+
+def _merge_moments(
+    a: dict[str, torch.Tensor | int], b: dict[str, torch.Tensor | int]
+) -> dict[str, torch.Tensor | int]:
+    """
+    Combine two sets of partial moments (Chan et al.'s parallel algorithm).
+    """
+    n = a["n"] + b["n"]
+    delta = b["mean"] - a["mean"]
+    return {
+        "n": n,
+        "mean": a["mean"] + delta * (b["n"] / n),
+        "M2": a["M2"] + b["M2"] + delta**2 * (a["n"] * b["n"] / n),
+    }
+
+
+def _field_min_max(
+    field_data: torch.Tensor, mean: torch.Tensor, std: torch.Tensor
+) -> dict[str, torch.Tensor]:
+    """
+    Per channel min and max of one field, ignoring values more than 9 standard
+    deviations from the mean.
+    """
+    mean = mean.to(field_data.device)
+    std = std.to(field_data.device)
+    inliers = (field_data >= mean - 9.0 * std) & (field_data <= mean + 9.0 * std)
+    return {
+        "min": torch.where(inliers, field_data, torch.inf).amin(dim=0).cpu(),
+        "max": torch.where(inliers, field_data, -torch.inf).amax(dim=0).cpu(),
+    }
+
+
+def _file_statistics(
+    reader_type: type[BackendReader],
+    reader_kwargs: dict,
+    filename: pathlib.Path,
+    field_keys: list[str],
+    mean: dict[str, torch.Tensor] | None = None,
+    std: dict[str, torch.Tensor] | None = None,
+) -> dict[str, dict]:
+    """
+    Partial statistics of one file, run in a worker process.
+
+    Returns the moments of each field, or with ``mean`` and ``std`` given,
+    the clipped min and max.
+    """
+    reader = reader_type(field_keys, {}, **reader_kwargs)
+    try:
+        data = reader.read_file(filename)
+    finally:
+        reader.close()
+
+    if mean is None:
+        return {key: _field_moments(data[key]) for key in field_keys}
+    return {key: _field_min_max(data[key], mean[key], std[key]) for key in field_keys}
+
+
 def compute_mean_std_min_max(
-    dataset: CAEDataset, field_keys: list[str], max_samples: int = 20
+    dataset: CAEDataset,
+    field_keys: list[str],
+    max_samples: int = 20,
+    num_workers: int = 0,
+    checkpoint_path: str | pathlib.Path | None = None,
+    distributed: bool = False,
 ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
     """
     Compute the mean, standard deviation, minimum, and maximum for a specified field
     across all samples in a dataset.
 
-    Uses a numerically stable online algorithm for mean and variance.
+    Every file contributes partial moments, which are merged with the
+    numerically stable parallel algorithm of Chan et al.  A second pass then
+    computes the min and max, ignoring outliers beyond 9 standard deviations.
+
+    The files can be spread over a pool of ``num_workers`` processes, which
+    read them with a fresh reader of the dataset's type and settings, and with
+    ``distributed`` over the ranks of the default process group.  With a
+    ``checkpoint_path``, the partial results are saved after every file
+    (one checkpoint per rank), and an interrupted run with the same settings
+    resumes from them.  The checkpoint is removed once the run completes.
 
     Args:
         dataset (CAEDataset): The dataset to process.
-        field_key (str): The key for the field to normalize.
+        field_keys (list[str]): The keys of the fields to normalize.
+        max_samples (int): The maximum number of files to use.
+        num_workers (int): Number of worker processes, or 0 to read through
+            the dataset in this process.
+        checkpoint_path (str | pathlib.Path | None): Where to save partial
+            results, to resume an interrupted run.
+        distributed (bool): Split the files over the distributed ranks.
 
     Returns:
         tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
             mean, std, min, max tensors for the field.
     """
-    N = {}
-    mean = {}
-    M2 = {}  # Sum of squares of differences from the current mean
-    min_val = {}
-    max_val = {}
+    rank, world_size = 0, 1
+    if distributed and dist.is_available() and dist.is_initialized():
+        rank, world_size = dist.get_rank(), dist.get_world_size()
+
+    # The settings a checkpoint is only valid for:
+    settings = {
+        "field_keys": list(field_keys),
+        "max_samples": max_samples,
+        "num_files": len(dataset),
+        "world_size": world_size,
+    }
+    checkpoint = {"settings": settings, "selection": None, "moments": {}, "min_max": {}}
+    if checkpoint_path is not None:
+        checkpoint_path = pathlib.Path(checkpoint_path)
+        if world_size > 1:
+            checkpoint_path = checkpoint_path.with_name(
+                f"{checkpoint_path.name}.rank{rank}"
+            )
+        if checkpoint_path.exists():
+            saved = torch.load(checkpoint_path, weights_only=True)
+            if saved["settings"] == settings:
+                checkpoint = saved
+                print(f"Resuming statistics from {checkpoint_path}")
+
+    def save_checkpoint():
+        if checkpoint_path is not None:
+            tmp_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+            torch.save(checkpoint, tmp_path)
+            tmp_path.replace(checkpoint_path)
+
+    # Choose the files, the same ones on every rank and on resumption:
+    if checkpoint["selection"] is None:
+        data_list = np.arange(len(dataset))
+        np.random.shuffle(data_list)
+        data_list = data_list[:max_samples].tolist()
+        if world_size > 1:
+            holder = [data_list]
+            dist.broadcast_object_list(holder, src=0)
+            data_list = holder[0]
+        checkpoint["selection"] = data_list
+    data_list = checkpoint["selection"]
+    local_list = data_list[rank::world_size]
+
+    def run_pass(name, mean=None, std=None):
+        """
+        Compute the partials of all local files for one pass, and merge them
+        across ranks.
+        """
+        partials = checkpoint[name]
+        todo = [j for j in local_list if j not in partials]
+        start = time.perf_counter()
 
-    # Read the first data item to get the shapes:
-    example_data = dataset[0]
+        def finish(j, result):
+            nonlocal start
+            partials[j] = result
+            save_checkpoint()
+            end = time.perf_counter()
+            print(
+                f"{name}: {len(partials)} of {len(local_list)} files, "
+                f"time: {end - start:.2f} seconds for file: {j}"
+            )
+            start = end
+
+        if num_workers > 0:
+            # Same reader settings as the dataset, but the workers read on the
+            # host, so no pinned memory:
+            reader_kwargs = {
+                key: value
+                for key, value in dataset._reader_kwargs.items()
+                if key != "pin_memory"
+            }
+            # Use spawn, the parent may hold threads and CUDA state:
+            context = torch.multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(num_workers, mp_context=context) as pool:
+                futures = {
+                    pool.submit(
+                        _file_statistics,
+                        type(dataset.file_reader),
+                        reader_kwargs,
+                        dataset._filenames[j],
+                        field_keys,
+                        mean,
+                        std,
+                    ): j
+                    for j in todo
+                }
+                for future in as_completed(futures):
+                    finish(futures[future], future.result())
+        else:
+            for j in todo:
+                data = dataset[j]
+                if mean is None:
+                    result = {key: _field_moments(data[key]) for key in field_keys}
+                else:
+                    result = {
+                        key: _field_min_max(data[key], mean[key], std[key])
+                        for key in field_keys
+                    }
+                finish(j, result)
+
+        if world_size > 1:
+            gathered = [None] * world_size
+            dist.all_gather_object(gathered, partials)
+            partials = {
+                j: p for rank_partials in gathered for j, p in rank_partials.items()
+            }
 
-    # Create placeholders for the accumulators:
-    for key in field_keys:
-        N[key] = torch.zeros(1, dtype=torch.int64, device=example_data[key].device)
-        mean[key] = torch.zeros(
-            example_data[key].shape[-1],
-            device=example_data[key].device,
-            dtype=torch.float64,
-        )
-        M2[key] = torch.zeros(
-            example_data[key].shape[-1],
-            device=example_data[key].device,
-            dtype=torch.float64,
-        )
-        min_val[key] = torch.full(
-            (example_data[key].shape[-1],),
-            float("inf"),
-            device=example_data[key].device,
-        )
-        max_val[key] = torch.full(
-            (example_data[key].shape[-1],),
-            float("-inf"),
-            device=example_data[key].device,
-        )
+        # Merge in a fixed order, so the result doesn't depend on timing:
+        return [partials[j] for j in data_list]
 
     global_start = time.perf_counter()
-    start = time.perf_counter()
-    data_list = np.arange(len(dataset))
-    np.random.shuffle(data_list)
-    for i, j in enumerate(data_list):
-        data = dataset[j]
-        if i >= max_samples:
-            break
-
-        for field_key in field_keys:
-            field_data = data[field_key]
-
-            # Compute batch statistics
-            batch_mean = field_data.mean(axis=(0))
-            batch_M2 = ((field_data - batch_mean) ** 2).sum(axis=(0))
-            batch_n = field_data.shape[0]
-
-            # Update running mean and M2 (Welford's algorithm)
-            delta = batch_mean - mean[field_key]
-            N[field_key] += batch_n  # batch_n should also be torch.int64
-            mean[field_key] = mean[field_key] + delta * (batch_n / N[field_key])
-            M2[field_key] = (
-                M2[field_key]
-                + batch_M2
-                + delta**2 * (batch_n * N[field_key]) / N[field_key]
-            )
-
-        end = time.perf_counter()
-        iteration_time = end - start
-        print(
-            f"on iteration {i} of {max_samples}, time: {iteration_time:.2f} seconds for file: {j}"
-        )
-        start = time.perf_counter()
+    device = dataset.output_device
 
-    var = {}
+    moments = run_pass("moments")
+    mean = {}
     std = {}
     for field_key in field_keys:
-        var[field_key] = M2[field_key] / (
-            N[field_key].item() - 1
-        )  # Convert N to Python int for division
-        std[field_key] = torch.sqrt(var[field_key])
-
-    start = time.perf_counter()
-    for i, j in enumerate(data_list):
-        data = dataset[j]
-        if i >= max_samples:
-            break
-
-        for field_key in field_keys:
-            field_data = data[field_key]
-
-            batch_n = field_data.shape[0]
-
-            # # Update min/max
-
-            mean_sample = mean[field_key]
-            std_sample = std[field_key]
-            mask = torch.ones_like(field_data, dtype=torch.bool)
-            for v in range(field_data.shape[-1]):
-                outliers = (field_data[:, v] < mean_sample[v] - 9.0 * std_sample[v]) | (
-                    field_data[:, v] > mean_sample[v] + 9.0 * std_sample[v]
-                )
-                mask[:, v] = ~outliers
-
-            batch_min = []
-            batch_max = []
-            for v in range(field_data.shape[-1]):
-                batch_min.append(field_data[mask[:, v], v].min())
-                batch_max.append(field_data[mask[:, v], v].max())
+        merged = moments[0][field_key]
+        for partial in moments[1:]:
+            merged = _merge_moments(merged, partial[field_key])
+        mean[field_key] = merged["mean"]
+        std[field_key] = torch.sqrt(merged["M2"] / (merged["n"] - 1))
 
-            batch_min = torch.stack(batch_min)
-            batch_max = torch.stack(batch_max)
-
-            min_val[field_key] = torch.minimum(min_val[field_key], batch_min)
-            max_val[field_key] = torch.maximum(max_val[field_key], batch_max)
+    min_max = run_pass("min_max", mean, std)
+    min_val = {}
+    max_val = {}
+    for field_key in field_keys:
+        min_val[field_key] = torch.stack([p[field_key]["min"] for p in min_max]).amin(0)
+        max_val[field_key] = torch.stack([p[field_key]["max"] for p in min_max]).amax(0)
 
-        end = time.perf_counter()
-        iteration_time = end - start
-        print(
-            f"on iteration {i} of {max_samples}, time: {iteration_time:.2f} seconds for file: {j}"
-        )
-        start = time.perf_counter()
+    mean = {k: v.to(device) for k, v in mean.items()}
+    std = {k: v.to(device) for k, v in std.items()}
+    min_val = {k: v.to(device, torch.float32) for k, v in min_val.items()}
+    max_val = {k: v.to(device, torch.float32) for k, v in max_val.items()}
 
-    global_end = time.perf_counter()
-    global_time = global_end - global_start
+    # The run is complete, so the partial results are no longer needed:
+    if checkpoint_path is not None:
+        checkpoint_path.unlink(missing_ok=True)
 
-    print(f"Total time: {global_time:.2f} seconds for {max_samples} samples")
+    global_time = time.perf_counter() - global_start
+    print(f"Total time: {global_time:.2f} seconds for {len(data_list)} samples")
 
     return mean, std, min_val, max_val
@@ -42,6 +42,7 @@ from physicsnemo.datapipes.cae.cae_dataset import (
     CAEDataset,
     compute_mean_std_min_max,
 )
+from physicsnemo.datapipes.cae.preprocessed_cache import PreprocessedSampleCache
 from physicsnemo.distributed import DistributedManager
 from physicsnemo.distributed.shard_tensor import ShardTensor, scatter_tensor
 from physicsnemo.utils.domino.utils import (
@@ -50,14 +51,16 @@ from physicsnemo.utils.domino.utils import (
     get_filenames,
     normalize,
     pad,
+    pad_ragged,
     shuffle_array,
+    shuffle_array_batched,
     standardize,
     unnormalize,
     unstandardize,
 )
 from physicsnemo.utils.neighbors import knn
 from physicsnemo.utils.profiling import profile
-from physicsnemo.utils.sdf import signed_distance_field
+from physicsnemo.utils.sdf import SignedDistanceField
 
 
 class BoundingBox(Protocol):
@@ -130,6 +133,18 @@ class DoMINODataConfig:
             Applies to the surf_grid and similiar tensors.
         shard_points: Whether to shard the points across GPUs for domain parallelism.
             Applies to the volume_fields/surface_fields and similiar tensors.
+        preprocessed_cache_dir: If set, cache preprocessed data on disk in this
+            directory, keyed on the file the sample was read from (its path,
+            size and modification time) and the config fields that affect it.
+            The grid SDFs are always cached; complete samples are cached only
+            when the output is deterministic (no sampling).  The directory can
+            be shared between ranks and runs.
+        preprocessed_cache_max_size: Maximum size of the preprocessed cache
+            in bytes.  Least recently used entries are evicted beyond it.
+        preprocessed_cache_hash_content: Key the preprocessed cache on a hash
+            of the raw sample contents instead, which reads every byte of the
+            sample on each lookup.  Always the case for samples passed to
+            `__call__` directly, whose source file is unknown.
     """
 
     data_path: Path | None
@@ -165,6 +180,10 @@ class DoMINODataConfig:
     shard_grid: bool = False
     shard_points: bool = False
 
+    preprocessed_cache_dir: Path | None = None
+    preprocessed_cache_max_size: int | None = None
+    preprocessed_cache_hash_content: bool = False
+
     def __post_init__(self):
         if self.data_path is not None:
             # Ensure data_path is a Path object:
@@ -185,6 +204,12 @@ class DoMINODataConfig:
             if self.compute_scaling_factors:
                 raise ValueError("Compute scaling factors should be False for caching")
 
+        if self.preprocessed_cache_dir is not None:
+            if self.shard_grid or self.shard_points:
+                raise ValueError(
+                    "The preprocessed cache does not support domain parallelism"
+                )
+
         if self.phase not in [
             "train",
             "val",
@@ -310,8 +335,53 @@ class DoMINODataPipe(Dataset):
                 self.preproc_device, dtype=torch.float32
             )
 
+        if self.config.preprocessed_cache_dir is not None:
+            self.preprocessed_cache = PreprocessedSampleCache(
+                self.config.preprocessed_cache_dir,
+                self.config.preprocessed_cache_max_size,
+            )
+        else:
+            self.preprocessed_cache = None
+
         self.dataset = None
 
+    def _cache_fingerprint(self, group: str) -> dict:
+        """
+        Collect the settings that determine a group of cached outputs.
+
+        The "geometry" group holds the grid SDFs, which only depend on the
+        STL and the grids.  The "sample" group holds the complete output, and
+        additionally depends on every setting of the surface and volume
+        processing.  Changing e.g. the scaling factors therefore only
+        invalidates the sample entries.
+        """
+        names = [
+            "bounding_box_dims",
+            "bounding_box_dims_surf",
+            "grid_resolution",
+            "normalize_coordinates",
+        ]
+        if group == "sample":
+            names += [
+                "num_surface_neighbors",
+                "sample_in_bbox",
+                "scaling_type",
+                "surface_factors",
+                "volume_factors",
+            ]
+
+        def to_json(value):
+            if isinstance(value, torch.Tensor):
+                return value.tolist()
+            if isinstance(value, (list, tuple)):
+                return [to_json(v) for v in value]
+            return value
+
+        fingerprint = {"group": group, "model_type": self.model_type}
+        for name in names:
+            fingerprint[name] = to_json(getattr(self.config, name))
+        return fingerprint
+
     def compute_stl_scaling_and_surface_grids(
         self,
     ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
@@ -533,6 +603,8 @@ class DoMINODataPipe(Dataset):
         stl_vertices: torch.Tensor,
         stl_indices: torch.Tensor,
         volume_fields: torch.Tensor | None,
+        stl_sdf: SignedDistanceField | None = None,
+        sdf_grid: torch.Tensor | None = None,
     ) -> dict[str, torch.Tensor]:
         """
         Preprocess the volume data.
@@ -542,6 +614,11 @@ class DoMINODataPipe(Dataset):
         Next, if sampling is enabled, we sample the volume points and apply that
         sampling to the ground truth too, if it's present.
 
+        ``stl_sdf`` is an optional, prebuilt SDF handle for the un-normalized
+        ``stl_vertices``.  It is reused when coordinates are not normalized,
+        which saves rebuilding the BVH of the same mesh.  ``sdf_grid`` is an
+        optional, precomputed SDF of the (maybe normalized) volume grid, as
+        stored in the preprocessed cache.
         """
         ########################################################################
         # Reject points outside the volumetric BBox
@@ -612,22 +689,19 @@ class DoMINODataPipe(Dataset):
         # because we need to use the (maybe) normalized volume coordinates and grid
         ########################################################################
 
+        # Build the BVH once and query both the grid and the volume points:
+        if stl_sdf is None or self.config.normalize_coordinates:
+            stl_sdf = SignedDistanceField(
+                normed_vertices, stl_indices, use_sign_winding_number=True
+            )
+
         # SDF calculation on the volume grid using WARP
-        sdf_grid, _ = signed_distance_field(
-            normed_vertices,
-            stl_indices,
-            grid,
-            use_sign_winding_number=True,
-        )
+        if sdf_grid is None:
+            sdf_grid, _ = stl_sdf(grid)
 
         # Get the SDF of all the selected volume coordinates,
         # And keep the closest point to each one.
-        sdf_nodes, sdf_node_closest_point = signed_distance_field(
-            normed_vertices,
-            stl_indices,
-            volume_coordinates,
-            use_sign_winding_number=True,
-        )
+        sdf_nodes, sdf_node_closest_point = stl_sdf(volume_coordinates)
         sdf_nodes = sdf_nodes.reshape((-1, 1))
 
         # Use the closest point from the mesh to compute the volume encodings:
@@ -660,8 +734,322 @@ class DoMINODataPipe(Dataset):
 
         return pos_normals_closest_vol, pos_normals_com_vol
 
+    def process_surface_batch(
+        self,
+        s_min: torch.Tensor,
+        s_max: torch.Tensor,
+        c_min: torch.Tensor,
+        c_max: torch.Tensor,
+        *,
+        center_of_mass: torch.Tensor,
+        surface_coordinates: Sequence[torch.Tensor],
+        surface_normals: Sequence[torch.Tensor],
+        surface_sizes: Sequence[torch.Tensor],
+        surface_fields: Sequence[torch.Tensor] | None,
+    ) -> dict[str, torch.Tensor]:
+        """
+        Batched version of `process_surface`, for B samples at once.
+
+        The per sample point clouds are padded into (B, N_max, ...) tensors,
+        so the filtering, sampling, normalization and scaling each run as a
+        single operation over the batch.  Only the kNN runs per sample.
+
+        Requires sampling, so every output has the same number of points and
+        can be stacked.  ``center_of_mass`` has shape (B, 1, 3).
+        """
+        if not self.config.sampling:
+            raise ValueError("Batched processing requires sampling to be enabled")
+
+        coordinates, valid = pad_ragged(surface_coordinates)
+        normals, _ = pad_ragged(surface_normals)
+        sizes, _ = pad_ragged(surface_sizes)
+        fields = pad_ragged(surface_fields)[0] if surface_fields is not None else None
+        batch_idx = torch.arange(coordinates.shape[0], device=coordinates.device)
+
+        # Remove any sizes <= 0, and points outside the VOLUME bounding box:
+        valid = valid & (sizes > 0)
+        if self.config.sample_in_bbox:
+            ids_in_bbox = (coordinates > c_min) & (coordinates < c_max)
+            valid = valid & ids_in_bbox.all(dim=-1)
+
+        # Sample every row at once, never selecting padding or removed points:
+        weights = (
+            sizes if self.config.surface_sampling_algorithm == "area_weighted" else None
+        )
+        sampled_coordinates, idx_surface = shuffle_array_batched(
+            coordinates, self.config.surface_points_sample, valid, weights=weights
+        )
+        sampled_normals = normals[batch_idx[:, None], idx_surface]
+        sampled_sizes = sizes[batch_idx[:, None], idx_surface]
+        if fields is not None:
+            fields = fields[batch_idx[:, None], idx_surface]
+
+        if self.config.num_surface_neighbors > 1:
+            # The kNN is per sample, over the remaining points only.  Map the
+            # neighbors back to indices into the padded tensors:
+            neighbor_indices = []
+            for b in range(coordinates.shape[0]):
+                candidates = valid[b].nonzero()[:, 0]
+                sample_neighbors, _ = knn(
+                    points=coordinates[b, candidates],
+                    queries=sampled_coordinates[b],
+                    k=self.config.num_surface_neighbors,
+                )
+                neighbor_indices.append(candidates[sample_neighbors[:, 1:]])
+            neighbor_indices = torch.stack(neighbor_indices)
+
+            surface_neighbors = coordinates[batch_idx[:, None, None], neighbor_indices]
+            surface_neighbors_normals = normals[
+                batch_idx[:, None, None], neighbor_indices
+            ]
+            surface_neighbors_sizes = sizes[batch_idx[:, None, None], neighbor_indices]
+        else:
+            surface_neighbors = sampled_coordinates
+            surface_neighbors_normals = sampled_normals
+            surface_neighbors_sizes = sampled_sizes
+
+        if self.config.normalize_coordinates:
+            sampled_coordinates = normalize(sampled_coordinates, s_max, s_min)
+            surface_neighbors = normalize(surface_neighbors, s_max, s_min)
+            center_of_mass = normalize(center_of_mass, s_max, s_min)
+
+        pos_normals_com_surface = sampled_coordinates - center_of_mass
+
+        if self.config.scaling_type is not None and fields is not None:
+            fields = self.scale_model_targets(fields, self.config.surface_factors)
+
+        return_dict = {
+            "pos_surface_center_of_mass": pos_normals_com_surface,
+            "surface_mesh_centers": sampled_coordinates,
+            "surface_mesh_neighbors": surface_neighbors,
+            "surface_normals": sampled_normals,
+            "surface_neighbors_normals": surface_neighbors_normals,
+            "surface_areas": sampled_sizes,
+            "surface_neighbors_areas": surface_neighbors_sizes,
+        }
+        if fields is not None:
+            return_dict["surface_fields"] = fields
+
+        return return_dict
+
+    def process_volume_batch(
+        self,
+        c_min: torch.Tensor,
+        c_max: torch.Tensor,
+        *,
+        volume_coordinates: Sequence[torch.Tensor],
+        volume_grid: torch.Tensor,
+        center_of_mass: torch.Tensor,
+        stl_vertices: Sequence[torch.Tensor],
+        stl_indices: Sequence[torch.Tensor],
+        volume_fields: Sequence[torch.Tensor] | None,
+        stl_sdfs: Sequence[SignedDistanceField] | None = None,
+    ) -> dict[str, torch.Tensor]:
+        """
+        Batched version of `process_volume`, for B samples at once.
+
+        Filtering, sampling, normalization, scaling and the volume encodings
+        each run as a single operation over the padded batch, and the shared
+        grid is normalized once.  The SDF queries run per sample, since every
+        sample has its own mesh.
+
+        Requires sampling, so every output has the same number of points and
+        can be stacked.  ``center_of_mass`` has shape (B, 1, 3).
+        """
+        if not self.config.sampling:
+            raise ValueError("Batched processing requires sampling to be enabled")
+
+        coordinates, valid = pad_ragged(volume_coordinates)
+        fields = pad_ragged(volume_fields)[0] if volume_fields is not None else None
+        batch_idx = torch.arange(coordinates.shape[0], device=coordinates.device)
+
+        if self.config.sample_in_bbox:
+            ids_in_bbox = (coordinates > c_min) & (coordinates < c_max)
+            valid = valid & ids_in_bbox.all(dim=-1)
+
+        coordinates, idx_volume = shuffle_array_batched(
+            coordinates, self.config.volume_points_sample, valid
+        )
+        if fields is not None:
+            fields = fields[batch_idx[:, None], idx_volume]
+
+        if self.config.normalize_coordinates:
+            coordinates = normalize(coordinates, c_max, c_min)
+            grid = normalize(volume_grid, c_max, c_min)
+            normed_vertices = [normalize(v, c_max, c_min) for v in stl_vertices]
+            center_of_mass = normalize(center_of_mass, c_max, c_min)
+        else:
+            grid = volume_grid
+            normed_vertices = stl_vertices
+
+        if self.config.scaling_type is not None and fields is not None:
+            fields = self.scale_model_targets(fields, self.config.volume_factors)
+
+        # The prebuilt handles are for un-normalized vertices:
+        if stl_sdfs is None or self.config.normalize_coordinates:
+            stl_sdfs = [
+                SignedDistanceField(v, i, use_sign_winding_number=True)
+                for v, i in zip(normed_vertices, stl_indices)
+            ]
+
+        sdf_grid, sdf_nodes, sdf_node_closest_point = [], [], []
+        for b, stl_sdf in enumerate(stl_sdfs):
+            sdf_grid.append(stl_sdf(grid)[0])
+            sample_sdf, sample_closest_point = stl_sdf(coordinates[b])
+            sdf_nodes.append(sample_sdf)
+            sdf_node_closest_point.append(sample_closest_point)
+        sdf_grid = torch.stack(sdf_grid)
+        sdf_nodes = torch.stack(sdf_nodes)[..., None]
+        sdf_node_closest_point = torch.stack(sdf_node_closest_point)
+
+        pos_normals_closest_vol, pos_normals_com_vol = self.calculate_volume_encoding(
+            coordinates, sdf_node_closest_point, center_of_mass
+        )
+
+        return_dict = {
+            "volume_mesh_centers": coordinates,
+            "sdf_nodes": sdf_nodes,
+            "grid": grid.expand(coordinates.shape[0], *grid.shape),
+            "sdf_grid": sdf_grid,
+            "pos_volume_closest": pos_normals_closest_vol,
+            "pos_volume_center_of_mass": pos_normals_com_vol,
+        }
+        if fields is not None:
+            return_dict["volume_fields"] = fields
+
+        return return_dict
+
+    @torch.no_grad()
+    def process_data_batch(
+        self, data_dicts: Sequence[dict[str, torch.Tensor]]
+    ) -> dict[str, torch.Tensor]:
+        """
+        Preprocess B samples at once, with the batched surface and volume paths.
+
+        Produces the same keys as `process_data`, stacked along a new leading
+        batch dimension.  Requires sampling, and does not support domain
+        parallelism or the preprocessed cache.
+        """
+        if self.config.shard_grid or self.config.shard_points:
+            raise ValueError("Batched processing does not support domain parallelism")
+        if not self.config.sampling:
+            raise ValueError("Batched processing requires sampling to be enabled")
+
+        required_keys = [
+            "global_params_values",
+            "global_params_reference",
+            "stl_coordinates",
+            "stl_faces",
+            "stl_centers",
+            "stl_areas",
+        ]
+        for data_dict in data_dicts:
+            missing_keys = [key for key in required_keys if key not in data_dict]
+            if missing_keys:
+                raise ValueError(
+                    f"Missing required keys in data_dict: {missing_keys}. "
+                    f"Required keys are: {required_keys}"
+                )
+
+        def gather(key):
+            return [data_dict[key] for data_dict in data_dicts]
+
+        batch_size = len(data_dicts)
+        return_dict = {
+            "global_params_values": torch.stack(gather("global_params_values")),
+            "global_params_reference": torch.stack(gather("global_params_reference")),
+        }
+
+        ########################################################################
+        # Process the core STL information
+        ########################################################################
+        s_min, s_max, surf_grid = self.compute_stl_scaling_and_surface_grids()
+        if self.config.normalize_coordinates:
+            surf_grid = normalize(surf_grid, s_max, s_min)
+
+        mesh_indices_flattened = [
+            faces.to(torch.int32) for faces in gather("stl_faces")
+        ]
+
+        # One BVH per sample, reused for the volume when not normalizing:
+        stl_sdfs = []
+        sdf_surf_grid = []
+        for vertices, faces in zip(gather("stl_coordinates"), mesh_indices_flattened):
+            if self.config.normalize_coordinates:
+                vertices = normalize(vertices, s_max, s_min)
+            stl_sdf = SignedDistanceField(vertices, faces, use_sign_winding_number=True)
+            stl_sdfs.append(stl_sdf)
+            sdf_surf_grid.append(stl_sdf(surf_grid)[0])
+        return_dict["sdf_surf_grid"] = torch.stack(sdf_surf_grid)
+        return_dict["surf_grid"] = surf_grid.expand(batch_size, *surf_grid.shape)
+
+        if self.config.normalize_coordinates:
+            return_dict["surface_min_max"] = torch.stack([s_min, s_max]).expand(
+                batch_size, 2, -1
+            )
+
+        # Area weighted center of mass of every sample, padding has zero area:
+        stl_centers, _ = pad_ragged(gather("stl_centers"))
+        stl_areas, _ = pad_ragged(gather("stl_areas"))
+        center_of_mass = (
+            torch.einsum("bi,bij->bj", stl_areas, stl_centers)
+            / stl_areas.sum(dim=1, keepdim=True)
+        )[:, None]
+
+        stl_coordinates, stl_valid = pad_ragged(gather("stl_coordinates"))
+        return_dict["geometry_coordinates"], _ = shuffle_array_batched(
+            stl_coordinates, self.config.geom_points_sample, stl_valid
+        )
+
+        c_min, c_max, volume_grid = self.compute_volume_scaling_and_grids()
+
+        ########################################################################
+        # Process the surface data
+        ########################################################################
+        if self.model_type == "surface" or self.model_type == "combined":
+            surface_dict = self.process_surface_batch(
+                s_min,
+                s_max,
+                c_min,
+                c_max,
+                center_of_mass=center_of_mass,
+                surface_coordinates=gather("surface_mesh_centers"),
+                surface_normals=gather("surface_normals"),
+                surface_sizes=gather("surface_areas"),
+                surface_fields=gather("surface_fields")
+                if "surface_fields" in data_dicts[0]
+                else None,
+            )
+            return_dict.update(surface_dict)
+
+        ########################################################################
+        # Process the volume data
+        ########################################################################
+        if self.model_type == "volume" or self.model_type == "combined":
+            if self.config.normalize_coordinates:
+                return_dict["volume_min_max"] = torch.stack([c_min, c_max]).expand(
+                    batch_size, 2, -1
+                )
+
+            volume_dict = self.process_volume_batch(
+                c_min,
+                c_max,
+                volume_coordinates=gather("volume_mesh_centers"),
+                volume_grid=volume_grid,
+                center_of_mass=center_of_mass,
+                stl_vertices=gather("stl_coordinates"),
+                stl_indices=mesh_indices_flattened,
+                volume_fields=gather("volume_fields")
+                if "volume_fields" in data_dicts[0]
+                else None,
+                stl_sdfs=stl_sdfs,
+            )
+            return_dict.update(volume_dict)
+
+        return return_dict
+
     @torch.no_grad()
-    def process_data(self, data_dict):
+    def process_data(self, data_dict, source: Path | None = None):
         # Validate that all required keys are present in data_dict
         required_keys = [
             "global_params_values",
@@ -699,6 +1087,38 @@ class DoMINODataPipe(Dataset):
 
             data_dict = local_data_dict
 
+        ########################################################################
+        # Look up the preprocessed cache
+        ########################################################################
+        if self.config.preprocessed_cache_hash_content:
+            source = None
+        # Complete samples are only reusable if the processing is deterministic:
+        sample_key = None
+        if (
+            self.preprocessed_cache is not None
+            and not self.config.sampling
+            and not self.config.volume_sample_from_disk
+        ):
+            sample_key = self.preprocessed_cache.key(
+                data_dict, self._cache_fingerprint("sample"), source
+            )
+            cached = self.preprocessed_cache.get(sample_key, self.preproc_device)
+            if cached is not None:
+                return cached
+
+        # The grid SDFs only depend on the STL, so are always reusable:
+        geometry_key = None
+        cached_geometry = None
+        if self.preprocessed_cache is not None:
+            geometry_key = self.preprocessed_cache.key(
+                {key: data_dict[key] for key in ("stl_coordinates", "stl_faces")},
+                self._cache_fingerprint("geometry"),
+                source,
+            )
+            cached_geometry = self.preprocessed_cache.get(
+                geometry_key, self.preproc_device
+            )
+
         ########################################################################
         # Process the core STL information
         ########################################################################
@@ -720,12 +1140,14 @@ class DoMINODataPipe(Dataset):
         mesh_indices_flattened = data_dict["stl_faces"].to(torch.int32)
 
         # Compute signed distance function for the surface grid:
-        sdf_surf_grid, _ = signed_distance_field(
-            mesh_vertices=normed_vertices,
-            mesh_indices=mesh_indices_flattened,
-            input_points=surf_grid,
-            use_sign_winding_number=True,
-        )
+        if cached_geometry is not None:
+            stl_sdf = None
+            sdf_surf_grid = cached_geometry["sdf_surf_grid"]
+        else:
+            stl_sdf = SignedDistanceField(
+                normed_vertices, mesh_indices_flattened, use_sign_winding_number=True
+            )
+            sdf_surf_grid, _ = stl_sdf(surf_grid)
         return_dict["sdf_surf_grid"] = sdf_surf_grid
         return_dict["surf_grid"] = surf_grid
 
@@ -796,10 +1218,25 @@ class DoMINODataPipe(Dataset):
                 stl_vertices=data_dict["stl_coordinates"],
                 stl_indices=mesh_indices_flattened,
                 volume_fields=volume_fields_raw,
+                stl_sdf=stl_sdf,
+                sdf_grid=None
+                if cached_geometry is None
+                else cached_geometry["sdf_grid"],
             )
 
             return_dict.update(volume_dict)
 
+        ########################################################################
+        # Fill the preprocessed cache
+        ########################################################################
+        if geometry_key is not None and cached_geometry is None:
+            geometry = {"sdf_surf_grid": return_dict["sdf_surf_grid"]}
+            if "sdf_grid" in return_dict:
+                geometry["sdf_grid"] = return_dict["sdf_grid"]
+            self.preprocessed_cache.put(geometry_key, geometry)
+        if sample_key is not None:
+            self.preprocessed_cache.put(sample_key, return_dict)
+
         # For domain parallelism, shard everything appropriately:
         if self.config.shard_grid or self.config.shard_points:
             # Mesh was defined above!
@@ -981,9 +1418,19 @@ class DoMINODataPipe(Dataset):
         # Under the hood, this may be fetching preloaded data.
         data_dict = self.dataset[idx]
 
-        return self.__call__(data_dict)
+        return self.__call__(data_dict, source=self._sample_source(idx))
+
+    def _sample_source(self, idx: int) -> Path | None:
+        """
+        File the dataset reads sample `idx` from, if it is a `CAEDataset`.
+        """
+        if isinstance(self.dataset, CAEDataset):
+            return self.dataset.source(idx)
+        return None
 
-    def __call__(self, data_dict: dict[str, torch.Tensor]) -> dict[str, torch.Tensor]:
+    def __call__(
+        self, data_dict: dict[str, torch.Tensor], source: Path | None = None
+    ) -> dict[str, torch.Tensor]:
         """
         Process the incoming data dictionary.
         - Processes the data
@@ -992,12 +1439,14 @@ class DoMINODataPipe(Dataset):
 
         Args:
             data_dict: Dictionary containing the data to process as torch.Tensors.
+            source: File the data was read from, which keys the preprocessed
+                cache.  If None, the cache is keyed on the data contents.
 
         Returns:
             Dictionary containing the processed data as torch.Tensors.
 
         """
-        data_dict = self.process_data(data_dict)
+        data_dict = self.process_data(data_dict, source)
 
         # If the data is not on the target device, put it there:
         for key, value in data_dict.items():
@@ -1009,6 +1458,30 @@ class DoMINODataPipe(Dataset):
 
         return data_dict
 
+    def process_batch(
+        self, data_dicts: Sequence[dict[str, torch.Tensor]]
+    ) -> dict[str, torch.Tensor]:
+        """
+        Process several incoming data dictionaries into one batch.
+
+        Like `__call__`, but the samples are preprocessed together with
+        `process_data_batch`, and the outputs are stacked along the batch
+        dimension.  Requires sampling.
+
+        Args:
+            data_dicts: Sequence of dictionaries containing the data to process.
+
+        Returns:
+            Dictionary containing the processed, batched data as torch.Tensors.
+        """
+        data_dict = self.process_data_batch(data_dicts)
+
+        for key, value in data_dict.items():
+            if value.device != self.output_device:
+                data_dict[key] = value.to(self.output_device)
+
+        return data_dict
+
     def __iter__(self):
         if self.dataset is None:
             raise ValueError(
@@ -1016,7 +1489,10 @@ class DoMINODataPipe(Dataset):
             )
 
         for i, batch in enumerate(self.dataset):
-            yield self.__call__(batch)
+            source = None
+            if isinstance(self.dataset, CAEDataset):
+                source = self._sample_source(self.dataset.idx_to_index(i))
+            yield self.__call__(batch, source=source)
 
 
 def compute_scaling_factors(
@@ -1024,6 +1500,9 @@ def compute_scaling_factors(
     input_path: str,
     target_keys: list[str],
     max_samples=20,
+    num_workers: int = 0,
+    checkpoint_path: str | Path | None = None,
+    distributed: bool = False,
 ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
     """
     Using the dataset at the path, compute the mean, std, min, and max of the target keys.
@@ -1032,6 +1511,11 @@ def compute_scaling_factors(
         cfg: Hydra configuration object containing all parameters
         input_path: Path to the dataset to load.
         target_keys: List of keys to compute the mean, std, min, and max of.
+        max_samples: Maximum number of files to use.
+        num_workers: Number of worker processes reading files in parallel.
+        checkpoint_path: Where to save partial results, to resume an
+            interrupted run.
+        distributed: Whether to split the files across distributed ranks.
         use_cache: (deprecated) This argument has no effect.
     """
 
@@ -1048,6 +1532,9 @@ def compute_scaling_factors(
         dataset,
         field_keys=target_keys,
         max_samples=max_samples,
+        num_workers=num_workers,
+        checkpoint_path=checkpoint_path,
+        distributed=distributed,
     )
 
     return mean, std, min_val, max_val
@@ -0,0 +1,276 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+On-disk cache of preprocessed samples, used by the DoMINO datapipe to skip
+repeated geometry preprocessing across epochs and runs.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Prefix of the private directories entries are written to before publishing:
+_TMP_PREFIX = ".tmp-"
+
+# Temporary directories older than this (in seconds) are left over from
+# crashed writers and are removed during eviction:
+_STALE_TMP_AGE = 3600.0
+
+
+def _update_with_layout(hasher, tensors: dict[str, torch.Tensor]) -> None:
+    for name in sorted(tensors.keys()):
+        hasher.update(name.encode())
+        hasher.update(str(tensors[name].dtype).encode())
+        hasher.update(str(tuple(tensors[name].shape)).encode())
+
+
+def content_key(tensors: dict[str, torch.Tensor], config: dict) -> str:
+    """
+    Content hash of a set of tensors plus a JSON serializable config.
+
+    The hash covers the name, dtype, shape and bytes of every tensor, so two
+    samples with the same data get the same key regardless of where they
+    were read from.  This reads every byte of the tensors (and copies GPU
+    tensors to the host), see ``source_key`` for a cheaper key.
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    _update_with_layout(hasher, tensors)
+    for name in sorted(tensors.keys()):
+        host = tensors[name].detach().contiguous().cpu()
+        hasher.update(np.ascontiguousarray(host.numpy()).view(np.uint8))
+    hasher.update(json.dumps(config, sort_keys=True).encode())
+    return hasher.hexdigest()
+
+
+def source_key(
+    source: str | Path, tensors: dict[str, torch.Tensor], config: dict
+) -> str:
+    """
+    Hash of the file a set of tensors was read from plus a JSON serializable
+    config.
+
+    The file is identified by its path, size and modification time (those of
+    every file below it for a directory), so rewriting the file changes the
+    key.  The name, dtype and shape of every tensor are hashed too, which
+    tells apart different keys or samples read from the same file, but their
+    bytes are not read.
+    """
+    source = Path(source).resolve()
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(str(source).encode())
+    files = [source]
+    if source.is_dir():
+        files = sorted(path for path in source.rglob("*") if path.is_file())
+    for file in files:
+        stat = file.stat()
+        hasher.update(
+            f"{file.relative_to(source)}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+        )
+    _update_with_layout(hasher, tensors)
+    hasher.update(json.dumps(config, sort_keys=True).encode())
+    return hasher.hexdigest()
+
+
+class PreprocessedSampleCache:
+    """
+    On-disk, content addressed cache of preprocessed samples.
+
+    Each entry is a directory named after its key, holding one ``<name>.npy``
+    file per tensor (the layout read by ``NpyDirectoryReader``).  Entries are
+    loaded memory-mapped and copy-on-write, without copying: the bytes are
+    only read when the tensors are used or moved to another device, and
+    writes to the tensors never reach the cache.
+
+    The cache is safe to share between processes and ranks: an entry is
+    written to a private temporary directory and published with an atomic
+    rename, so readers never see partial entries, and concurrent writers of
+    the same key simply discard the losing copy.  A reader racing an eviction
+    sees a miss.
+
+    With ``max_size`` set, the least recently used entries are removed after
+    each insertion until the cache fits.  Recency is tracked through the
+    modification time of the entry directories, which is refreshed on hits.
+
+    Args:
+        cache_dir: Directory holding the cache.  Created if needed.
+        max_size: Maximum total size of the cache in bytes, unbounded by default.
+
+    Example:
+    >>> import tempfile, torch
+    >>> cache = PreprocessedSampleCache(tempfile.mkdtemp())
+    >>> key = cache.key({"x": torch.arange(4)}, {"scale": 2})
+    >>> cache.get(key) is None
+    True
+    >>> cache.put(key, {"y": torch.arange(4) * 2})
+    >>> cache.get(key)["y"]
+    tensor([0, 2, 4, 6])
+    """
+
+    def __init__(self, cache_dir: str | Path, max_size: int | None = None) -> None:
+        if max_size is not None and max_size <= 0:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+    def key(
+        self,
+        tensors: dict[str, torch.Tensor],
+        config: dict,
+        source: str | Path | None = None,
+    ) -> str:
+        """
+        Return the cache key of the raw ``tensors`` processed with ``config``.
+
+        With the ``source`` file the tensors were read from, the key is based
+        on the identity of that file (see ``source_key``), which only costs a
+        few ``stat`` calls.  Without it, the contents of the tensors are
+        hashed (see ``content_key``).
+        """
+        if source is not None:
+            return source_key(source, tensors, config)
+        return content_key(tensors, config)
+
+    def _entries(self) -> list[Path]:
+        return [
+            path
+            for path in self.cache_dir.iterdir()
+            if path.is_dir() and not path.name.startswith(_TMP_PREFIX)
+        ]
+
+    def get(
+        self, key: str, device: torch.device | str | None = None
+    ) -> dict[str, torch.Tensor] | None:
+        """
+        Load an entry, returning None on a miss.
+        """
+        entry = self.cache_dir / key
+        try:
+            files = sorted(entry.glob("*.npy"))
+            data = {}
+            for file in files:
+                array = np.load(file, mmap_mode="c")
+                data[file.stem] = torch.from_numpy(array)
+            # Mark this entry as recently used:
+            os.utime(entry)
+        except (FileNotFoundError, ValueError):
+            # Evicted while reading:
+            return None
+
+        if len(data) == 0:
+            return None
+
+        if device is not None:
+            data = {name: value.to(device) for name, value in data.items()}
+        return data
+
+    def put(self, key: str, data: dict[str, torch.Tensor]) -> None:
+        """
+        Store an entry, then evict old entries if the cache is over its size.
+        """
+        entry = self.cache_dir / key
+        if entry.exists():
+            return
+
+        tmp = self.cache_dir / f"{_TMP_PREFIX}{key}-{uuid.uuid4().hex}"
+        tmp.mkdir()
+        try:
+            for name, value in data.items():
+                np.save(tmp / f"{name}.npy", value.detach().cpu().numpy())
+            os.rename(tmp, entry)
+        except OSError:
+            # Another writer published this key first:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not entry.exists():
+                raise
+
+        if self.max_size is not None:
+            self.evict()
+
+    def size(self) -> int:
+        """
+        Total size of the published entries in bytes.
+        """
+        return sum(_entry_size(entry) for entry in self._entries())
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits ``max_size``.
+        """
+        # Clean up after writers that died mid-write:
+        now = time.time()
+        for path in self.cache_dir.glob(f"{_TMP_PREFIX}*"):
+            mtime = _mtime(path)
+            if mtime is not None and now - mtime > _STALE_TMP_AGE:
+                shutil.rmtree(path, ignore_errors=True)
+
+        if self.max_size is None:
+            return
+
+        # Entries removed concurrently have no modification time:
+        entries = []
+        for entry in self._entries():
+            mtime = _mtime(entry)
+            if mtime is not None:
+                entries.append((mtime, _entry_size(entry), entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        for entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def __contains__(self, key: str) -> bool:
+        return (self.cache_dir / key).is_dir()
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+
+def _mtime(path: Path) -> float | None:
+    """
+    Modification time of a path, or None if it was removed.
+    """
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _entry_size(entry: Path) -> int:
+    """
+    Size of an entry directory in bytes, zero if it was removed.
+    """
+    try:
+        return sum(file.stat().st_size for file in entry.iterdir())
+    except FileNotFoundError:
+        return 0
@@ -17,13 +17,11 @@
 
 import json
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
 from itertools import chain
 
 import h5py
 import netCDF4 as nc
 import numpy as np
-import pytz
 import torch
 
 try:
@@ -42,8 +40,13 @@ from typing import Callable, Iterable, List, Mapping, Tuple, Union
 
 from scipy.io import netcdf_file
 
+from physicsnemo.datapipes.climate.utils.hyperslab import (
+    plan_channel_reads,
+    read_hyperslabs,
+)
 from physicsnemo.datapipes.climate.utils.invariant import latlon_grid
 from physicsnemo.datapipes.climate.utils.zenith_angle import cos_zenith_angle
+from physicsnemo.datapipes.climate.utils.zenith_table import sequence_timestamps
 from physicsnemo.datapipes.datapipe import Datapipe
 from physicsnemo.datapipes.meta import DatapipeMetaData
 from physicsnemo.launch.logging import PythonLogger
@@ -729,15 +732,8 @@ class ClimateDaliExternalSource(ABC):
         state_seq = self._load_sequence(year_idx, in_idx)
 
         # Load sequence of timestamps
-        year = self.start_year + year_idx
-        start_time = datetime(year, 1, 1, tzinfo=pytz.utc) + timedelta(
-            hours=int(in_idx) * self.dt
-        )
-        timestamps = np.array(
-            [
-                (start_time + timedelta(hours=i * self.stride * self.dt)).timestamp()
-                for i in range(self.num_steps)
-            ]
+        timestamps = sequence_timestamps(
+            self.start_year + year_idx, in_idx, self.num_steps, self.stride, self.dt
         )
 
         # outputs from auxiliary sources
@@ -771,7 +767,11 @@ class ClimateHDF5DaliExternalSource(ClimateDaliExternalSource):
     def _load_sequence(self, year_idx: int, idx: int) -> np.array:
         # TODO: the data is returned in a weird (time, channels, width, height) shape
         data = self._get_data_file(year_idx)["fields"]
-        return data[idx : idx + self.num_steps * self.stride : self.stride, self.chans]
+        return read_hyperslabs(
+            data,
+            slice(idx, idx + self.num_steps * self.stride, self.stride),
+            plan_channel_reads(self.chans),
+        )
 
 
 class ClimateNetCDF4DaliExternalSource(ClimateDaliExternalSource):
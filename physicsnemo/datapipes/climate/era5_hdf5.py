@@ -29,14 +29,19 @@ except ImportError:
     )
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple, Union
 
-import pytz
-
+from physicsnemo.datapipes.climate.utils.hyperslab import (
+    plan_channel_reads,
+    read_hyperslabs,
+)
 from physicsnemo.datapipes.climate.utils.invariant import latlon_grid
 from physicsnemo.datapipes.climate.utils.zenith_angle import cos_zenith_angle
+from physicsnemo.datapipes.climate.utils.zenith_table import (
+    build_cos_zenith_table,
+    sequence_timestamps,
+)
 
 from ..datapipe import Datapipe
 from ..meta import DatapipeMetaData
@@ -105,6 +110,11 @@ class ERA5HDF5Datapipe(Datapipe):
             ((lat_start, lat_end,), (lon_start, lon_end)).
             By default ((90, -90), (0, 360)).
 
+        table_dir : str, optional
+            If set, the cos zenith angles of every time step are precomputed once into
+            memory-mapped tables in this directory and looked up by the workers
+            instead of being computed for every sample, by default None
+
         Defaults are only applicable if use_cos_zenith is True. Otherwise, defaults to {}.
     use_time_of_year_index: bool
         If true, also returns the index that can be used to determine the time of the year
@@ -235,6 +245,7 @@ class ERA5HDF5Datapipe(Datapipe):
 
         self.parse_dataset_files()
         self.load_statistics()
+        self.build_cos_zenith_tables()
 
         self.pipe = self._create_pipeline()
 
@@ -309,6 +320,32 @@ class ERA5HDF5Datapipe(Datapipe):
             self.logger.info(f"Number of samples/year: {self.num_samples_per_year}")
             self.logger.info(f"Number of channels available: {f['fields'].shape[1]}")
 
+    def build_cos_zenith_tables(self) -> None:
+        """Precomputes the cos zenith angles of each year if a table directory is set
+
+        Tables cover the time steps that samples of a year can reach and are shared
+        by all workers (and ranks) through memory-mapped files.
+        """
+        table_dir = self.cos_zenith_args.get("table_dir")
+        if not self.use_cos_zenith or table_dir is None:
+            self.cos_zenith_tables = None
+            return
+
+        num_times = self.num_samples_per_year + (
+            (self.num_steps + self.num_history) * self.stride
+        )
+        self.cos_zenith_tables = []
+        for year_idx in range(self.n_years):
+            path = build_cos_zenith_table(
+                table_dir,
+                year=self.cos_zenith_args["start_year"] + year_idx,
+                num_times=num_times,
+                dt=self.cos_zenith_args["dt"],
+                latlon=self.data_latlon,
+            )
+            self.logger.info(f"Cos zenith table: {path}")
+            self.cos_zenith_tables.append(str(path))
+
     def load_statistics(self) -> None:
         """Loads ERA5 statistics from pre-computed numpy files
 
@@ -372,6 +409,7 @@ class ERA5HDF5Datapipe(Datapipe):
                 num_samples_per_year=self.num_samples_per_year,
                 use_cos_zenith=self.use_cos_zenith,
                 cos_zenith_args=self.cos_zenith_args,
+                cos_zenith_tables=self.cos_zenith_tables,
                 use_time_of_year_index=self.use_time_of_year_index,
                 batch_size=self.batch_size,
                 shuffle=self.shuffle,
@@ -428,10 +466,15 @@ class ERA5HDF5Datapipe(Datapipe):
 
             # cos zenith angle
             if self.use_cos_zenith:
-                cos_zenith = dali.fn.cast(
-                    cos_zenith_angle(timestamps, latlon=self.latlon_dali),
-                    dtype=dali.types.FLOAT,
-                )
+                if self.cos_zenith_tables is not None:
+                    # The source looked the angles up in the precomputed tables
+                    # and returned them in place of the timestamps.
+                    cos_zenith = timestamps
+                else:
+                    cos_zenith = dali.fn.cast(
+                        cos_zenith_angle(timestamps, latlon=self.latlon_dali),
+                        dtype=dali.types.FLOAT,
+                    )
                 if self.device.type == "cuda":
                     cos_zenith = cos_zenith.gpu()
 
@@ -494,6 +537,9 @@ class ERA5DaliExternalSource:
 
         start_year: int
             Start year of dataset
+    cos_zenith_tables: List[str], optional
+        Paths to the precomputed cos zenith tables of each year. If given, the cos
+        zenith angles are returned in place of the timestamps, by default None
     shuffle : bool, optional
         Shuffle dataset, by default True
     process_rank : int, optional
@@ -519,6 +565,7 @@ class ERA5DaliExternalSource:
         use_cos_zenith: bool,
         cos_zenith_args: Dict,
         use_time_of_year_index: bool,
+        cos_zenith_tables: Union[List[str], None] = None,
         batch_size: int = 1,
         shuffle: bool = True,
         process_rank: int = 0,
@@ -526,14 +573,19 @@ class ERA5DaliExternalSource:
     ):
         self.data_paths = list(data_paths)
         # Will be populated later once each worker starts running in its own process.
-        self.data_files = None
+        self.data_files = [None] * len(self.data_paths)
         self.num_samples = num_samples
         self.chans = list(channels)
+        # Channels are read as a few strided slices instead of a fancy index
+        self.channel_reads = plan_channel_reads(self.chans)
         self.num_steps = num_steps
         self.num_history = num_history
         self.stride = stride
         self.num_samples_per_year = num_samples_per_year
         self.use_cos_zenith = use_cos_zenith
+        self.cos_zenith_tables = cos_zenith_tables
+        # Memory-mapped by each worker on first use.
+        self.cos_zenith_files = [None] * len(self.data_paths)
         self.use_time_of_year_index = use_time_of_year_index
         self.batch_size = batch_size
         self.shuffle = shuffle
@@ -559,12 +611,6 @@ class ERA5DaliExternalSource:
         if sample_info.iteration >= self.num_batches:
             raise StopIteration()
 
-        if self.data_files is None:
-            # This will be called once per worker. Workers are persistent,
-            # so there is no need to explicitly close the files - this will be done
-            # when corresponding pipeline/dataset is destroyed.
-            self.data_files = [h5py.File(path, "r") for path in self.data_paths]
-
         # Shuffle before the next epoch starts.
         if self.shuffle and sample_info.epoch_idx != self.last_epoch:
             # All workers use the same rng seed so the resulting
@@ -578,19 +624,22 @@ class ERA5DaliExternalSource:
         in_idx = idx % self.num_samples_per_year
 
         # Load sequence of timestamps
-        if self.use_cos_zenith:
-            year = self.start_year + year_idx
-            start_time = datetime(year, 1, 1, tzinfo=pytz.utc) + timedelta(
-                hours=int(in_idx) * self.dt
-            )
+        num_times = self.num_history + self.num_steps + 1
+        if self.use_cos_zenith and self.cos_zenith_tables is not None:
+            # Has [T,1,H,W] shape, returned in place of the timestamps.
             timestamps = np.array(
-                [
-                    (
-                        start_time + timedelta(hours=i * self.stride * self.dt)
-                    ).timestamp()
-                    for i in range(self.num_history + self.num_steps + 1)
+                self._get_cos_zenith_table(year_idx)[
+                    in_idx : in_idx + num_times * self.stride : self.stride
                 ]
             )
+        elif self.use_cos_zenith:
+            timestamps = sequence_timestamps(
+                self.start_year + year_idx,
+                in_idx,
+                num_times,
+                self.stride,
+                self.dt,
+            )
         else:
             timestamps = np.array([])
         if self.use_time_of_year_index:
@@ -598,25 +647,43 @@ class ERA5DaliExternalSource:
         else:
             time_of_year_idx = -1
 
-        data = self.data_files[year_idx]["fields"]
-        if self.num_history == 0:
-            # Has [C,H,W] shape.
-            invar = data[in_idx, self.chans]
-        else:
-            # Has [T,C,H,W] shape.
-            invar = data[
-                in_idx : in_idx + (self.num_history + 1) * self.stride : self.stride,
-                self.chans,
-            ]
-
+        # History and rollout steps are evenly spaced, so the whole sequence is
+        # one strided hyperslab read into a single [T,C,H,W] array.
+        data = self._get_data_file(year_idx)["fields"]
+        num_inputs = self.num_history + 1
+        sequence = read_hyperslabs(
+            data,
+            slice(
+                in_idx,
+                in_idx + (num_inputs + self.num_steps) * self.stride,
+                self.stride,
+            ),
+            self.channel_reads,
+        )
+        # Has [C,H,W] shape if there is no history, [T,C,H,W] otherwise.
+        invar = sequence[0] if self.num_history == 0 else sequence[:num_inputs]
         # Has [T,C,H,W] shape.
-        outvar = np.empty((self.num_steps,) + invar.shape[-3:], dtype=invar.dtype)
-
-        for i in range(self.num_steps):
-            out_idx = in_idx + (self.num_history + i + 1) * self.stride
-            outvar[i] = data[out_idx, self.chans]
+        outvar = sequence[num_inputs:]
 
         return invar, outvar, timestamps, np.array([time_of_year_idx])
 
+    def _get_data_file(self, year_idx: int) -> h5py.File:
+        """Return the opened file for year `year_idx`."""
+        if self.data_files[year_idx] is None:
+            # This will be called once per worker. Workers are persistent,
+            # so there is no need to explicitly close the files - this will be done
+            # when corresponding pipeline/dataset is destroyed.
+            # Lazy opening avoids unnecessary file open ops when sharding.
+            self.data_files[year_idx] = h5py.File(self.data_paths[year_idx], "r")
+        return self.data_files[year_idx]
+
+    def _get_cos_zenith_table(self, year_idx: int) -> np.ndarray:
+        """Return the memory-mapped cos zenith table for year `year_idx`."""
+        if self.cos_zenith_files[year_idx] is None:
+            self.cos_zenith_files[year_idx] = np.load(
+                self.cos_zenith_tables[year_idx], mmap_mode="r"
+            )
+        return self.cos_zenith_files[year_idx]
+
     def __len__(self):
         return len(self.indices)
@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List, Sequence, Tuple
+
+import h5py
+import numpy as np
+
+
+def plan_channel_reads(channels: Sequence[int]) -> List[Tuple[slice, slice]]:
+    """Split a list of channel indices into the fewest strided slices.
+
+    Consecutive channels with a constant positive step are merged into one slice,
+    so a contiguous channel list becomes a single read.
+
+    Parameters
+    ----------
+    channels : Sequence[int]
+        Channel indices in the order they should appear in the output
+
+    Returns
+    -------
+    List[Tuple[slice, slice]]
+        Pairs of (source slice in the file, destination slice in the output)
+    """
+    channels = [int(c) for c in channels]
+    reads = []
+    start = 0
+    while start < len(channels):
+        stop = start + 1
+        step = channels[stop] - channels[start] if stop < len(channels) else 1
+        if step > 0:
+            while stop < len(channels) and channels[stop] - channels[stop - 1] == step:
+                stop += 1
+        else:
+            step = 1
+        source = slice(channels[start], channels[stop - 1] + 1, step)
+        reads.append((source, slice(start, stop)))
+        start = stop
+    return reads
+
+
+def read_hyperslabs(
+    data: h5py.Dataset,
+    time_slice: slice,
+    channel_reads: List[Tuple[slice, slice]],
+    out: np.ndarray = None,
+) -> np.ndarray:
+    """Read a strided time range of selected channels straight into an array.
+
+    Parameters
+    ----------
+    data : h5py.Dataset
+        Dataset of shape [T, C, H, W]
+    time_slice : slice
+        Time steps to read, with a positive step
+    channel_reads : List[Tuple[slice, slice]]
+        Channel plan from :func:`plan_channel_reads`
+    out : np.ndarray, optional
+        C-contiguous output of shape [T', C', H, W], allocated if not given
+
+    Returns
+    -------
+    np.ndarray
+        The output array
+    """
+    if out is None:
+        num_times = len(range(*time_slice.indices(data.shape[0])))
+        num_channels = channel_reads[-1][1].stop if channel_reads else 0
+        out = np.empty((num_times, num_channels) + data.shape[2:], dtype=data.dtype)
+    for source, dest in channel_reads:
+        data.read_direct(
+            out, source_sel=np.s_[time_slice, source], dest_sel=np.s_[:, dest]
+        )
+    return out
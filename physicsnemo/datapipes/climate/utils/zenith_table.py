@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Union
+
+import filelock
+import numpy as np
+import pytz
+
+from physicsnemo.utils.zenith_angle import cos_zenith_angle_from_timestamp
+
+
+def sequence_timestamps(
+    year: int, index: Union[int, np.ndarray], num_steps: int, stride: int, dt: float
+) -> np.ndarray:
+    """Timestamps of a sequence of samples, computed in one vectorized operation.
+
+    Parameters
+    ----------
+    year : int
+        Year of the data file
+    index : Union[int, np.ndarray]
+        Index of the first time step of the sequence within the year
+    num_steps : int
+        Number of time steps in the sequence
+    stride : int
+        Number of data time steps between consecutive sequence steps
+    dt : float
+        Time in hours between each time step in the dataset
+
+    Returns
+    -------
+    np.ndarray
+        UNIX timestamps in seconds with shape (num_steps,)
+    """
+    start = datetime(year, 1, 1, tzinfo=pytz.utc).timestamp()
+    steps = np.asarray(index) + np.arange(num_steps) * stride
+    return start + steps * (dt * 3600.0)
+
+
+def build_cos_zenith_table(
+    table_dir: Union[str, Path],
+    year: int,
+    num_times: int,
+    dt: float,
+    latlon: np.ndarray,
+    chunk_size: int = 16,
+) -> Path:
+    """Precompute the cosine zenith angle of every time step of a year.
+
+    The table is stored as a ``.npy`` file of shape (num_times, 1, lat, lon) so that
+    it can be memory-mapped by every data loading worker. Its name is derived from
+    the arguments, so an existing table is reused and concurrent builds of the same
+    table (e.g. one per rank) are serialized with a file lock.
+
+    Parameters
+    ----------
+    table_dir : Union[str, Path]
+        Directory to store the table in
+    year : int
+        Year of the data file
+    num_times : int
+        Number of time steps from the start of the year to include
+    dt : float
+        Time in hours between each time step in the dataset
+    latlon : np.ndarray
+        Latitude and longitude in degrees, shape (2, lat, lon)
+    chunk_size : int, optional
+        Number of time steps computed at once, by default 16
+
+    Returns
+    -------
+    Path
+        Path to the table
+    """
+    table_dir = Path(table_dir)
+    table_dir.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha256(
+        repr((year, num_times, dt, latlon.shape)).encode()
+        + np.ascontiguousarray(latlon, dtype=np.float64).tobytes()
+    ).hexdigest()[:16]
+    path = table_dir / f"cos_zenith_{year}_{key}.npy"
+
+    with filelock.FileLock(str(path) + ".lock"):
+        if path.exists():
+            return path
+        timestamps = sequence_timestamps(year, 0, num_times, 1, dt)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        table = np.lib.format.open_memmap(
+            tmp_path,
+            mode="w+",
+            dtype=np.float32,
+            shape=(num_times, 1) + latlon.shape[1:],
+        )
+        for start in range(0, num_times, chunk_size):
+            time = timestamps[start : start + chunk_size, None, None, None]
+            table[start : start + chunk_size] = cos_zenith_angle_from_timestamp(
+                time, lon=latlon[1], lat=latlon[0]
+            )
+        table.flush()
+        del table
+        os.replace(tmp_path, path)
+    return path
@@ -36,6 +36,8 @@ except ImportError:
         'Install: pip install "tensorflow<=2.17.1"'
     )
 
+from physicsnemo.utils.neighbors import radius_graph_csr
+
 from .lagrangian_reading_utils import parse_serialized_simulation_example
 
 # Hide GPU from visible devices for TF
@@ -44,24 +46,34 @@ tf.config.set_visible_devices([], "GPU")
 logger = logging.getLogger("lmgn")
 
 
-def compute_edge_index(pos, radius):
+def compute_edge_index(pos, radius, batch: Optional[Tensor] = None):
     """Computes graph connectivity based on pairwise distance.
 
+    Uses a uniform grid (cell list) radius search, so the cost grows with the
+    number of particles and edges rather than quadratically.  Self-edges are
+    included, and edges are sorted by source, then destination.
+
     Parameters
     ----------
     pos : Tensor
         Node positions
     radius : float
         Connectivity radius
+    batch : Tensor, optional
+        Scene index of each node, for several independent scenes in one call.
+        Nodes of different scenes are never connected.
 
     Returns
     -------
     Tensor
         Edge indices
     """
-    distances = torch.cdist(pos, pos, p=2)
-    mask = distances < radius  # & (distances > 0) # include self-edge
-    edge_index = torch.nonzero(mask).t().contiguous()
+    offsets, neighbors, distances = radius_graph_csr(pos, radius, batch=batch)
+    senders = torch.repeat_interleave(
+        torch.arange(pos.shape[0], device=pos.device), offsets.diff()
+    )
+    mask = distances < radius
+    edge_index = torch.stack([senders[mask], neighbors[mask]])
     return edge_index
 
 
@@ -88,22 +100,123 @@ def compute_edge_attr(graph: PyGData, radius: float = 0.015) -> PyGData:
     return graph
 
 
-def graph_update(graph: PyGData, radius) -> PyGData:
+class VerletNeighborList:
+    """Incremental radius graph for rollouts, using Verlet lists.
+
+    Keeps a candidate edge set built with the enlarged radius
+    ``radius + skin``, and at every step filters it down to the pairs
+    within ``radius``.  The candidates are only rebuilt once some particle
+    has moved more than ``skin / 2`` from its position at the last rebuild,
+    which guarantees that no pair within ``radius`` is missing.  The edges
+    match ``compute_edge_index``, in the same order.
+
+    Parameters
+    ----------
+    radius : float
+        Connectivity radius
+    skin : float
+        Extra distance added to the radius of the candidate list. Larger
+        values rebuild less often, but filter more candidates per step.
+
+    Examples
+    --------
+    >>> import torch
+    >>> neighbors = VerletNeighborList(radius=0.5, skin=0.1)
+    >>> pos = torch.tensor([[0.0, 0.0], [0.3, 0.0], [1.0, 0.0]])
+    >>> neighbors.update(pos).shape
+    torch.Size([2, 5])
+    >>> neighbors.update(pos + 0.01).shape
+    torch.Size([2, 5])
+    >>> neighbors.num_rebuilds
+    1
+    """
+
+    def __init__(self, radius: float, skin: float) -> None:
+        if skin < 0:
+            raise ValueError(f"skin must be non-negative, got {skin}")
+        self.radius = radius
+        self.skin = skin
+        self.num_rebuilds = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the candidate edges, e.g. at the start of a new rollout."""
+        self.reference_pos = None
+        self.reference_batch = None
+        self.candidates = None
+
+    def needs_rebuild(self, pos: Tensor, batch: Optional[Tensor] = None) -> bool:
+        """Whether the candidate edges may miss a pair within the radius."""
+        if self.reference_pos is None or self.reference_pos.shape != pos.shape:
+            return True
+        if (batch is None) != (self.reference_batch is None) or (
+            batch is not None and not torch.equal(batch, self.reference_batch)
+        ):
+            return True
+        if self.reference_pos.device != pos.device:
+            return True
+        displacement = torch.linalg.vector_norm(pos - self.reference_pos, dim=-1)
+        return bool(displacement.max() > 0.5 * self.skin)
+
+    def update(self, pos: Tensor, batch: Optional[Tensor] = None) -> Tensor:
+        """Return the edge indices for the current positions.
+
+        Parameters
+        ----------
+        pos : Tensor
+            Node positions
+        batch : Tensor, optional
+            Scene index of each node, see ``compute_edge_index``.
+
+        Returns
+        -------
+        Tensor
+            Edge indices
+        """
+        if self.needs_rebuild(pos, batch):
+            self.candidates = compute_edge_index(pos, self.radius + self.skin, batch)
+            self.reference_pos = pos.clone()
+            self.reference_batch = batch
+            self.num_rebuilds += 1
+
+        distance = torch.linalg.vector_norm(
+            pos[self.candidates[0]] - pos[self.candidates[1]], dim=-1
+        )
+        return self.candidates[:, distance < self.radius]
+
+
+def graph_update(
+    graph: PyGData,
+    radius,
+    neighbor_list: Optional[VerletNeighborList] = None,
+) -> PyGData:
     """Updates graph structure by reconstructing edges based on positions.
 
+    For a batch of graphs, the scenes are kept separate using ``graph.batch``.
+
     Parameters
     ----------
     graph : PyGData
         Input graph
     radius : float
         Connectivity radius
+    neighbor_list : VerletNeighborList, optional
+        Neighbor list reused between calls, e.g. the steps of a rollout. If
+        given, edges are filtered from its candidates instead of rebuilt.
 
     Returns
     -------
     PyGData
         Updated graph
     """
-    graph.edge_index = compute_edge_index(graph.pos, radius)
+    if neighbor_list is not None:
+        if neighbor_list.radius != radius:
+            raise ValueError(
+                f"Neighbor list radius {neighbor_list.radius} does not match {radius}"
+            )
+        graph.edge_index = neighbor_list.update(graph.pos, graph.batch)
+    else:
+        graph.edge_index = compute_edge_index(graph.pos, radius, graph.batch)
     return compute_edge_attr(graph)
 
 
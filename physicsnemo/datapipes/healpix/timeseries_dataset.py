@@ -17,6 +17,7 @@
 import logging
 import time
 import warnings
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Optional, Sequence, Union
 
@@ -64,6 +65,8 @@ class TimeSeriesDataset(Dataset, Datapipe):
         drop_last: bool = False,
         add_insolation: bool = False,
         forecast_init_times: Optional[Sequence] = None,
+        reuse_buffers: bool = False,
+        insolation_cache_size: int = 8,
         meta: DatapipeMetaData = MetaData(),
     ):
         """
@@ -99,6 +102,16 @@ class TimeSeriesDataset(Dataset, Datapipe):
             Note that:
                 - providing this parameter configures the data loader to only produce this number of samples, and
                     NOT produce any target array.
+        reuse_buffers: bool, optional
+            Gather every batch into the same preallocated output arrays instead of allocating
+            new ones, default False
+            Note that:
+                - the arrays returned by one call are overwritten by the next call, so only
+                    enable this when each batch is consumed (e.g. copied to the GPU) before
+                    the next one is requested.
+        insolation_cache_size: int, optional
+            Number of time windows whose insolation is kept in memory, 0 disables the
+            cache, default 8
         meta: DatapipeMetaData, optional
             Data class for storing essential meta data
         """
@@ -118,6 +131,10 @@ class TimeSeriesDataset(Dataset, Datapipe):
         self.add_insolation = add_insolation
         self.forecast_init_times = forecast_init_times
         self.forecast_mode = self.forecast_init_times is not None
+        self.reuse_buffers = reuse_buffers
+        self.insolation_cache_size = insolation_cache_size
+        self._buffers = {}
+        self._insolation_cache = OrderedDict()
 
         # Time stepping
         if (self.time_step % self.data_time_step).total_seconds() != 0:
@@ -180,6 +197,15 @@ class TimeSeriesDataset(Dataset, Datapipe):
             )
             for n in range(self.batch_size)
         ]
+        # The same indices as arrays [B, T] so a whole batch is gathered at once
+        self._input_index_array = np.array(self._input_indices, dtype=np.intp)
+        self._output_index_array = np.array(self._output_indices, dtype=np.intp)
+        self._sol_index_array = np.concatenate(
+            (self._input_index_array, self._output_index_array), axis=1
+        )
+        # In forecast mode only the input time steps are read, so they are
+        # gathered from a window holding just those steps
+        self._forecast_index_array = np.arange(self.input_time_dim, dtype=np.intp)[None]
 
         self.spatial_dims = (
             self.ds.sizes["face"],
@@ -402,80 +428,77 @@ class TimeSeriesDataset(Dataset, Datapipe):
                 f"index {item} out of range for dataset with length {len(self)}"
             )
 
-        # remark: load first then normalize
+        # remark: gather first then normalize the (smaller, contiguous) batch in place
         torch.cuda.nvtx.range_push("TimeSeriesDataset:__getitem__:load_batch")
         time_index, this_batch = self._get_time_index(item)
-        batch = {"time": slice(*time_index)}
         load_time = time.time()
 
-        input_array = self.ds["inputs"].isel(**batch).to_numpy()
-        input_array = (input_array - self.input_scaling["mean"]) / self.input_scaling[
-            "std"
-        ]
+        if self.forecast_mode:
+            # only read the time steps that end up in the inputs
+            batch = {"time": time_index[0] + self._input_index_array[0]}
+            input_indices = self._forecast_index_array
+        else:
+            batch = {"time": slice(*time_index)}
+            input_indices = self._input_index_array[:this_batch]
 
+        input_array = self.ds["inputs"].isel(**batch).to_numpy()
         if not self.forecast_mode:
             target_array = self.ds["targets"].isel(**batch).to_numpy()
-            target_array = (
-                target_array - self.target_scaling["mean"]
-            ) / self.target_scaling["std"]
 
         logger.log(5, "loaded batch data in %0.2f s", time.time() - load_time)
         torch.cuda.nvtx.range_pop()
 
         torch.cuda.nvtx.range_push("TimeSeriesDataset:__getitem__:process_batch")
         compute_time = time.time()
-        # Insolation
-        if self.add_insolation:
-            sol = insolation(
-                self._get_forecast_sol_times(item),
-                self.ds.lat.values,
-                self.ds.lon.values,
-            )[:, None]
-            decoder_inputs = np.empty(
-                (this_batch, self.input_time_dim + self.output_time_dim, 1)
-                + self.spatial_dims,
-                dtype="float32",
-            )
 
-        # Get buffers for the batches, which we'll fill in iteratively.
-        inputs = np.empty(
-            (this_batch, self.input_time_dim, self.ds.sizes["channel_in"])
-            + self.spatial_dims,
-            dtype="float32",
+        # Buffers are laid out as [B, F, T, C, H, W] and filled through a
+        # [B, T, C, F, H, W] view, so the gather also performs the transpose
+        inputs = self._get_buffer(
+            "inputs",
+            (this_batch, self.spatial_dims[0], self.input_time_dim)
+            + (self.ds.sizes["channel_in"],)
+            + self.spatial_dims[1:],
         )
-        if not self.forecast_mode:
-            targets = np.empty(
-                (this_batch, self.output_time_dim, self.ds.sizes["channel_out"])
-                + self.spatial_dims,
-                dtype="float32",
-            )
-
-        # Iterate over valid sample windows
-        for sample in range(this_batch):
-            inputs[sample] = input_array[self._input_indices[sample]]
-            if not self.forecast_mode:
-                targets[sample] = target_array[self._output_indices[sample]]
-            if self.add_insolation:
-                decoder_inputs[sample] = (
-                    sol
-                    if self.forecast_mode
-                    else sol[self._input_indices[sample] + self._output_indices[sample]]
-                )
-
+        self._gather(input_array, input_indices, inputs, self.input_scaling)
         inputs_result = [inputs]
+
+        # Insolation
         if self.add_insolation:
+            sol = self._get_insolation(item)
+            decoder_inputs = self._get_buffer(
+                "decoder_inputs",
+                (
+                    this_batch,
+                    self.spatial_dims[0],
+                    self.input_time_dim + self.output_time_dim,
+                    1,
+                )
+                + self.spatial_dims[1:],
+            )
+            if self.forecast_mode:
+                decoder_inputs[0] = np.transpose(sol, axes=(2, 0, 1, 3, 4))
+            else:
+                self._gather(sol, self._sol_index_array[:this_batch], decoder_inputs)
             inputs_result.append(decoder_inputs)
 
-        # we need to transpose channels and data:
-        # [B, T, C, F, H, W] -> [B, F, T, C, H, W]
-        inputs_result = [
-            np.transpose(x, axes=(0, 3, 1, 2, 4, 5)) for x in inputs_result
-        ]
-
         if self.constants is not None:
             # Add the constants as [F, C, H, W]
             inputs_result.append(self.constants)
 
+        if not self.forecast_mode:
+            targets = self._get_buffer(
+                "targets",
+                (this_batch, self.spatial_dims[0], self.output_time_dim)
+                + (self.ds.sizes["channel_out"],)
+                + self.spatial_dims[1:],
+            )
+            self._gather(
+                target_array,
+                self._output_index_array[:this_batch],
+                targets,
+                self.target_scaling,
+            )
+
         logger.log(5, "computed batch in %0.2f s", time.time() - compute_time)
         torch.cuda.nvtx.range_pop()
 
@@ -485,7 +508,76 @@ class TimeSeriesDataset(Dataset, Datapipe):
         if self.forecast_mode:
             return inputs_result
 
-        # we also need to transpose targets
-        targets = np.transpose(targets, axes=(0, 3, 1, 2, 4, 5))
-
         return inputs_result, targets
+
+    def _get_buffer(self, name, shape):
+        """Get an output array, reusing the previous one if `reuse_buffers` is set
+
+        Parameters
+        ----------
+        name: str
+            Name of the buffer
+        shape: tuple[int, ...]
+            Shape of the requested buffer
+
+        Returns
+        -------
+        np.ndarray
+            Uninitialized float32 array of the requested shape
+        """
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype="float32")
+            if self.reuse_buffers:
+                self._buffers[name] = buffer
+        return buffer
+
+    @staticmethod
+    def _gather(array, indices, out, scaling=None):
+        """Gather sample windows from a loaded time window and normalize them in place
+
+        Parameters
+        ----------
+        array: np.ndarray
+            Loaded data of shape [T, C, F, H, W]
+        indices: np.ndarray
+            Time indices of shape [B, T'] to gather for each sample
+        out: np.ndarray
+            Output array of shape [B, F, T', C, H, W]
+        scaling: dict, optional
+            Dictionary with "mean" and "std" arrays broadcastable to [T, C, F, H, W]
+        """
+        # [B, F, T, C, H, W] -> [B, T, C, F, H, W]
+        view = np.transpose(out, axes=(0, 2, 3, 1, 4, 5))
+        # indices are valid by construction, "clip" avoids numpy's bounds-check copy
+        np.take(array, indices, axis=0, out=view, mode="clip")
+        if scaling is not None:
+            view -= scaling["mean"]
+            view /= scaling["std"]
+
+    def _get_insolation(self, item):
+        """Get the insolation for the time window of a sample, using a small LRU cache
+
+        Parameters
+        ----------
+        item: int
+            The sample number
+
+        Returns
+        -------
+        np.ndarray
+            Insolation of shape [T, 1, F, H, W]
+        """
+        times = self._get_forecast_sol_times(item)
+        key = (times[0], len(times))
+        sol = self._insolation_cache.get(key)
+        if sol is not None:
+            self._insolation_cache.move_to_end(key)
+            return sol
+        sol = insolation(times, self.ds.lat.values, self.ds.lon.values)[:, None]
+        sol = sol.astype("float32", copy=False)
+        if self.insolation_cache_size > 0:
+            self._insolation_cache[key] = sol
+            while len(self._insolation_cache) > self.insolation_cache_size:
+                self._insolation_cache.popitem(last=False)
+        return sol
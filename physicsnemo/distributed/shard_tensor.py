@@ -547,6 +547,64 @@ class ShardTensor(DTensor):
         """
         return self._spec.offsets(mesh_dim)
 
+    def _checkpoint_chunk(self):
+        """
+        Size and global offset of the local shard, for distributed checkpoints.
+
+        DTensor derives them from an even split of the global shape, which is
+        wrong for the uneven shards ShardTensor allows, so they are computed
+        from the actual sharding shapes instead.
+
+        Returns:
+            ChunkStorageMetadata describing the local shard.
+        """
+        from torch.distributed.checkpoint.metadata import ChunkStorageMetadata
+
+        # Populates the sharding shapes the offsets are computed from:
+        self._spec.sharding_shapes()
+        mesh_offsets = self._spec.offsets()
+        offsets = [0] * self.ndim
+        for mesh_dim, placement in enumerate(self._spec.placements):
+            if isinstance(placement, Shard):
+                offsets[placement.dim] += mesh_offsets[mesh_dim]
+
+        return ChunkStorageMetadata(
+            offsets=torch.Size(offsets), sizes=self._local_tensor.shape
+        )
+
+    def __create_write_items__(self, fqn: str, object: "ShardTensor"):
+        """
+        Write items of the local shard, used by torch.distributed.checkpoint.
+        """
+        from torch.distributed.checkpoint.metadata import (
+            MetadataIndex,
+            TensorProperties,
+        )
+        from torch.distributed.checkpoint.planner import (
+            TensorWriteData,
+            WriteItem,
+            WriteItemType,
+        )
+
+        chunk = self._checkpoint_chunk()
+        return [
+            WriteItem(
+                index=MetadataIndex(fqn, chunk.offsets),
+                type=WriteItemType.SHARD,
+                tensor_data=TensorWriteData(
+                    chunk=chunk,
+                    properties=TensorProperties.create_from_tensor(self._local_tensor),
+                    size=self.size(),
+                ),
+            )
+        ]
+
+    def __create_chunk_list__(self):
+        """
+        Chunks held by this rank, used by torch.distributed.checkpoint.
+        """
+        return [self._checkpoint_chunk()]
+
     def redistribute(
         self,
         device_mesh: Optional[DeviceMesh] = None,
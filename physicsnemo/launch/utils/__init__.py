@@ -14,4 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .checkpoint import get_checkpoint_dir, load_checkpoint, save_checkpoint
+from .checkpoint import (
+    get_checkpoint_dir,
+    load_checkpoint,
+    save_checkpoint,
+    wait_for_checkpoint,
+)
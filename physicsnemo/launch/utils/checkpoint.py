@@ -14,14 +14,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 import os
 import re
+from concurrent.futures import Future
 from pathlib import Path, PurePath
 from typing import Any, Dict, List, NewType, Optional, Union
 
 import fsspec
 import fsspec.utils
 import torch
+import torch.distributed as dist
 from torch.cuda.amp import GradScaler
 from torch.optim.lr_scheduler import _LRScheduler
 
@@ -29,7 +32,7 @@ import physicsnemo
 from physicsnemo.distributed import DistributedManager
 from physicsnemo.launch.logging import PythonLogger
 from physicsnemo.utils.capture import _StaticCapture
-from physicsnemo.utils.filesystem import LOCAL_CACHE, _download_cached
+from physicsnemo.utils.filesystem import _download_cached
 
 optimizer = NewType("optimizer", torch.optim)
 scheduler = NewType("scheduler", _LRScheduler)
@@ -37,6 +40,80 @@ scaler = NewType("scaler", GradScaler)
 
 checkpoint_logging = PythonLogger("checkpoint")
 
+# Base name of sharded checkpoint directories
+_SHARDED_BASE_NAME = "checkpoint.sharded"
+
+# Asynchronous sharded save in flight, see ``save_checkpoint``
+_pending_save: Optional[Future] = None
+
+# CPU process group used by asynchronous saves, created on first use
+_async_process_group = None
+
+
+def _get_model_parallel_rank() -> int:
+    """Gets the model parallel rank used in checkpoint file names"""
+    # Get model parallel rank so all processes in the first model parallel group
+    # can save their checkpoint. In the case without model parallelism,
+    # model_parallel_rank should be the same as the process rank itself and
+    # only rank 0 saves
+    if not DistributedManager.is_initialized():
+        checkpoint_logging.warning(
+            "`DistributedManager` not initialized already. Initializing now, but this might lead to unexpected errors"
+        )
+        DistributedManager.initialize()
+    manager = DistributedManager()
+    return (
+        manager.group_rank("model_parallel")
+        if "model_parallel" in manager.group_names
+        else 0
+    )
+
+
+def _get_checkpoint_index(path: str, saving: bool = False) -> Union[int, None]:
+    """Gets the latest checkpoint index, or the next one when saving
+
+    Sharded checkpoint directories and the model and training files of
+    non-sharded checkpoints share one index sequence, so the latest checkpoint
+    is the one with the largest index in either format. A sharded checkpoint
+    is only complete once its ``.metadata`` manifest has been written, which
+    happens after every rank wrote its shards, so incomplete directories (e.g.
+    from an interrupted asynchronous save) are skipped when loading, but still
+    take up their index when saving.
+
+    Parameters
+    ----------
+    path : str
+        Path to checkpoints
+    saving : bool, optional
+        Get the index for saving a new checkpoint, by default False
+
+    Returns
+    -------
+    Union[int, None]
+        Checkpoint index, None when loading and no checkpoint was found
+    """
+    protocol = fsspec.utils.get_protocol(path)
+    fs = fsspec.filesystem(protocol)
+    if protocol == "file":
+        path = str(Path(path).resolve())
+    model_parallel_rank = _get_model_parallel_rank()
+
+    file_pattern = rf"^.+\.{model_parallel_rank}\.(\d+)\.(mdlus|pt)$"
+    dir_pattern = rf"^{re.escape(_SHARDED_BASE_NAME)}\.(\d+)$"
+    indices = []
+    for name in fs.glob(f"{path}/*"):
+        match = re.match(file_pattern, PurePath(name).name)
+        if match is None:
+            match = re.match(dir_pattern, PurePath(name).name)
+            if match and not (saving or fs.exists(f"{name}/.metadata")):
+                match = None
+        if match:
+            indices.append(int(match.group(1)))
+
+    if saving:
+        return max(indices) + 1 if indices else 0
+    return max(indices) if indices else None
+
 
 def _get_checkpoint_filename(
     path: str,
@@ -73,21 +150,7 @@ def _get_checkpoint_filename(
     str
         Checkpoint file name
     """
-    # Get model parallel rank so all processes in the first model parallel group
-    # can save their checkpoint. In the case without model parallelism,
-    # model_parallel_rank should be the same as the process rank itself and
-    # only rank 0 saves
-    if not DistributedManager.is_initialized():
-        checkpoint_logging.warning(
-            "`DistributedManager` not initialized already. Initializing now, but this might lead to unexpected errors"
-        )
-        DistributedManager.initialize()
-    manager = DistributedManager()
-    model_parallel_rank = (
-        manager.group_rank("model_parallel")
-        if "model_parallel" in manager.group_names
-        else 0
-    )
+    model_parallel_rank = _get_model_parallel_rank()
 
     # Determine input file name. Get absolute file path if Posix path.
     # pathlib does not support custom schemes (eg: msc://...) so only perform resolve() for Posix.
@@ -141,6 +204,7 @@ def _get_checkpoint_filename(
 def _unique_model_names(
     models: List[torch.nn.Module],
     loading: bool = False,
+    keep_fsdp: bool = False,
 ) -> Dict[str, torch.nn.Module]:
     """Util to clean model names and index if repeat names, will also strip DDP wrappers
      and torch dynamo wrappers if they exist.
@@ -151,6 +215,10 @@ def _unique_model_names(
         List of models to generate names for.
     loading : bool, optional
         Whether the models are being loaded, by default False.
+    keep_fsdp : bool, optional
+        Whether to return FSDP wrapped models as is rather than their inner
+        module, which sharded checkpoints need to access the sharded state, by
+        default False.
 
     Returns
     -------
@@ -160,6 +228,7 @@ def _unique_model_names(
     # Loop through provided models and set up base names
     model_dict = {}
     for model0 in models:
+        wrapper = model0
         if hasattr(model0, "module"):
             # Strip out DDP layer
             model0 = model0.module
@@ -179,6 +248,11 @@ def _unique_model_names(
             checkpoint_logging.warning(
                 f"Model {base_name} is already compiled, consider loading first and then compiling."
             )
+        if keep_fsdp:
+            from torch.distributed.fsdp import FullyShardedDataParallel
+
+            if isinstance(wrapper, FullyShardedDataParallel):
+                model0 = wrapper
         # If we have multiple models of the same name, introduce another index
         if base_name in model_dict:
             model_dict[base_name].append(model0)
@@ -197,6 +271,244 @@ def _unique_model_names(
     return output_dict
 
 
+def _training_state_dict(
+    scheduler: Union[scheduler, None],
+    scaler: Union[scaler, None],
+    epoch: Union[int, None],
+    metadata: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Training checkpoint entries other than the optimizer state"""
+    checkpoint_dict = {}
+    # Scheduler state dict
+    if scheduler:
+        checkpoint_dict["scheduler_state_dict"] = scheduler.state_dict()
+
+    # Scaler state dict
+    if scaler:
+        checkpoint_dict["scaler_state_dict"] = scaler.state_dict()
+    # Static capture is being used, save its grad scaler
+    if _StaticCapture._amp_scalers:
+        checkpoint_dict["static_capture_state_dict"] = _StaticCapture.state_dict()
+
+    if epoch:
+        checkpoint_dict["epoch"] = epoch
+    if metadata:
+        checkpoint_dict["metadata"] = metadata
+    return checkpoint_dict
+
+
+def _get_sharded_checkpoint_dir(
+    path: str, index: Union[int, None] = None, saving: bool = False
+) -> Union[str, None]:
+    """Gets the directory of a sharded checkpoint
+
+    Without an index, this is the directory of the latest checkpoint (or of
+    the next one when saving) in the index sequence shared with non-sharded
+    checkpoints, see ``_get_checkpoint_index``. When loading, None is returned
+    if the checkpoint at that index is not a complete sharded checkpoint.
+
+    Parameters
+    ----------
+    path : str
+        Path to checkpoints
+    index : Union[int, None], optional
+        Checkpoint index, by default None
+    saving : bool, optional
+        Get directory for saving a new checkpoint, by default False
+
+    Returns
+    -------
+    Union[str, None]
+        Checkpoint directory, None when loading and no checkpoint was found
+    """
+    protocol = fsspec.utils.get_protocol(path)
+    fs = fsspec.filesystem(protocol)
+    if protocol == "file":
+        path = str(Path(path).resolve())
+
+    if index is None:
+        index = _get_checkpoint_index(path, saving=saving)
+        if index is None:
+            return None
+    checkpoint_dir = f"{path}/{_SHARDED_BASE_NAME}.{index}"
+    if saving or fs.exists(f"{checkpoint_dir}/.metadata"):
+        return checkpoint_dir
+    return None
+
+
+def _sharded_state_dict(
+    models: Dict[str, torch.nn.Module],
+    optimizer: Union[optimizer, None],
+) -> Dict[str, Any]:
+    """Model and optimizer state of a sharded checkpoint
+
+    Uses the ``torch.distributed.checkpoint`` state dict helpers, which keep
+    FSDP and DTensor (including ``ShardTensor``) parameters sharded, and key
+    the optimizer state by parameter name rather than by index, so that it can
+    be resharded on load.
+    """
+    from torch.distributed.checkpoint.state_dict import (
+        get_model_state_dict,
+        get_optimizer_state_dict,
+    )
+
+    state_dict = {}
+    if models:
+        state_dict["models"] = {
+            name: get_model_state_dict(model) for name, model in models.items()
+        }
+    if optimizer:
+        if models:
+            state_dict["optimizer"] = get_optimizer_state_dict(
+                torch.nn.ModuleDict(models), optimizer
+            )
+        else:
+            state_dict["optimizer"] = optimizer.state_dict()
+    return state_dict
+
+
+def _get_async_process_group():
+    """CPU capable process group for asynchronous saves
+
+    Asynchronous saves run their collectives from a background thread, on a
+    separate gloo group so that they do not interleave with the training
+    collectives.
+    """
+    global _async_process_group
+    if not (dist.is_available() and dist.is_initialized()):
+        return None
+    if _async_process_group is None:
+        _async_process_group = dist.new_group(backend="gloo")
+    return _async_process_group
+
+
+def wait_for_checkpoint() -> None:
+    """Block until the pending asynchronous checkpoint save, if any, is written
+
+    Errors raised by the background save are raised here. Called
+    automatically before the next save, but should also be called before the
+    end of training so that the last checkpoint is complete.
+    """
+    global _pending_save
+    if _pending_save is None:
+        return
+    future, _pending_save = _pending_save, None
+    future.result()
+
+
+def _save_sharded_checkpoint(
+    path: str,
+    models: Dict[str, torch.nn.Module],
+    optimizer: Union[optimizer, None],
+    training_state: Dict[str, Any],
+    epoch: Union[int, None],
+    async_save: bool,
+) -> None:
+    """Saves a sharded checkpoint, see ``save_checkpoint``"""
+    global _pending_save
+    import torch.distributed.checkpoint as dcp
+    from torch.distributed.checkpoint._fsspec_filesystem import FsspecWriter
+
+    # Indices are derived from the existing directories, so the previous save
+    # has to be complete, and all ranks must agree on the result
+    wait_for_checkpoint()
+    checkpoint_dir = _get_sharded_checkpoint_dir(path, index=epoch, saving=True)
+    if dist.is_available() and dist.is_initialized():
+        checkpoint_dirs = [checkpoint_dir]
+        dist.broadcast_object_list(checkpoint_dirs, src=0)
+        checkpoint_dir = checkpoint_dirs[0]
+
+    state_dict = _sharded_state_dict(models, optimizer)
+
+    # Everything else is small and written once, as an opaque blob
+    training_state_buffer = io.BytesIO()
+    torch.save(training_state, training_state_buffer)
+    state_dict["training_state"] = training_state_buffer
+
+    if fsspec.utils.get_protocol(checkpoint_dir) == "file":
+        storage_writer = dcp.FileSystemWriter(checkpoint_dir)
+    else:
+        storage_writer = FsspecWriter(checkpoint_dir)
+
+    if async_save:
+        # Returns once the state is staged on the host, the write runs on a
+        # background thread
+        response = dcp.async_save(
+            state_dict,
+            storage_writer=storage_writer,
+            process_group=_get_async_process_group(),
+        )
+        _pending_save = getattr(response, "upload_completion", response)
+        checkpoint_logging.success(
+            f"Started asynchronous sharded checkpoint save: {checkpoint_dir}"
+        )
+    else:
+        dcp.save(state_dict, storage_writer=storage_writer)
+        checkpoint_logging.success(f"Saved sharded checkpoint: {checkpoint_dir}")
+
+
+def _load_sharded_checkpoint(
+    checkpoint_dir: str,
+    models: Dict[str, torch.nn.Module],
+    optimizer: Union[optimizer, None],
+    device: Union[str, torch.device],
+) -> Dict[str, Any]:
+    """Loads a sharded checkpoint, see ``load_checkpoint``
+
+    Returns the training state saved alongside the models and optimizer.
+    """
+    import torch.distributed.checkpoint as dcp
+    from torch.distributed.checkpoint._fsspec_filesystem import FsspecReader
+    from torch.distributed.checkpoint.state_dict import (
+        set_model_state_dict,
+        set_optimizer_state_dict,
+    )
+
+    if fsspec.utils.get_protocol(checkpoint_dir) == "file":
+        storage_reader = dcp.FileSystemReader(checkpoint_dir)
+    else:
+        storage_reader = FsspecReader(checkpoint_dir)
+
+    # The manifest lists the stored entries, skip what is not in there
+    stored_keys = storage_reader.read_metadata().state_dict_metadata.keys()
+
+    def _is_stored(prefix: str) -> bool:
+        return any(key.startswith(prefix) for key in stored_keys)
+
+    for name in list(models.keys()):
+        if not _is_stored(f"models.{name}."):
+            checkpoint_logging.error(
+                f"Could not find model {name} in {checkpoint_dir}, skipping load"
+            )
+            models.pop(name)
+    if optimizer and not _is_stored("optimizer."):
+        optimizer = None
+
+    # Loaded in place into the current (possibly sharded) state, which is what
+    # lets the checkpoint be resharded to a different world size
+    state_dict = _sharded_state_dict(models, optimizer)
+    state_dict["training_state"] = io.BytesIO()
+    dcp.load(state_dict, storage_reader=storage_reader)
+
+    for name, model in models.items():
+        set_model_state_dict(model, state_dict["models"][name])
+        checkpoint_logging.success(
+            f"Loaded model state dictionary {name} from {checkpoint_dir}"
+        )
+    if optimizer:
+        if models:
+            set_optimizer_state_dict(
+                torch.nn.ModuleDict(models), optimizer, state_dict["optimizer"]
+            )
+        else:
+            optimizer.load_state_dict(state_dict["optimizer"])
+        checkpoint_logging.success("Loaded optimizer state dictionary")
+
+    training_state_buffer = state_dict["training_state"]
+    training_state_buffer.seek(0)
+    return torch.load(training_state_buffer, map_location=device)
+
+
 def save_checkpoint(
     path: str,
     models: Union[torch.nn.Module, List[torch.nn.Module], None] = None,
@@ -205,6 +517,8 @@ def save_checkpoint(
     scaler: Union[scaler, None] = None,
     epoch: Union[int, None] = None,
     metadata: Optional[Dict[str, Any]] = None,
+    sharded: bool = False,
+    async_save: bool = False,
 ) -> None:
     r"""Training checkpoint saving utility.
 
@@ -227,6 +541,21 @@ def save_checkpoint(
     If multiple models share the same {model_name}, they are indexed by {model_id}
     (e.g., "MyModel0", "MyModel1").
 
+    With ``sharded=True``, everything is instead saved to a single
+    "checkpoint.sharded.{epoch}" directory with
+    ``torch.distributed.checkpoint``: every rank writes its own shards of the
+    models and optimizer state in parallel (FSDP, DTensor and ``ShardTensor``
+    parameters stay sharded), and a ``.metadata`` manifest records how the
+    shards assemble into the full tensors, so that the checkpoint can be loaded
+    back at a different world size. This mode is collective: all ranks must
+    call ``save_checkpoint``. With ``async_save=True`` as well, the call only
+    takes a host copy of the state and the files are written on a background
+    thread; the next save (or
+    :func:`~physicsnemo.launch.utils.checkpoint.wait_for_checkpoint`) waits
+    for it to complete. Sharded and non-sharded checkpoints share one index
+    sequence, so without an ``epoch`` either kind is saved after the latest
+    checkpoint of both, and loaded back as the latest one.
+
     The function :func:`~physicsnemo.launch.utils.checkpoint.load_checkpoint`
     can be used to restore from these files with models that are **already instantiated**.
     To load only the model checkpoint (even when the models are **not** already instantiated),
@@ -251,7 +580,20 @@ def save_checkpoint(
         valid index, by default None
     metadata : Optional[Dict[str, Any]], optional
         Additional metadata to save, by default None
+    sharded : bool, optional
+        Save a sharded checkpoint, written in parallel by all ranks, by default
+        False
+    async_save : bool, optional
+        Write the sharded checkpoint on a background thread, by default False
+
+    Raises
+    ------
+    ValueError
+        If ``async_save`` is used without ``sharded``
     """
+    if async_save and not sharded:
+        raise ValueError("Asynchronous checkpoint saves require sharded=True")
+
     protocol = fsspec.utils.get_protocol(path)
     fs = fsspec.filesystem(protocol)
     # Create checkpoint directory if it does not exist.
@@ -262,10 +604,27 @@ def save_checkpoint(
         )
         Path(path).mkdir(parents=True, exist_ok=True)
 
+    if models and not isinstance(models, list):
+        models = [models]
+
+    # == Saving sharded checkpoint ==
+    if sharded:
+        _save_sharded_checkpoint(
+            path,
+            _unique_model_names(models or [], keep_fsdp=True),
+            optimizer,
+            _training_state_dict(scheduler, scaler, epoch, metadata),
+            epoch,
+            async_save,
+        )
+        return
+
+    # Every file of the checkpoint gets the same index, which follows the
+    # latest checkpoint in either format
+    index = epoch if epoch is not None else _get_checkpoint_index(path, saving=True)
+
     # == Saving model checkpoint ==
     if models:
-        if not isinstance(models, list):
-            models = [models]
         models = _unique_model_names(models)
         for name, model in models.items():
             # Get model type
@@ -275,7 +634,7 @@ def save_checkpoint(
 
             # Get full file path / name
             file_name = _get_checkpoint_filename(
-                path, name, index=epoch, saving=True, model_type=model_type
+                path, name, index=index, saving=True, model_type=model_type
             )
 
             # Save state dictionary
@@ -299,25 +658,13 @@ def save_checkpoint(
             pg["param_names"] = [pn.removeprefix("_orig_mod.") for pn in param_names]
         checkpoint_dict["optimizer_state_dict"] = opt_state_dict
 
-    # Scheduler state dict
-    if scheduler:
-        checkpoint_dict["scheduler_state_dict"] = scheduler.state_dict()
-
-    # Scaler state dict
-    if scaler:
-        checkpoint_dict["scaler_state_dict"] = scaler.state_dict()
-    # Static capture is being used, save its grad scaler
-    if _StaticCapture._amp_scalers:
-        checkpoint_dict["static_capture_state_dict"] = _StaticCapture.state_dict()
+    # Scheduler, scaler, epoch and metadata
+    checkpoint_dict.update(_training_state_dict(scheduler, scaler, epoch, metadata))
 
     # Output file name
     output_filename = _get_checkpoint_filename(
-        path, index=epoch, saving=True, model_type="pt"
+        path, index=index, saving=True, model_type="pt"
     )
-    if epoch:
-        checkpoint_dict["epoch"] = epoch
-    if metadata:
-        checkpoint_dict["metadata"] = metadata
 
     # Save checkpoint to memory
     if bool(checkpoint_dict):
@@ -359,7 +706,7 @@ def load_checkpoint(
         AMP grad scaler, by default None
     epoch : Union[int, None], optional
         Epoch checkpoint to load. If none is provided this will attempt to load the
-        checkpoint with the largest index, by default None
+        checkpoint with the largest index, sharded or not, by default None
     metadata_dict: Optional[Dict[str, Any]], optional
         Dictionary to store metadata from the checkpoint, by default None
     device : Union[str, torch.device], optional
@@ -383,10 +730,22 @@ def load_checkpoint(
         )
         return 0
 
+    if models and not isinstance(models, list):
+        models = [models]
+
+    # == Loading sharded checkpoint ==
+    sharded_dir = _get_sharded_checkpoint_dir(path, index=epoch)
+    if sharded_dir is not None:
+        checkpoint_dict = _load_sharded_checkpoint(
+            sharded_dir,
+            _unique_model_names(models or [], loading=True, keep_fsdp=True),
+            optimizer,
+            device,
+        )
+        return _load_training_state(checkpoint_dict, scheduler, scaler, metadata_dict)
+
     # == Loading model checkpoint ==
     if models:
-        if not isinstance(models, list):
-            models = [models]
         models = _unique_model_names(models, loading=True)
         for name, model in models.items():
             # Get model type
@@ -443,6 +802,17 @@ def load_checkpoint(
         optimizer.load_state_dict(checkpoint_dict["optimizer_state_dict"])
         checkpoint_logging.success("Loaded optimizer state dictionary")
 
+    return _load_training_state(checkpoint_dict, scheduler, scaler, metadata_dict)
+
+
+def _load_training_state(
+    checkpoint_dict: Dict[str, Any],
+    scheduler: Union[scheduler, None],
+    scaler: Union[scaler, None],
+    metadata_dict: Dict[str, Any],
+) -> int:
+    """Restores the scheduler, scaler and metadata of a training checkpoint,
+    returning the loaded epoch"""
     # Scheduler state dict
     if scheduler and "scheduler_state_dict" in checkpoint_dict:
         scheduler.load_state_dict(checkpoint_dict["scheduler_state_dict"])
@@ -462,9 +832,7 @@ def load_checkpoint(
         epoch = checkpoint_dict["epoch"]
 
     # Update metadata if exists and the dictionary object is provided
-    metadata = checkpoint_dict.get("metadata", {})
-    for key, value in metadata.items():
-        metadata_dict[key] = value
+    metadata_dict.update(checkpoint_dict.get("metadata", {}))
 
     return epoch
 
@@ -494,14 +862,11 @@ def get_checkpoint_dir(base_dir: str, model_name: str) -> str:
         return os.path.join(base_dir, top_level_dir)
 
 
-# Read via cache and return the cached path for non-file protocols, otherwise just return the path
+# Read via cache and return the cached path for non-file protocols, otherwise just return the path.
+# The cache is shared by the processes of a node, which download each checkpoint once.
 def _cache_if_needed(path: str) -> str:
     protocol = fsspec.utils.get_protocol(path)
     if protocol == "file":
         return path
     else:
-        return _download_cached(
-            path,
-            recursive=False,
-            local_cache_path=os.path.join(LOCAL_CACHE, f"checkpoint_pid_{os.getpid()}"),
-        )
+        return _download_cached(path, recursive=False)
@@ -15,7 +15,7 @@
 # limitations under the License.
 
 from abc import ABC
-from typing import List, Tuple, Union
+from typing import Dict, List, Tuple, Union
 
 import torch
 import torch.distributed as dist
@@ -30,6 +30,12 @@ class EnsembleMetrics(ABC):
 
     Can be helpful for distributed and sequential computations of metrics.
 
+    The sufficient statistics of a metric form a state that can be saved with
+    `state_dict`, restored with `load_state_dict` and combined exactly with the state
+    of another instance (e.g. from another thread, process or evaluation chunk) with
+    `merge`. With `sync_updates=False`, updates only use local data and
+    `all_reduce` combines the partial states of all ranks in one collective.
+
     Parameters
     ----------
     input_shape : Union[Tuple[int,...], List]
@@ -38,18 +44,36 @@ class EnsembleMetrics(ABC):
         Pytorch device model is on, by default 'cpu'
     dtype : torch.dtype, optional
         Standard dtype to initialize any tensor with
+    sync_updates : bool, optional
+        Reduce every calculation and update across ranks when running distributed,
+        by default True
     """
 
+    # Names of the tensors holding the state of the sequential computation
+    _state_names: Tuple[str, ...] = ()
+
     def __init__(
         self,
         input_shape: Union[Tuple[int, ...], List[int]],
         device: Union[str, torch.device] = "cpu",
         dtype: torch.dtype = torch.float32,
+        sync_updates: bool = True,
     ):
         super().__init__()
         self.input_shape = list(input_shape)
         self.device = torch.device(device)
         self.dtype = dtype
+        self.sync_updates = sync_updates
+
+    def _is_distributed(self) -> bool:
+        """
+        Whether calculations and updates are reduced across ranks.
+        """
+        return (
+            self.sync_updates
+            and DistributedManager.is_initialized()
+            and dist.is_initialized()
+        )
 
     def _check_shape(self, inputs: Tensor) -> None:
         """
@@ -82,6 +106,96 @@ class EnsembleMetrics(ABC):
         """
         raise NotImplementedError("Class member must implement a finalize method.")
 
+    def state_dict(self) -> Dict[str, Tensor]:
+        """State of the sequential computation
+
+        Returns
+        -------
+        Dict[str, Tensor]
+            Copies of the state tensors, which can be saved with `torch.save`
+        """
+        return {
+            name: getattr(self, name).detach().clone() for name in self._state_names
+        }
+
+    def load_state_dict(self, state_dict: Dict[str, Tensor]) -> None:
+        """Restore the state of the sequential computation
+
+        Parameters
+        ----------
+        state_dict : Dict[str, Tensor]
+            State returned by `state_dict`
+        """
+        missing = set(self._state_names) - set(state_dict)
+        if missing:
+            raise KeyError(f"Missing state entries {sorted(missing)}.")
+        for name in self._state_names:
+            setattr(self, name, state_dict[name].to(self.device).clone())
+
+    def merge(self, *others: "EnsembleMetrics") -> "EnsembleMetrics":
+        """
+        Combine the states of other instances into this one, as if their data had
+        been passed to this instance.
+        """
+        raise NotImplementedError("Class member must implement a merge method.")
+
+    def all_reduce(self, group=None) -> "EnsembleMetrics":
+        """Combine the states of all ranks in a single collective
+
+        Every rank gathers the states of all ranks and merges them in rank order, so
+        that all ranks end up with the same state. Does nothing if not running
+        distributed.
+
+        Parameters
+        ----------
+        group : torch.distributed.ProcessGroup, optional
+            Process group to reduce over, by default the default group
+
+        Returns
+        -------
+        EnsembleMetrics
+            This instance
+        """
+        if not (DistributedManager.is_initialized() and dist.is_initialized()):
+            return self
+        state = self.state_dict()
+        # Pack all state tensors into one buffer; float64 holds the counts exactly
+        packed = torch.cat([t.flatten().to(torch.float64) for t in state.values()])
+        gathered = [torch.empty_like(packed) for _ in range(dist.get_world_size(group))]
+        dist.all_gather(gathered, packed, group=group)
+
+        parts = []
+        for buffer in gathered:
+            other = self.__class__.__new__(self.__class__)
+            other.__dict__.update(self.__dict__)
+            offset = 0
+            for name, t in state.items():
+                value = buffer[offset : offset + t.numel()].view(t.shape).to(t.dtype)
+                setattr(other, name, value)
+                offset += t.numel()
+            parts.append(other)
+
+        self.load_state_dict(parts[0].state_dict())
+        return self.merge(*parts[1:])
+
+    def _check_merge(self, other: "EnsembleMetrics") -> None:
+        """
+        Check that another instance can be merged into this one.
+        """
+        if not isinstance(other, self.__class__):
+            raise TypeError(
+                f"Cannot merge {type(other).__name__} into {type(self).__name__}."
+            )
+        for name in self._state_names:
+            if getattr(other, name).shape != getattr(self, name).shape:
+                raise ValueError(
+                    "Expected states to merge to have compatible shapes but got "
+                    + str(getattr(other, name).shape)
+                    + " and "
+                    + str(getattr(self, name).shape)
+                    + f" for {name}."
+                )
+
 
 def _update_mean(
     old_sum: Tensor,
@@ -133,6 +247,8 @@ class Mean(EnsembleMetrics):
         Shape of broadcasted dimensions
     """
 
+    _state_names = ("sum", "n")
+
     def __init__(self, input_shape: Union[Tuple, List], **kwargs):
         super().__init__(input_shape, **kwargs)
         self.sum = torch.zeros(self.input_shape, dtype=self.dtype, device=self.device)
@@ -161,9 +277,7 @@ class Mean(EnsembleMetrics):
         self.n = torch.as_tensor([inputs.shape[dim]], device=self.device)
         # TODO(Dallas) Move distributed calls into finalize.
 
-        if (
-            DistributedManager.is_initialized() and dist.is_initialized()
-        ):  # pragma: no cover
+        if self._is_distributed():  # pragma: no cover
             dist.all_reduce(self.sum, op=dist.ReduceOp.SUM)
             dist.all_reduce(self.n, op=dist.ReduceOp.SUM)
 
@@ -191,9 +305,7 @@ class Mean(EnsembleMetrics):
             )
 
         # TODO(Dallas) Move distributed calls into finalize.
-        if (
-            DistributedManager.is_initialized() and dist.is_initialized()
-        ):  # pragma: no cover
+        if self._is_distributed():  # pragma: no cover
             # Collect local sums, n
             sums = torch.sum(inputs, dim=dim)
             n = torch.as_tensor([inputs.shape[dim]], device=self.device)
@@ -209,6 +321,25 @@ class Mean(EnsembleMetrics):
             self.sum, self.n = _update_mean(self.sum, self.n, inputs, batch_dim=dim)
         return self.sum / self.n
 
+    def merge(self, *others: "Mean") -> "Mean":
+        """Combine the sums and number of samples of other instances into this one
+
+        Parameters
+        ----------
+        others : Mean
+            Instances holding partial results over other samples
+
+        Returns
+        -------
+        Mean
+            This instance
+        """
+        for other in others:
+            self._check_merge(other)
+            self.sum = self.sum + other.sum.to(self.device)
+            self.n = self.n + other.n.to(self.device)
+        return self
+
     def finalize(
         self,
     ) -> Tensor:
@@ -282,6 +413,57 @@ def _update_var(
     return new_sum, new_sum2, new_n
 
 
+def _merge_moments(
+    n_a: Tensor,
+    sum_a: Tensor,
+    sum2_a: Tensor,
+    n_b: Union[int, Tensor],
+    sum_b: Tensor,
+    sum2_b: Tensor,
+) -> Tuple[Tensor, Tensor, Tensor]:
+    """Merge the variance sufficient statistics of two disjoint sets of samples
+
+    Either set may be empty, in which case the statistics of the other set are returned.
+
+    Parameters
+    ----------
+    n_a : Tensor
+        Number of samples in the first set
+    sum_a : Tensor
+        Sum of the first set
+    sum2_a : Tensor
+        Sum of squared deviations from the mean of the first set
+    n_b : Union[int, Tensor]
+        Number of samples in the second set
+    sum_b : Tensor
+        Sum of the second set
+    sum2_b : Tensor
+        Sum of squared deviations from the mean of the second set
+
+    Returns
+    -------
+    Tuple[Tensor, Tensor, Tensor]
+        Merged (number of samples, sum, squared sum)
+
+    Note
+    ----
+    See "Updating Formulae and a Pairwise Algorithm for Computing Sample Variances"
+    by Chan et al.
+    http://i.stanford.edu/pub/cstr/reports/cs/tr/79/773/CS-TR-79-773.pdf
+    for details.
+    """
+    n_b = torch.as_tensor(n_b, device=n_a.device)
+    new_n = n_a + n_b
+    # Counts are kept as integers, the merge is computed in the precision of the sums.
+    # Clamping the denominators avoids NaNs when merging with an empty set, in which
+    # case the correction term vanishes.
+    fn_a = n_a.to(sum_a.dtype)
+    fn_b = n_b.to(sum_a.dtype)
+    delta = sum_b / fn_b.clamp(min=1) - sum_a / fn_a.clamp(min=1)
+    correction = fn_a * fn_b / (fn_a + fn_b).clamp(min=1) * delta**2
+    return new_n, sum_a + sum_b, sum2_a + sum2_b + correction
+
+
 class Variance(EnsembleMetrics):
     """Utility class that computes the variance over a batched or ensemble dimension
 
@@ -291,6 +473,10 @@ class Variance(EnsembleMetrics):
     ----------
     input_shape : Union[Tuple, List]
         Shape of broadcasted dimensions
+    chunk_size : Union[int, None], optional
+        Maximum number of elements of the broadcasted dimensions processed at once by
+        `update`, which bounds the size of temporary tensors to chunk_size times the
+        batch size. All elements are processed at once if None, by default None
 
     Note
     ----
@@ -300,8 +486,18 @@ class Variance(EnsembleMetrics):
     for details.
     """
 
-    def __init__(self, input_shape: Union[Tuple, List], **kwargs):
+    _state_names = ("sum", "sum2", "n")
+
+    def __init__(
+        self,
+        input_shape: Union[Tuple, List],
+        chunk_size: Union[int, None] = None,
+        **kwargs,
+    ):
         super().__init__(input_shape, **kwargs)
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        self.chunk_size = chunk_size
         self.n = torch.zeros([1], dtype=torch.int32, device=self.device)
         self.sum = torch.zeros(self.input_shape, dtype=self.dtype, device=self.device)
         self.sum2 = torch.zeros(self.input_shape, dtype=self.dtype, device=self.device)
@@ -329,9 +525,7 @@ class Variance(EnsembleMetrics):
         self.sum = torch.sum(inputs, dim=dim)
         self.n = torch.as_tensor([inputs.shape[0]], device=self.device)
 
-        if (
-            DistributedManager.is_initialized() and dist.is_initialized()
-        ):  # pragma: no cover
+        if self._is_distributed():  # pragma: no cover
             # Compute mean and send around.
             dist.all_reduce(self.sum, op=dist.ReduceOp.SUM)
             dist.all_reduce(self.n, op=dist.ReduceOp.SUM)
@@ -366,32 +560,71 @@ class Variance(EnsembleMetrics):
                 f"Input device, {inputs.device}, and Module device, {self.device}, must be the same."
             )
 
-        new_n = torch.as_tensor([inputs.shape[0]], device=self.device)
-        new_sum = torch.sum(inputs, dim=0)
         # TODO(Dallas) Move distributed calls into finalize.
-        if (
-            DistributedManager.is_initialized() and dist.is_initialized()
-        ):  # pragma: no cover
+        if self._is_distributed():  # pragma: no cover
+            new_n = torch.as_tensor([inputs.shape[0]], device=self.device)
+            new_sum = torch.sum(inputs, dim=0)
             dist.all_reduce(new_n, op=dist.ReduceOp.SUM)
             dist.all_reduce(new_sum, op=dist.ReduceOp.SUM)
             new_sum2 = torch.sum((inputs - new_sum / new_n) ** 2, dim=0)
             dist.all_reduce(new_sum2, op=dist.ReduceOp.SUM)
-
+            self.n, self.sum, self.sum2 = _merge_moments(
+                self.n, self.sum, self.sum2, new_n, new_sum, new_sum2
+            )
         else:
-            # Calculate new statistics
-            new_sum2 = torch.sum((inputs - new_sum / new_n) ** 2, dim=0)
+            self._update_chunked(inputs)
 
-        delta = self.sum * new_n / self.n - new_sum
-        # Update
-        self.sum += new_sum
-        self.sum2 += new_sum2
-        self.sum2 += self.n / new_n / (self.n + new_n) * (delta) ** 2
-        self.n += new_n
         if self.n < 2.0:
             return self.sum2
         else:
             return self.sum2 / (self.n - 1.0)
 
+    def _update_chunked(self, inputs: Tensor) -> None:
+        """
+        Merge the statistics of local inputs into the state, chunk_size elements of the
+        broadcasted dimensions at a time.
+        """
+        new_n = torch.as_tensor([inputs.shape[0]], device=self.device)
+        inputs = inputs.reshape(inputs.shape[0], -1)
+        sums = self.sum.contiguous().view(-1)
+        sums2 = self.sum2.contiguous().view(-1)
+        chunk_size = self.chunk_size or inputs.shape[1]
+        for start in range(0, inputs.shape[1], chunk_size):
+            chunk = slice(start, start + chunk_size)
+            new_sum = torch.sum(inputs[:, chunk], dim=0)
+            new_sum2 = torch.sum((inputs[:, chunk] - new_sum / new_n) ** 2, dim=0)
+            _, sums[chunk], sums2[chunk] = _merge_moments(
+                self.n, sums[chunk], sums2[chunk], new_n, new_sum, new_sum2
+            )
+        self.sum = sums.view(self.sum.shape)
+        self.sum2 = sums2.view(self.sum2.shape)
+        self.n = self.n + new_n
+
+    def merge(self, *others: "Variance") -> "Variance":
+        """Combine the statistics of other instances into this one
+
+        Parameters
+        ----------
+        others : Variance
+            Instances holding partial results over other samples
+
+        Returns
+        -------
+        Variance
+            This instance
+        """
+        for other in others:
+            self._check_merge(other)
+            self.n, self.sum, self.sum2 = _merge_moments(
+                self.n,
+                self.sum,
+                self.sum2,
+                other.n.to(self.device),
+                other.sum.to(self.device),
+                other.sum2.to(self.device),
+            )
+        return self
+
     @property
     def mean(self) -> Tensor:
         """Mean value"""
@@ -15,7 +15,7 @@
 # limitations under the License.
 
 
-from typing import Tuple, Union
+from typing import Dict, Tuple, Union
 
 import torch
 import torch.distributed as dist
@@ -333,6 +333,7 @@ def _update_bins_counts(
     counts: Tensor,
     cdf: bool = False,
     tol: float = 1e-2,
+    distributed: bool = True,
 ) -> Tuple[Tensor, Tensor]:
     """Utility for updating an existing histogram with new inputs
 
@@ -349,20 +350,24 @@ def _update_bins_counts(
         density function otherwise, by default False
     tol : float, optional
         Binning tolerance, by default 1e-4
+    distributed : bool, optional
+        Reduce the update across ranks when in a distributed environment, by default
+        True
 
     Returns
     -------
     Tuple[Tensor, Tensor]
         Updated (bin, count) tensors
     """
+    distributed = (
+        distributed and DistributedManager.is_initialized() and dist.is_initialized()
+    )
 
     # Compute new lows and highs, compare against old bins
     low, high = _get_mins_maxs(input)
 
     # If in distributed environment, reduce to get extrema min and max
-    if (
-        DistributedManager.is_initialized() and dist.is_initialized()
-    ):  # pragma: no cover
+    if distributed:  # pragma: no cover
         dist.all_reduce(low, op=dist.ReduceOp.MIN)
         dist.all_reduce(high, op=dist.ReduceOp.MAX)
 
@@ -404,13 +409,78 @@ def _update_bins_counts(
     # Count inputs to bins
     partial_counts = _count_bins(input, bin_edges, counts=None, cdf=cdf)
     # If in distributed environment, reduce to get extrema min and max
-    if DistributedManager.is_initialized() and dist.is_initialized():
+    if distributed:  # pragma: no cover
         dist.all_reduce(partial_counts, op=dist.ReduceOp.SUM)
     counts += partial_counts
     # Finally, combine the new partial counts with the existing counts
     return bin_edges, counts
 
 
+def _align_bins(
+    bin_edges: Tensor,
+    counts: Tensor,
+    start: Tensor,
+    end: Tensor,
+    tol: float = 1e-2,
+) -> Tuple[Tensor, Tensor]:
+    """Extends a histogram to the range [start, end] without rebinning
+
+    The range must lie on the lattice of the bin edges, i.e. differ from them by a
+    whole number of bins, which holds for histograms with equal initial bins that
+    were only extended with `_update_bins_counts`. Counts are then shifted and
+    padded with empty bins so that histograms extended to the same range can be
+    added exactly.
+
+    Parameters
+    ----------
+    bin_edges : Tensor
+        Current bin range tensor [N+1, ...] where N is the number of bins
+    counts : Tensor
+        Existing bin count tensor with dimension [N, ...] where N is the number of bins
+    start : Tensor
+        Lower edge of the new range, must not be larger than bin_edges[0]
+    end : Tensor
+        Upper edge of the new range, must not be smaller than bin_edges[-1]
+    tol : float, optional
+        Tolerance, in bin widths, when matching the range to the lattice, by default
+        1e-2
+
+    Returns
+    -------
+    Tuple[Tensor, Tensor]
+        Extended (bin edges [M+1, ...], counts [M, ...]) tensors
+    """
+    dbin_edges = bin_edges[1] - bin_edges[0]
+    lower = (bin_edges[0] - start) / dbin_edges
+    upper = (end - bin_edges[-1]) / dbin_edges
+    lk = torch.round(lower)
+    uk = torch.round(upper)
+    if not (
+        torch.all(torch.abs(lower - lk) <= tol)
+        and torch.all(torch.abs(upper - uk) <= tol)
+        and torch.all(lk == lk.flatten()[0])
+        and torch.all(uk == uk.flatten()[0])
+        and lk.flatten()[0] >= 0
+        and uk.flatten()[0] >= 0
+    ):
+        raise ValueError(
+            "Histograms can only be merged if their bin edges lie on the same lattice."
+        )
+    lk = int(lk.flatten()[0].item())
+    uk = int(uk.flatten()[0].item())
+    if lk == 0 and uk == 0:
+        return bin_edges, counts
+
+    old_number_of_bins = bin_edges.shape[0] - 1
+    number_of_bins = old_number_of_bins + lk + uk
+    bin_edges = linspace(start, end, number_of_bins)
+    new_counts = torch.zeros(
+        (number_of_bins, *counts.shape[1:]), dtype=counts.dtype, device=counts.device
+    )
+    new_counts[lk : lk + old_number_of_bins] += counts
+    return bin_edges, new_counts
+
+
 def _compute_counts_cdf(
     *inputs: Tensor,
     bins: Union[int, Tensor] = 10,
@@ -595,8 +665,16 @@ class Histogram(EnsembleMetrics):
         Initial bin edges or number of bins to use, by default 10
     tol : float, optional
         Bin edge tolerance, by default 1e-3
+
+    Note
+    ----
+    Histograms constructed with the same arguments and only extended by `update`
+    share a lattice of bin edges and can be merged exactly with `merge` or
+    `all_reduce`.
     """
 
+    _state_names = ("bin_edges", "counts")
+
     def __init__(
         self,
         input_shape: Tuple[int],
@@ -640,7 +718,7 @@ class Histogram(EnsembleMetrics):
             The calculated (bin edges [N+1, ...], counts [N, ...]) tensors
         """
         # Build bin_edges
-        if DistributedManager.is_initialized() and dist.is_initialized():
+        if self._is_distributed():  # pragma: no cover
             start, _ = torch.min(input, axis=0)
             end, _ = torch.max(input, axis=0)
             # We assume that the start/end across the distributed environments
@@ -672,11 +750,97 @@ class Histogram(EnsembleMetrics):
         """
         # TODO(Dallas) Move distributed calls into finalize.
         self.bin_edges, self.counts = _update_bins_counts(
-            input, self.bin_edges, self.counts
+            input, self.bin_edges, self.counts, distributed=self.sync_updates
         )
         self.number_of_bins = self.bin_edges.shape[0]
         return self.bin_edges, self.counts
 
+    def load_state_dict(self, state_dict: Dict[str, Tensor]) -> None:
+        """Restore the state of the histogram
+
+        Parameters
+        ----------
+        state_dict : Dict[str, Tensor]
+            State returned by `state_dict`
+        """
+        super().load_state_dict(state_dict)
+        self.number_of_bins = self.counts.shape[0]
+
+    def _check_merge(self, other: "Histogram") -> None:
+        """
+        Check that another histogram can be merged into this one.
+        """
+        if not isinstance(other, self.__class__):
+            raise TypeError(
+                f"Cannot merge {type(other).__name__} into {type(self).__name__}."
+            )
+        if other.bin_edges.shape[1:] != self.bin_edges.shape[1:]:
+            raise ValueError(
+                "Expected histograms to merge to have compatible non-leading "
+                + "dimensions but got "
+                + str(other.bin_edges.shape)
+                + " and "
+                + str(self.bin_edges.shape)
+                + "."
+            )
+
+    def merge(self, *others: "Histogram") -> "Histogram":
+        """Combine the counts of other histograms into this one
+
+        Both histograms are extended to the union of their ranges before adding the
+        counts, so no samples are rebinned.
+
+        Parameters
+        ----------
+        others : Histogram
+            Histograms over other samples, with bin edges on the same lattice
+
+        Returns
+        -------
+        Histogram
+            This histogram
+        """
+        for other in others:
+            self._check_merge(other)
+            other_edges = other.bin_edges.to(self.device)
+            start = torch.minimum(self.bin_edges[0], other_edges[0])
+            end = torch.maximum(self.bin_edges[-1], other_edges[-1])
+            self.bin_edges, self.counts = _align_bins(
+                self.bin_edges, self.counts, start, end, tol=self.tol
+            )
+            _, other_counts = _align_bins(
+                other_edges, other.counts.to(self.device), start, end, tol=self.tol
+            )
+            self.counts = self.counts + other_counts
+        self.number_of_bins = self.counts.shape[0]
+        return self
+
+    def all_reduce(self, group=None) -> "Histogram":  # pragma: no cover
+        """Combine the histograms of all ranks
+
+        Parameters
+        ----------
+        group : torch.distributed.ProcessGroup, optional
+            Process group to reduce over, by default the default group
+
+        Returns
+        -------
+        Histogram
+            This histogram
+        """
+        if not (DistributedManager.is_initialized() and dist.is_initialized()):
+            return self
+        start = self.bin_edges[0].clone()
+        end = self.bin_edges[-1].clone()
+        dist.all_reduce(start, op=dist.ReduceOp.MIN, group=group)
+        dist.all_reduce(end, op=dist.ReduceOp.MAX, group=group)
+        self.bin_edges, self.counts = _align_bins(
+            self.bin_edges, self.counts, start, end, tol=self.tol
+        )
+        dist.all_reduce(self.counts, op=dist.ReduceOp.SUM, group=group)
+        self.number_of_bins = self.counts.shape[0]
+        return self
+
     def finalize(self, cdf: bool = False) -> Tuple[Tensor, Tensor]:
         """Finalize the histogram, which computes the pdf and cdf
 
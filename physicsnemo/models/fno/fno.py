@@ -29,6 +29,15 @@ from ..meta import ModelMetaData
 from ..mlp import FullyConnected
 from ..module import Module
 
+
+def _coord_grid(sizes: List[int], device: torch.device) -> Tensor:
+    """Relative coordinates in [0, 1] of a grid, shape [1, len(sizes), *sizes]"""
+    grids = [
+        torch.linspace(0, 1, size, dtype=torch.float32, device=device) for size in sizes
+    ]
+    return torch.stack(torch.meshgrid(grids, indexing="ij"), dim=0).unsqueeze(0)
+
+
 # ===================================================================
 # ===================================================================
 # 1D FNO
@@ -81,6 +90,8 @@ class FNO1DEncoder(nn.Module):
         self.coord_features = coord_features
         if self.coord_features:
             self.in_channels = self.in_channels + 1
+        # Coordinate grid of the last input shape, expanded over the batch
+        self.register_buffer("coord_grid", torch.empty(0), persistent=False)
 
         # Padding values for spectral conv
         if isinstance(padding, int):
@@ -157,11 +168,22 @@ class FNO1DEncoder(nn.Module):
         -------
         Tensor
             Meshgrid tensor
+
+        Note
+        ----
+        The grid is cached for the last spatial shape and device and expanded
+        over the batch, the returned tensor is a view and must not be modified.
         """
-        bsize, size_x = shape[0], shape[2]
-        grid_x = torch.linspace(0, 1, size_x, dtype=torch.float32, device=device)
-        grid_x = grid_x.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1)
-        return grid_x
+        bsize = shape[0]
+        grid = self.coord_grid
+        if (
+            list(grid.shape[2:]) != shape[2:]
+            or grid.device != device
+            or grid.dtype != torch.float32
+        ):
+            grid = _coord_grid(shape[2:], device)
+            self.coord_grid = grid
+        return grid.expand(bsize, -1, -1)
 
     def grid_to_points(self, value: Tensor) -> Tuple[Tensor, List[int]]:
         """converting from grid based (image) to point based representation
@@ -249,6 +271,8 @@ class FNO2DEncoder(nn.Module):
         # Add relative coordinate feature
         if self.coord_features:
             self.in_channels = self.in_channels + 2
+        # Coordinate grid of the last input shape, expanded over the batch
+        self.register_buffer("coord_grid", torch.empty(0), persistent=False)
 
         # Padding values for spectral conv
         if isinstance(padding, int):
@@ -336,14 +360,22 @@ class FNO2DEncoder(nn.Module):
         -------
         Tensor
             Meshgrid tensor
+
+        Note
+        ----
+        The grid is cached for the last spatial shape and device and expanded
+        over the batch, the returned tensor is a view and must not be modified.
         """
-        bsize, size_x, size_y = shape[0], shape[2], shape[3]
-        grid_x = torch.linspace(0, 1, size_x, dtype=torch.float32, device=device)
-        grid_y = torch.linspace(0, 1, size_y, dtype=torch.float32, device=device)
-        grid_x, grid_y = torch.meshgrid(grid_x, grid_y, indexing="ij")
-        grid_x = grid_x.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1, 1)
-        grid_y = grid_y.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1, 1)
-        return torch.cat((grid_x, grid_y), dim=1)
+        bsize = shape[0]
+        grid = self.coord_grid
+        if (
+            list(grid.shape[2:]) != shape[2:]
+            or grid.device != device
+            or grid.dtype != torch.float32
+        ):
+            grid = _coord_grid(shape[2:], device)
+            self.coord_grid = grid
+        return grid.expand(bsize, -1, -1, -1)
 
     def grid_to_points(self, value: Tensor) -> Tuple[Tensor, List[int]]:
         """converting from grid based (image) to point based representation
@@ -432,6 +464,8 @@ class FNO3DEncoder(nn.Module):
         # Add relative coordinate feature
         if self.coord_features:
             self.in_channels = self.in_channels + 3
+        # Coordinate grid of the last input shape, expanded over the batch
+        self.register_buffer("coord_grid", torch.empty(0), persistent=False)
 
         # Padding values for spectral conv
         if isinstance(padding, int):
@@ -520,16 +554,22 @@ class FNO3DEncoder(nn.Module):
         -------
         Tensor
             Meshgrid tensor
+
+        Note
+        ----
+        The grid is cached for the last spatial shape and device and expanded
+        over the batch, the returned tensor is a view and must not be modified.
         """
-        bsize, size_x, size_y, size_z = shape[0], shape[2], shape[3], shape[4]
-        grid_x = torch.linspace(0, 1, size_x, dtype=torch.float32, device=device)
-        grid_y = torch.linspace(0, 1, size_y, dtype=torch.float32, device=device)
-        grid_z = torch.linspace(0, 1, size_z, dtype=torch.float32, device=device)
-        grid_x, grid_y, grid_z = torch.meshgrid(grid_x, grid_y, grid_z, indexing="ij")
-        grid_x = grid_x.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1, 1, 1)
-        grid_y = grid_y.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1, 1, 1)
-        grid_z = grid_z.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1, 1, 1)
-        return torch.cat((grid_x, grid_y, grid_z), dim=1)
+        bsize = shape[0]
+        grid = self.coord_grid
+        if (
+            list(grid.shape[2:]) != shape[2:]
+            or grid.device != device
+            or grid.dtype != torch.float32
+        ):
+            grid = _coord_grid(shape[2:], device)
+            self.coord_grid = grid
+        return grid.expand(bsize, -1, -1, -1, -1)
 
     def grid_to_points(self, value: Tensor) -> Tuple[Tensor, List[int]]:
         """converting from grid based (image) to point based representation
@@ -618,6 +658,8 @@ class FNO4DEncoder(nn.Module):
         # Add relative coordinate feature
         if self.coord_features:
             self.in_channels = self.in_channels + 4
+        # Coordinate grid of the last input shape, expanded over the batch
+        self.register_buffer("coord_grid", torch.empty(0), persistent=False)
 
         # Padding values for spectral conv
         if isinstance(padding, int):
@@ -709,26 +751,22 @@ class FNO4DEncoder(nn.Module):
         -------
         Tensor
             Meshgrid tensor
+
+        Note
+        ----
+        The grid is cached for the last spatial shape and device and expanded
+        over the batch, the returned tensor is a view and must not be modified.
         """
-        bsize, size_x, size_y, size_z, size_t = (
-            shape[0],
-            shape[2],
-            shape[3],
-            shape[4],
-            shape[5],
-        )
-        grid_x = torch.linspace(0, 1, size_x, dtype=torch.float32, device=device)
-        grid_y = torch.linspace(0, 1, size_y, dtype=torch.float32, device=device)
-        grid_z = torch.linspace(0, 1, size_z, dtype=torch.float32, device=device)
-        grid_t = torch.linspace(0, 1, size_t, dtype=torch.float32, device=device)
-        grid_x, grid_y, grid_z, grid_t = torch.meshgrid(
-            grid_x, grid_y, grid_z, grid_t, indexing="ij"
-        )
-        grid_x = grid_x.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1, 1, 1, 1)
-        grid_y = grid_y.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1, 1, 1, 1)
-        grid_z = grid_z.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1, 1, 1, 1)
-        grid_t = grid_t.unsqueeze(0).unsqueeze(0).repeat(bsize, 1, 1, 1, 1, 1)
-        return torch.cat((grid_x, grid_y, grid_z, grid_t), dim=1)
+        bsize = shape[0]
+        grid = self.coord_grid
+        if (
+            list(grid.shape[2:]) != shape[2:]
+            or grid.device != device
+            or grid.dtype != torch.float32
+        ):
+            grid = _coord_grid(shape[2:], device)
+            self.coord_grid = grid
+        return grid.expand(bsize, -1, -1, -1, -1, -1)
 
     def grid_to_points(self, value: Tensor) -> Tuple[Tensor, List[int]]:
         """converting from grid based (image) to point based representation
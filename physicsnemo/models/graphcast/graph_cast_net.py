@@ -44,6 +44,7 @@ from physicsnemo.utils.graphcast.graph import Graph
 from .graph_cast_processor import (
     GraphCastProcessor,
     GraphCastProcessorGraphTransformer,
+    GraphCastProcessorSparseGraphTransformer,
 )
 
 logger = logging.getLogger(__name__)
@@ -223,6 +224,15 @@ class GraphCastNet(Module):
         avoid either having to distribute the computation of a loss function.
     graph_backend : str, default="pyg"
         Backend to use for the graph. Available options are "dgl" and "pyg".
+    graph_cache_dir : str, default=None
+        Directory to cache the graph topology in, shared by all processes using it.
+        The topology is then built once per input resolution and mesh instead of
+        on every model construction. Not cached if None.
+    sparse_attention : bool, default=False
+        If True, the GraphTransformer processor computes attention over the k-hop
+        neighbor pairs only, instead of over all mesh node pairs with a dense
+        N x N mask. Memory then scales with the number of neighbor pairs, and
+        Transformer Engine is not used by the processor.
 
     Note
     ----
@@ -276,6 +286,8 @@ class GraphCastNet(Module):
         produce_aggregated_output: bool = True,
         produce_aggregated_output_on_all_ranks: bool = True,
         graph_backend: Literal["dgl", "pyg"] = "pyg",
+        graph_cache_dir: Optional[str] = None,
+        sparse_attention: bool = False,
     ):
         super().__init__(meta=MetaData())
 
@@ -319,6 +331,8 @@ class GraphCastNet(Module):
             multimesh,
             khop_neighbors,
             backend=graph_backend,
+            cache_dir=graph_cache_dir,
+            sparse_khop=sparse_attention,
         )
 
         self.mesh_graph, self.attn_mask = self.graph.create_mesh_graph(verbose=False)
@@ -515,6 +529,16 @@ class GraphCastNet(Module):
                 do_concat_trick=do_concat_trick,
                 recompute_activation=recompute_activation,
             )
+        elif sparse_attention:
+            self.processor_encoder = torch.nn.Identity()
+            self.processor = GraphCastProcessorSparseGraphTransformer(
+                neighbors=self.attn_mask,
+                num_attention_heads=num_attention_heads,
+                processor_layers=processor_layers,
+                input_dim_nodes=hidden_dim,
+                hidden_dim=hidden_dim,
+            )
+            self.processor_decoder = torch.nn.Identity()
         else:
             self.processor_encoder = torch.nn.Identity()
             self.processor = GraphCastProcessorGraphTransformer(
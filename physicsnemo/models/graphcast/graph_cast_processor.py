@@ -22,6 +22,8 @@ from torch import Tensor
 from physicsnemo.models.gnn_layers.mesh_edge_block import MeshEdgeBlock
 from physicsnemo.models.gnn_layers.mesh_node_block import MeshNodeBlock
 from physicsnemo.models.gnn_layers.utils import GraphType, set_checkpoint_fn
+from physicsnemo.models.layers.attention_layers import SparseSelfAttention
+from physicsnemo.models.layers.mlp_layers import Mlp
 
 
 class GraphCastProcessor(nn.Module):
@@ -234,3 +236,93 @@ class GraphCastProcessorGraphTransformer(nn.Module):
             )
 
         return torch.squeeze(nfeat, 1)
+
+
+class SparseTransformerLayer(nn.Module):
+    """Pre-norm transformer layer whose self-attention is restricted to given node
+    pairs.
+
+    Parameters
+    ----------
+    hidden_size : int
+        Dimension of the node features.
+    ffn_hidden_size : int
+        Dimension of the hidden features of the feed-forward network.
+    num_attention_heads : int
+        Number of attention heads.
+    """
+
+    def __init__(
+        self,
+        hidden_size: int,
+        ffn_hidden_size: int,
+        num_attention_heads: int,
+    ):
+        super().__init__()
+        self.attention_norm = nn.LayerNorm(hidden_size)
+        self.attention = SparseSelfAttention(hidden_size, num_attention_heads)
+        self.mlp_norm = nn.LayerNorm(hidden_size)
+        self.mlp = Mlp(hidden_size, ffn_hidden_size, act_layer=nn.GELU)
+
+    def forward(self, nfeat: Tensor, rows: Tensor, cols: Tensor) -> Tensor:
+        nfeat = nfeat + self.attention(self.attention_norm(nfeat), rows, cols)
+        return nfeat + self.mlp(self.mlp_norm(nfeat))
+
+
+class GraphCastProcessorSparseGraphTransformer(nn.Module):
+    """Processor block used in GenCast operating on a latent space
+    represented by hierarchy of icosahedral meshes, in which each mesh node only
+    attends to its k-hop neighbors.
+
+    Attention scores are computed for the neighbor pairs only, so memory scales with
+    the number of pairs instead of the square of the number of mesh nodes.
+
+    Parameters
+    ----------
+    neighbors : torch.Tensor
+        Boolean sparse tensor of shape [N, N] holding the mesh node pairs
+        (query, key) that attend to each other.
+    num_attention_heads : int, optional (default=4)
+        Number of attention heads.
+    processor_layers : int, optional (default=16)
+        Number of processing layers.
+    input_dim_nodes : int, optional (default=512)
+        Dimension of the input features for each node.
+    hidden_dim : int, optional (default=512)
+        Dimension of the hidden features within the transformer layers.
+    """
+
+    def __init__(
+        self,
+        neighbors: torch.Tensor,
+        num_attention_heads: int = 4,
+        processor_layers: int = 16,
+        input_dim_nodes: int = 512,
+        hidden_dim: int = 512,
+    ):
+        super().__init__()
+        self.num_attention_heads = num_attention_heads
+        self.hidden_dim = hidden_dim
+        if neighbors.layout != torch.sparse_coo:
+            neighbors = neighbors.to_sparse()
+        rows, cols = neighbors.coalesce().indices()
+        self.register_buffer("rows", rows, persistent=False)
+        self.register_buffer("cols", cols, persistent=False)
+
+        layers = [
+            SparseTransformerLayer(
+                hidden_size=input_dim_nodes,
+                ffn_hidden_size=hidden_dim,
+                num_attention_heads=num_attention_heads,
+            )
+            for _ in range(processor_layers)
+        ]
+        self.processor_layers = nn.ModuleList(layers)
+
+    def forward(
+        self,
+        nfeat: Tensor,
+    ) -> Tensor:
+        for module in self.processor_layers:
+            nfeat = module(nfeat, self.rows, self.cols)
+        return nfeat
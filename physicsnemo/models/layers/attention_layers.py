@@ -238,3 +238,80 @@ class EarthAttention2D(nn.Module):
         x = self.proj(x)
         x = self.proj_drop(x)
         return x
+
+
+class SparseSelfAttention(nn.Module):
+    """
+    Multi-head self-attention restricted to given pairs of nodes, e.g. the k-hop
+    neighborhoods of a graph.
+
+    Scores are only computed for the listed (query, key) pairs and normalized over the
+    keys of each query, so memory scales with the number of pairs rather than with
+    the square of the number of nodes. This is equivalent to dense attention with a
+    mask that only allows the listed pairs.
+
+    Args:
+        dim (int): Number of input channels.
+        num_heads (int): Number of attention heads.
+        qkv_bias (bool, optional): If True, add a learnable bias to query, key, value. Default: True
+        qk_scale (float | None, optional): Override default qk scale of head_dim ** -0.5 if set
+        attn_drop (float, optional): Dropout ratio of attention weight. Default: 0.0
+        proj_drop (float, optional): Dropout ratio of output. Default: 0.0
+    """
+
+    def __init__(
+        self,
+        dim,
+        num_heads,
+        qkv_bias=True,
+        qk_scale=None,
+        attn_drop=0.0,
+        proj_drop=0.0,
+    ):
+        super().__init__()
+        if dim % num_heads != 0:
+            raise ValueError(
+                f"dim ({dim}) must be divisible by num_heads ({num_heads})"
+            )
+        self.dim = dim
+        self.num_heads = num_heads
+        head_dim = dim // num_heads
+        self.scale = qk_scale or head_dim**-0.5
+
+        self.qkv = nn.Linear(dim, dim * 3, bias=qkv_bias)
+        self.attn_drop = nn.Dropout(attn_drop)
+        self.proj = nn.Linear(dim, dim)
+        self.proj_drop = nn.Dropout(proj_drop)
+
+    def forward(self, x: torch.Tensor, rows: torch.Tensor, cols: torch.Tensor):
+        """
+        Args:
+            x: input features with shape of (N, C)
+            rows: query node of each attended pair with shape of (E,)
+            cols: key node of each attended pair with shape of (E,)
+        """
+        N, C = x.shape
+        q, k, v = (
+            self.qkv(x).reshape(N, 3, self.num_heads, C // self.num_heads).unbind(1)
+        )
+
+        # (E, nH) scores of the attended pairs
+        attn = (q[rows] * k[cols]).sum(-1) * self.scale
+
+        # Softmax over the keys of each query
+        with torch.no_grad():
+            attn_max = torch.full(
+                (N, self.num_heads), -torch.inf, dtype=attn.dtype, device=attn.device
+            )
+            attn_max = attn_max.scatter_reduce(
+                0, rows.unsqueeze(-1).expand_as(attn), attn, "amax"
+            )
+        attn = torch.exp(attn - attn_max[rows])
+        attn_sum = torch.zeros_like(attn_max).index_add(0, rows, attn)
+        attn = attn / attn_sum[rows]
+        attn = self.attn_drop(attn)
+
+        x = torch.zeros_like(q).index_add(0, rows, attn.unsqueeze(-1) * v[cols])
+        x = self.proj(x.reshape(N, C))
+        x = self.proj_drop(x)
+        return x
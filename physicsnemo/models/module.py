@@ -24,13 +24,16 @@ import keyword
 import logging
 import os
 import re
+import struct
 import tarfile
 import tempfile
+import time
 import warnings
 import zipfile
 from pathlib import Path
 from typing import Any, Dict, Optional, Set, Union
 
+import numpy as np
 import torch
 
 import physicsnemo
@@ -41,6 +44,179 @@ from physicsnemo.utils.filesystem import _download_cached, _get_fs
 # Used for saving checkpoints of nested modules
 _BASE_CKPT_PREFIX = "__physicsnemo.Module__"
 
+# Byte alignment of the tensors stored in memory-mappable checkpoints
+_TENSOR_TABLE_ALIGNMENT = 64
+
+# Zip extra field id used to pad local headers (same id as Android's zipalign)
+_ZIP_ALIGNMENT_EXTRA_ID = 0xD935
+
+
+def _write_tensor_table(archive: zipfile.ZipFile, state_dict: Dict[str, Any]) -> None:
+    """Write a state dictionary to a zip archive as a flat tensor table
+
+    The tensors are concatenated, uncompressed and aligned, into a single
+    ``tensors.bin`` member whose data starts at an aligned offset of the
+    archive, and ``tensors.json`` lists the name, dtype, shape and offset of
+    each tensor, so that the whole table can be memory-mapped on load.
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        Archive open for writing on a seekable file
+    state_dict : Dict[str, Any]
+        State dictionary to write
+
+    Raises
+    ------
+    ValueError
+        If the state dictionary contains anything other than dense tensors
+    """
+    table = []
+    tensors = []
+    offset = 0
+    for name, value in state_dict.items():
+        if (
+            not isinstance(value, torch.Tensor)
+            or value.layout != torch.strided
+            or value.is_quantized
+        ):
+            raise ValueError(
+                f"State dict entry '{name}' is not a dense tensor, which is not "
+                f"supported by memory-mappable checkpoints. Please save with "
+                f"'mmap_format=False' instead."
+            )
+        host = value.detach().cpu().contiguous()
+        offset = -(-offset // _TENSOR_TABLE_ALIGNMENT) * _TENSOR_TABLE_ALIGNMENT
+        nbytes = host.numel() * host.element_size()
+        table.append(
+            {
+                "name": name,
+                "dtype": str(host.dtype).removeprefix("torch."),
+                "shape": list(host.shape),
+                "offset": offset,
+                "nbytes": nbytes,
+            }
+        )
+        tensors.append(host)
+        offset += nbytes
+
+    archive.writestr("tensors.json", json.dumps(table))
+
+    # Pad the local header so that the member data starts at an aligned
+    # offset. The header is 30 bytes, plus the file name, the padding record
+    # and the 20 bytes zip64 record added by force_zip64.
+    zinfo = zipfile.ZipInfo("tensors.bin", date_time=time.localtime()[:6])
+    zinfo.compress_type = zipfile.ZIP_STORED
+    zinfo.file_size = offset
+    header_size = 30 + len(zinfo.filename.encode("utf-8")) + 4 + 20
+    padding = -(archive.fp.tell() + header_size) % _TENSOR_TABLE_ALIGNMENT
+    zinfo.extra = struct.pack("<HH", _ZIP_ALIGNMENT_EXTRA_ID, padding) + bytes(padding)
+
+    with archive.open(zinfo, "w", force_zip64=True) as member:
+        position = 0
+        for entry, host in zip(table, tensors):
+            member.write(bytes(entry["offset"] - position))
+            if entry["nbytes"] > 0:
+                member.write(host.view(-1).view(torch.uint8).numpy().data)
+            position = entry["offset"] + entry["nbytes"]
+
+
+def _read_tensor_table(
+    file_name: str, archive: zipfile.ZipFile
+) -> Dict[str, torch.Tensor]:
+    """Memory-map a flat tensor table written by ``_write_tensor_table``
+
+    The returned tensors are copy-on-write views of the checkpoint file on
+    the CPU: only the pages that are read are loaded from disk, and loading
+    them into a model copies them straight into its parameters.
+
+    Parameters
+    ----------
+    file_name : str
+        Local path of the checkpoint
+    archive : zipfile.ZipFile
+        Checkpoint archive open for reading
+
+    Returns
+    -------
+    Dict[str, torch.Tensor]
+        State dictionary
+
+    Raises
+    ------
+    IOError
+        If the tensor table is compressed
+    """
+    table = json.loads(archive.read("tensors.json").decode("utf-8"))
+    info = archive.getinfo("tensors.bin")
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise IOError("Memory-mappable checkpoint tensors must be stored uncompressed")
+
+    # The data follows the local header, whose extra field may differ from
+    # the one recorded in the central directory
+    with open(file_name, "rb") as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+    if header[:4] != b"PK\x03\x04":
+        raise IOError(f"Corrupt local header for 'tensors.bin' in {file_name}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    data_offset = info.header_offset + 30 + name_length + extra_length
+
+    buffer = None
+    if info.file_size > 0:
+        buffer = torch.from_numpy(
+            np.memmap(
+                file_name,
+                dtype=np.uint8,
+                mode="c",
+                offset=data_offset,
+                shape=(info.file_size,),
+            )
+        )
+
+    state_dict = {}
+    for entry in table:
+        dtype = getattr(torch, entry["dtype"])
+        if entry["nbytes"] == 0:
+            state_dict[entry["name"]] = torch.empty(entry["shape"], dtype=dtype)
+            continue
+        start = entry["offset"]
+        state_dict[entry["name"]] = (
+            buffer[start : start + entry["nbytes"]].view(dtype).view(entry["shape"])
+        )
+    return state_dict
+
+
+def _check_zip_checkpoint(archive: zipfile.ZipFile) -> None:
+    """Check that a zip checkpoint holds its arguments, metadata and weights"""
+    archive_files = archive.namelist()
+    expected_files = ["args.json", "metadata.json"]
+    if "tensors.bin" in archive_files:
+        expected_files.append("tensors.json")
+    else:
+        expected_files.append("model.pt")
+    for expected_file in expected_files:
+        if expected_file not in archive_files:
+            raise IOError(f"File '{expected_file}' not found in checkpoint")
+
+
+def _load_zip_state_dict(
+    file_name: str,
+    archive: zipfile.ZipFile,
+    map_location: Union[None, str, torch.device],
+) -> Dict[str, Any]:
+    """Load the state dictionary of a zip checkpoint
+
+    Memory-mappable checkpoints are mapped on the CPU, ``map_location`` only
+    applies to regular checkpoints, which are read into memory.
+    """
+    if "tensors.bin" in archive.namelist():
+        return _read_tensor_table(file_name, archive)
+
+    # Read into memory
+    model_bytes = archive.read("model.pt")
+    return torch.load(io.BytesIO(model_bytes), map_location=map_location)
+
 
 def _load_state_dict_with_logging(
     module: torch.nn.Module, state_dict: Dict[str, Any], *args, **kwargs
@@ -390,6 +566,7 @@ class Module(torch.nn.Module):
         file_name: Union[str, None] = None,
         verbose: bool = False,
         legacy_format: bool = False,
+        mmap_format: bool = False,
     ) -> None:
         """
         Utility method for saving a ``Module`` instance to a '.mdlus' checkpoint file.
@@ -405,11 +582,19 @@ class Module(torch.nn.Module):
         legacy_format : bool, optional, default=False
             Whether to save the model in legacy tar format. If True, saves as tar archive.
             If False (default), saves as zip archive.
+        mmap_format : bool, optional, default=False
+            Whether to store the weights as an uncompressed and aligned tensor
+            table rather than a ``torch.save`` payload. Such checkpoints are
+            memory-mapped by :meth:`load` and :meth:`from_checkpoint`, which
+            copy the weights straight from the file into the model parameters
+            instead of reading the whole payload into memory first. Only
+            supported for state dicts made of dense tensors.
 
         Raises
         ------
         ValueError
-            If file_name does not end with .mdlus extension
+            If file_name does not end with .mdlus extension, or if
+            ``mmap_format`` is combined with ``legacy_format``
 
         Examples
         --------
@@ -420,6 +605,8 @@ class Module(torch.nn.Module):
         >>> model.save()
         >>> # Save a checkpoint to a specified file name 'my_model.mdlus'
         >>> model.save("my_model.mdlus")
+        >>> # Save a checkpoint that is memory-mapped when loaded
+        >>> model.save("my_model.mdlus", mmap_format=True)
         """
 
         # Define some helper functions
@@ -494,10 +681,14 @@ class Module(torch.nn.Module):
             raise ValueError(
                 f"File name must end with {self._file_extension} extension"
             )
+        if legacy_format and mmap_format:
+            raise ValueError(
+                "Memory-mappable checkpoints are not supported in the legacy format"
+            )
 
         # Strip out torch dynamo wrapper
         if isinstance(self, torch._dynamo.eval_frame.OptimizedModule):
-            self._orig_mod.save(file_name, verbose)
+            self._orig_mod.save(file_name, verbose, legacy_format, mmap_format)
             return
 
         # Save the physicsnemo version and git hash (if available)
@@ -543,9 +734,12 @@ class Module(torch.nn.Module):
 
                 with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as archive:
                     # Save model state dict
-                    state_dict_buffer = io.BytesIO()
-                    torch.save(self.state_dict(), state_dict_buffer)
-                    archive.writestr("model.pt", state_dict_buffer.getvalue())
+                    if mmap_format:
+                        _write_tensor_table(archive, self.state_dict())
+                    else:
+                        state_dict_buffer = io.BytesIO()
+                        torch.save(self.state_dict(), state_dict_buffer)
+                        archive.writestr("model.pt", state_dict_buffer.getvalue())
 
                     # Save args
                     args_str = json.dumps(_args)
@@ -649,6 +843,8 @@ class Module(torch.nn.Module):
             Checkpoint file name. Must be a valid '.mdlus' checkpoint file.
         map_location : Union[None, str, torch.device], optional, default=None
             Map location for loading the model weights, ``None`` will use the model's device.
+            Ignored for checkpoints saved with ``mmap_format=True``, whose
+            weights are memory-mapped and copied directly into the model.
         strict: bool, optional, default=True
             Whether to strictly enforce that the keys in ``state_dict`` match.
 
@@ -699,17 +895,9 @@ class Module(torch.nn.Module):
             # Load directly from zip file (no extraction needed)
             with zipfile.ZipFile(cached_file_name, "r") as archive:
                 # Check if all expected files are present
-                expected_files = ["args.json", "metadata.json", "model.pt"]
-                archive_files = archive.namelist()
-                for expected_file in expected_files:
-                    if expected_file not in archive_files:
-                        raise IOError(f"File '{expected_file}' not found in checkpoint")
+                _check_zip_checkpoint(archive)
 
-                # Read into memory
-                model_bytes = archive.read("model.pt")
-
-            # Load state dict after closing archive
-            model_dict = torch.load(io.BytesIO(model_bytes), map_location=device)
+                model_dict = _load_zip_state_dict(cached_file_name, archive, device)
 
             # Load state_dict into the model
             _load_state_dict_with_logging(self, model_dict, strict=strict)
@@ -988,11 +1176,7 @@ class Module(torch.nn.Module):
             # Load directly from zip file (no extraction needed)
             with zipfile.ZipFile(cached_file_name, "r") as archive:
                 # Check if all expected files are present
-                expected_files = ["args.json", "metadata.json", "model.pt"]
-                archive_files = archive.namelist()
-                for expected_file in expected_files:
-                    if expected_file not in archive_files:
-                        raise IOError(f"File '{expected_file}' not found in checkpoint")
+                _check_zip_checkpoint(archive)
 
                 # Load model arguments and instantiate the model
                 with archive.open("args.json") as f:
@@ -1010,11 +1194,9 @@ class Module(torch.nn.Module):
                     strict,
                 )
 
-                # Read into memory
-                model_bytes = archive.read("model.pt")
-
-            # Load state dict after closing archive
-            model_dict = torch.load(io.BytesIO(model_bytes), map_location=model.device)
+                model_dict = _load_zip_state_dict(
+                    cached_file_name, archive, model.device
+                )
 
             # Load state_dict into the model
             _load_state_dict_with_logging(model, model_dict, strict=strict)
@@ -16,9 +16,15 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import sys
+import uuid
 import warnings
 from importlib.metadata import EntryPoint, entry_points
-from typing import List, Union
+from pathlib import Path
+from typing import Dict, List, Union
 
 # NOTE: This is for backport compatibility, some entry points seem to be using this old class
 # Exact cause of this is unknown but it seems to be related to multiple versions
@@ -35,6 +41,89 @@ except ImportError:
 
 import physicsnemo  # noqa: E402
 
+# Entry point groups scanned for models, newest first
+_ENTRY_POINT_GROUPS = ["physicsnemo.models", "modulus.models"]
+
+# Version of the on-disk entry point cache layout
+_CACHE_VERSION = 1
+
+
+def _registry_cache_dir() -> Path | None:
+    """Directory of the entry point cache, None when disabled with
+    ``PHYSICSNEMO_REGISTRY_CACHE=0``."""
+    cache_dir = os.environ.get("PHYSICSNEMO_REGISTRY_CACHE")
+    if cache_dir == "0":
+        return None
+    if cache_dir is None:
+        local_cache = os.environ.get(
+            "LOCAL_CACHE", Path.home() / ".cache" / "physicsnemo"
+        )
+        cache_dir = Path(local_cache) / "registry"
+    return Path(cache_dir)
+
+
+def _distributions_fingerprint() -> str:
+    """Hash of the installed distributions.
+
+    Only lists the ``*.dist-info`` and ``*.egg-info`` directories on
+    ``sys.path``, whose names carry the distribution versions, which is much
+    cheaper than reading their metadata. Modification times are included so
+    that reinstalling the same version (e.g. an editable install) is seen.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{_CACHE_VERSION}:{sys.version}".encode())
+    for path in sys.path:
+        try:
+            with os.scandir(path or ".") as it:
+                names = sorted(
+                    (entry.name, entry.stat().st_mtime_ns)
+                    for entry in it
+                    if entry.name.endswith((".dist-info", ".egg-info"))
+                )
+        except OSError:
+            continue
+        hasher.update(path.encode())
+        for name, mtime in names:
+            hasher.update(f"{name}:{mtime}".encode())
+    return hasher.hexdigest()
+
+
+def _scan_entry_points() -> Dict[str, List[List[str]]]:
+    """Name and value of every model entry point, per group."""
+    return {
+        group: [[ep.name, ep.value] for ep in entry_points(group=group)]
+        for group in _ENTRY_POINT_GROUPS
+    }
+
+
+def _cached_entry_points() -> Dict[str, List[List[str]]]:
+    """Model entry points, read from the on-disk cache when the installed
+    distributions did not change since it was written."""
+    cache_dir = _registry_cache_dir()
+    if cache_dir is None:
+        return _scan_entry_points()
+
+    cache_file = cache_dir / f"entry_points-{_distributions_fingerprint()}.json"
+    try:
+        with open(cache_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    groups = _scan_entry_points()
+    # The cache is an optimization, so failing to write it (e.g. read-only
+    # home directory) is not an error. Written atomically so that concurrent
+    # workers never read a partial file.
+    tmp_file = cache_file.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, "w") as f:
+            json.dump(groups, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+    return groups
+
 
 # This model registry follows conventions similar to fsspec,
 # https://github.com/fsspec/filesystem_spec/blob/master/fsspec/registry.py#L62C2-L62C2
@@ -52,25 +141,26 @@ class ModelRegistry:
 
     @staticmethod
     def _construct_registry() -> dict:
+        # Entry points are only resolved (i.e. their module imported) when the
+        # model is requested through ``factory``
         registry = {}
-        entrypoints = entry_points(group="physicsnemo.models")
-        for entry_point in entrypoints:
-            registry[entry_point.name] = entry_point
+        groups = _cached_entry_points()
+        for name, value in groups["physicsnemo.models"]:
+            registry[name] = EntryPoint(name, value, "physicsnemo.models")
 
         # Pull in any modulus models for backwards compatibility
-        entrypoints = entry_points(group="modulus.models")
-        for entry_point in entrypoints:
-            if entry_point.name not in registry:
+        for name, value in groups["modulus.models"]:
+            if name not in registry:
                 # Add depricated warning
                 warnings.warn(
-                    f"Model {entry_point.name} is being loaded from the 'modulus.models' group. "
+                    f"Model {name} is being loaded from the 'modulus.models' group. "
                     f"This probably means it is being exposed from a package that has not yet been "
                     f"updated to use the 'physicsnemo.models' group. This group may be removed in a "
                     f"future release. Please contact the package maintainer to update the entry point.",
                     DeprecationWarning,
                     stacklevel=2,
                 )
-                registry[entry_point.name] = entry_point
+                registry[name] = EntryPoint(name, value, "modulus.models")
 
         return registry
 
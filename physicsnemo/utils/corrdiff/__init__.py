@@ -14,4 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .utils import NetCDFWriter, diffusion_step, get_time_from_range, regression_step
+from .utils import (
+    NetCDFWriter,
+    ZarrWriter,
+    diffusion_step,
+    get_time_from_range,
+    regression_step,
+)
@@ -15,10 +15,13 @@
 # limitations under the License.
 
 import datetime
+import queue
+import threading
 import warnings
 from typing import Literal, Optional
 
 import cftime
+import numpy as np
 import nvtx
 import torch
 import tqdm
@@ -236,13 +239,65 @@ def diffusion_step(
 
 
 class NetCDFWriter:
-    """NetCDF Writer"""
+    """NetCDF Writer
+
+    Writes the inputs, ground truth and ensemble predictions of CorrDiff generation
+    to a netCDF4 dataset with ``input``, ``truth`` and ``prediction`` groups.
+
+    By default every ``write_*`` call writes to the file immediately. With
+    ``asynchronous=True`` the values are copied to host buffers and queued, and a
+    background thread writes them, merging consecutive ensemble members (or time
+    steps) of the same variable into a single write. The queue is bounded, so
+    producers block instead of accumulating unbounded host memory. Call
+    :meth:`flush` to wait for the queued writes and :meth:`close` to stop the
+    background thread; errors raised while writing are re-raised by these calls
+    and by the next ``write_*`` call.
+
+    Parameters
+    ----------
+    f : netCDF4.Dataset
+        Dataset opened for writing.
+    lat : np.ndarray
+        Latitudes with shape (y, x).
+    lon : np.ndarray
+        Longitudes with shape (y, x).
+    input_channels : list
+        Input channel descriptions with ``name`` and ``level`` attributes.
+    output_channels : list
+        Output channel descriptions with ``name`` and ``level`` attributes.
+    has_lead_time : bool, optional
+        Whether times are stored as lead time strings. Default is False.
+    asynchronous : bool, optional
+        Whether to write from a background thread. Default is False.
+    max_queue_size : int, optional
+        Maximum number of queued writes in asynchronous mode. Default is 64.
+    chunk_sizes : Optional[dict], optional
+        Chunk size of the data variables per dimension name (``"ensemble"``,
+        ``"time"``, ``"y"``, ``"x"``). Dimensions not listed use 1 for ``ensemble``
+        and ``time`` and the full extent for ``y`` and ``x``. Default is None, which
+        leaves chunking to the backend.
+    compression : Optional[dict], optional
+        Extra keyword arguments for the creation of the data variables, e.g.
+        ``dict(compression="zlib", complevel=4)``. Default is None.
+    """
 
     def __init__(
-        self, f, lat, lon, input_channels, output_channels, has_lead_time=False
+        self,
+        f,
+        lat,
+        lon,
+        input_channels,
+        output_channels,
+        has_lead_time=False,
+        asynchronous=False,
+        max_queue_size=64,
+        chunk_sizes=None,
+        compression=None,
     ):
         self._f = f
         self.has_lead_time = has_lead_time
+        self.chunk_sizes = chunk_sizes
+        self.compression = compression
         # create unlimited dimensions
         f.createDimension("time")
         f.createDimension("ensemble")
@@ -250,6 +305,7 @@ class NetCDFWriter:
         if lat.shape != lon.shape:
             raise ValueError("lat and lon must have the same shape")
         ny, nx = lat.shape
+        self._grid_shape = (ny, nx)
 
         # create lat/lon grid
         f.createDimension("x", nx)
@@ -280,38 +336,323 @@ class NetCDFWriter:
 
         for variable in output_channels:
             name = variable.name + variable.level
-            self.truth_group.createVariable(name, "f", dimensions=("time", "y", "x"))
+            self.truth_group.createVariable(
+                name,
+                "f",
+                dimensions=("time", "y", "x"),
+                **self._variable_kwargs(("time", "y", "x")),
+            )
             self.prediction_group.createVariable(
-                name, "f", dimensions=("ensemble", "time", "y", "x")
+                name,
+                "f",
+                dimensions=("ensemble", "time", "y", "x"),
+                **self._variable_kwargs(("ensemble", "time", "y", "x")),
             )
 
         # setup input data in netCDF
 
         for variable in input_channels:
             name = variable.name + variable.level
-            self.input_group.createVariable(name, "f", dimensions=("time", "y", "x"))
+            self.input_group.createVariable(
+                name,
+                "f",
+                dimensions=("time", "y", "x"),
+                **self._variable_kwargs(("time", "y", "x")),
+            )
+
+        self._start_writer(asynchronous, max_queue_size)
+
+    def _chunks(self, dimensions):
+        """Chunk shape of a data variable, None if chunking is left to the backend."""
+        if self.chunk_sizes is None:
+            return None
+        extent = dict(zip(("y", "x"), self._grid_shape))
+        return tuple(self.chunk_sizes.get(d, extent.get(d, 1)) for d in dimensions)
+
+    def _variable_kwargs(self, dimensions):
+        """Backend keyword arguments for creating a data variable."""
+        kwargs = dict(self.compression or {})
+        chunks = self._chunks(dimensions)
+        if chunks is not None:
+            kwargs["chunksizes"] = chunks
+        return kwargs
+
+    def _start_writer(self, asynchronous, max_queue_size):
+        """Start the background writer thread if requested."""
+        self.asynchronous = asynchronous
+        self._error = None
+        self._queue = None
+        self._thread = None
+        if asynchronous:
+            self._queue = queue.Queue(maxsize=max_queue_size)
+            self._thread = threading.Thread(
+                target=self._writer_loop, name="NetCDFWriter", daemon=True
+            )
+            self._thread.start()
+
+    def _write(self, variable, index, val):
+        """Write `val` to `variable[index]`."""
+        variable[index] = val
+
+    def _time_value(self, time):
+        """Value stored in the time variable for `time`."""
+        if self.has_lead_time:
+            return time
+        time_v = self._f["time"]
+        return cftime.date2num(time, time_v.units, time_v.calendar)
+
+    def _submit(self, group, channel_name, index, val):
+        """Write a value now, or queue a host copy of it in asynchronous mode."""
+        if not self.asynchronous:
+            self._write(group[channel_name], index, val)
+            return
+        self._raise_error()
+        if self._thread is None:
+            raise RuntimeError("Cannot write to a closed NetCDFWriter")
+        if isinstance(val, torch.Tensor):
+            val = val.detach().to("cpu", copy=True).numpy()
+        else:
+            val = np.array(val, copy=True)
+        self._queue.put((group, channel_name, index, val))
 
     def write_input(self, channel_name, time_index, val):
         """Write input data to NetCDF file."""
-        self.input_group[channel_name][time_index] = val
+        self._submit(self.input_group, channel_name, time_index, val)
 
     def write_truth(self, channel_name, time_index, val):
         """Write ground truth data to NetCDF file."""
-        self.truth_group[channel_name][time_index] = val
+        self._submit(self.truth_group, channel_name, time_index, val)
 
     def write_prediction(self, channel_name, time_index, ensemble_index, val):
         """Write prediction data to NetCDF file."""
-        self.prediction_group[channel_name][ensemble_index, time_index] = val
+        self._submit(
+            self.prediction_group, channel_name, (ensemble_index, time_index), val
+        )
 
     def write_time(self, time_index, time):
         """Write time information to NetCDF file."""
-        if self.has_lead_time:
-            self._f["time"][time_index] = time
+        if not self.asynchronous:
+            self._write(self._f["time"], time_index, self._time_value(time))
+            return
+        self._raise_error()
+        if self._thread is None:
+            raise RuntimeError("Cannot write to a closed NetCDFWriter")
+        self._queue.put((None, "time", time_index, time))
+
+    def _writer_loop(self):
+        """Background thread: drain the queue in batches and write them."""
+        while True:
+            items = [self._queue.get()]
+            try:
+                while True:
+                    items.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            stop = items[-1] is None
+            if stop:
+                items.pop()
+            try:
+                if self._error is None:
+                    self._write_batch(items)
+            except Exception as e:  # re-raised in the calling thread
+                self._error = e
+            finally:
+                for _ in range(len(items) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, items):
+        """Write queued items, merging consecutive indices of the same variable.
+
+        Predictions are merged along the ensemble dimension and inputs/truth along
+        the time dimension. Items with the same index keep their submission order,
+        so the last write wins.
+        """
+        runs = {}
+        for group, channel_name, index, val in items:
+            if group is None:
+                self._write(self._f["time"], index, self._time_value(val))
+                continue
+            if isinstance(index, tuple):
+                # prediction: (ensemble_index, time_index)
+                key = (id(group), channel_name, index[1])
+                position = index[0]
+            else:
+                key = (id(group), channel_name)
+                position = index
+            runs.setdefault(key, (group, []))[1].append((position, val))
+
+        for key, (group, values) in runs.items():
+            variable = group[key[1]]
+            values.sort(key=lambda item: item[0])
+            start = 0
+            while start < len(values):
+                stop = start + 1
+                while stop < len(values) and values[stop][0] == values[stop - 1][0] + 1:
+                    stop += 1
+                first = values[start][0]
+                block = slice(first, first + stop - start)
+                index = (block, key[2]) if len(key) == 3 else block
+                self._write(
+                    variable, index, np.stack([v for _, v in values[start:stop]])
+                )
+                start = stop
+
+    def _raise_error(self):
+        """Re-raise an error from the background thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Asynchronous NetCDF write failed") from error
+
+    def flush(self):
+        """Wait until all queued writes are written."""
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Write all queued data and stop the background thread.
+
+        The underlying dataset is not closed, as it is owned by the caller.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ZarrWriter(NetCDFWriter):
+    """Zarr Writer
+
+    Writes the same layout as :class:`NetCDFWriter` to a zarr group, with
+    xarray-compatible dimension names. The unlimited ``time`` and ``ensemble``
+    dimensions grow as data is written.
+
+    Parameters
+    ----------
+    f : zarr.Group
+        Group opened for writing.
+    lat : np.ndarray
+        Latitudes with shape (y, x).
+    lon : np.ndarray
+        Longitudes with shape (y, x).
+    input_channels : list
+        Input channel descriptions with ``name`` and ``level`` attributes.
+    output_channels : list
+        Output channel descriptions with ``name`` and ``level`` attributes.
+    has_lead_time : bool, optional
+        Whether times are stored as lead time strings. Default is False.
+    asynchronous : bool, optional
+        Whether to write from a background thread. Default is False.
+    max_queue_size : int, optional
+        Maximum number of queued writes in asynchronous mode. Default is 64.
+    chunk_sizes : Optional[dict], optional
+        Chunk size of the data variables per dimension name. Dimensions not listed
+        use 1 for ``ensemble`` and ``time`` and the full extent for ``y`` and ``x``.
+        Default is None, which uses these defaults for all dimensions.
+    compression : Optional[dict], optional
+        Extra keyword arguments for the creation of the data variables, e.g.
+        ``dict(compressor=numcodecs.Blosc())``. Default is None.
+    """
+
+    def __init__(
+        self,
+        f,
+        lat,
+        lon,
+        input_channels,
+        output_channels,
+        has_lead_time=False,
+        asynchronous=False,
+        max_queue_size=64,
+        chunk_sizes=None,
+        compression=None,
+    ):
+        self._f = f
+        self.has_lead_time = has_lead_time
+        self.chunk_sizes = {} if chunk_sizes is None else chunk_sizes
+        self.compression = compression
+
+        if lat.shape != lon.shape:
+            raise ValueError("lat and lon must have the same shape")
+        self._grid_shape = lat.shape
+
+        for name, values, standard_name, units in (
+            ("lat", lat, "latitude", "degrees_north"),
+            ("lon", lon, "longitude", "degrees_east"),
+        ):
+            v = f.create_dataset(name, data=np.asarray(values, dtype="f4"))
+            v.attrs.update(
+                {
+                    "_ARRAY_DIMENSIONS": ["y", "x"],
+                    "standard_name": standard_name,
+                    "units": units,
+                }
+            )
+
+        if has_lead_time:
+            v = f.create_dataset("time", shape=(0,), chunks=(1024,), dtype=str)
         else:
-            time_v = self._f["time"]
-            self._f["time"][time_index] = cftime.date2num(
-                time, time_v.units, time_v.calendar
+            v = f.create_dataset("time", shape=(0,), chunks=(1024,), dtype="i8")
+            v.attrs.update(
+                {"calendar": "standard", "units": "hours since 1990-01-01 00:00:00"}
+            )
+        v.attrs["_ARRAY_DIMENSIONS"] = ["time"]
+
+        self.truth_group = f.require_group("truth")
+        self.prediction_group = f.require_group("prediction")
+        self.input_group = f.require_group("input")
+
+        for variable in output_channels:
+            name = variable.name + variable.level
+            self._create_variable(self.truth_group, name, ("time", "y", "x"))
+            self._create_variable(
+                self.prediction_group, name, ("ensemble", "time", "y", "x")
             )
+        for variable in input_channels:
+            name = variable.name + variable.level
+            self._create_variable(self.input_group, name, ("time", "y", "x"))
+
+        self._start_writer(asynchronous, max_queue_size)
+
+    def _create_variable(self, group, name, dimensions):
+        """Create an empty data variable that grows along the unlimited dimensions."""
+        shape = tuple(0 for _ in dimensions[:-2]) + tuple(self._grid_shape)
+        v = group.create_dataset(
+            name,
+            shape=shape,
+            chunks=self._chunks(dimensions),
+            dtype="f4",
+            fill_value=np.nan,
+            **(self.compression or {}),
+        )
+        v.attrs["_ARRAY_DIMENSIONS"] = list(dimensions)
+
+    def _write(self, variable, index, val):
+        """Grow `variable` to contain `index`, then write `val` to it."""
+        indices = index if isinstance(index, tuple) else (index,)
+        shape = list(variable.shape)
+        for axis, i in enumerate(indices):
+            stop = i.stop if isinstance(i, slice) else i + 1
+            shape[axis] = max(shape[axis], stop)
+        if tuple(shape) != tuple(variable.shape):
+            variable.resize(tuple(shape))
+        variable[index] = val
+
+    def _time_value(self, time):
+        """Value stored in the time variable for `time`."""
+        if self.has_lead_time:
+            return time
+        attrs = self._f["time"].attrs
+        return cftime.date2num(time, attrs["units"], attrs["calendar"])
 
 
 ############################################################################
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 from .deterministic_sampler import deterministic_sampler
+from .sampler_engine import EDMSamplerEngine
 from .stochastic_sampler import stochastic_sampler
 from .utils import (
     EasyDict,
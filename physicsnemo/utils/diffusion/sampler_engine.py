@@ -0,0 +1,425 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+import torch
+from torch import Tensor
+
+from physicsnemo.models.diffusion import EDMPrecond
+from physicsnemo.utils.patching import GridPatching2D
+
+
+class EDMSamplerEngine:
+    r"""
+    Reusable EDM sampler (Algorithm 2) with preallocated state, for repeated
+    generation of samples with the same shapes, such as ensemble generation.
+
+    The engine computes the same updates as
+    :func:`~physicsnemo.utils.diffusion.stochastic_sampler`, but the noise level
+    schedule and the churn of every step are computed once, and the sampler state
+    is kept in preallocated float32 buffers that are updated in place. The buffers,
+    the schedule and the conditioning buffers are reused by all the calls with the
+    same network, shapes and device.
+
+    Each denoising step reads its noise levels from a static buffer, so a step
+    has static shapes and can be compiled with ``torch.compile`` or captured
+    in a CUDA graph (see ``capture``).
+
+    Parameters
+    ----------
+    num_steps : int, optional
+        Number of time steps for the sampler. By default 18.
+    sigma_min : float, optional
+        Minimum noise level. By default 0.002.
+    sigma_max : float, optional
+        Maximum noise level. By default 800.
+    rho : float, optional
+        Exponent used in the time step discretization. By default 7.
+    solver : Literal["heun", "euler"], optional
+        ``"heun"`` applies a 2nd order correction on every step but the last one,
+        ``"euler"`` only evaluates the network once per step. By default
+        ``"heun"``.
+    S_churn : float, optional
+        Churn parameter controlling the level of noise added in each step. By
+        default 0.
+    S_min : float, optional
+        Minimum time step for applying churn. By default 0.
+    S_max : float, optional
+        Maximum time step for applying churn. By default ``float("inf")``.
+    S_noise : float, optional
+        Noise scaling factor applied during the churn step. By default 1.
+    patching : Optional[GridPatching2D], optional
+        A patching utility for patch-based diffusion. The patches of the
+        conditioning are extracted once per call and, unless the steps are
+        captured, the positional embeddings of the patches are selected once per
+        call. By default ``None``, in which case non-patched diffusion is used.
+    amp_dtype : Optional[torch.dtype], optional
+        If given, the network is evaluated under ``torch.autocast`` with this
+        dtype, while the sampler state stays in float32. By default ``None``.
+    capture : Literal["none", "compile", "cuda_graph"], optional
+        How the denoising steps are executed. ``"compile"`` compiles the step
+        with ``torch.compile``. ``"cuda_graph"`` runs each kind of step (Heun
+        and Euler) once eagerly as a warm-up, then captures it in a CUDA graph
+        and replays the graph for the following steps; it requires a CUDA
+        device, and a random number generator that can be used outside of the
+        graph. By default ``"none"``.
+
+    Note
+    ----
+    With ``solver="heun"``, the engine generates the same samples as
+    :func:`~physicsnemo.utils.diffusion.stochastic_sampler` for the same
+    arguments and random number generator. It draws the churn noise at every step
+    only if churn is applied to at least one step, to consume the random number
+    generator in the same way.
+
+    Example
+    -------
+    >>> import torch
+    >>> from physicsnemo.utils.diffusion import EDMSamplerEngine
+    >>> class Net(torch.nn.Module):
+    ...     sigma_min, sigma_max = 0.0, float("inf")
+    ...     def round_sigma(self, sigma):
+    ...         return torch.as_tensor(sigma)
+    ...     def forward(self, x, img_lr, sigma, class_labels=None):
+    ...         return 0.9 * x
+    >>> engine = EDMSamplerEngine(num_steps=4)
+    >>> latents = torch.randn(2, 3, 8, 8)
+    >>> img_lr = torch.randn(2, 1, 8, 8)
+    >>> engine(Net(), latents, img_lr).shape
+    torch.Size([2, 3, 8, 8])
+    """
+
+    def __init__(
+        self,
+        num_steps: int = 18,
+        sigma_min: float = 0.002,
+        sigma_max: float = 800,
+        rho: float = 7,
+        solver: Literal["heun", "euler"] = "heun",
+        S_churn: float = 0,
+        S_min: float = 0,
+        S_max: float = float("inf"),
+        S_noise: float = 1,
+        patching: Optional[GridPatching2D] = None,
+        amp_dtype: Optional[torch.dtype] = None,
+        capture: Literal["none", "compile", "cuda_graph"] = "none",
+    ):
+        if solver not in ["heun", "euler"]:
+            raise ValueError(f"Unknown solver {solver}")
+        if capture not in ["none", "compile", "cuda_graph"]:
+            raise ValueError(f"Unknown capture mode {capture}")
+        if patching is not None and not isinstance(patching, GridPatching2D):
+            raise ValueError("patching must be an instance of GridPatching2D.")
+
+        self.num_steps = num_steps
+        self.sigma_min = sigma_min
+        self.sigma_max = sigma_max
+        self.rho = rho
+        self.solver = solver
+        self.S_churn = S_churn
+        self.S_min = S_min
+        self.S_max = S_max
+        self.S_noise = S_noise
+        self.patching = patching
+        self.amp_dtype = amp_dtype
+        self.capture = capture
+
+        self._net = None
+        self._key = None
+        self._compiled_step = None
+        self._graphs: Dict[bool, torch.cuda.CUDAGraph] = {}
+        self._warm: set = set()
+        self._embeddings: List[Tensor] = []
+        self._embedding_index = 0
+
+    def __call__(
+        self,
+        net: torch.nn.Module,
+        latents: Tensor,
+        img_lr: Tensor,
+        class_labels: Optional[Tensor] = None,
+        randn_like: Callable[[Tensor], Tensor] = torch.randn_like,
+        mean_hr: Optional[Tensor] = None,
+        lead_time_label: Optional[Tensor] = None,
+    ) -> Tensor:
+        r"""
+        Generate samples, with the same arguments as
+        :func:`~physicsnemo.utils.diffusion.stochastic_sampler`.
+
+        Parameters
+        ----------
+        net : torch.nn.Module
+            The neural network model that generates denoised images from noisy
+            inputs, see :func:`~physicsnemo.utils.diffusion.stochastic_sampler`
+            for its expected signature and attributes.
+        latents : Tensor
+            The latent variables used as the initial input for the sampler, of
+            shape :math:`(B, C_{out}, H, W)`.
+        img_lr : Tensor
+            Low-resolution input image for conditioning, of shape
+            :math:`(B, C_{lr}, H, W)`.
+        class_labels : Optional[Tensor], optional
+            Class labels for conditional generation. By default ``None``.
+        randn_like : Callable[[Tensor], Tensor], optional
+            Function to generate random noise with the same shape as the input
+            tensor. By default ``torch.randn_like``.
+        mean_hr : Optional[Tensor], optional
+            Optional mean high-resolution images for conditioning, of shape
+            :math:`(B_{hr}, C_{hr}, H, W)` with :math:`B_{hr}` equal to 1 or
+            :math:`B`. By default ``None``.
+        lead_time_label : Optional[Tensor], optional
+            Optional lead time labels. By default ``None``.
+
+        Returns
+        -------
+        Tensor
+            The generated samples, with the shape and dtype of ``latents``.
+        """
+        # Safety check: if patching is used then img_lr and latents must have same
+        # height and width, otherwise there is mismatch in the number
+        # of patches extracted to form the final batch_size.
+        if self.patching:
+            if img_lr.shape[-2:] != latents.shape[-2:]:
+                raise ValueError(
+                    f"img_lr and latents must have the same height and width, "
+                    f"but found {img_lr.shape[-2:]} vs {latents.shape[-2:]}. "
+                )
+        # img_lr and latents must also have the same batch_size, otherwise mismatch
+        # when processed by the network
+        if img_lr.shape[0] != latents.shape[0]:
+            raise ValueError(
+                f"img_lr and latents must have the same batch size, but found "
+                f"{img_lr.shape[0]} vs {latents.shape[0]}."
+            )
+
+        # conditioning = [mean_hr, img_lr]
+        x_lr = img_lr
+        if mean_hr is not None:
+            if mean_hr.shape[-2:] != img_lr.shape[-2:]:
+                raise ValueError(
+                    f"mean_hr and img_lr must have the same height and width, "
+                    f"but found {mean_hr.shape[-2:]} vs {img_lr.shape[-2:]}."
+                )
+            x_lr = torch.cat((mean_hr.expand(x_lr.shape[0], -1, -1, -1), x_lr), dim=1)
+        if self.patching:
+            # (batch_size * patch_num, C_in + C_out, patch_shape_y, patch_shape_x)
+            x_lr = self.patching.apply(input=x_lr, additional_input=img_lr)
+
+        self._setup(net, latents, x_lr, class_labels, lead_time_label)
+        self._x_lr.copy_(x_lr)
+        if isinstance(class_labels, Tensor):
+            self._class_labels.copy_(class_labels)
+        else:
+            self._class_labels = class_labels
+        if isinstance(lead_time_label, Tensor):
+            self._lead_time_label.copy_(lead_time_label)
+        else:
+            self._lead_time_label = lead_time_label
+        self._embeddings = []
+
+        # Main sampling loop
+        torch.mul(latents, self._t_steps[0], out=self._x)
+        for i in range(self.num_steps):
+            if self._draw_noise:
+                noise = randn_like(self._x)
+                if self._churn[i]:
+                    # Increase noise temporarily
+                    self._x.add_(noise.mul_(self._noise_scales[i]))
+            self._scalars.copy_(self._schedule[i])
+            self._run_step(self.solver == "heun" and i < self.num_steps - 1)
+        return self._x.to(latents.dtype, copy=True)
+
+    def _setup(
+        self,
+        net: torch.nn.Module,
+        latents: Tensor,
+        x_lr: Tensor,
+        class_labels: Optional[Tensor],
+        lead_time_label: Optional[Tensor],
+    ) -> None:
+        """Build the schedule and the buffers, unless they match the arguments"""
+
+        def spec(value: Any) -> Any:
+            if isinstance(value, Tensor):
+                return (value.shape, value.dtype, value.device, value.stride())
+            return None
+
+        key = (
+            spec(latents),
+            spec(x_lr),
+            spec(class_labels),
+            spec(lead_time_label),
+            torch.is_inference_mode_enabled(),
+        )
+        if net is self._net and key == self._key:
+            return
+        if self.capture == "cuda_graph" and latents.device.type != "cuda":
+            raise ValueError("CUDA graph capture requires latents on a CUDA device.")
+
+        self._net = net
+        self._batch_size = latents.shape[0]
+        self._compiled_step = None
+        self._graphs = {}
+        self._warm = set()
+
+        # Time step discretization, adjusted to the noise levels supported by
+        # the network
+        device = latents.device
+        sigma_min = max(self.sigma_min, net.sigma_min)
+        sigma_max = min(self.sigma_max, net.sigma_max)
+        step_indices = torch.arange(self.num_steps, device=device)
+        t_steps = (
+            sigma_max ** (1 / self.rho)
+            + step_indices
+            / (self.num_steps - 1)
+            * (sigma_min ** (1 / self.rho) - sigma_max ** (1 / self.rho))
+        ) ** self.rho
+        t_steps = torch.cat(
+            [net.round_sigma(t_steps), torch.zeros_like(t_steps[:1])]
+        )  # t_N = 0
+
+        # Noise levels of every step: [t_hat, t_next, t_next - t_hat]
+        schedule, self._churn, self._noise_scales = [], [], []
+        for t_cur, t_next in zip(t_steps[:-1].tolist(), t_steps[1:]):
+            gamma = (
+                self.S_churn / self.num_steps
+                if self.S_min <= t_cur <= self.S_max
+                else 0
+            )
+            t_cur = t_steps.new_tensor(t_cur)
+            t_hat = net.round_sigma(t_cur + gamma * t_cur)
+            self._churn.append(gamma > 0)
+            self._noise_scales.append((t_hat**2 - t_cur**2).sqrt() * self.S_noise)
+            schedule.append(torch.stack([t_hat, t_next, t_next - t_hat]))
+        self._t_steps = t_steps.to(torch.float32)
+        self._schedule = torch.stack(schedule).to(torch.float32)
+        self._scalars = torch.empty_like(self._schedule[0])
+        self._draw_noise = any(self._churn)
+
+        # Sampler state and conditioning
+        state = torch.empty_like(latents, dtype=torch.float32)
+        self._x = state
+        self._x_next = torch.empty_like(state)
+        self._d_cur = torch.empty_like(state)
+        self._d_prime = torch.empty_like(state)
+        self._x_lr = torch.empty_like(x_lr)
+        self._class_labels = (
+            torch.empty_like(class_labels) if isinstance(class_labels, Tensor) else None
+        )
+        self._lead_time_label = (
+            torch.empty_like(lead_time_label)
+            if isinstance(lead_time_label, Tensor)
+            else None
+        )
+        self._key = key
+
+    def _select_embedding(self, emb: Tensor) -> Tensor:
+        """Select the positional embeddings of the patches, cached in eager mode"""
+        if self.capture != "none":
+            return self.patching.apply(emb.expand(self._batch_size, -1, -1, -1))
+        # The network selects the same embeddings in every evaluation, in the
+        # same order
+        index = self._embedding_index
+        self._embedding_index += 1
+        if index == len(self._embeddings):
+            self._embeddings.append(
+                self.patching.apply(emb.expand(self._batch_size, -1, -1, -1))
+            )
+        return self._embeddings[index]
+
+    def _denoise(self, x: Tensor, sigma: Tensor) -> Tensor:
+        """Evaluate the network on the current state"""
+        net = self._net
+        optional_args = {}
+        if self._lead_time_label is not None:
+            optional_args["lead_time_label"] = self._lead_time_label
+        if self.patching:
+            # (batch_size * patch_num, C_out, patch_shape_y, patch_shape_x)
+            x = self.patching.apply(input=x)
+            optional_args["embedding_selector"] = self._select_embedding
+            self._embedding_index = 0
+
+        with torch.autocast(
+            device_type=x.device.type,
+            dtype=self.amp_dtype,
+            enabled=self.amp_dtype is not None,
+            cache_enabled=False,
+        ):
+            if isinstance(net, EDMPrecond):
+                # Conditioning info is passed as keyword arg
+                denoised = net(
+                    x,
+                    sigma,
+                    condition=self._x_lr,
+                    class_labels=self._class_labels,
+                    **optional_args,
+                )
+            else:
+                denoised = net(
+                    x, self._x_lr, sigma, self._class_labels, **optional_args
+                )
+
+        if self.patching:
+            # Un-patch the denoised image
+            # (batch_size, C_out, img_shape_y, img_shape_x)
+            denoised = self.patching.fuse(input=denoised, batch_size=self._batch_size)
+        return denoised
+
+    def _step(self, heun: bool) -> None:
+        """Denoising step from the noise level t_hat to t_next, in place"""
+        x, x_next, d_cur, d_prime = self._x, self._x_next, self._d_cur, self._d_prime
+        t_hat, t_next, h = self._scalars[0], self._scalars[1], self._scalars[2]
+
+        # Euler step
+        denoised = self._denoise(x, t_hat)
+        torch.sub(x, denoised, out=d_cur).div_(t_hat)
+        if not heun:
+            x.add_(d_cur.mul_(h))
+            return
+
+        # Apply 2nd order correction
+        torch.mul(d_cur, h, out=x_next).add_(x)
+        denoised = self._denoise(x_next, t_next)
+        torch.sub(x_next, denoised, out=d_prime).div_(t_next)
+        x.add_(d_cur.mul_(0.5).add_(d_prime.mul_(0.5)).mul_(h))
+
+    def _run_step(self, heun: bool) -> None:
+        """Run a denoising step with the capture mode of the engine"""
+        if self.capture == "compile":
+            if self._compiled_step is None:
+                self._compiled_step = torch.compile(self._step)
+            self._compiled_step(heun)
+            return
+        if self.capture == "none":
+            self._step(heun)
+            return
+
+        if heun not in self._graphs:
+            if heun not in self._warm:
+                # Warm up on a side stream before the capture
+                stream = torch.cuda.Stream()
+                stream.wait_stream(torch.cuda.current_stream())
+                with torch.cuda.stream(stream):
+                    self._step(heun)
+                torch.cuda.current_stream().wait_stream(stream)
+                self._warm.add(heun)
+                return
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                self._step(heun)
+            self._graphs[heun] = graph
+        self._graphs[heun].replay()
@@ -501,6 +501,107 @@ def shuffle_array(
     return points_selected, idx
 
 
+def pad_ragged(
+    tensors: Sequence[torch.Tensor], pad_value: float = 0.0
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Stack tensors of different lengths into one padded tensor.
+
+    This is the entry point for batched preprocessing: per sample point
+    clouds of different sizes become one (batch, max_points, ...) tensor
+    plus a mask of the real entries.
+
+    Args:
+        tensors: Sequence of tensors of shape (n_points_i, ...), with equal
+            trailing dimensions.
+        pad_value: Value of the padding entries. Defaults to 0.0.
+
+    Returns:
+        Tuple containing:
+        - Padded tensor of shape (batch, max_points, ...)
+        - Boolean mask of shape (batch, max_points), True for real entries
+
+    Examples:
+        >>> import torch
+        >>> padded, valid = pad_ragged([torch.ones(2, 3), torch.ones(1, 3)])
+        >>> padded.shape
+        torch.Size([2, 2, 3])
+        >>> valid.tolist()
+        [[True, True], [True, False]]
+    """
+    padded = torch.nn.utils.rnn.pad_sequence(
+        list(tensors), batch_first=True, padding_value=pad_value
+    )
+    lengths = torch.tensor([t.shape[0] for t in tensors], device=padded.device)
+    valid = torch.arange(padded.shape[1], device=padded.device) < lengths[:, None]
+    return padded, valid
+
+
+def shuffle_array_batched(
+    points: torch.Tensor,
+    n_points: int,
+    valid: torch.Tensor,
+    weights: torch.Tensor | None = None,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Randomly sample points from every row of a padded batch without replacement.
+
+    The batched counterpart of `shuffle_array`: all rows are sampled by one
+    `torch.multinomial` call, and entries masked out by `valid` are never
+    selected.  Batches wider than 2^24 points are sampled row by row with
+    `shuffle_array`.
+
+    Args:
+        points: Padded input tensor of shape (batch, max_points, ...).
+        n_points: Number of points to sample from each row.
+        valid: Boolean mask of shape (batch, max_points) of the entries that
+            may be sampled, e.g. from `pad_ragged`.
+        weights: Optional sampling weights of shape (batch, max_points).
+            If None, uniform weights are used.
+
+    Returns:
+        Tuple containing:
+        - Sampled tensor of shape (batch, n_points, ...)
+        - Indices of the selected points into dimension 1, shape (batch, n_points)
+
+    Raises:
+        ValueError: If a row has fewer valid points than n_points.
+
+    Examples:
+        >>> import torch
+        >>> _ = torch.manual_seed(42)
+        >>> data = torch.arange(8).reshape(2, 4)
+        >>> valid = torch.tensor([[True, True, True, True], [True, True, False, False]])
+        >>> subset, indices = shuffle_array_batched(data, 2, valid)
+        >>> subset.shape
+        torch.Size([2, 2])
+        >>> bool((indices[1] < 2).all())
+        True
+    """
+    n_valid = valid.sum(dim=1)
+    if bool((n_valid < n_points).any()):
+        raise ValueError(
+            f"Requested {n_points} points, but a sample only has {int(n_valid.min())}"
+        )
+
+    if weights is None:
+        weights = valid.to(torch.float32)
+    else:
+        weights = torch.where(valid, weights, torch.zeros_like(weights))
+
+    if points.shape[1] <= 2**24:
+        idx = torch.multinomial(weights, n_points, replacement=False)
+    else:
+        # Multinomial can't take more than 2^24 columns, so sample row by row:
+        idx = []
+        for row_weights, row_valid in zip(weights, valid):
+            candidates = row_valid.nonzero()[:, 0]
+            _, row_idx = shuffle_array(candidates, n_points, row_weights[candidates])
+            idx.append(candidates[row_idx])
+        idx = torch.stack(idx)
+
+    batch_idx = torch.arange(points.shape[0], device=points.device)[:, None]
+    return points[batch_idx, idx], idx
+
+
 def shuffle_array_without_sampling(
     arr: torch.Tensor,
 ) -> tuple[torch.Tensor, torch.Tensor]:
@@ -19,15 +19,17 @@ import json
 import logging
 import os
 import re
+import threading
 import urllib.request
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import filelock
 import fsspec
 import fsspec.implementations.cached
 import fsspec.utils
 import requests
-import s3fs
 from tqdm import tqdm
 
 logger = logging.getLogger(__name__)
@@ -46,6 +48,10 @@ def _cache_fs(fs):
 
 def _get_fs(path):
     if path.startswith("s3://"):
+        # Imported lazily, s3fs (and botocore) take a large share of the
+        # import time of physicsnemo
+        import s3fs
+
         return s3fs.S3FileSystem(client_kwargs=dict(endpoint_url="https://pbss.s8k.io"))
     else:
         return fsspec.filesystem(fsspec.utils.get_protocol(path))
@@ -150,6 +156,353 @@ def _download_ngc_model_file(path: str, out_path: str, timeout: int = 300) -> st
     return out_path
 
 
+def _remote_info(path: str, timeout: int = 60) -> tuple[int | None, str]:
+    """Size of a remote file (None if unknown or if ranged reads are not
+    supported) and a token that changes whenever the file does.
+
+    Servers that reject HEAD requests (e.g. presigned URLs, which are only
+    signed for GET) give an unknown size and an empty token, so the file is
+    downloaded in a single stream.
+    """
+    if urllib.parse.urlparse(path).scheme in ("http", "https"):
+        response = requests.head(path, allow_redirects=True, timeout=timeout)
+        if response.status_code >= 400 and response.status_code != 404:
+            return None, ""
+        response.raise_for_status()
+        headers = response.headers
+        size = headers.get("Content-Length")
+        if size is None or headers.get("Accept-Ranges") != "bytes":
+            size = None
+        version = headers.get("ETag") or headers.get("Last-Modified") or ""
+        return (int(size) if size is not None else None), f"{version}:{size}"
+
+    fs = fsspec.filesystem(fsspec.utils.get_protocol(path))
+    info = fs.info(path)
+    if info.get("type") == "directory":
+        raise IsADirectoryError(f"{path} is a directory")
+    version = [
+        info.get(key)
+        for key in ("ETag", "etag", "LastModified", "mtime", "last_modified", "size")
+    ]
+    return info.get("size"), json.dumps(version, default=str)
+
+
+def _read_range(path: str, start: int, end: int, timeout: int = 60) -> bytes:
+    """Read bytes ``[start, end)`` of a remote file."""
+    if urllib.parse.urlparse(path).scheme in ("http", "https"):
+        headers = {"Range": f"bytes={start}-{end - 1}"}
+        response = requests.get(path, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise IOError(f"Server ignored the range request for {path}")
+        return response.content
+
+    fs = fsspec.filesystem(fsspec.utils.get_protocol(path))
+    return fs.cat_file(path, start=start, end=end)
+
+
+def _download_stream(path: str, out_path: str, timeout: int = 60) -> None:
+    """Download a remote file in a single stream."""
+    if urllib.parse.urlparse(path).scheme in ("http", "https"):
+        with requests.get(path, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(out_path, "wb") as output:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    output.write(chunk)
+    else:
+        fs = fsspec.filesystem(fsspec.utils.get_protocol(path))
+        fs.get(path, out_path)
+
+
+def _sha256sum(file_path: str | Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+class DownloadCache:
+    """Node-shared cache of remote files.
+
+    Entries are keyed by the remote path together with its version (ETag,
+    modification time and size), so a remote file that is overwritten gets a
+    new entry rather than a stale copy. A file lock per entry makes a single
+    process download each file while the others wait and then reuse it, so
+    all the ranks of a node can share one cache directory.
+
+    Files whose size is known are downloaded as ranged chunks on a thread
+    pool, written in place into a ``.part`` file. The completed chunks are
+    recorded next to it, so a download that failed (or whose process died)
+    resumes where it stopped on the next call. Downloads are checked against
+    the remote size, and against ``sha256`` when one is given, before being
+    published.
+
+    With ``max_size`` set, the least recently used entries are removed after
+    each download until the cache fits, skipping entries being downloaded.
+
+    If the remote file cannot be reached, the most recently downloaded entry of
+    the same path is used instead, so cached files can be opened offline.
+
+    Args:
+        cache_dir (str | Path): Directory holding the cache, created if needed.
+        max_size (int | None, optional): Maximum total size of the cache in
+            bytes. Defaults to None (unbounded).
+        chunk_size (int, optional): Size of the ranged reads. Defaults to 64 MiB.
+        num_workers (int, optional): Number of concurrent ranged reads.
+            Defaults to 8.
+        retries (int, optional): Number of attempts per chunk. Defaults to 3.
+        timeout (float, optional): Time to wait for another process's download,
+            in seconds, -1 to wait forever. Defaults to -1.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_size: int | None = None,
+        chunk_size: int = 64 << 20,
+        num_workers: int = 8,
+        retries: int = 3,
+        timeout: float = -1,
+    ):
+        if max_size is not None and max_size <= 0:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.num_workers = num_workers
+        self.retries = retries
+        self.timeout = timeout
+
+    def _lock(self, key: str) -> filelock.FileLock:
+        return filelock.FileLock(
+            str(self.cache_dir / f"{key}.lock"), timeout=self.timeout
+        )
+
+    def get(self, path: str, sha256: str | None = None) -> str:
+        """Local path of the remote file ``path``, downloading it if needed.
+
+        Args:
+            path (str): Remote file path or URL.
+            sha256 (str | None, optional): Expected SHA-256 hex digest of the
+                file. Defaults to None (not checked).
+
+        Raises:
+            IOError: If the downloaded file does not match the remote size or
+                ``sha256``.
+
+        Returns:
+            str: Path of the cached file.
+        """
+        try:
+            size, version = _remote_info(path)
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            OSError,
+        ) as error:
+            if isinstance(error, (IsADirectoryError, FileNotFoundError)):
+                raise
+            entry = self._latest_entry(path, sha256)
+            if entry is None:
+                raise
+            logger.warning(
+                "Could not reach %s (%s), opening from cache: %s", path, error, entry
+            )
+            os.utime(entry)
+            return str(entry)
+
+        key = hashlib.sha256(f"{path}\n{version}".encode()).hexdigest()
+        entry = self.cache_dir / key
+
+        if not entry.exists():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with self._lock(key):
+                # Another process may have downloaded it while we waited
+                if not entry.exists():
+                    logger.debug("Downloading %s to cache: %s", path, entry)
+                    self._download(path, entry, size, sha256)
+            if self.max_size is not None:
+                self.evict(keep=entry)
+        else:
+            logger.debug("Opening from cache: %s", entry)
+
+        # Mark this entry as recently used
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            # Evicted by another process in the meantime
+            return self.get(path, sha256)
+        return str(entry)
+
+    def _latest_entry(self, path: str, sha256: str | None = None) -> Path | None:
+        """Most recently downloaded entry of the remote file ``path``, if any."""
+        latest = None
+        if not self.cache_dir.exists():
+            return latest
+        for source in self.cache_dir.glob("*.source"):
+            try:
+                if source.read_text() != path:
+                    continue
+                downloaded = source.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            entry = source.with_suffix("")
+            if not entry.exists() or (latest is not None and downloaded <= latest[0]):
+                continue
+            if sha256 is not None and _sha256sum(entry) != sha256:
+                continue
+            latest = (downloaded, entry)
+        return latest[1] if latest is not None else None
+
+    def _download(
+        self, path: str, entry: Path, size: int | None, sha256: str | None
+    ) -> None:
+        part = entry.with_name(f"{entry.name}.part")
+        progress_file = entry.with_name(f"{entry.name}.part.json")
+
+        if size is None:
+            _download_stream(path, part)
+        else:
+            self._download_chunks(path, part, progress_file, size)
+
+        error = None
+        if size is not None and os.path.getsize(part) != size:
+            error = f"Size mismatch downloading {path}"
+        elif sha256 is not None and _sha256sum(part) != sha256:
+            error = f"Checksum mismatch downloading {path}"
+        if error is not None:
+            # Start from scratch next time
+            part.unlink()
+            progress_file.unlink(missing_ok=True)
+            raise IOError(error)
+
+        # Remote path of the entry, to find it when the remote is unreachable
+        entry.with_name(f"{entry.name}.source").write_text(path)
+        os.replace(part, entry)
+        progress_file.unlink(missing_ok=True)
+
+    def _download_chunks(
+        self, path: str, part: Path, progress_file: Path, size: int
+    ) -> None:
+        num_chunks = -(-size // self.chunk_size)
+        layout = {"size": size, "chunk_size": self.chunk_size}
+
+        # Resume a previous partial download of the same file
+        done = set()
+        try:
+            progress = json.loads(progress_file.read_text())
+            if part.exists() and progress["layout"] == layout:
+                done = set(progress["done"])
+        except (OSError, ValueError, KeyError):
+            pass
+        if done:
+            logger.debug("Resuming download of %s", path)
+
+        progress_lock = threading.Lock()
+        fd = os.open(part, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+
+            def _fetch(index: int) -> None:
+                start = index * self.chunk_size
+                end = min(size, start + self.chunk_size)
+                data = self._read_chunk(path, start, end, self.retries)
+                os.pwrite(fd, data, start)
+                # Chunks are only recorded once written, a crash loses at
+                # most the chunks in flight
+                with progress_lock:
+                    done.add(index)
+                    progress_file.write_text(
+                        json.dumps({"layout": layout, "done": sorted(done)})
+                    )
+
+            todo = [index for index in range(num_chunks) if index not in done]
+            with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+                # Consume the results to raise the first error
+                list(executor.map(_fetch, todo))
+        finally:
+            os.close(fd)
+
+    def _read_chunk(self, path: str, start: int, end: int, attempts: int) -> bytes:
+        try:
+            data = _read_range(path, start, end)
+            if len(data) != end - start:
+                raise IOError(f"Short read downloading {path}")
+            return data
+        except Exception:
+            if attempts <= 1:
+                raise
+            logger.debug("Retrying bytes %d-%d of %s", start, end, path)
+            return self._read_chunk(path, start, end, attempts - 1)
+
+    def size(self) -> int:
+        """Total size of the cached files in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """Modification time, size and path of the published entries."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.iterdir():
+            if "." in path.name:
+                # Locks and partial downloads
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self, keep: str | Path | None = None) -> None:
+        """Remove least recently used entries until the cache fits ``max_size``.
+
+        Args:
+            keep (str | Path | None, optional): Cached file that must not be
+                evicted. Defaults to None.
+        """
+        if self.max_size is None:
+            return
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            if keep is not None and path == Path(keep):
+                continue
+            lock = self._lock(path.name)
+            try:
+                lock.acquire(timeout=0)
+            except filelock.Timeout:
+                continue
+            try:
+                path.unlink(missing_ok=True)
+                path.with_name(f"{path.name}.source").unlink(missing_ok=True)
+                total -= size
+            finally:
+                lock.release()
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+            path.with_name(f"{path.name}.source").unlink(missing_ok=True)
+
+
+def _download_cache(local_cache_path: str | Path = LOCAL_CACHE) -> DownloadCache:
+    """Download cache in ``local_cache_path``, capped to the size in bytes set by
+    the ``PHYSICSNEMO_CACHE_MAX_SIZE`` environment variable, if any."""
+    max_size = os.environ.get("PHYSICSNEMO_CACHE_MAX_SIZE")
+    return DownloadCache(
+        Path(local_cache_path) / "downloads",
+        max_size=int(max_size) if max_size else None,
+    )
+
+
 def _download_cached(
     path: str, recursive: bool = False, local_cache_path: str = LOCAL_CACHE
 ) -> str:
@@ -174,6 +527,13 @@ def _download_cached(
 
     url = urllib.parse.urlparse(path)
 
+    # Single files are downloaded to the shared, chunked download cache
+    if url.scheme in ("s3", "msc", "http", "https") and not recursive:
+        try:
+            return _download_cache(local_cache_path).get(path)
+        except IsADirectoryError:
+            pass
+
     # TODO watch for race condition here
     if not os.path.exists(cache_path):
         logger.debug("Downloading %s to cache: %s", path, cache_path)
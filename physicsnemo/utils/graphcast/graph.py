@@ -15,6 +15,8 @@
 # limitations under the License.
 
 import logging
+from pathlib import Path
+from typing import Dict, Optional, Union
 
 import numpy as np
 import torch
@@ -24,6 +26,7 @@ from torch import Tensor
 from physicsnemo.models.gnn_layers.utils import GraphType
 from physicsnemo.utils.graphcast.graph_backend import DglGraphBackend, PyGGraphBackend
 
+from .graph_cache import graph_cache_key, load_or_build_graph_arrays
 from .graph_utils import (
     get_face_centroids,
     latlon2xyz,
@@ -59,8 +62,19 @@ class Graph:
         of all mesh nodes. It is applicable when a graph transformer is used as the
         processor. If set to 0, this list is not computed. If a message passing
         processor is used, it is forced to 0. By default 0.
+    sparse_khop : bool, optional
+        If True, the k-hop neighborhoods are returned by `create_mesh_graph` as a
+        boolean sparse COO tensor of the node pairs that may attend to each other,
+        instead of a dense N x N mask of the pairs that may not. By default False.
     dtype : torch.dtype, optional
         Data type of the graph, by default torch.float
+    backend : str, optional
+        Graph backend, "dgl" or "pyg", by default "dgl"
+    cache_dir : Union[str, Path, None], optional
+        Directory to cache the graph topology in, i.e. the mesh and the grid2mesh and
+        mesh2grid edges. The topology only depends on the grid and the mesh, so one
+        entry serves every backend and dtype. Processes sharing the directory build
+        each entry once. Not cached if None, by default None
     """
 
     def __init__(
@@ -71,8 +85,11 @@ class Graph:
         khop_neighbors: int = 0,
         dtype=torch.float,
         backend: str = "dgl",
+        cache_dir: Union[str, Path, None] = None,
+        sparse_khop: bool = False,
     ) -> None:
         self.khop_neighbors = khop_neighbors
+        self.sparse_khop = sparse_khop
         self.dtype = dtype
         if backend == "dgl":
             self.backend = DglGraphBackend
@@ -84,20 +101,88 @@ class Graph:
         # flatten lat/lon gird
         self.lat_lon_grid_flat = lat_lon_grid.permute(2, 0, 1).view(2, -1).permute(1, 0)
 
-        # create the multi-mesh
+        # grid2mesh and mesh2grid edges, computed on demand if not cached
+        self.g2m_src = self.g2m_dst = None
+        self.m2g_src = self.m2g_dst = None
+
+        if cache_dir is None:
+            self._set_arrays(self._create_mesh_arrays(mesh_level, multimesh))
+        else:
+
+            def build() -> Dict[str, np.ndarray]:
+                arrays = self._create_mesh_arrays(mesh_level, multimesh)
+                self._set_arrays(arrays)
+                arrays["g2m_src"], arrays["g2m_dst"] = self._g2m_edges()
+                arrays["m2g_src"], arrays["m2g_dst"] = self._m2g_edges()
+                return arrays
+
+            key = graph_cache_key(self.lat_lon_grid_flat.numpy(), mesh_level, multimesh)
+            self._set_arrays(load_or_build_graph_arrays(cache_dir, key, build))
+
+    @staticmethod
+    def _create_mesh_arrays(mesh_level: int, multimesh: bool) -> Dict[str, np.ndarray]:
+        """Create the vertices, faces and edges of the finest mesh and latent mesh."""
         _meshes = get_hierarchy_of_triangular_meshes_for_sphere(splits=mesh_level)
         finest_mesh = _meshes[-1]  # get the last one in the list of meshes
-        self.finest_mesh_src, self.finest_mesh_dst = faces_to_edges(finest_mesh.faces)
-        self.finest_mesh_vertices = np.array(finest_mesh.vertices)
+        arrays = {}
+        arrays["finest_mesh_src"], arrays["finest_mesh_dst"] = faces_to_edges(
+            finest_mesh.faces
+        )
+        arrays["finest_mesh_vertices"] = np.array(finest_mesh.vertices)
         if multimesh:
             mesh = merge_meshes(_meshes)
-            self.mesh_src, self.mesh_dst = faces_to_edges(mesh.faces)
-            self.mesh_vertices = np.array(mesh.vertices)
+            arrays["mesh_src"], arrays["mesh_dst"] = faces_to_edges(mesh.faces)
+            arrays["mesh_vertices"] = np.array(mesh.vertices)
         else:
             mesh = finest_mesh
-            self.mesh_src, self.mesh_dst = self.finest_mesh_src, self.finest_mesh_dst
-            self.mesh_vertices = self.finest_mesh_vertices
-        self.mesh_faces = mesh.faces
+            arrays["mesh_src"] = arrays["finest_mesh_src"]
+            arrays["mesh_dst"] = arrays["finest_mesh_dst"]
+            arrays["mesh_vertices"] = arrays["finest_mesh_vertices"]
+        arrays["mesh_faces"] = np.asarray(mesh.faces)
+        return arrays
+
+    def _set_arrays(self, arrays: Dict[str, Optional[np.ndarray]]) -> None:
+        """Set the arrays describing the graph topology as attributes."""
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    def _g2m_edges(self):
+        """Source (grid) and destination (mesh) nodes of the grid2mesh edges."""
+        if self.g2m_src is not None:
+            return self.g2m_src, self.g2m_dst
+
+        # get the max edge length of icosphere with max order
+        max_edge_len = max_edge_length(
+            self.finest_mesh_vertices, self.finest_mesh_src, self.finest_mesh_dst
+        )
+
+        # connect each grid node to the mesh nodes within 0.6 of the max edge length
+        cartesian_grid = latlon2xyz(self.lat_lon_grid_flat)
+        n_nbrs = 4
+        neighbors = NearestNeighbors(n_neighbors=n_nbrs).fit(self.mesh_vertices)
+        distances, indices = neighbors.kneighbors(cartesian_grid)
+        connected = distances <= 0.6 * max_edge_len
+        src = np.nonzero(connected)[0]
+        dst = indices[connected]
+        # NOTE this gives 1,618,820 edges, in the paper it is 1,618,746
+        return src, dst
+
+    def _m2g_edges(self):
+        """Source (mesh) and destination (grid) nodes of the mesh2grid edges."""
+        if self.m2g_src is not None:
+            return self.m2g_src, self.m2g_dst
+
+        # connect each grid node to the vertices of the closest mesh face
+        cartesian_grid = latlon2xyz(self.lat_lon_grid_flat)
+        face_centroids = get_face_centroids(self.mesh_vertices, self.mesh_faces)
+        n_nbrs = 1
+        neighbors = NearestNeighbors(n_neighbors=n_nbrs).fit(face_centroids)
+        _, indices = neighbors.kneighbors(cartesian_grid)
+        indices = indices.flatten()
+
+        src = np.asarray(self.mesh_faces)[indices].reshape(-1)
+        dst = np.repeat(np.arange(len(cartesian_grid)), 3)
+        return src, dst
 
     def create_mesh_graph(self, verbose: bool = True) -> GraphType:
         """Create the multimesh graph.
@@ -111,10 +196,12 @@ class Graph:
         -------
         GraphType
             Multimesh graph
+        Tensor
+            k-hop attention mask, see `sparse_khop`, or None if `khop_neighbors` is 0
         """
         mesh_graph = self.backend.create_graph(
-            self.mesh_src,
-            self.mesh_dst,
+            np.array(self.mesh_src),
+            np.array(self.mesh_dst),
             to_bidirected=True,
             add_self_loop=False,
             dtype=torch.int32,
@@ -136,7 +223,12 @@ class Graph:
             mesh_graph.x = mesh_graph.x.to(dtype=self.dtype)
             mesh_graph.edge_attr = mesh_graph.edge_attr.to(dtype=self.dtype)
 
-        if self.khop_neighbors > 0:
+        if self.khop_neighbors > 0 and self.sparse_khop:
+            # Node pairs connected by up to k hops in the original graph.
+            mask = self.backend.khop_adj_all_k(
+                graph=mesh_graph, kmax=self.khop_neighbors, sparse=True
+            )
+        elif self.khop_neighbors > 0:
             # Make a graph whose edges connect the k-hop neighbors of the original graph.
             mask = ~self.backend.khop_adj_all_k(
                 graph=mesh_graph, kmax=self.khop_neighbors
@@ -160,28 +252,11 @@ class Graph:
         GraphType
             Graph2mesh graph.
         """
-        # get the max edge length of icosphere with max order
-
-        max_edge_len = max_edge_length(
-            self.finest_mesh_vertices, self.finest_mesh_src, self.finest_mesh_dst
-        )
-
         # create the grid2mesh bipartite graph
         cartesian_grid = latlon2xyz(self.lat_lon_grid_flat)
-        n_nbrs = 4
-        neighbors = NearestNeighbors(n_neighbors=n_nbrs).fit(self.mesh_vertices)
-        distances, indices = neighbors.kneighbors(cartesian_grid)
-
-        src, dst = [], []
-        for i in range(len(cartesian_grid)):
-            for j in range(n_nbrs):
-                if distances[i][j] <= 0.6 * max_edge_len:
-                    src.append(i)
-                    dst.append(indices[i][j])
-                    # NOTE this gives 1,618,820 edges, in the paper it is 1,618,746
-
+        src, dst = self._g2m_edges()
         g2m_graph = self.backend.create_heterograph(
-            src, dst, ("grid", "g2m", "mesh"), dtype=torch.int32
+            np.array(src), np.array(dst), ("grid", "g2m", "mesh"), dtype=torch.int32
         )
         if self.backend.name == "dgl":
             g2m_graph.srcdata["pos"] = cartesian_grid.to(torch.float32)
@@ -244,16 +319,9 @@ class Graph:
         """
         # create the mesh2grid bipartite graph
         cartesian_grid = latlon2xyz(self.lat_lon_grid_flat)
-        face_centroids = get_face_centroids(self.mesh_vertices, self.mesh_faces)
-        n_nbrs = 1
-        neighbors = NearestNeighbors(n_neighbors=n_nbrs).fit(face_centroids)
-        _, indices = neighbors.kneighbors(cartesian_grid)
-        indices = indices.flatten()
-
-        src = [p for i in indices for p in self.mesh_faces[i]]
-        dst = [i for i in range(len(cartesian_grid)) for _ in range(3)]
+        src, dst = self._m2g_edges()
         m2g_graph = self.backend.create_heterograph(
-            src, dst, ("mesh", "m2g", "grid"), dtype=torch.int32
+            np.array(src), np.array(dst), ("mesh", "m2g", "grid"), dtype=torch.int32
         )  # number of edges is 3,114,720, exactly matches with the paper
 
         if self.backend.name == "dgl":
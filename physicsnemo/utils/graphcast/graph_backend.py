@@ -49,6 +49,21 @@ from physicsnemo.utils.graphcast.graph_utils import (
 )
 
 
+def _sparsity_pattern(adj: Tensor) -> Tensor:
+    """Boolean coalesced sparse COO tensor, i.e. sorted by rows, with the nonzero
+    pattern of a sparse COO tensor."""
+    adj = adj.coalesce()
+    indices = adj.indices()[:, adj.values() != 0]
+    # The indices of a coalesced tensor are valid, sorted and unique
+    return torch.sparse_coo_tensor(
+        indices,
+        torch.ones(indices.shape[1], dtype=torch.bool, device=indices.device),
+        adj.shape,
+        check_invariants=False,
+        is_coalesced=True,
+    )
+
+
 class DglGraphBackend:
     """DGL graph backend."""
 
@@ -97,8 +112,12 @@ class DglGraphBackend:
         return add_node_features(graph, pos)
 
     @staticmethod
-    def khop_adj_all_k(graph: DGLGraph, kmax: int):
-        """Construct the union of k-hop adjacencies up to distance `kmax` for a graph."""
+    def khop_adj_all_k(graph: DGLGraph, kmax: int, sparse: bool = False):
+        """Construct the union of k-hop adjacencies up to distance `kmax` for a graph.
+
+        Returned as a dense [N, N] boolean tensor, or as a boolean coalesced sparse COO
+        tensor if `sparse` is True.
+        """
 
         if not graph.is_homogeneous:
             raise NotImplementedError("only homogeneous graph is supported")
@@ -112,6 +131,8 @@ class DglGraphBackend:
                 # but >= 1.0
                 adj_k = (adj @ adj_k) / min_degree
                 adj_all += adj_k
+        if sparse:
+            return _sparsity_pattern(adj_all)
         return adj_all.to_dense().bool()
 
 
@@ -254,8 +275,12 @@ class PyGGraphBackend:
         return graph
 
     @staticmethod
-    def khop_adj_all_k(graph: PyGData, kmax: int):
-        """Construct the union of k-hop adjacencies up to distance `kmax` for a graph."""
+    def khop_adj_all_k(graph: PyGData, kmax: int, sparse: bool = False):
+        """Construct the union of k-hop adjacencies up to distance `kmax` for a graph.
+
+        Returned as a dense [N, N] boolean tensor, or as a boolean coalesced sparse COO
+        tensor if `sparse` is True.
+        """
 
         from torch_sparse import SparseTensor
 
@@ -282,4 +307,6 @@ class PyGGraphBackend:
             adj_k = adj @ adj_k
             adj_all = adj_all + adj_k
 
+        if sparse:
+            return _sparsity_pattern(adj_all.to_torch_sparse_coo_tensor())
         return adj_all.to_dense().bool()
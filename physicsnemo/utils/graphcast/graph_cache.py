@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""On-disk cache of the GraphCast graph topology."""
+
+import hashlib
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, Union
+
+import filelock
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout or the construction of the cached arrays changes
+GRAPH_CACHE_VERSION = 1
+
+
+def graph_cache_key(lat_lon_grid: np.ndarray, mesh_level: int, multimesh: bool) -> str:
+    """Key of the graph topology built for a lat/lon grid and mesh.
+
+    Parameters
+    ----------
+    lat_lon_grid : np.ndarray
+        Latitudes and longitudes of the grid nodes
+    mesh_level : int
+        Level of the latent mesh
+    multimesh : bool
+        If the latent mesh is a multimesh
+
+    Returns
+    -------
+    str
+        Hexadecimal key
+    """
+    lat_lon_grid = np.ascontiguousarray(lat_lon_grid, dtype=np.float64)
+    return hashlib.sha256(
+        repr(
+            (GRAPH_CACHE_VERSION, int(mesh_level), bool(multimesh), lat_lon_grid.shape)
+        ).encode()
+        + lat_lon_grid.tobytes()
+    ).hexdigest()[:16]
+
+
+def load_or_build_graph_arrays(
+    cache_dir: Union[str, Path],
+    key: str,
+    build_fn: Callable[[], Dict[str, np.ndarray]],
+) -> Dict[str, np.ndarray]:
+    """Load cached graph arrays, building and storing them if they do not exist.
+
+    Each array is stored as a ``.npy`` file in a directory named after the key and
+    loaded memory-mapped, so processes on a node share its pages. A file lock makes
+    one process build the arrays while the other processes wait for it, and the
+    directory is only published once complete.
+
+    Parameters
+    ----------
+    cache_dir : Union[str, Path]
+        Directory to store cached graphs in, should be shared by all processes of
+        a node
+    key : str
+        Key of the graph, see `graph_cache_key`
+    build_fn : Callable[[], Dict[str, np.ndarray]]
+        Function building the arrays if they are not cached
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Read-only arrays
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"graphcast_{key}"
+
+    with filelock.FileLock(str(path) + ".lock"):
+        if not path.is_dir():
+            logger.info(f"Building GraphCast graph cache entry {path}")
+            arrays = build_fn()
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            tmp_path.mkdir()
+            for name, array in arrays.items():
+                np.save(tmp_path / f"{name}.npy", np.asarray(array))
+            os.replace(tmp_path, path)
+
+    return {
+        file.stem: np.load(file, mmap_mode="r") for file in sorted(path.glob("*.npy"))
+    }
@@ -180,92 +180,88 @@ def _two_split_unit_sphere_triangle_faces(
 ) -> TriangularMesh:
     """Splits each triangular face into 4 triangles keeping the orientation."""
 
+    vertices = np.asarray(triangular_mesh.vertices)
+    faces = np.asarray(triangular_mesh.faces)
+    num_vertices = vertices.shape[0]
+
     # Every time we split a triangle into 4 we will be adding 3 extra vertices,
-    # located at the edge centres.
-    # This class handles the positioning of the new vertices, and avoids creating
-    # duplicates.
-    new_vertices_builder = _ChildVerticesBuilder(triangular_mesh.vertices)
-
-    new_faces = []
-    for ind1, ind2, ind3 in triangular_mesh.faces:
-        # Transform each triangular face into 4 triangles,
-        # preserving the orientation.
-        #                    ind3
-        #                   /    \
-        #                /          \
-        #              /      #3       \
-        #            /                  \
-        #         ind31 -------------- ind23
-        #         /   \                /   \
-        #       /       \     #4     /      \
-        #     /    #1     \        /    #2    \
-        #   /               \    /              \
-        # ind1 ------------ ind12 ------------ ind2
-        ind12 = new_vertices_builder.get_new_child_vertex_index((ind1, ind2))
-        ind23 = new_vertices_builder.get_new_child_vertex_index((ind2, ind3))
-        ind31 = new_vertices_builder.get_new_child_vertex_index((ind3, ind1))
-        # Note how each of the 4 triangular new faces specifies the order of the
-        # vertices to preserve the orientation of the original face. As the input
-        # face should always be counter-clockwise as specified in the diagram,
-        # this means child faces should also be counter-clockwise.
-        new_faces.extend(
-            [
-                [ind1, ind12, ind31],  # 1
-                [ind12, ind2, ind23],  # 2
-                [ind31, ind23, ind3],  # 3
-                [ind12, ind23, ind31],  # 4
-            ]
-        )
+    # located at the edge centres. The edges of each face are (ind1, ind2),
+    # (ind2, ind3) and (ind3, ind1), in face order.
+    edges = np.stack([faces, np.roll(faces, -1, axis=1)], axis=-1).reshape(-1, 2)
+    child_vertices, parent_edges = _get_child_vertex_indices(edges, num_vertices)
+    ind12, ind23, ind31 = child_vertices.reshape(-1, 3).T
+    ind1, ind2, ind3 = faces.T
+
+    # Transform each triangular face into 4 triangles,
+    # preserving the orientation.
+    #                    ind3
+    #                   /    \
+    #                /          \
+    #              /      #3       \
+    #            /                  \
+    #         ind31 -------------- ind23
+    #         /   \                /   \
+    #       /       \     #4     /      \
+    #     /    #1     \        /    #2    \
+    #   /               \    /              \
+    # ind1 ------------ ind12 ------------ ind2
+    # Note how each of the 4 triangular new faces specifies the order of the
+    # vertices to preserve the orientation of the original face. As the input
+    # face should always be counter-clockwise as specified in the diagram,
+    # this means child faces should also be counter-clockwise.
+    new_faces = np.stack(
+        [
+            np.stack([ind1, ind12, ind31], axis=-1),  # 1
+            np.stack([ind12, ind2, ind23], axis=-1),  # 2
+            np.stack([ind31, ind23, ind3], axis=-1),  # 3
+            np.stack([ind12, ind23, ind31], axis=-1),  # 4
+        ],
+        axis=1,
+    ).reshape(-1, 3)
+
+    # Position for new vertices is the middle point, between the parent points,
+    # projected to unit sphere. The norm is computed as a dot product, like
+    # `np.linalg.norm` of a single vertex.
+    child_positions = vertices[parent_edges].mean(1)
+    child_positions /= np.sqrt(
+        child_positions[:, None, :] @ child_positions[:, :, None]
+    )[:, 0]
+
     return TriangularMesh(
-        vertices=new_vertices_builder.get_all_vertices(),
-        faces=np.array(new_faces, dtype=np.int32),
+        vertices=np.concatenate([vertices, child_positions]),
+        faces=new_faces.astype(np.int32),
     )
 
 
-class _ChildVerticesBuilder(object):
-    """Bookkeeping of new child vertices added to an existing set of vertices."""
-
-    def __init__(self, parent_vertices):
-        # Because the same new vertex will be required when splitting adjacent
-        # triangles (which share an edge) we keep them in a hash table indexed by
-        # sorted indices of the vertices adjacent to the edge, to avoid creating
-        # duplicated child vertices.
-        self._child_vertices_index_mapping = {}
-        self._parent_vertices = parent_vertices
-        # We start with all previous vertices.
-        self._all_vertices_list = list(parent_vertices)
-
-    def _get_child_vertex_key(self, parent_vertex_indices):
-        return tuple(sorted(parent_vertex_indices))
-
-    def _create_child_vertex(self, parent_vertex_indices):
-        """Creates a new vertex."""
-        # Position for new vertex is the middle point, between the parent points,
-        # projected to unit sphere.
-        child_vertex_position = self._parent_vertices[list(parent_vertex_indices)].mean(
-            0
-        )
-        child_vertex_position /= np.linalg.norm(child_vertex_position)
-
-        # Add the vertex to the output list. The index for this new vertex will
-        # match the length of the list before adding it.
-        child_vertex_key = self._get_child_vertex_key(parent_vertex_indices)
-        self._child_vertices_index_mapping[child_vertex_key] = len(
-            self._all_vertices_list
-        )
-        self._all_vertices_list.append(child_vertex_position)
-
-    def get_new_child_vertex_index(self, parent_vertex_indices):
-        """Returns index for a child vertex, creating it if necessary."""
-        # Get the key to see if we already have a new vertex in the middle.
-        child_vertex_key = self._get_child_vertex_key(parent_vertex_indices)
-        if child_vertex_key not in self._child_vertices_index_mapping:
-            self._create_child_vertex(parent_vertex_indices)
-        return self._child_vertices_index_mapping[child_vertex_key]
-
-    def get_all_vertices(self):
-        """Returns an array with old vertices."""
-        return np.array(self._all_vertices_list)
+def _get_child_vertex_indices(
+    edges: np.ndarray, num_vertices: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Assigns an index to the child vertex at the centre of each edge.
+
+    Because the same new vertex is required when splitting adjacent triangles
+    (which share an edge), edges are identified by the sorted indices of their
+    vertices, so that each unique edge gets one child vertex. Child vertices are
+    numbered after the existing vertices, in order of first appearance of their
+    edge.
+
+    Args:
+      edges: Integer array of shape [num_edges, 2] with the vertex indices of each
+          edge. Shared edges appear once per adjacent face.
+      num_vertices: Number of existing vertices.
+    Returns:
+      Tuple with the child vertex index of each edge, of shape [num_edges], and
+      the parent vertices of each child vertex, of shape [num_child_vertices, 2].
+    """
+    sorted_edges = np.sort(edges, axis=1).astype(np.int64)
+    keys = sorted_edges[:, 0] * num_vertices + sorted_edges[:, 1]
+    _, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    # np.unique orders edges by key, renumber them by first appearance
+    order = np.argsort(first_index, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.shape[0])
+    child_vertices = num_vertices + rank[inverse.reshape(-1)]
+    return child_vertices, edges[first_index[order]]
 
 
 def faces_to_edges(faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
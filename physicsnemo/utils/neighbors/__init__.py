@@ -15,8 +15,23 @@
 # limitations under the License.
 
 
-from .knn import knn
-from .radius_search import radius_search
+from .knn import KNNIndex, KNNIndexCache, build_index, knn
+from .radius_search import (
+    RadiusSearchBlock,
+    radius_graph_csr,
+    radius_search,
+    radius_search_blocks,
+    radius_search_csr,
+)
 
 # This is exclusively for the autodoc to generate the api docs:
-__all__ = ["radius_search"]
+__all__ = [
+    "radius_search",
+    "radius_search_blocks",
+    "radius_search_csr",
+    "radius_graph_csr",
+    "RadiusSearchBlock",
+    "build_index",
+    "KNNIndex",
+    "KNNIndexCache",
+]
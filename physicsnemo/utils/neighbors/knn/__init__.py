@@ -15,4 +15,4 @@
 # limitations under the License.
 
 
-from .knn import knn
+from .knn import KNNIndex, KNNIndexCache, build_index, knn
@@ -24,10 +24,18 @@ if CUML_AVAILABLE:
     import cuml
     import cupy as cp
 
-    @torch.library.custom_op("physicsnemo::knn_cuml", mutates_args=())
-    def knn_impl(
-        points: torch.Tensor, queries: torch.Tensor, k: int = 3
-    ) -> tuple[torch.Tensor, torch.Tensor]:
+    def build_tree(points: torch.Tensor, k: int = 3):
+        """
+        Fit a cuML NearestNeighbors index over ``points``.
+
+        Args:
+            points (torch.Tensor): CUDA points to index, shape (N, D)
+            k (int): Default number of neighbors for the index
+
+        Returns:
+            cuml.neighbors.NearestNeighbors: The fitted index, reusable for
+            any number of queries.
+        """
         # Create a cuml handle to ensure we use the right stream:
         torch_stream = torch.cuda.current_stream()
 
@@ -39,15 +47,33 @@ if CUML_AVAILABLE:
 
         # Use dlpack to move the data without copying between pytorch and cuml:
         points = cp.from_dlpack(points)
-        queries = cp.from_dlpack(queries)
 
         # Construct the knn:
         knn = cuml.neighbors.NearestNeighbors(n_neighbors=k, handle=handle)
         # First pass partitions everything in points to make lookups fast
         knn.fit(points)
 
+        return knn
+
+    def query_tree(
+        tree, queries: torch.Tensor, k: int = 3
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Query a fitted cuML index for the ``k`` nearest neighbors of ``queries``.
+
+        Args:
+            tree (cuml.neighbors.NearestNeighbors): Index from ``build_tree``.
+            queries (torch.Tensor): CUDA query points, shape (M, D)
+            k (int): Number of neighbors
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: indices and distances, each
+            of shape (M, k)
+        """
+        queries = cp.from_dlpack(queries)
+
         # Second pass uses that partition to quickly find neighbors of points in points
-        distance, indices = knn.kneighbors(queries)
+        distance, indices = tree.kneighbors(queries, n_neighbors=k)
 
         # convert back to pytorch:
         distance = torch.from_dlpack(distance)
@@ -56,6 +82,12 @@ if CUML_AVAILABLE:
         # Return torch objects.
         return indices, distance
 
+    @torch.library.custom_op("physicsnemo::knn_cuml", mutates_args=())
+    def knn_impl(
+        points: torch.Tensor, queries: torch.Tensor, k: int = 3
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        return query_tree(build_tree(points, k=k), queries, k=k)
+
     @knn_impl.register_fake
     def _(
         points: torch.Tensor, queries: torch.Tensor, k: int = 3
@@ -73,6 +105,30 @@ if CUML_AVAILABLE:
         return idx_output, dist_output
 else:
 
+    def build_tree(points: torch.Tensor, k: int = 3) -> None:
+        """
+        Dummy implementation for when cuml is not available.
+
+        Raises:
+            ImportError: If cuml is not installed.
+        """
+
+        raise ImportError(
+            "cuml is not installed, can not be used as a backend for a knn search"
+        )
+
+    def query_tree(tree, queries: torch.Tensor, k: int = 3) -> None:
+        """
+        Dummy implementation for when cuml is not available.
+
+        Raises:
+            ImportError: If cuml is not installed.
+        """
+
+        raise ImportError(
+            "cuml is not installed, can not be used as a backend for a knn search"
+        )
+
     def knn_impl(
         points: torch.Tensor,
         queries: torch.Tensor,
@@ -23,16 +23,38 @@ SCIPY_AVAILABLE = check_min_version("scipy", "1.7.0", hard_fail=False)
 if SCIPY_AVAILABLE:
     from scipy.spatial import KDTree
 
-    @torch.library.custom_op("physicsnemo::knn_scipy", mutates_args=())
-    def knn_impl(
-        points: torch.Tensor, queries: torch.Tensor, k: int = 3
+    def build_tree(points: torch.Tensor) -> KDTree:
+        """
+        Build a scipy KDTree over ``points``.
+
+        Args:
+            points (torch.Tensor): CPU points to index, shape (N, D)
+
+        Returns:
+            KDTree: The constructed tree, reusable for any number of queries.
+        """
+        return KDTree(points.detach().numpy())
+
+    def query_tree(
+        tree: KDTree, queries: torch.Tensor, k: int = 3, workers: int = 1
     ) -> tuple[torch.Tensor, torch.Tensor]:
-        # Use dlpack to move the data without copying between pytorch and cuml:
-        points = points.detach().numpy()
+        """
+        Query a prebuilt KDTree for the ``k`` nearest neighbors of ``queries``.
+
+        Args:
+            tree (KDTree): Tree returned by ``build_tree``.
+            queries (torch.Tensor): CPU query points, shape (M, D)
+            k (int): Number of neighbors
+            workers (int): Number of threads scipy uses for the query;
+                -1 uses all available cores.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: indices and distances, each
+            of shape (M, k)
+        """
         queries = queries.detach().numpy()
 
-        interp_func = KDTree(points)
-        distance, indices = interp_func.query(queries, k=k)
+        distance, indices = tree.query(queries, k=k, workers=workers)
 
         # Ensure dtype compatibility: cast distances to the dtype of queries:
         distance = distance.astype(queries.dtype)
@@ -45,9 +67,15 @@ if SCIPY_AVAILABLE:
             queries.shape[0], k
         )
 
+    @torch.library.custom_op("physicsnemo::knn_scipy", mutates_args=())
+    def knn_impl(
+        points: torch.Tensor, queries: torch.Tensor, k: int = 3, workers: int = 1
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        return query_tree(build_tree(points), queries, k=k, workers=workers)
+
     @knn_impl.register_fake
     def _(
-        points: torch.Tensor, queries: torch.Tensor, k: int = 3
+        points: torch.Tensor, queries: torch.Tensor, k: int = 3, workers: int = 1
     ) -> tuple[torch.Tensor, torch.Tensor]:
         if points.device != queries.device:
             raise RuntimeError("points and queries must be on the same device")
@@ -62,10 +90,35 @@ if SCIPY_AVAILABLE:
         return idx_output, dist_output
 else:
 
+    def build_tree(points: torch.Tensor) -> None:
+        """
+        Dummy implementation for when scipy is not available.
+
+        Raises:
+            ImportError: If scipy is not installed.
+        """
+
+        raise ImportError(
+            "scipy is not installed, can not be used as a backend for a knn search"
+        )
+
+    def query_tree(tree, queries: torch.Tensor, k: int = 3, workers: int = 1) -> None:
+        """
+        Dummy implementation for when scipy is not available.
+
+        Raises:
+            ImportError: If scipy is not installed.
+        """
+
+        raise ImportError(
+            "scipy is not installed, can not be used as a backend for a knn search"
+        )
+
     def knn_impl(
         points: torch.Tensor,
         queries: torch.Tensor,
         k: int = 3,
+        workers: int = 1,
     ) -> None:
         """
         Dummy implementation for when scipy is not available.
@@ -74,6 +127,7 @@ else:
             points (torch.Tensor): The points to search in.
             queries (torch.Tensor): The queries to search for.
             k (int): The number of neighbors to search for.
+            workers (int): The number of threads to query with.
 
         Raises:
             ImportError: If scipy is not installed.
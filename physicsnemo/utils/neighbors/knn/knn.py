@@ -14,57 +14,36 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Literal
 
 import torch
 
 from ._cuml_impl import CUML_AVAILABLE
+from ._cuml_impl import build_tree as build_tree_cuml
 from ._cuml_impl import knn_impl as knn_cuml
+from ._cuml_impl import query_tree as query_tree_cuml
 from ._scipy_impl import SCIPY_AVAILABLE
+from ._scipy_impl import build_tree as build_tree_scipy
 from ._scipy_impl import knn_impl as knn_scipy
+from ._scipy_impl import query_tree as query_tree_scipy
 from ._torch_impl import knn_impl as knn_torch
 
 
-def knn(
+def _resolve_backend(
     points: torch.Tensor,
-    queries: torch.Tensor,
-    k: int,
-    backend: Literal["cuml", "torch", "scipy", "auto"] = "auto",
-) -> tuple[torch.Tensor, torch.Tensor]:
+    backend: Literal["cuml", "torch", "scipy", "auto"],
+) -> str:
     """
-    Perform a k-nearest neighbor search on torch tensors.  Can be done with
-    torch directly, or leverage RAPIDS cuML algorithm.
-
-    The "auto" backend will dispatch to the optimal version for the data
-    device of the input tensors.
-
-    Args:
-        points: Tensor of shape (N, 3) containing the points to search from.
-        queries: Tensor of shape (M, 3) containing the points to search for.
-        k: Number of nearest neighbors to return for each query point.
-        backend: Backend to use for the search.
-
-    Returns:
-        indices: Tensor of shape (M, k) containing the indices of the k nearest neighbors for each query point.
-        distances: Tensor of shape (M, k) containing the distances to the k nearest neighbors for each query point.
-
+    Validate ``backend`` and resolve "auto" for the device of ``points``.
     """
-
     if backend not in ["cuml", "torch", "scipy", "auto"]:
         raise ValueError(
             f"`knn` backend must be in ['cuml', 'torch', 'scipy', 'auto'], got {backend=}"
         )
 
-    if points.device != queries.device:
-        raise ValueError(
-            f"`knn` points and queries must be on the same device, got {points.device=} and {queries.device=}"
-        )
-
-    if points.dtype != queries.dtype:
-        raise ValueError(
-            f"`knn` points and queries must have the same dtype, got {points.dtype=} and {queries.dtype=}"
-        )
-
     # cuml is GPU only
     # scip is CPU only.
 
@@ -84,33 +63,318 @@ def knn(
             else:
                 backend = "torch"
 
-    # Cuml foes not support bfloat16:
-    # Autocast to float32:
-    original_dtype = points.dtype
-
-    if points.dtype == torch.bfloat16 and (backend == "cuml" or backend == "scipy"):
-        points = points.to(torch.float32)
-        queries = queries.to(torch.float32)
-
     match backend:
         case "scipy":
             if points.device.type != "cpu":
                 raise ValueError(
                     f"`knn` scipy backend does not support CUDA, got {points.device=}"
                 )
-            method = knn_scipy
         case "cuml":
             if points.device.type != "cuda":
                 raise ValueError(
                     f"`knn` cuml backend does not support CPU, got {points.device=}"
                 )
-            method = knn_cuml
         case "torch":
-            method = knn_torch
+            pass
         case _:
             raise NotImplementedError(f"Unknown backend: {backend}")
 
-    indices, distances = method(points, queries, k)
+    return backend
+
+
+def _check_points_and_queries(points: torch.Tensor, queries: torch.Tensor) -> None:
+    if points.device != queries.device:
+        raise ValueError(
+            f"`knn` points and queries must be on the same device, got {points.device=} and {queries.device=}"
+        )
+
+    if points.dtype != queries.dtype:
+        raise ValueError(
+            f"`knn` points and queries must have the same dtype, got {points.dtype=} and {queries.dtype=}"
+        )
+
+
+class KNNIndex:
+    """
+    A reusable k-nearest neighbor index over a fixed set of points.
+
+    :func:`knn` rebuilds its search structure on every call.  When the same
+    ``points`` are queried many times, build the index once with
+    :func:`build_index` and call :meth:`query` for each batch of queries.
+
+    For the scipy backend the KDTree is built once, and queries can be
+    spread over several threads with ``workers`` (-1 uses every core).  For
+    the cuml backend the NearestNeighbors index is fitted once.  The torch
+    backend is brute force, so it only keeps a reference to the points.
+
+    Args:
+        points: Tensor of shape (N, 3) containing the points to search from.
+        backend: Backend to use for the search.
+        workers: Default number of threads for scipy queries.
+        query_batch_size: If set, queries are processed in chunks of this
+            many points, which bounds the peak memory of a single query.
+    """
+
+    def __init__(
+        self,
+        points: torch.Tensor,
+        backend: Literal["cuml", "torch", "scipy", "auto"] = "auto",
+        workers: int = 1,
+        query_batch_size: int | None = None,
+    ):
+        self.backend = _resolve_backend(points, backend)
+        self.workers = workers
+        self.query_batch_size = query_batch_size
+
+        self.device = points.device
+        self.dtype = points.dtype
+        self.num_points = points.shape[0]
+
+        # Cuml and scipy do not support bfloat16, index in float32:
+        if points.dtype == torch.bfloat16 and self.backend in ("cuml", "scipy"):
+            points = points.to(torch.float32)
+        self._search_dtype = points.dtype
+
+        match self.backend:
+            case "scipy":
+                self._tree = build_tree_scipy(points)
+            case "cuml":
+                self._tree = build_tree_cuml(points)
+            case "torch":
+                self._tree = points
+
+    def _query(
+        self, queries: torch.Tensor, k: int, workers: int
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        match self.backend:
+            case "scipy":
+                return query_tree_scipy(self._tree, queries, k=k, workers=workers)
+            case "cuml":
+                return query_tree_cuml(self._tree, queries, k=k)
+            case "torch":
+                return knn_torch(self._tree, queries, k)
+
+    def query(
+        self,
+        queries: torch.Tensor,
+        k: int,
+        workers: int | None = None,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Find the ``k`` nearest indexed points for each query point.
+
+        Args:
+            queries: Tensor of shape (M, 3) containing the points to search for.
+            k: Number of nearest neighbors to return for each query point.
+            workers: Number of threads for scipy queries, overriding the
+                index default.
+
+        Returns:
+            indices: Tensor of shape (M, k) containing the indices of the k nearest neighbors for each query point.
+            distances: Tensor of shape (M, k) containing the distances to the k nearest neighbors for each query point.
+        """
+        if queries.device != self.device:
+            raise ValueError(
+                f"`knn` points and queries must be on the same device, got {self.device=} and {queries.device=}"
+            )
+        if queries.dtype != self.dtype:
+            raise ValueError(
+                f"`knn` points and queries must have the same dtype, got {self.dtype=} and {queries.dtype=}"
+            )
+
+        workers = self.workers if workers is None else workers
+        original_dtype = queries.dtype
+        queries = queries.to(self._search_dtype)
+
+        batch_size = self.query_batch_size
+        if batch_size is None or queries.shape[0] <= batch_size:
+            indices, distances = self._query(queries, k, workers)
+        else:
+            results = [
+                self._query(chunk, k, workers)
+                for chunk in torch.split(queries, batch_size)
+            ]
+            indices = torch.cat([r[0] for r in results])
+            distances = torch.cat([r[1] for r in results])
+
+        # Return the distances in the original dtype:
+        return indices, distances.to(original_dtype)
+
+
+def build_index(
+    points: torch.Tensor,
+    backend: Literal["cuml", "torch", "scipy", "auto"] = "auto",
+    workers: int = 1,
+    query_batch_size: int | None = None,
+) -> KNNIndex:
+    """
+    Build a reusable :class:`KNNIndex` over ``points``.
+
+    Args:
+        points: Tensor of shape (N, 3) containing the points to search from.
+        backend: Backend to use for the search.
+        workers: Default number of threads for scipy queries.
+        query_batch_size: Optional chunk size for queries.
+
+    Returns:
+        The index; call ``.query(queries, k)`` to search it.
+
+    Example:
+        >>> import torch
+        >>> from physicsnemo.utils.neighbors import build_index
+        >>> points = torch.tensor([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 2.0, 0.0]])
+        >>> index = build_index(points, backend="torch")
+        >>> indices, distances = index.query(torch.tensor([[0.9, 0.0, 0.0]]), k=2)
+        >>> indices
+        tensor([[1, 0]])
+    """
+    return KNNIndex(
+        points, backend=backend, workers=workers, query_batch_size=query_batch_size
+    )
+
+
+def _points_content_key(points: torch.Tensor, backend: str) -> str:
+    """
+    Content hash of ``points`` plus the backend, for :class:`KNNIndexCache`.
+    """
+    host = points.detach().contiguous().cpu()
+    if host.dtype == torch.bfloat16:
+        host = host.view(torch.int16)
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{tuple(host.shape)}|{points.dtype}|{points.device}".encode())
+    hasher.update(f"|{backend}".encode())
+    hasher.update(host.numpy().tobytes())
+    return hasher.hexdigest()
+
+
+class KNNIndexCache:
+    """
+    Bounded LRU cache of :class:`KNNIndex` objects keyed on point content.
+
+    Passing a cache to :func:`knn` lets repeated calls with identical
+    ``points`` reuse the same search structure.  Hashing reads the points on
+    the host, which is cheap compared with building a tree, but callers that
+    already hold the points should prefer :func:`build_index` directly.
+
+    Entries do not depend on the number of query threads, which is chosen
+    per query.  The cache is safe to share between threads.
+
+    Args:
+        max_size: Maximum number of indices to keep alive.
+    """
+
+    def __init__(self, max_size: int = 4):
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self.max_size = max_size
+        self._entries: OrderedDict[str, KNNIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def key(
+        self,
+        points: torch.Tensor,
+        backend: Literal["cuml", "torch", "scipy", "auto"] = "auto",
+    ) -> str:
+        """Return the cache key for ``points`` and the backend."""
+        return _points_content_key(points, _resolve_backend(points, backend))
+
+    def get(
+        self,
+        points: torch.Tensor,
+        backend: Literal["cuml", "torch", "scipy", "auto"] = "auto",
+    ) -> KNNIndex:
+        """Return the cached index for ``points``, building it on a miss."""
+        key = self.key(points, backend)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                return index
+
+        # Build outside of the lock so other threads are not blocked:
+        index = KNNIndex(points, backend=backend)
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+            self._entries[key] = index
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return index
+
+    def evict(self, key: str) -> bool:
+        """Remove the index stored under ``key``. Returns True if one was removed."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove all cached indices."""
+        with self._lock:
+            self._entries.clear()
+
+
+def knn(
+    points: torch.Tensor,
+    queries: torch.Tensor,
+    k: int,
+    backend: Literal["cuml", "torch", "scipy", "auto"] = "auto",
+    workers: int = 1,
+    cache: KNNIndexCache | None = None,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    Perform a k-nearest neighbor search on torch tensors.  Can be done with
+    torch directly, or leverage RAPIDS cuML algorithm.
+
+    The "auto" backend will dispatch to the optimal version for the data
+    device of the input tensors.
+
+    Args:
+        points: Tensor of shape (N, 3) containing the points to search from.
+        queries: Tensor of shape (M, 3) containing the points to search for.
+        k: Number of nearest neighbors to return for each query point.
+        backend: Backend to use for the search.
+        workers: Number of threads used by the scipy backend; -1 uses all
+            available cores.  Ignored by the other backends.
+        cache: Optional :class:`KNNIndexCache`.  If given, the search
+            structure for ``points`` is looked up in (or added to) the cache
+            instead of being rebuilt.
+
+    Returns:
+        indices: Tensor of shape (M, k) containing the indices of the k nearest neighbors for each query point.
+        distances: Tensor of shape (M, k) containing the distances to the k nearest neighbors for each query point.
+
+    """
+
+    _check_points_and_queries(points, queries)
+
+    if cache is not None:
+        return cache.get(points, backend=backend).query(queries, k, workers=workers)
+
+    backend = _resolve_backend(points, backend)
+
+    # Cuml foes not support bfloat16:
+    # Autocast to float32:
+    original_dtype = points.dtype
+
+    if points.dtype == torch.bfloat16 and (backend == "cuml" or backend == "scipy"):
+        points = points.to(torch.float32)
+        queries = queries.to(torch.float32)
+
+    match backend:
+        case "scipy":
+            indices, distances = knn_scipy(points, queries, k, workers)
+        case "cuml":
+            indices, distances = knn_cuml(points, queries, k)
+        case "torch":
+            indices, distances = knn_torch(points, queries, k)
 
     # Return the distances in the original dtype:
     distances = distances.to(original_dtype)
@@ -15,4 +15,10 @@
 # limitations under the License.
 
 
+from ._chunked_impl import (
+    RadiusSearchBlock,
+    radius_graph_csr,
+    radius_search_blocks,
+    radius_search_csr,
+)
 from .radius_search import radius_search
@@ -0,0 +1,493 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Memory bounded, chunked radius search in pure PyTorch.
+
+The brute force torch backend of ``radius_search`` materializes the full
+(N, M) distance matrix, which does not fit in host memory for large point
+clouds.  The functions here tile the queries (and, for the brute force path,
+the points) so that the number of candidate pairs held in memory at once
+stays within a byte budget.  With ``use_grid=True`` the points are bucketed
+in a uniform grid with a cell size equal to the radius, so each query only
+considers points in its 27 neighboring cells instead of all N points.
+
+Results are produced in CSR layout: for a block of queries, ``offsets`` has
+one more entry than there are queries, and the neighbors of the i-th query
+of the block are ``indices[offsets[i]:offsets[i + 1]]``.
+"""
+
+from typing import Iterator, NamedTuple
+
+import torch
+
+# Candidate pair bookkeeping: two int64 indices and a bool mask, plus the
+# coordinate difference and the distance in the input dtype.
+_PAIR_INDEX_BYTES = 2 * 8 + 1
+
+
+def _neighbor_cell_offsets(dim: int, batched: bool) -> torch.Tensor:
+    """
+    The 3**dim cell offsets around (and including) a cell.  For a batched
+    grid, the leading batch coordinate of every offset is 0.
+    """
+    offsets = torch.stack(
+        torch.meshgrid(*[torch.arange(-1, 2)] * dim, indexing="ij"), dim=-1
+    ).reshape(-1, dim)
+    if batched:
+        offsets = torch.cat([torch.zeros_like(offsets[:, :1]), offsets], dim=1)
+    return offsets
+
+
+class RadiusSearchBlock(NamedTuple):
+    """
+    CSR neighbors for a contiguous block of queries.
+
+    Attributes:
+        query_start: Index of the first query of this block.
+        offsets: Tensor of shape (num_block_queries + 1,), int64.
+        indices: Tensor of shape (num_block_neighbors,), int64, indices into
+            the points.
+        distances: Tensor of shape (num_block_neighbors,) with the distance of
+            each neighbor to its query.
+    """
+
+    query_start: int
+    offsets: torch.Tensor
+    indices: torch.Tensor
+    distances: torch.Tensor
+
+
+def _max_pairs(memory_budget: int, dtype: torch.dtype) -> int:
+    """Number of candidate pairs that fit in ``memory_budget`` bytes."""
+    itemsize = torch.empty((), dtype=dtype).element_size()
+    bytes_per_pair = _PAIR_INDEX_BYTES + 4 * itemsize
+    return max(1, memory_budget // bytes_per_pair)
+
+
+def _csr_from_sorted_pairs(query_local: torch.Tensor, num_queries: int) -> torch.Tensor:
+    """Build CSR offsets from query ids that are already grouped by query."""
+    counts = torch.bincount(query_local, minlength=num_queries)
+    offsets = torch.zeros(num_queries + 1, dtype=torch.int64, device=counts.device)
+    torch.cumsum(counts, dim=0, out=offsets[1:])
+    return offsets
+
+
+class _PointGrid:
+    """
+    Uniform grid over a point cloud, stored as points sorted by cell id.
+
+    No dense per-cell arrays are allocated, so the grid costs O(N) memory
+    regardless of the extent of the domain.
+
+    With a ``batch`` vector assigning each point to an independent scene,
+    the scene index becomes the leading cell coordinate, so points of
+    different scenes never share or neighbor a cell.
+    """
+
+    def __init__(
+        self,
+        points: torch.Tensor,
+        cell_size: float,
+        batch: torch.Tensor | None = None,
+    ):
+        self.cell_size = cell_size
+        self.origin = points.min(dim=0).values
+        self.neighbor_offsets = _neighbor_cell_offsets(
+            points.shape[-1], batch is not None
+        ).to(points.device)
+        cells = self._cell_coords(points, batch)
+        self.dims = cells.max(dim=0).values + 1
+
+        cell_ids = self._linearize(cells)
+        self.sorted_ids, self.order = torch.sort(cell_ids)
+
+    def _cell_coords(
+        self, coords: torch.Tensor, batch: torch.Tensor | None = None
+    ) -> torch.Tensor:
+        cells = torch.floor((coords - self.origin) / self.cell_size).to(torch.int64)
+        if batch is not None:
+            cells = torch.cat([batch[:, None].to(torch.int64), cells], dim=1)
+        return cells
+
+    def _linearize(self, cells: torch.Tensor) -> torch.Tensor:
+        cell_ids = cells[..., 0]
+        for d in range(1, cells.shape[-1]):
+            cell_ids = cell_ids * self.dims[d] + cells[..., d]
+        return cell_ids
+
+    def candidate_ranges(
+        self, queries: torch.Tensor, batch: torch.Tensor | None = None
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Ranges into the sorted points for each query and neighboring cell.
+
+        Returns:
+            starts, lengths: Tensors of shape (num_queries, 3**dim).
+        """
+        offsets = self.neighbor_offsets
+        neighbor_cells = (
+            self._cell_coords(queries, batch)[:, None, :] + offsets[None, :, :]
+        )
+        valid = ((neighbor_cells >= 0) & (neighbor_cells < self.dims)).all(dim=-1)
+
+        cell_ids = self._linearize(neighbor_cells)
+        starts = torch.searchsorted(self.sorted_ids, cell_ids, side="left")
+        ends = torch.searchsorted(self.sorted_ids, cell_ids, side="right")
+        lengths = torch.where(valid, ends - starts, 0)
+        return starts, lengths
+
+
+def _split_by_pair_count(counts: torch.Tensor, max_pairs: int) -> list[int]:
+    """
+    Split a run of queries into sub-blocks holding at most ``max_pairs``
+    candidates each.  A single query with more candidates than ``max_pairs``
+    gets a block of its own.
+
+    Returns the boundaries, starting at 0 and ending at len(counts).
+    """
+    cumulative = torch.cumsum(counts, dim=0)
+    boundaries = [0]
+    while boundaries[-1] < counts.shape[0]:
+        start = boundaries[-1]
+        block_base = int(cumulative[start - 1]) if start > 0 else 0
+        end = int(torch.searchsorted(cumulative, block_base + max_pairs, side="right"))
+        boundaries.append(max(end, start + 1))
+    return boundaries
+
+
+def _grid_blocks(
+    points: torch.Tensor,
+    queries: torch.Tensor,
+    radius: float,
+    max_pairs: int,
+    point_batch: torch.Tensor | None = None,
+    query_batch: torch.Tensor | None = None,
+) -> Iterator[RadiusSearchBlock]:
+    grid = _PointGrid(points, radius, point_batch)
+    n_cells = grid.neighbor_offsets.shape[0]
+
+    # The per-query cell ranges cost about six int64 per neighboring cell:
+    query_tile = max(1, max_pairs // n_cells)
+
+    for tile_start in range(0, queries.shape[0], query_tile):
+        tile = queries[tile_start : tile_start + query_tile]
+        tile_batch = (
+            query_batch[tile_start : tile_start + query_tile]
+            if query_batch is not None
+            else None
+        )
+        starts, lengths = grid.candidate_ranges(tile, tile_batch)
+        counts = lengths.sum(dim=1)
+
+        boundaries = _split_by_pair_count(counts, max_pairs)
+        for lo, hi in zip(boundaries[:-1], boundaries[1:]):
+            block_starts = starts[lo:hi].reshape(-1)
+            block_lengths = lengths[lo:hi].reshape(-1)
+
+            # Expand the ragged ranges into one candidate per (query, point):
+            segment = torch.repeat_interleave(
+                torch.arange(block_lengths.shape[0], device=tile.device),
+                block_lengths,
+            )
+            range_base = torch.cumsum(block_lengths, dim=0) - block_lengths
+            position = (
+                torch.arange(segment.shape[0], device=tile.device) - range_base[segment]
+            )
+            point_idx = grid.order[block_starts[segment] + position]
+            query_local = torch.div(segment, n_cells, rounding_mode="floor")
+
+            distances = torch.linalg.vector_norm(
+                tile[lo:hi][query_local] - points[point_idx], dim=-1
+            )
+            selection = distances <= radius
+
+            query_local = query_local[selection]
+            yield RadiusSearchBlock(
+                query_start=tile_start + lo,
+                offsets=_csr_from_sorted_pairs(query_local, hi - lo),
+                indices=point_idx[selection],
+                distances=distances[selection],
+            )
+
+
+def _brute_force_blocks(
+    points: torch.Tensor,
+    queries: torch.Tensor,
+    radius: float,
+    max_pairs: int,
+) -> Iterator[RadiusSearchBlock]:
+    point_tile = max(1, min(points.shape[0], max_pairs))
+    query_tile = max(1, max_pairs // point_tile)
+
+    for q_start in range(0, queries.shape[0], query_tile):
+        q_block = queries[q_start : q_start + query_tile]
+
+        query_ids, point_ids, dists = [], [], []
+        for p_start in range(0, points.shape[0], point_tile):
+            p_block = points[p_start : p_start + point_tile]
+            # Without the compute mode set, this is numerically unstable.
+            block_dists = torch.cdist(
+                q_block, p_block, p=2.0, compute_mode="donot_use_mm_for_euclid_dist"
+            )
+            q_idx, p_idx = torch.nonzero(block_dists <= radius, as_tuple=True)
+            query_ids.append(q_idx)
+            point_ids.append(p_idx + p_start)
+            dists.append(block_dists[q_idx, p_idx])
+
+        query_local = torch.cat(query_ids)
+        order = torch.argsort(query_local, stable=True)
+
+        query_local = query_local[order]
+        yield RadiusSearchBlock(
+            query_start=q_start,
+            offsets=_csr_from_sorted_pairs(query_local, q_block.shape[0]),
+            indices=torch.cat(point_ids)[order],
+            distances=torch.cat(dists)[order],
+        )
+
+
+def radius_search_blocks(
+    points: torch.Tensor,
+    queries: torch.Tensor,
+    radius: float,
+    memory_budget: int = 256 * 1024**2,
+    use_grid: bool = True,
+) -> Iterator[RadiusSearchBlock]:
+    """Memory bounded radius search, streamed as CSR blocks of queries.
+
+    Finds all points within ``radius`` of each query, like ``radius_search``
+    with ``max_points=None``, but never holds more candidate pairs in memory
+    than fit in ``memory_budget`` bytes.  Blocks are yielded in query order
+    and together cover every query exactly once.
+
+    With ``use_grid=True`` the points are bucketed in a uniform grid with a
+    cell size of ``radius``, and each query is only compared with points of
+    its 27 neighboring cells.  With ``use_grid=False`` the queries and the
+    points are both tiled and compared exhaustively.
+
+    The budget bounds the candidate pairs of a block.  A single query with
+    more candidates than the budget allows is still processed in one block.
+
+    Args:
+        points (torch.Tensor): The reference point cloud, shape (N, 3).
+        queries (torch.Tensor): The query points, shape (M, 3).
+        radius (float): The search radius. Points within or at this radius of a
+            query point will be considered neighbors.
+        memory_budget (int, optional): Approximate upper bound, in bytes, for
+            the temporary memory of one block. Defaults to 256 MiB.
+        use_grid (bool, optional): Whether to use the uniform grid
+            acceleration. Defaults to True.
+
+    Yields:
+        RadiusSearchBlock: ``(query_start, offsets, indices, distances)`` for
+        consecutive blocks of queries.
+
+    Raises:
+        ValueError: If the radius or memory budget are not positive, or the
+            inputs are not 3D point clouds of the same dtype and device.
+    """
+    if radius <= 0:
+        raise ValueError(f"`radius_search` radius must be positive, got {radius=}")
+    if memory_budget <= 0:
+        raise ValueError(
+            f"`radius_search` memory_budget must be positive, got {memory_budget=}"
+        )
+    if points.shape[-1] != 3 or queries.shape[-1] != 3:
+        raise ValueError(
+            "`radius_search` points and queries must have a last dimension of size 3"
+        )
+    if points.device != queries.device:
+        raise ValueError(
+            f"`radius_search` points and queries must be on the same device, got {points.device=} and {queries.device=}"
+        )
+
+    if points.dtype != queries.dtype:
+        raise ValueError(
+            f"`radius_search` points and queries must have the same dtype, got {points.dtype=} and {queries.dtype=}"
+        )
+
+    if points.shape[0] == 0:
+        if queries.shape[0] > 0:
+            yield RadiusSearchBlock(
+                query_start=0,
+                offsets=torch.zeros(
+                    queries.shape[0] + 1, dtype=torch.int64, device=queries.device
+                ),
+                indices=torch.empty(0, dtype=torch.int64, device=queries.device),
+                distances=torch.empty(0, dtype=queries.dtype, device=queries.device),
+            )
+        return
+
+    max_pairs = _max_pairs(memory_budget, points.dtype)
+
+    if use_grid:
+        yield from _grid_blocks(points, queries, radius, max_pairs)
+    else:
+        yield from _brute_force_blocks(points, queries, radius, max_pairs)
+
+
+def radius_search_csr(
+    points: torch.Tensor,
+    queries: torch.Tensor,
+    radius: float,
+    memory_budget: int = 256 * 1024**2,
+    use_grid: bool = True,
+) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Memory bounded radius search, concatenated into one CSR structure.
+
+    Runs :func:`radius_search_blocks` and concatenates the blocks.  The
+    budget only bounds the temporaries of the search; the result itself
+    holds every neighbor pair.
+
+    Args:
+        points (torch.Tensor): The reference point cloud, shape (N, 3).
+        queries (torch.Tensor): The query points, shape (M, 3).
+        radius (float): The search radius.
+        memory_budget (int, optional): Approximate upper bound, in bytes, for
+            the temporary memory of one block. Defaults to 256 MiB.
+        use_grid (bool, optional): Whether to use the uniform grid
+            acceleration. Defaults to True.
+
+    Returns:
+        tuple: ``(offsets, indices, distances)`` where ``offsets`` has shape
+        (M + 1,) and the neighbors of query ``i`` are
+        ``indices[offsets[i]:offsets[i + 1]]``.
+
+    Example:
+        >>> import torch
+        >>> from physicsnemo.utils.neighbors import radius_search_csr
+        >>> points = torch.tensor([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [3.0, 0.0, 0.0]])
+        >>> queries = torch.tensor([[0.1, 0.0, 0.0], [2.9, 0.0, 0.0]])
+        >>> offsets, indices, distances = radius_search_csr(points, queries, 1.0)
+        >>> offsets
+        tensor([0, 2, 3])
+        >>> indices
+        tensor([0, 1, 2])
+    """
+    offsets, indices, distances = [], [], []
+    neighbor_base = 0
+    for block in radius_search_blocks(
+        points, queries, radius, memory_budget=memory_budget, use_grid=use_grid
+    ):
+        offsets.append(block.offsets[:-1] + neighbor_base)
+        neighbor_base += block.indices.shape[0]
+        indices.append(block.indices)
+        distances.append(block.distances)
+
+    offsets.append(
+        torch.tensor([neighbor_base], dtype=torch.int64, device=queries.device)
+    )
+    if len(indices) == 0:
+        indices = [torch.empty(0, dtype=torch.int64, device=queries.device)]
+        distances = [torch.empty(0, dtype=queries.dtype, device=queries.device)]
+
+    return torch.cat(offsets), torch.cat(indices), torch.cat(distances)
+
+
+def radius_graph_csr(
+    points: torch.Tensor,
+    radius: float,
+    batch: torch.Tensor | None = None,
+    memory_budget: int = 256 * 1024**2,
+) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Radius graph of a point cloud, built with a uniform grid (cell list).
+
+    Connects every point to all points within ``radius``, including itself,
+    in O(N) memory for the search plus the size of the graph, instead of the
+    O(N^2) of a dense distance matrix.  Works for points of any dimension,
+    typically 2D or 3D.
+
+    Several independent scenes can be processed in one vectorized call by
+    passing a ``batch`` vector, as in PyTorch Geometric: points of different
+    scenes are never connected.
+
+    Args:
+        points (torch.Tensor): The points, shape (N, D).
+        radius (float): The connectivity radius.  Points within or at this
+            distance are connected.
+        batch (torch.Tensor | None, optional): Scene index of each point,
+            shape (N,).  Defaults to a single scene.
+        memory_budget (int, optional): Approximate upper bound, in bytes, for
+            the temporary memory of the search. Defaults to 256 MiB.
+
+    Returns:
+        tuple: ``(offsets, indices, distances)`` in CSR layout, where
+        ``offsets`` has shape (N + 1,) and the neighbors of point ``i`` are
+        ``indices[offsets[i]:offsets[i + 1]]``, in increasing order.
+
+    Raises:
+        ValueError: If the radius or memory budget are not positive, or the
+            batch vector does not match the points.
+
+    Example:
+        >>> import torch
+        >>> from physicsnemo.utils.neighbors import radius_graph_csr
+        >>> points = torch.tensor([[0.0, 0.0], [0.5, 0.0], [0.0, 0.5]])
+        >>> offsets, indices, _ = radius_graph_csr(points, 0.6)
+        >>> offsets
+        tensor([0, 3, 5, 7])
+        >>> indices
+        tensor([0, 1, 2, 0, 1, 0, 2])
+        >>> offsets, indices, _ = radius_graph_csr(points, 0.6, batch=torch.tensor([0, 0, 1]))
+        >>> indices
+        tensor([0, 1, 0, 1, 2])
+    """
+    if radius <= 0:
+        raise ValueError(f"`radius_graph` radius must be positive, got {radius=}")
+    if memory_budget <= 0:
+        raise ValueError(
+            f"`radius_graph` memory_budget must be positive, got {memory_budget=}"
+        )
+    if batch is not None and batch.shape != points.shape[:1]:
+        raise ValueError(
+            f"`radius_graph` batch must have shape {tuple(points.shape[:1])}, got {tuple(batch.shape)}"
+        )
+
+    num_points = points.shape[0]
+    if num_points == 0:
+        return (
+            torch.zeros(1, dtype=torch.int64, device=points.device),
+            torch.empty(0, dtype=torch.int64, device=points.device),
+            torch.empty(0, dtype=points.dtype, device=points.device),
+        )
+
+    offsets, indices, distances = [], [], []
+    neighbor_base = 0
+    for block in _grid_blocks(
+        points,
+        points,
+        radius,
+        _max_pairs(memory_budget, points.dtype),
+        point_batch=batch,
+        query_batch=batch,
+    ):
+        # Order the neighbors of every point by index:
+        rows = torch.repeat_interleave(
+            torch.arange(block.offsets.shape[0] - 1, device=points.device),
+            block.offsets.diff(),
+        )
+        order = torch.argsort(rows * num_points + block.indices)
+
+        offsets.append(block.offsets[:-1] + neighbor_base)
+        neighbor_base += block.indices.shape[0]
+        indices.append(block.indices[order])
+        distances.append(block.distances[order])
+
+    offsets.append(
+        torch.tensor([neighbor_base], dtype=torch.int64, device=points.device)
+    )
+    return torch.cat(offsets), torch.cat(indices), torch.cat(distances)
@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Import time budget of a module, measured with ``python -X importtime``.
+
+Can also be run as a script to print a report:
+
+    python -m physicsnemo.utils.profiling.import_time physicsnemo --top 20
+"""
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    """
+    Import time of a single module.
+
+    Args:
+        name: Fully qualified module name.
+        self_us: Time spent executing the module itself, in microseconds.
+        cumulative_us: Time including the imports of its own dependencies,
+            in microseconds.
+    """
+
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+def import_time_report(
+    module: str = "physicsnemo", top: int | None = 20, prefix: str | None = None
+) -> list[ImportTime]:
+    """
+    Measure the import time of ``module`` and of everything it imports.
+
+    The import runs in a fresh interpreter so that modules already imported by
+    the caller do not hide their cost.
+
+    Args:
+        module: Module to import.
+        top: Number of entries to return, all of them if None.
+        prefix: Only report modules whose name starts with this prefix, for
+            example ``"physicsnemo."`` for the submodules of the package.
+
+    Returns:
+        The imported modules, most expensive (cumulative time) first.
+
+    Raises:
+        RuntimeError: If importing ``module`` fails.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}"
+        )
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Header line
+            continue
+        name = fields[2].strip()
+        if prefix is not None and not name.startswith(prefix):
+            continue
+        entries.append(ImportTime(name, int(fields[0]), int(fields[1])))
+
+    entries.sort(key=lambda entry: entry.cumulative_us, reverse=True)
+    return entries if top is None else entries[:top]
+
+
+def format_import_time_report(entries: list[ImportTime]) -> str:
+    """
+    Format the entries of ``import_time_report`` as a table, in milliseconds.
+    """
+    width = max((len(entry.name) for entry in entries), default=6)
+    header = f"{'module':<{width}}  {'cumulative':>10}  {'self':>8}"
+    rows = [
+        f"{entry.name:<{width}}  {entry.cumulative_us / 1e3:>8.1f}ms"
+        f"  {entry.self_us / 1e3:>6.1f}ms"
+        for entry in entries
+    ]
+    return "\n".join([header, *rows])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("module", nargs="?", default="physicsnemo")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--prefix", default=None)
+    args = parser.parse_args()
+    print(
+        format_import_time_report(
+            import_time_report(args.module, top=args.top, prefix=args.prefix)
+        )
+    )
@@ -14,6 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import threading
+from collections import OrderedDict
+
 import torch
 import warp as wp
 
@@ -67,6 +71,57 @@ def _bvh_query_distance(
     sdf_hit_point[tid] = p_closest
 
 
+def _warp_launch_context(device: torch.device):
+    """
+    Return the warp stream and device to launch on for a torch device.
+    """
+    if device.type == "cuda":
+        wp_launch_stream = wp.stream_from_torch(torch.cuda.current_stream(device))
+        wp_launch_device = None  # We explicitly pass None if using the stream.
+    else:
+        wp_launch_stream = None
+        wp_launch_device = "cpu"  # CPUs have no streams
+    return wp_launch_stream, wp_launch_device
+
+
+def _launch_bvh_query(
+    mesh: wp.Mesh,
+    input_points: torch.Tensor,
+    max_dist: float,
+    sdf: torch.Tensor,
+    sdf_hit_point: torch.Tensor,
+    use_sign_winding_number: bool,
+) -> None:
+    """
+    Launch the BVH distance query against an already constructed warp mesh.
+
+    ``input_points`` must be flattened to shape (N, 3), and ``sdf`` /
+    ``sdf_hit_point`` are float32 output buffers of shape (N,) and (N, 3).
+    Must be called inside a ``wp.ScopedStream`` matching the input device.
+    """
+    wp_launch_stream, wp_launch_device = _warp_launch_context(input_points.device)
+
+    # zero copy the input points and outputs to warp:
+    wp_input_points = wp.from_torch(input_points.to(torch.float32), dtype=wp.vec3)
+    wp_sdf = wp.from_torch(sdf, dtype=wp.float32)
+    wp_sdf_hit_point = wp.from_torch(sdf_hit_point, dtype=wp.vec3f)
+
+    wp.launch(
+        kernel=_bvh_query_distance,
+        dim=len(input_points),
+        inputs=[
+            mesh.id,
+            wp_input_points,
+            max_dist,
+            wp_sdf,
+            wp_sdf_hit_point,
+            use_sign_winding_number,
+        ],
+        device=wp_launch_device,
+        stream=wp_launch_stream,
+    )
+
+
 @torch.library.custom_op("physicsnemo::signed_distance_field", mutates_args=())
 def signed_distance_field(
     mesh_vertices: torch.Tensor,
@@ -132,26 +187,14 @@ def signed_distance_field(
     sdf = torch.zeros(N, dtype=torch.float32, device=input_points.device)
     sdf_hit_point = torch.zeros(N, 3, dtype=torch.float32, device=input_points.device)
 
-    if input_points.device.type == "cuda":
-        wp_launch_stream = wp.stream_from_torch(
-            torch.cuda.current_stream(input_points.device)
-        )
-        wp_launch_device = None  # We explicitly pass None if using the stream.
-    else:
-        wp_launch_stream = None
-        wp_launch_device = "cpu"  # CPUs have no streams
+    wp_launch_stream, wp_launch_device = _warp_launch_context(input_points.device)
 
     with wp.ScopedStream(wp_launch_stream):
         wp.init()
 
-        # zero copy the vertices, indices, and input points to warp:
+        # zero copy the vertices and indices to warp:
         wp_vertices = wp.from_torch(mesh_vertices.to(torch.float32), dtype=wp.vec3)
         wp_indices = wp.from_torch(mesh_indices.to(torch.int32), dtype=wp.int32)
-        wp_input_points = wp.from_torch(input_points.to(torch.float32), dtype=wp.vec3)
-
-        # Convert output points:
-        wp_sdf = wp.from_torch(sdf, dtype=wp.float32)
-        wp_sdf_hit_point = wp.from_torch(sdf_hit_point, dtype=wp.vec3f)
 
         mesh = wp.Mesh(
             points=wp_vertices,
@@ -159,19 +202,13 @@ def signed_distance_field(
             support_winding_number=use_sign_winding_number,
         )
 
-        wp.launch(
-            kernel=_bvh_query_distance,
-            dim=N,
-            inputs=[
-                mesh.id,
-                wp_input_points,
-                max_dist,
-                wp_sdf,
-                wp_sdf_hit_point,
-                use_sign_winding_number,
-            ],
-            device=wp_launch_device,
-            stream=wp_launch_stream,
+        _launch_bvh_query(
+            mesh,
+            input_points,
+            max_dist,
+            sdf,
+            sdf_hit_point,
+            use_sign_winding_number,
         )
 
     # Unflatten the output to be like the input:
@@ -203,3 +240,259 @@ def _(
     )
 
     return sdf_output, sdf_hit_point_output
+
+
+class SignedDistanceField:
+    """
+    Reusable signed distance field handle for a fixed triangle mesh.
+
+    :func:`signed_distance_field` builds a fresh BVH from the mesh on every
+    call.  When the same geometry is queried repeatedly (for example, the
+    volume grid and the sampled volume points of a single DoMINO sample),
+    this object builds the BVH once and answers any number of point batches
+    against it.
+
+    The mesh buffers are converted to float32 / int32 once and kept alive
+    for the lifetime of the handle, since the warp mesh references them
+    without copying.
+
+    Parameters
+    ----------
+    mesh_vertices : torch.Tensor
+        Coordinates of the vertices of the mesh; shape: (n_vertices, 3)
+    mesh_indices : torch.Tensor
+        Indices corresponding to the faces of the mesh; shape: (n_faces * 3,)
+        or (n_faces, 3)
+    use_sign_winding_number : bool, optional
+        Whether to use the sign winding number method for the SDF. This is
+        fixed at construction time, since the BVH has to be built with
+        winding number support. Default is False.
+
+    Example
+    -------
+    >>> import torch
+    >>> from physicsnemo.utils.sdf import SignedDistanceField
+    >>> verts = torch.tensor([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    >>> faces = torch.tensor([0, 1, 2], dtype=torch.int32)
+    >>> sdf_handle = SignedDistanceField(verts, faces)
+    >>> sdf, hit = sdf_handle(torch.tensor([[0.1, 0.1, 0.5]]))
+    >>> sdf.shape, hit.shape
+    (torch.Size([1]), torch.Size([1, 3]))
+    """
+
+    def __init__(
+        self,
+        mesh_vertices: torch.Tensor,
+        mesh_indices: torch.Tensor,
+        use_sign_winding_number: bool = False,
+    ):
+        if mesh_vertices.shape[-1] != 3:
+            raise ValueError(
+                "Mesh vertices must be a tensor with last dimension of size 3"
+            )
+        if mesh_vertices.device != mesh_indices.device:
+            raise RuntimeError(
+                "mesh_vertices and mesh_indices must be on the same device"
+            )
+
+        self.device = mesh_vertices.device
+        self.use_sign_winding_number = use_sign_winding_number
+
+        # Hold on to the converted buffers, warp references them zero-copy:
+        self._vertices = mesh_vertices.reshape(-1, 3).to(torch.float32).contiguous()
+        self._indices = mesh_indices.reshape(-1).to(torch.int32).contiguous()
+
+        wp_launch_stream, _ = _warp_launch_context(self.device)
+        with wp.ScopedStream(wp_launch_stream):
+            wp.init()
+            self._mesh = wp.Mesh(
+                points=wp.from_torch(self._vertices, dtype=wp.vec3),
+                indices=wp.from_torch(self._indices, dtype=wp.int32),
+                support_winding_number=use_sign_winding_number,
+            )
+
+    @property
+    def num_faces(self) -> int:
+        """Number of triangles in the mesh."""
+        return self._indices.shape[0] // 3
+
+    def query(
+        self,
+        input_points: torch.Tensor,
+        max_dist: float = 1e8,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """
+        Compute the signed distance and closest hit point for ``input_points``.
+
+        Parameters
+        ----------
+        input_points : torch.Tensor
+            Coordinates of the points for which to compute the SDF; shape:
+            (..., 3).  Must be on the same device as the mesh.
+        max_dist : float, optional
+            Maximum distance within which to search for the closest point on
+            the mesh. Default is 1e8.
+
+        Returns
+        -------
+        tuple[torch.Tensor, torch.Tensor]
+            The signed distance per input point, shape (...), and the hit
+            point per input point, shape (..., 3), both in the input dtype.
+        """
+        if input_points.shape[-1] != 3:
+            raise ValueError(
+                "Input points must be a tensor with last dimension of size 3"
+            )
+        if input_points.device != self.device:
+            raise RuntimeError(
+                f"input_points are on {input_points.device} but the mesh is on "
+                f"{self.device}"
+            )
+
+        input_shape = input_points.shape
+        flat_points = input_points.reshape(-1, 3)
+        N = len(flat_points)
+
+        sdf = torch.zeros(N, dtype=torch.float32, device=self.device)
+        sdf_hit_point = torch.zeros(N, 3, dtype=torch.float32, device=self.device)
+
+        wp_launch_stream, _ = _warp_launch_context(self.device)
+        with wp.ScopedStream(wp_launch_stream):
+            _launch_bvh_query(
+                self._mesh,
+                flat_points,
+                max_dist,
+                sdf,
+                sdf_hit_point,
+                self.use_sign_winding_number,
+            )
+
+        sdf = sdf.reshape(input_shape[:-1])
+        sdf_hit_point = sdf_hit_point.reshape(input_shape)
+
+        return sdf.to(input_points.dtype), sdf_hit_point.to(input_points.dtype)
+
+    __call__ = query
+
+
+def _mesh_content_key(
+    mesh_vertices: torch.Tensor,
+    mesh_indices: torch.Tensor,
+    use_sign_winding_number: bool,
+) -> str:
+    """
+    Content hash of a mesh, used to key :class:`SignedDistanceFieldCache`.
+
+    The hash covers the vertex / index bytes after the same dtype conversion
+    applied when building the BVH, plus the device and the winding number
+    flag, so two equal meshes on different devices get different entries.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for tensor, dtype in ((mesh_vertices, torch.float32), (mesh_indices, torch.int32)):
+        host = tensor.detach().to(dtype).contiguous().cpu()
+        hasher.update(str(tuple(host.shape)).encode())
+        hasher.update(host.numpy().tobytes())
+    hasher.update(str(mesh_vertices.device).encode())
+    hasher.update(b"winding" if use_sign_winding_number else b"normal")
+    return hasher.hexdigest()
+
+
+class SignedDistanceFieldCache:
+    """
+    Bounded LRU cache of :class:`SignedDistanceField` handles.
+
+    Entries are keyed on a content hash of the mesh vertex and index
+    buffers, so repeated lookups with identical geometry reuse the same BVH
+    even if the tensors themselves were reloaded.  Hashing requires reading
+    the mesh buffers on the host; when the caller already holds on to the
+    geometry, constructing a :class:`SignedDistanceField` directly avoids
+    that cost.
+
+    The cache is safe to share between threads.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Maximum number of BVH handles to keep alive. The least recently used
+        handle is evicted once this is exceeded. Default is 8.
+
+    Example
+    -------
+    >>> import torch
+    >>> from physicsnemo.utils.sdf import SignedDistanceFieldCache
+    >>> cache = SignedDistanceFieldCache(max_size=2)
+    >>> verts = torch.tensor([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    >>> faces = torch.tensor([0, 1, 2], dtype=torch.int32)
+    >>> cache.get(verts, faces) is cache.get(verts.clone(), faces)
+    True
+    >>> len(cache)
+    1
+    """
+
+    def __init__(self, max_size: int = 8):
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self.max_size = max_size
+        self._entries: OrderedDict[str, SignedDistanceField] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def key(
+        self,
+        mesh_vertices: torch.Tensor,
+        mesh_indices: torch.Tensor,
+        use_sign_winding_number: bool = False,
+    ) -> str:
+        """Return the cache key for a mesh."""
+        return _mesh_content_key(mesh_vertices, mesh_indices, use_sign_winding_number)
+
+    def get(
+        self,
+        mesh_vertices: torch.Tensor,
+        mesh_indices: torch.Tensor,
+        use_sign_winding_number: bool = False,
+    ) -> SignedDistanceField:
+        """
+        Return the cached handle for a mesh, building the BVH on a miss.
+        """
+        key = self.key(mesh_vertices, mesh_indices, use_sign_winding_number)
+        with self._lock:
+            handle = self._entries.get(key)
+            if handle is not None:
+                self._entries.move_to_end(key)
+                return handle
+
+        # Build outside of the lock so other threads are not blocked:
+        handle = SignedDistanceField(
+            mesh_vertices, mesh_indices, use_sign_winding_number
+        )
+
+        with self._lock:
+            # Another thread may have built the same mesh in the meantime:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+            self._entries[key] = handle
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return handle
+
+    def evict(self, key: str) -> bool:
+        """
+        Remove the handle stored under ``key``.
+
+        Returns True if an entry was removed.
+        """
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove all cached handles."""
+        with self._lock:
+            self._entries.clear()
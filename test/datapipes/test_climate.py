@@ -457,3 +457,115 @@ def test_era5_hdf5_cudagraphs(
     )
 
     assert common.check_cuda_graphs(datapipe, input_fn)
+
+
+@import_or_fail(["h5py", "nvidia.dali", "pytz"])
+@pytest.mark.parametrize(
+    "channels", [[0, 1, 2, 3], [1, 3, 5, 6, 9], [9, 2, 0], list(range(10))]
+)
+def test_hdf5_hyperslab_reads(channels, tmp_path, pytestconfig):
+    import h5py
+    import numpy as np
+
+    from physicsnemo.datapipes.climate.utils.hyperslab import (
+        plan_channel_reads,
+        read_hyperslabs,
+    )
+
+    # contiguous channels are a single slice
+    assert plan_channel_reads([2, 3, 4]) == [(slice(2, 5, 1), slice(0, 3))]
+    # evenly spaced channels are a single strided slice
+    assert plan_channel_reads([0, 2, 4]) == [(slice(0, 5, 2), slice(0, 3))]
+
+    data = np.random.rand(20, 10, 3, 4).astype(np.float32)
+    with h5py.File(tmp_path / "data.h5", "w") as f:
+        f.create_dataset("fields", data=data)
+        f.create_dataset("chunked", data=data, chunks=(1, 1, 3, 4))
+
+    reads = plan_channel_reads(channels)
+    with h5py.File(tmp_path / "data.h5", "r") as f:
+        for name in ["fields", "chunked"]:
+            for time_slice in [slice(0, 20, 1), slice(3, 15, 3), slice(5, 6)]:
+                out = read_hyperslabs(f[name], time_slice, reads)
+                assert np.array_equal(out, data[time_slice][:, channels])
+
+
+@import_or_fail(["filelock", "nvidia.dali", "pytz"])
+def test_cos_zenith_table(tmp_path, pytestconfig):
+    from datetime import datetime, timedelta, timezone
+
+    import numpy as np
+
+    from physicsnemo.datapipes.climate.utils.invariant import latlon_grid
+    from physicsnemo.datapipes.climate.utils.zenith_table import (
+        build_cos_zenith_table,
+        sequence_timestamps,
+    )
+    from physicsnemo.utils.zenith_angle import cos_zenith_angle_from_timestamp
+
+    # vectorized timestamps match datetime arithmetic
+    start_time = datetime(2018, 1, 1, tzinfo=timezone.utc) + timedelta(hours=17 * 6)
+    timestamps = np.array(
+        [(start_time + timedelta(hours=i * 3 * 6)).timestamp() for i in range(5)]
+    )
+    assert np.array_equal(sequence_timestamps(2018, 17, 5, 3, 6.0), timestamps)
+
+    latlon = np.stack(latlon_grid(shape=(9, 18)), axis=0)
+    path = build_cos_zenith_table(tmp_path, 2018, 10, 6.0, latlon, chunk_size=3)
+    table = np.load(path, mmap_mode="r")
+    assert table.shape == (10, 1, 9, 18)
+    assert table.dtype == np.float32
+
+    timestamps = sequence_timestamps(2018, 0, 10, 1, 6.0)
+    expected = cos_zenith_angle_from_timestamp(
+        timestamps[:, None, None, None], lon=latlon[1], lat=latlon[0]
+    )
+    assert np.allclose(table, expected, atol=1e-6)
+
+    # an existing table is reused, a different grid gets its own table
+    assert build_cos_zenith_table(tmp_path, 2018, 10, 6.0, latlon) == path
+    assert build_cos_zenith_table(tmp_path, 2018, 10, 6.0, latlon[:, :3]) != path
+
+
+@import_or_fail(["filelock", "h5py", "nvidia.dali", "pytz"])
+def test_era5_hdf5_cos_zenith_table(tmp_path, pytestconfig):
+    import h5py
+    import numpy as np
+
+    from physicsnemo.datapipes.climate import ERA5HDF5Datapipe
+
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for year in [2018, 2019]:
+        with h5py.File(data_dir / f"{year}.h5", "w") as f:
+            f.create_dataset(
+                "fields", data=np.random.rand(8, 2, 9, 18).astype(np.float32)
+            )
+
+    def read(table_dir):
+        cos_zenith_args = {"dt": 6.0, "start_year": 2018}
+        if table_dir is not None:
+            cos_zenith_args["table_dir"] = str(table_dir)
+        datapipe = ERA5HDF5Datapipe(
+            data_dir=data_dir,
+            latlon_resolution=(9, 18),
+            use_cos_zenith=True,
+            cos_zenith_args=cos_zenith_args,
+            num_steps=2,
+            stride=2,
+            batch_size=2,
+            shuffle=False,
+            device="cpu",
+        )
+        return [(data[0]["invar"], data[0]["cos_zenith"]) for data in datapipe]
+
+    computed = read(None)
+    looked_up = read(tmp_path / "tables")
+    assert len(computed) == len(looked_up) > 0
+    # the tables are computed in float64, the DALI path in float32
+    for (invar, cos_zenith), (table_invar, table_cos_zenith) in zip(
+        computed, looked_up
+    ):
+        assert torch.equal(invar, table_invar)
+        assert cos_zenith.shape == table_cos_zenith.shape == (2, 3, 1, 9, 18)
+        assert torch.allclose(cos_zenith, table_cos_zenith, rtol=0.0, atol=2.5e-3)
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import shutil
 import tempfile
 from dataclasses import dataclass
@@ -258,6 +259,7 @@ def create_basic_dataset(
     scaling_type: Optional[Literal["min_max_scaling", "mean_std_scaling"]] = None,
     volume_factors: Optional[Sequence] = None,
     surface_factors: Optional[Sequence] = None,
+    preprocessed_cache_dir: Optional[Path] = None,
 ):
     """Helper function to create a basic DoMINODataPipe with default settings."""
 
@@ -325,6 +327,7 @@ def create_basic_dataset(
         "gpu_preprocessing": gpu_preprocessing,
         "gpu_output": gpu_output,
         "surface_sampling_algorithm": surface_sampling_algorithm,
+        "preprocessed_cache_dir": preprocessed_cache_dir,
     }
 
     pipe = DoMINODataPipe(
@@ -948,3 +951,442 @@ def test_domino_datapipe_surface_sampling(
 
     sample = dataset[0]
     validate_sample_structure(sample, "surface", gpu_output=True)
+
+
+@pytest.mark.parametrize("volume_sampling_size", [None, 777])
+def test_zarr_reader_parallel_read(tmp_path, volume_sampling_size):
+    """The threaded, chunk split zarr read must match a serial read."""
+    from physicsnemo.datapipes.cae.cae_dataset import ZarrFileReader
+
+    zarr_path = tmp_path / "sample.zarr"
+    root = zarr.open(str(zarr_path), mode="w")
+    arrays = {
+        "stl_coordinates": np.random.randn(1000, 3).astype(np.float32),
+        "stl_faces": np.arange(3000, dtype=np.int32),
+        "air_density": np.float32(1.225),
+        "volume_mesh_centers": np.random.randn(5003, 3).astype(np.float32),
+        "volume_fields": np.random.randn(5003, 5),
+    }
+    for key, value in arrays.items():
+        if np.ndim(value) == 0:
+            root[key] = value
+        else:
+            # Small chunks so large arrays are split across threads:
+            root.create_dataset(key, data=value, chunks=(128,) + value.shape[1:])
+
+    keys = list(arrays.keys())
+    serial = ZarrFileReader(keys, {}, max_workers=1)
+    parallel = ZarrFileReader(keys, {}, max_workers=4)
+    if volume_sampling_size is not None:
+        serial.set_volume_sampling_size(volume_sampling_size)
+        parallel.set_volume_sampling_size(volume_sampling_size)
+
+    np.random.seed(1234)
+    serial_data = serial.read_file(zarr_path)
+    np.random.seed(1234)
+    parallel_data = parallel.read_file(zarr_path)
+    parallel.close()
+
+    assert serial_data.keys() == parallel_data.keys()
+    for key in keys:
+        assert torch.equal(serial_data[key], parallel_data[key]), key
+
+    if volume_sampling_size is None:
+        for key, value in arrays.items():
+            assert np.array_equal(parallel_data[key].numpy(), value), key
+    else:
+        assert parallel_data["volume_fields"].shape == (volume_sampling_size, 5)
+        assert parallel_data["stl_faces"].shape == (3000,)
+
+
+@pytest.mark.parametrize("preload_memory_limit", [None, 1])
+def test_cae_dataset_prefetch_pipeline(zarr_dataset, preload_memory_limit):
+    """Iterating with deep preloading returns every sample and tracks metrics."""
+    keys = ["stl_coordinates", "stl_faces", "volume_mesh_centers"]
+    dataset = CAEDataset(
+        data_dir=zarr_dataset,
+        keys_to_read=keys,
+        keys_to_read_if_available={},
+        output_device=torch.device("cpu"),
+        preload_depth=3,
+        preload_memory_limit=preload_memory_limit,
+    )
+
+    samples = list(iter(dataset))
+    assert len(samples) == len(dataset)
+
+    # Preloaded samples match a direct read:
+    for i, sample in enumerate(samples):
+        reference = dataset[i]
+        for key in keys:
+            assert torch.equal(sample[key], reference[key])
+        assert sample["stl_faces"].dtype == torch.int32
+
+    metrics = dataset.prefetch_metrics()
+    for stage in ["read", "transfer"]:
+        assert metrics[stage]["completed"] == len(dataset)
+        assert metrics[stage]["queued"] == 0
+        assert metrics[stage]["active"] == 0
+        assert metrics[stage]["max_occupancy"] >= 1
+    assert metrics["in_flight_bytes"] == 0
+    assert metrics["in_flight_samples"] == 0
+    assert metrics["consumer_wait_time"] >= 0.0
+
+    dataset.close()
+
+
+def test_cae_dataset_memory_budget_reservation(zarr_dataset):
+    """Reads reserve budget before they start, and dropping releases it."""
+    dataset = CAEDataset(
+        data_dir=zarr_dataset,
+        keys_to_read=["stl_coordinates", "stl_faces"],
+        keys_to_read_if_available={},
+        output_device=torch.device("cpu"),
+        preload_depth=3,
+        preload_memory_limit=1,
+    )
+
+    for idx in range(3):
+        dataset.preload(idx)
+    dataset._preload_queue[0].result()
+    # The first sample fills the budget, the other reads wait for it:
+    metrics = dataset.prefetch_metrics()
+    assert metrics["in_flight_samples"] == 1
+    assert metrics["read"]["completed"] == 1
+
+    # Nothing is consumed, dropping the samples frees the budget:
+    dataset.reset()
+    metrics = dataset.prefetch_metrics()
+    assert metrics["in_flight_bytes"] == 0
+    assert metrics["in_flight_samples"] == 0
+
+    samples = list(iter(dataset))
+    assert len(samples) == len(dataset)
+    assert dataset.prefetch_metrics()["in_flight_samples"] == 0
+
+    dataset.close()
+
+
+def test_pinned_buffer_pool():
+    """Pinned buffers are shared across shapes of a bucket and capped in size."""
+    if not torch.cuda.is_available():
+        pytest.skip("Pinned memory requires CUDA")
+    from physicsnemo.datapipes.cae.cae_dataset import _PinnedBufferPool
+
+    class _Done:
+        def query(self):
+            return True
+
+    pool = _PinnedBufferPool(max_buffers_per_bucket=2, max_bytes=4096)
+    buffer = pool.acquire(torch.Size([10, 3]), torch.float32)
+    assert buffer.shape == (10, 3) and buffer.is_pinned()
+    assert pool.total_bytes == 128
+    pool.release_after(_Done(), [buffer])
+
+    # Another shape of the same bucket reuses the buffer:
+    reused = pool.acquire(torch.Size([25]), torch.int32)
+    assert reused.data_ptr() == buffer.data_ptr()
+    assert pool.total_bytes == 128
+    pool.release_after(_Done(), [reused])
+
+    # Free buffers are dropped to make room, and oversized requests are not kept:
+    large = pool.acquire(torch.Size([1024]), torch.float32)
+    assert pool.total_bytes == 4096
+    oversized = pool.acquire(torch.Size([2048]), torch.float32)
+    pool.release_after(_Done(), [large, oversized])
+    pool.acquire(torch.Size([1]), torch.uint8)
+    assert pool.total_bytes <= 4096
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+@pytest.mark.parametrize("volume_sampling_size", [None, 777])
+def test_mmap_readers(tmp_path, compressed, volume_sampling_size):
+    """Memory-mapped npz and npy directory reads must match a regular read."""
+    from physicsnemo.datapipes.cae.cae_dataset import (
+        NpyDirectoryReader,
+        NpzFileReader,
+        is_npy_directory,
+    )
+
+    arrays = {
+        "stl_coordinates": np.random.randn(1000, 3).astype(np.float32),
+        "stl_faces": np.arange(3000, dtype=np.int32),
+        "air_density": np.float32(1.225),
+        "volume_mesh_centers": np.random.randn(5003, 3).astype(np.float32),
+        "volume_fields": np.asfortranarray(np.random.randn(5003, 5)),
+    }
+    npz_path = tmp_path / "sample.npz"
+    (np.savez_compressed if compressed else np.savez)(npz_path, **arrays)
+    npy_dir = tmp_path / "sample"
+    npy_dir.mkdir()
+    for key, value in arrays.items():
+        np.save(npy_dir / f"{key}.npy", value)
+    assert is_npy_directory(npy_dir)
+    assert not is_npy_directory(npz_path)
+
+    keys = list(arrays.keys())
+    readers = [
+        NpzFileReader(keys, {}, mmap_mode="r"),
+        NpyDirectoryReader(keys, {}),
+    ]
+    if volume_sampling_size is not None:
+        for reader in readers:
+            reader.set_volume_sampling_size(volume_sampling_size)
+
+    np.random.seed(1234)
+    npz_data = readers[0].read_file(npz_path)
+    np.random.seed(1234)
+    npy_data = readers[1].read_file(npy_dir)
+
+    for key, value in arrays.items():
+        assert torch.equal(npz_data[key], npy_data[key]), key
+        if volume_sampling_size is None or "volume" not in key:
+            assert np.array_equal(npz_data[key].numpy(), value), key
+    if volume_sampling_size is not None:
+        assert npz_data["volume_fields"].shape == (volume_sampling_size, 5)
+
+    regular = NpzFileReader(keys, {})
+    if volume_sampling_size is None:
+        regular_data = regular.read_file(npz_path)
+        for key in keys:
+            assert torch.equal(regular_data[key], npz_data[key]), key
+    else:
+        with pytest.raises(NotImplementedError):
+            regular.set_volume_sampling_size(volume_sampling_size)
+
+    # Volume fields can be read without their mesh centers:
+    for reader, path in [
+        (NpzFileReader(["volume_fields"], {}, mmap_mode="r"), npz_path),
+        (NpyDirectoryReader(["volume_fields"], {}), npy_dir),
+    ]:
+        assert set(reader.read_file(path).keys()) == {"volume_fields"}
+
+
+def test_preprocessed_sample_cache(tmp_path):
+    """Entries round trip, are keyed on content and evicted least recently used."""
+    from physicsnemo.datapipes.cae.preprocessed_cache import PreprocessedSampleCache
+
+    raw = {"stl_coordinates": torch.randn(100, 3)}
+    cache = PreprocessedSampleCache(tmp_path, max_size=2 * 100 * 3 * 4 + 1024)
+
+    key = cache.key(raw, {"grid_resolution": [4, 4, 4]})
+    assert key == cache.key(
+        {k: v.clone() for k, v in raw.items()}, {"grid_resolution": [4, 4, 4]}
+    )
+    assert key != cache.key(raw, {"grid_resolution": [8, 4, 4]})
+    assert key != cache.key({"stl_coordinates": raw["stl_coordinates"] + 1}, {})
+    assert cache.get(key) is None
+
+    cache.put(key, {"a": raw["stl_coordinates"], "b": torch.tensor(3)})
+    # A concurrent writer of the same key is a no-op:
+    cache.put(key, {"a": raw["stl_coordinates"]})
+    entry = cache.get(key)
+    assert torch.equal(entry["a"], raw["stl_coordinates"])
+    assert entry["b"].item() == 3
+    assert len(cache) == 1
+    # Entries are not copied on load, and writes to them stay private:
+    entry["a"].zero_()
+    assert torch.equal(cache.get(key)["a"], raw["stl_coordinates"])
+
+    # Keys on the source file follow its identity, not the contents:
+    source = tmp_path / "sample.npy"
+    np.save(source, raw["stl_coordinates"].numpy())
+    source_key = cache.key(raw, {}, source=source)
+    assert source_key == cache.key({k: v + 1 for k, v in raw.items()}, {}, source)
+    assert source_key != cache.key(
+        {"volume_fields": raw["stl_coordinates"]}, {}, source
+    )
+    assert source_key != cache.key(raw, {"grid_resolution": [4, 4, 4]}, source)
+    os.utime(source, (0, 0))
+    assert source_key != cache.key(raw, {}, source=source)
+
+    # Only two entries fit, so the least recently used one goes:
+    cache.clear()
+    keys = [cache.key(raw, {"i": i}) for i in range(3)]
+    for k in keys[:2]:
+        cache.put(k, {"a": raw["stl_coordinates"]})
+        os.utime(tmp_path / k, (0, 0))
+    cache.get(keys[0])
+    cache.put(keys[2], {"a": raw["stl_coordinates"]})
+    assert keys[0] in cache and keys[2] in cache
+    assert keys[1] not in cache
+    assert cache.size() <= cache.max_size
+    assert not any(p.name.startswith(".tmp-") for p in tmp_path.iterdir())
+
+
+@import_or_fail(["warp"])
+@pytest.mark.parametrize("model_type", ["surface", "volume", "combined"])
+def test_domino_datapipe_preprocessed_cache(
+    npz_dataset, tmp_path, model_type, pytestconfig
+):
+    """Cached samples match freshly processed ones, and only affected entries miss."""
+
+    def make_pipe(**kwargs):
+        return create_basic_dataset(
+            npz_dataset, model_type, preprocessed_cache_dir=tmp_path, **kwargs
+        )
+
+    reference = create_basic_dataset(npz_dataset, model_type)[0]
+
+    pipe = make_pipe()
+    first = pipe[0]
+    # One geometry entry plus one complete sample:
+    assert len(pipe.preprocessed_cache) == 2
+    second = make_pipe()[0]
+    assert len(pipe.preprocessed_cache) == 2
+    for key in reference:
+        assert torch.allclose(reference[key], first[key]), key
+        assert torch.equal(first[key], second[key]), key
+
+    # Different normalization factors only add a sample entry:
+    scaled = make_pipe(
+        scaling_type="min_max_scaling",
+        volume_factors=np.array([[1.0] * 5, [0.0] * 5], dtype=np.float32),
+        surface_factors=np.array([[1.0] * 4, [0.0] * 4], dtype=np.float32),
+    )[0]
+    assert len(pipe.preprocessed_cache) == 3
+    for key in reference:
+        if "grid" in key:
+            assert torch.equal(scaled[key], first[key]), key
+
+    # Sampling still uses the cached geometry, but not a complete sample:
+    make_pipe(sampling=True, volume_points_sample=100, surface_points_sample=100)[0]
+    assert len(pipe.preprocessed_cache) == 3
+
+
+@import_or_fail(["warp"])
+def test_domino_datapipe_preprocessed_cache_invalid(
+    zarr_dataset, tmp_path, pytestconfig
+):
+    """The preprocessed cache can not be combined with domain parallelism."""
+    with pytest.raises(ValueError, match="does not support domain parallelism"):
+        DoMINODataConfig(
+            data_path=zarr_dataset,
+            phase="test",
+            shard_points=True,
+            preprocessed_cache_dir=tmp_path,
+        )
+
+
+@import_or_fail(["warp"])
+@pytest.mark.parametrize("model_type", ["surface", "volume", "combined"])
+def test_domino_datapipe_process_batch(npz_dataset, model_type, pytestconfig):
+    """The batched path matches the per sample path on every sampled point."""
+    from physicsnemo.utils.neighbors import knn
+    from physicsnemo.utils.sdf import SignedDistanceField
+
+    pipe = create_basic_dataset(
+        npz_dataset,
+        model_type,
+        sampling=True,
+        volume_points_sample=500,
+        surface_points_sample=300,
+    )
+    raw = [pipe.dataset[i] for i in range(len(pipe.dataset))]
+    batch = pipe.process_batch(raw)
+    single = [pipe(sample) for sample in raw]
+
+    assert batch.keys() == single[0].keys()
+    for key in batch:
+        assert batch[key].shape == (len(raw),) + single[0][key].shape[1:], key
+
+    def match_rows(sampled, full):
+        # Index of every sampled row in the full array:
+        match = (sampled[:, None] == full[None]).all(dim=-1)
+        assert bool(match.any(dim=1).all())
+        return match.to(torch.int8).argmax(dim=1)
+
+    for b, sample in enumerate(raw):
+        for key in ["sdf_surf_grid", "surf_grid", "grid", "sdf_grid"]:
+            if key in batch:
+                assert torch.allclose(batch[key][b], single[b][key][0]), key
+
+        if model_type in ["surface", "combined"]:
+            centers = batch["surface_mesh_centers"][b]
+            idx = match_rows(centers, sample["surface_mesh_centers"])
+            assert torch.equal(
+                batch["surface_fields"][b], sample["surface_fields"][idx]
+            )
+            neighbors, _ = knn(sample["surface_mesh_centers"], centers, k=5)
+            assert torch.equal(
+                batch["surface_mesh_neighbors"][b],
+                sample["surface_mesh_centers"][neighbors[:, 1:]],
+            )
+
+        if model_type in ["volume", "combined"]:
+            centers = batch["volume_mesh_centers"][b]
+            idx = match_rows(centers, sample["volume_mesh_centers"])
+            assert torch.equal(batch["volume_fields"][b], sample["volume_fields"][idx])
+            sdf = SignedDistanceField(
+                sample["stl_coordinates"],
+                sample["stl_faces"].to(torch.int32),
+                use_sign_winding_number=True,
+            )
+            assert torch.allclose(batch["sdf_nodes"][b], sdf(centers)[0][:, None])
+
+
+def test_compute_mean_std_min_max(npz_dataset, tmp_path, monkeypatch):
+    """Parallel and resumed statistics match a direct computation."""
+    from physicsnemo.datapipes.cae.cae_dataset import compute_mean_std_min_max
+
+    keys = ["surface_fields", "volume_fields"]
+    dataset = CAEDataset(
+        data_dir=npz_dataset,
+        keys_to_read=keys,
+        keys_to_read_if_available={},
+        output_device=torch.device("cpu"),
+        preload_depth=0,
+    )
+    all_data = [dataset[i] for i in range(len(dataset))]
+
+    def check(stats):
+        for key, mean, std, min_val, max_val in zip(keys, *[s.values() for s in stats]):
+            values = torch.cat([d[key] for d in all_data]).to(torch.float64)
+            assert torch.allclose(mean, values.mean(0))
+            assert torch.allclose(std, values.std(0))
+            # Gaussian data has no values beyond 9 standard deviations:
+            assert torch.allclose(min_val, values.amin(0).float())
+            assert torch.allclose(max_val, values.amax(0).float())
+
+    check(compute_mean_std_min_max(dataset, keys, max_samples=10))
+    check(compute_mean_std_min_max(dataset, keys, num_workers=2))
+
+    # The workers read with the reader settings of the dataset:
+    mmap_dataset = CAEDataset(
+        data_dir=npz_dataset,
+        keys_to_read=keys,
+        keys_to_read_if_available={},
+        output_device=torch.device("cpu"),
+        preload_depth=0,
+        mmap_mode="r",
+    )
+    assert mmap_dataset._reader_kwargs == {"mmap_mode": "r"}
+    check(compute_mean_std_min_max(mmap_dataset, keys, num_workers=2))
+
+    # Interrupt a run after two files, then resume it:
+    checkpoint = tmp_path / "statistics.pt"
+    reads = []
+    getitem = CAEDataset.__getitem__
+
+    def failing_getitem(self, idx):
+        if len(reads) == 2:
+            raise RuntimeError("interrupted")
+        reads.append(idx)
+        return getitem(self, idx)
+
+    monkeypatch.setattr(CAEDataset, "__getitem__", failing_getitem)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        compute_mean_std_min_max(dataset, keys, checkpoint_path=checkpoint)
+    assert checkpoint.exists()
+
+    # Only the third file is read again for the moments, then all for min/max:
+    reads.clear()
+
+    def counting_getitem(self, idx):
+        reads.append(idx)
+        return getitem(self, idx)
+
+    monkeypatch.setattr(CAEDataset, "__getitem__", counting_getitem)
+    check(compute_mean_std_min_max(dataset, keys, checkpoint_path=checkpoint))
+    assert len(reads) == 1 + len(dataset)
+    assert not checkpoint.exists()
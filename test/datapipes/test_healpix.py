@@ -471,6 +471,72 @@ def test_TimeSeriesDataset_get(
     zarr_ds.close()
 
 
+@import_or_fail("omegaconf")
+@import_or_fail("netCDF4")
+@import_or_fail("numpy")
+def test_TimeSeriesDataset_reuse_buffers(
+    data_dir, dataset_name, scaling_double_dict, pytestconfig
+):
+    from physicsnemo.datapipes.healpix.timeseries_dataset import TimeSeriesDataset
+
+    # open our test dataset
+    ds_path = Path(data_dir, dataset_name + ".zarr")
+    zarr_ds = xr.open_zarr(ds_path)
+
+    kwargs = dict(
+        dataset=zarr_ds,
+        scaling=scaling_double_dict,
+        input_time_dim=2,
+        output_time_dim=2,
+        batch_size=2,
+        drop_last=True,
+        add_insolation=True,
+    )
+    timeseries_ds = TimeSeriesDataset(**kwargs)
+    reuse_ds = TimeSeriesDataset(reuse_buffers=True, insolation_cache_size=0, **kwargs)
+
+    for idx in range(len(timeseries_ds)):
+        inputs, targets = timeseries_ds[idx]
+        reuse_inputs, reuse_targets = reuse_ds[idx]
+        for x, y in zip(inputs, reuse_inputs):
+            assert np.array_equal(x, y)
+        assert np.array_equal(targets, reuse_targets)
+
+        # gathered windows match the per-sample time indices
+        targets_expected = (
+            zarr_ds.targets[idx * 2 + timeseries_ds._output_indices[0][0]]
+            .transpose("face", "channel_out", "height", "width")
+            .to_numpy()
+            / 2
+        )
+        assert np.array_equal(targets[0][:, 0], targets_expected)
+
+    # the same buffers are handed out for every batch
+    assert reuse_ds[0][1] is reuse_ds[1][1]
+    assert timeseries_ds[0][1] is not timeseries_ds[1][1]
+
+    # forecast mode only reads the input time steps
+    forecast_ds = TimeSeriesDataset(
+        dataset=zarr_ds,
+        scaling=scaling_double_dict,
+        input_time_dim=2,
+        output_time_dim=2,
+        batch_size=1,
+        add_insolation=True,
+        forecast_init_times=zarr_ds.time[2:4],
+    )
+    inputs = forecast_ds[0]
+    inputs_expected = (
+        zarr_ds.inputs[[0, 2]]
+        .transpose("face", "time", "channel_in", "height", "width")
+        .to_numpy()
+        / 2
+    )
+    assert np.array_equal(inputs[0][0], inputs_expected)
+    assert inputs[1].shape[2] == 4
+    zarr_ds.close()
+
+
 @import_or_fail("omegaconf")
 @import_or_fail("netCDF4")
 def test_TimeSeriesDataModule_initialization(
@@ -105,6 +105,53 @@ def test_graph_construction(device, pytestconfig):
     assert not any((edge_index[0] == 0) & (edge_index[1] == 2))
 
 
+@import_or_fail(["tensorflow", "torch_geometric", "torch_scatter"])
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_graph_construction_batched(device, pytestconfig):
+    from physicsnemo.datapipes.gnn.lagrangian_dataset import compute_edge_index
+
+    torch.manual_seed(0)
+    radius = 0.1
+    pos = torch.rand(600, 2, device=device)
+    batch = torch.repeat_interleave(torch.arange(3, device=device), 200)
+
+    edge_index = compute_edge_index(pos, radius, batch)
+
+    expected = []
+    for scene in range(3):
+        scene_pos = pos[batch == scene]
+        distances = torch.cdist(
+            scene_pos, scene_pos, compute_mode="donot_use_mm_for_euclid_dist"
+        )
+        expected.append(torch.nonzero(distances < radius).t() + 200 * scene)
+    assert torch.equal(edge_index, torch.cat(expected, dim=1))
+
+
+@import_or_fail(["tensorflow", "torch_geometric", "torch_scatter"])
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_verlet_neighbor_list(device, pytestconfig):
+    from physicsnemo.datapipes.gnn.lagrangian_dataset import (
+        VerletNeighborList,
+        compute_edge_index,
+    )
+
+    torch.manual_seed(0)
+    radius = 0.05
+    pos = torch.rand(500, 2, device=device)
+    velocity = 0.002 * torch.randn(500, 2, device=device)
+
+    neighbors = VerletNeighborList(radius, skin=0.02)
+    for _ in range(50):
+        pos = pos + velocity
+        assert torch.equal(neighbors.update(pos), compute_edge_index(pos, radius))
+
+    # The candidates are reused for most steps:
+    assert 1 < neighbors.num_rebuilds < 50
+
+    neighbors.reset()
+    assert neighbors.needs_rebuild(pos)
+
+
 @import_or_fail(["tensorflow", "dgl", "torch_geometric", "torch_scatter"])
 @pytest.mark.parametrize("split", ["train", "valid", "test"])
 def test_lagrangian_dgl_pyg_equivalence(data_dir, split, pytestconfig):
@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests saving unevenly sharded ShardTensors with torch.distributed.checkpoint,
+and loading them back with a different sharding.
+"""
+
+import pytest
+
+from physicsnemo.utils.version_check import check_module_requirements
+
+try:
+    check_module_requirements("physicsnemo.distributed.shard_tensor")
+    import torch.distributed.checkpoint as dcp
+    from torch.distributed.tensor.placement_types import Shard
+
+    from physicsnemo.distributed.shard_tensor import ShardTensor
+
+except ImportError:
+    pytest.skip(
+        "Skipping test because physicsnemo.distributed.shard_tensor is not available",
+        allow_module_level=True,
+    )
+
+import torch
+import torch.distributed as dist
+
+from physicsnemo.distributed import DistributedManager
+
+
+def _uneven_shard_tensor(full, sizes, mesh):
+    rank = mesh.get_local_rank()
+    offset = sum(sizes[:rank])
+    local = full[offset : offset + sizes[rank]].clone()
+    sharding_shapes = {0: tuple(torch.Size([n, *full.shape[1:]]) for n in sizes)}
+    return ShardTensor.from_local(local, mesh, [Shard(0)], sharding_shapes)
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.multigpu_static
+def test_shard_tensor_checkpoint(distributed_mesh, tmp_path_factory):
+    dm = DistributedManager()
+    world_size = distributed_mesh.size()
+
+    # Same directory on every rank
+    checkpoint_dirs = [str(tmp_path_factory.mktemp("shard_tensor_checkpoint"))]
+    dist.broadcast_object_list(checkpoint_dirs, src=0)
+    checkpoint_dir = checkpoint_dirs[0]
+
+    torch.manual_seed(0)
+    num_rows = 3 * world_size + 1
+    full = torch.randn(num_rows, 5).to(dm.device)
+
+    # Save with the extra row on the last rank
+    sizes = [3] * world_size
+    sizes[-1] += 1
+    dcp.save(
+        {"w": _uneven_shard_tensor(full, sizes, distributed_mesh)},
+        storage_writer=dcp.FileSystemWriter(checkpoint_dir),
+    )
+
+    # Load with the extra row on the first rank
+    sizes = [3] * world_size
+    sizes[0] += 1
+    state_dict = {
+        "w": _uneven_shard_tensor(torch.zeros_like(full), sizes, distributed_mesh)
+    }
+    dcp.load(state_dict, storage_reader=dcp.FileSystemReader(checkpoint_dir))
+    offset = sum(sizes[: distributed_mesh.get_local_rank()])
+    expected = full[offset : offset + sizes[distributed_mesh.get_local_rank()]]
+    assert torch.equal(state_dict["w"].to_local(), expected)
+
+    # Load unsharded, as with a world size of one
+    state_dict = {"w": torch.zeros_like(full)}
+    dcp.load(
+        state_dict, storage_reader=dcp.FileSystemReader(checkpoint_dir), no_dist=True
+    )
+    assert torch.equal(state_dict["w"], full)
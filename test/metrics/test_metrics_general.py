@@ -713,6 +713,63 @@ def test_means_var(device, rtol: float = 1e-3, atol: float = 1e-3):
         del os.environ["MASTER_PORT"]
 
 
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_ensemble_metrics_merge(device, rtol: float = 1e-3, atol: float = 1e-3):
+    x = torch.randn((24, 1, 12, 24), device=device)
+    chunks = torch.split(x, [7, 1, 10, 6])
+
+    # Partial means and variances over chunks merge to the full statistics
+    means = [em.Mean((1, 12, 24), device=device) for _ in chunks]
+    variances = [em.Variance((1, 12, 24), device=device, chunk_size=50) for _ in chunks]
+    for M, V, chunk in zip(means, variances, chunks):
+        M.update(chunk)
+        V.update(chunk)
+    M = means[0].merge(*means[1:])
+    V = variances[0].merge(*variances[1:])
+    assert M.n == 24 and V.n == 24
+    assert torch.allclose(M.finalize(), torch.mean(x, dim=0), rtol=rtol, atol=atol)
+    assert torch.allclose(V.mean, torch.mean(x, dim=0), rtol=rtol, atol=atol)
+    assert torch.allclose(V.finalize(), torch.var(x, dim=0), rtol=rtol, atol=atol)
+
+    # Chunked updates match a single update
+    V_full = em.Variance((1, 12, 24), device=device)
+    V_full.update(x)
+    assert torch.allclose(V_full.finalize(), V.finalize(), rtol=rtol, atol=atol)
+
+    # States round-trip
+    V_resumed = em.Variance((1, 12, 24), device=device)
+    V_resumed.load_state_dict(V.state_dict())
+    assert torch.allclose(V_resumed.finalize(), V.finalize())
+    with pytest.raises(KeyError):
+        V_resumed.load_state_dict({"sum": V.sum})
+    with pytest.raises(ValueError):
+        V.merge(em.Variance((1, 6, 24), device=device))
+    with pytest.raises(TypeError):
+        V.merge(M)
+
+    # Histograms with a shared lattice merge to the sequential histogram
+    H = hist.Histogram((24, 1, 12, 24), bins=10, device=device)
+    H_parts = [hist.Histogram((24, 1, 12, 24), bins=10, device=device) for _ in chunks]
+    for H_part, chunk in zip(H_parts, chunks):
+        H.update(chunk)
+        H_part.update(chunk)
+    H_merged = H_parts[0].merge(*H_parts[1:])
+    assert torch.all(torch.sum(H_merged.counts, dim=0) == 24)
+    assert torch.allclose(H_merged.bin_edges, H.bin_edges, rtol=rtol, atol=atol)
+    assert torch.equal(H_merged.counts, H.counts)
+
+    H_resumed = hist.Histogram((24, 1, 12, 24), bins=10, device=device)
+    H_resumed.load_state_dict(H_merged.state_dict())
+    assert H_resumed.number_of_bins == H_merged.counts.shape[0]
+    assert torch.equal(H_resumed.counts, H_merged.counts)
+
+    # Histograms binned from their own extrema do not share a lattice
+    H_other = hist.Histogram((24, 1, 12, 24), bins=10, device=device)
+    H_other(x)
+    with pytest.raises(ValueError):
+        H_resumed.merge(H_other)
+
+
 @pytest.mark.parametrize("device", ["cuda:0", "cpu"])
 def test_calibration(device, rtol: float = 1e-2, atol: float = 1e-2):
     x = torch.randn((10_000, 30, 30), device=device, dtype=torch.float32)
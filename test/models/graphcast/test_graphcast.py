@@ -22,6 +22,7 @@ sys.path.append(os.path.join(os.path.dirname(script_path), ".."))
 
 import common
 import pytest
+import torch
 from graphcast.utils import create_random_input, fix_random_seeds
 from pytest_utils import import_or_fail
 
@@ -68,6 +69,19 @@ def test_graphcast_forward(
 
     assert common.validate_forward_accuracy(model, (x,), rtol=1e-2)
 
+    # The sparse k-hop attention processor does not need Transformer Engine,
+    # and must produce the same output layout as the dense processors
+    sparse_model = GraphCastNet(
+        **model_kwds,
+        processor_type="GraphTransformer",
+        khop_neighbors=2,
+        num_attention_heads=2,
+        sparse_attention=True,
+    ).to(device)
+    sparse_out = sparse_model(x)
+    assert sparse_out.shape == model(x).shape
+    assert torch.isfinite(sparse_out).all()
+
 
 @import_or_fail("dgl")
 @pytest.mark.parametrize("device", ["cuda:0", "cpu"])
@@ -112,6 +126,22 @@ def test_graphcast_constructor(
             "do_concat_trick": False,
             "graph_backend": backend,
         },
+        {
+            "mesh_level": 1,
+            "input_res": (res_h, res_w),
+            "input_dim_grid_nodes": num_channels_2,
+            "input_dim_mesh_nodes": 3,
+            "input_dim_edges": 4,
+            "output_dim_grid_nodes": num_channels_2,
+            "processor_layers": 4,
+            "hidden_dim": 8,
+            "multimesh": False,
+            "processor_type": "GraphTransformer",
+            "khop_neighbors": 2,
+            "num_attention_heads": 2,
+            "sparse_attention": True,
+            "graph_backend": backend,
+        },
     ]
     for kw_args in arg_list:
         # Construct GraphCast model
@@ -241,3 +241,36 @@ def test_fnodeploy(device, dimension):
 
     assert common.validate_onnx_export(model, (invar,))
     assert common.validate_onnx_runtime(model, (invar,))
+
+
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+@pytest.mark.parametrize("dimension", [1, 2, 3, 4])
+def test_fno_meshgrid_cache(device, dimension):
+    """Test FNO coordinate grid is cached and rebuilt for new shapes"""
+    model = FNO(
+        in_channels=1,
+        out_channels=1,
+        dimension=dimension,
+        latent_channels=4,
+        num_fno_layers=1,
+        num_fno_modes=2,
+    ).to(device)
+    encoder = model.spec_encoder
+
+    for size in [5, 6]:
+        shape = [3, 1] + [size] * dimension
+        grid = encoder.meshgrid(shape, torch.device(device))
+        assert grid.shape == torch.Size([3, dimension] + [size] * dimension)
+        assert grid.dtype == torch.float32
+        # Cached grid is shared by the whole batch
+        assert grid.stride(0) == 0
+        assert torch.equal(grid[0], grid[-1])
+        assert (
+            grid.data_ptr() == encoder.meshgrid(shape, torch.device(device)).data_ptr()
+        )
+
+        axis = torch.linspace(0, 1, size, device=device)
+        for i in range(dimension):
+            index = [0, i] + [0] * dimension
+            index[2 + i] = slice(None)
+            assert torch.equal(grid[tuple(index)], axis)
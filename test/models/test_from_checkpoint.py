@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import struct
 from pathlib import Path
 
 import pytest
@@ -122,3 +123,47 @@ def test_from_checkpoint_override(device):
         )
 
     Path("checkpoint.mdlus").unlink(missing_ok=False)
+
+
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_from_checkpoint_mmap_format(device, tmp_path):
+    """Test memory-mappable checkpoints"""
+    import zipfile
+
+    torch.manual_seed(0)
+    file_name = str(tmp_path / "checkpoint.mdlus")
+
+    mock_model = MockModel().to(device)
+    mock_model.layer.register_buffer("mask", torch.rand(3, 5) > 0.5)
+    mock_model.layer.register_buffer("bf16", torch.randn(7, dtype=torch.bfloat16))
+    mock_model.layer.register_buffer("empty", torch.zeros(0, 4))
+    mock_model.save(file_name, mmap_format=True)
+
+    # The tensor table is stored uncompressed, at an aligned offset
+    with zipfile.ZipFile(file_name) as archive:
+        assert "model.pt" not in archive.namelist()
+        info = archive.getinfo("tensors.bin")
+        assert info.compress_type == zipfile.ZIP_STORED
+    with open(file_name, "rb") as f:
+        f.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", f.read(4))
+    assert (info.header_offset + 30 + name_length + extra_length) % 64 == 0
+
+    # Load into an instantiated model
+    loaded = MockModel().to(device)
+    loaded.layer.register_buffer("mask", torch.zeros(3, 5, dtype=torch.bool))
+    loaded.layer.register_buffer("bf16", torch.zeros(7, dtype=torch.bfloat16))
+    loaded.layer.register_buffer("empty", torch.ones(0, 4))
+    loaded.load(file_name)
+    for key, value in mock_model.state_dict().items():
+        assert torch.equal(loaded.state_dict()[key], value)
+
+    # Instantiate from the checkpoint
+    mock_model = MockModel().to(device)
+    mock_model.save(file_name, mmap_format=True)
+    loaded = MockModel.from_checkpoint(file_name)
+    for key, value in mock_model.state_dict().items():
+        assert torch.equal(loaded.state_dict()[key], value.cpu())
+
+    with pytest.raises(ValueError):
+        mock_model.save(file_name, legacy_format=True, mmap_format=True)
@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+import torch
+
+from physicsnemo.models.layers.attention_layers import SparseSelfAttention
+
+
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_sparse_self_attention(device):
+    """Test that sparse attention matches dense attention with a boolean mask"""
+    torch.manual_seed(0)
+    num_nodes, dim, num_heads = 40, 16, 4
+
+    # Random neighborhoods, every node attends at least to itself
+    mask = torch.rand(num_nodes, num_nodes, device=device) < 0.2
+    mask |= torch.eye(num_nodes, dtype=torch.bool, device=device)
+    rows, cols = mask.nonzero(as_tuple=True)
+
+    attention = SparseSelfAttention(dim, num_heads).to(device)
+    x = torch.randn(num_nodes, dim, device=device, requires_grad=True)
+    out = attention(x, rows, cols)
+
+    q, k, v = (
+        attention.qkv(x)
+        .reshape(num_nodes, 3, num_heads, dim // num_heads)
+        .permute(1, 2, 0, 3)
+    )
+    expected = torch.nn.functional.scaled_dot_product_attention(q, k, v, attn_mask=mask)
+    expected = attention.proj(expected.permute(1, 0, 2).reshape(num_nodes, dim))
+    assert torch.allclose(out, expected, atol=1e-5)
+
+    grad = torch.autograd.grad(out.square().sum(), x)[0]
+    expected_grad = torch.autograd.grad(expected.square().sum(), x)[0]
+    assert torch.allclose(grad, expected_grad, atol=1e-5)
+
+    with pytest.raises(ValueError):
+        SparseSelfAttention(dim, 3)
@@ -59,3 +59,51 @@ def test_register_and_factory(device):
         outvar = model(invar)
         assert outvar.shape == invar.shape
         assert outvar.device == invar.device
+
+
+def test_registry_entry_point_cache(tmp_path, monkeypatch):
+    """Entry points are cached on disk and resolved lazily"""
+    from physicsnemo.registry import model_registry
+
+    monkeypatch.setenv("PHYSICSNEMO_REGISTRY_CACHE", str(tmp_path))
+    scans = []
+
+    def _scan():
+        scans.append(1)
+        return {
+            "physicsnemo.models": [["MockEntry", "physicsnemo.models.module:Module"]],
+            "modulus.models": [],
+        }
+
+    monkeypatch.setattr(model_registry, "_scan_entry_points", _scan)
+
+    # The first lookup scans the entry points and writes the cache
+    groups = model_registry._cached_entry_points()
+    assert groups["physicsnemo.models"] == [
+        ["MockEntry", "physicsnemo.models.module:Module"]
+    ]
+    assert len(scans) == 1
+    assert len(list(tmp_path.glob("entry_points-*.json"))) == 1
+
+    # Later lookups read the cache
+    assert model_registry._cached_entry_points() == groups
+    assert len(scans) == 1
+
+    # The cache can be disabled
+    monkeypatch.setenv("PHYSICSNEMO_REGISTRY_CACHE", "0")
+    model_registry._cached_entry_points()
+    assert len(scans) == 2
+
+    # Models are only imported when requested
+    registry = ModelRegistry()
+    try:
+        registry.__clear_registry__()
+        registry._model_registry.update(
+            model_registry.ModelRegistry._construct_registry()
+        )
+        assert "MockEntry" in registry.list_models()
+        assert registry.factory("MockEntry") is Module
+    finally:
+        registry.__clear_registry__()
+        monkeypatch.undo()
+        registry.__restore_registry__()
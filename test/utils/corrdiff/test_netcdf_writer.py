@@ -20,6 +20,7 @@ from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
+import torch
 from pytest_utils import import_or_fail
 
 
@@ -183,3 +184,106 @@ def test_write_time(mock_ncfile, pytestconfig):
         )
         mock_ncfile["time"][time_index] = 0
         mock_ncfile["time"].__setitem__.assert_called_with(time_index, 0)
+
+
+def _channels(names):
+    channels = []
+    for name in names:
+        channel = MagicMock()
+        channel.name = name
+        channel.level = ""
+        channels.append(channel)
+    return channels
+
+
+def _write_rollout(writer, inputs, truth, prediction):
+    for t in range(truth.shape[1]):
+        writer.write_time(t, datetime.datetime(2024, 1, 1, t))
+        writer.write_input("a", t, inputs[t])
+        writer.write_truth("b", t, truth[0, t])
+        # out of order ensemble members are merged as well
+        for e in reversed(range(prediction.shape[0])):
+            writer.write_prediction("b", t, e, torch.from_numpy(prediction[e, t]))
+
+
+@import_or_fail(["cftime", "netCDF4"])
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_netcdf_writer_rollout(asynchronous, tmp_path, pytestconfig):
+    import netCDF4 as nc
+
+    from physicsnemo.utils.corrdiff import NetCDFWriter
+
+    rng = np.random.default_rng(0)
+    lat, lon = np.meshgrid(np.arange(3.0), np.arange(4.0), indexing="ij")
+    inputs = rng.random((5, 3, 4), dtype=np.float32)
+    truth = rng.random((1, 5, 3, 4), dtype=np.float32)
+    prediction = rng.random((6, 5, 3, 4), dtype=np.float32)
+
+    with nc.Dataset(tmp_path / "out.nc", "w") as f:
+        writer = NetCDFWriter(
+            f,
+            lat,
+            lon,
+            _channels(["a"]),
+            _channels(["b"]),
+            asynchronous=asynchronous,
+            max_queue_size=4,
+            chunk_sizes={"ensemble": 2},
+            compression={"compression": "zlib", "complevel": 1},
+        )
+        _write_rollout(writer, inputs, truth, prediction)
+        writer.close()
+        # closed writers do not accept more data
+        if asynchronous:
+            with pytest.raises(RuntimeError):
+                writer.write_input("a", 0, inputs[0])
+            with pytest.raises(RuntimeError):
+                writer.write_time(0, datetime.datetime(2000, 1, 1))
+
+    with nc.Dataset(tmp_path / "out.nc", "r") as f:
+        assert np.array_equal(f["input"]["a"][:], inputs)
+        assert np.array_equal(f["truth"]["b"][:], truth[0])
+        assert np.array_equal(f["prediction"]["b"][:], prediction)
+        assert f["prediction"]["b"].chunking() == [2, 1, 3, 4]
+        times = nc.num2date(f["time"][:], f["time"].units, f["time"].calendar)
+        assert [t.hour for t in times] == list(range(5))
+
+
+@import_or_fail(["cftime", "zarr"])
+@pytest.mark.parametrize("asynchronous", [False, True])
+def test_zarr_writer_rollout(asynchronous, tmp_path, pytestconfig):
+    import zarr
+
+    from physicsnemo.utils.corrdiff import ZarrWriter
+
+    rng = np.random.default_rng(0)
+    lat, lon = np.meshgrid(np.arange(3.0), np.arange(4.0), indexing="ij")
+    inputs = rng.random((5, 3, 4), dtype=np.float32)
+    truth = rng.random((1, 5, 3, 4), dtype=np.float32)
+    prediction = rng.random((6, 5, 3, 4), dtype=np.float32)
+
+    group = zarr.open_group(str(tmp_path / "out.zarr"), mode="w")
+    with ZarrWriter(
+        group,
+        lat,
+        lon,
+        _channels(["a"]),
+        _channels(["b"]),
+        asynchronous=asynchronous,
+        chunk_sizes={"ensemble": 4},
+    ) as writer:
+        _write_rollout(writer, inputs, truth, prediction)
+        writer.flush()
+        assert group["prediction"]["b"].shape == prediction.shape
+
+    assert np.array_equal(group["input"]["a"][:], inputs)
+    assert np.array_equal(group["truth"]["b"][:], truth[0])
+    assert np.array_equal(group["prediction"]["b"][:], prediction)
+    assert group["prediction"]["b"].chunks == (4, 1, 3, 4)
+    assert group["prediction"]["b"].attrs["_ARRAY_DIMENSIONS"] == [
+        "ensemble",
+        "time",
+        "y",
+        "x",
+    ]
+    assert len(group["time"][:]) == 5
@@ -0,0 +1,167 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Callable, Optional
+
+import pytest
+import torch
+from pytest_utils import import_or_fail
+from torch import Tensor
+
+
+# Mock network class, with conditioning and positional embeddings
+class MockNet(torch.nn.Module):
+    def __init__(self, sigma_min=0.1, sigma_max=1000):
+        super().__init__()
+        self.sigma_min = sigma_min
+        self.sigma_max = sigma_max
+        self.a = torch.nn.Parameter(0.9 * torch.ones(1))
+        self.register_buffer("pos_embd", torch.randn(1, 32, 32))
+
+    def round_sigma(self, t: Tensor) -> Tensor:
+        return t
+
+    def forward(
+        self,
+        x: Tensor,
+        x_lr: Tensor,
+        t: Tensor,
+        class_labels: Optional[Tensor],
+        embedding_selector: Optional[Callable] = None,
+    ) -> Tensor:
+        out = x * self.a + 0.1 * t.log() * x_lr[:, : x.shape[1]]
+        if embedding_selector is not None:
+            out = out + embedding_selector(self.pos_embd)
+        return out
+
+
+def _generator_randn_like(seed):
+    generator = torch.Generator().manual_seed(seed)
+    return lambda x: torch.randn(x.shape, generator=generator).to(x.device)
+
+
+@import_or_fail("cftime")
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+@pytest.mark.parametrize("patched", [False, True])
+@pytest.mark.parametrize("S_churn", [0, 10])
+def test_sampler_engine_matches_stochastic_sampler(
+    device, patched, S_churn, pytestconfig
+):
+    from physicsnemo.utils.diffusion import EDMSamplerEngine, stochastic_sampler
+    from physicsnemo.utils.patching import GridPatching2D
+
+    torch._dynamo.reset()
+    torch.manual_seed(0)
+
+    net = MockNet().to(device)
+    latents = torch.randn(2, 3, 32, 32, device=device)
+    img_lr = torch.randn(2, 3, 32, 32, device=device)
+    patching = (
+        GridPatching2D(img_shape=(32, 32), patch_shape=(16, 12), overlap_pix=4)
+        if patched
+        else None
+    )
+    kwargs = dict(num_steps=5, S_churn=S_churn, S_min=0.05, S_max=50)
+
+    with torch.no_grad():
+        expected = stochastic_sampler(
+            net,
+            latents,
+            img_lr,
+            randn_like=_generator_randn_like(1),
+            patching=patching,
+            **kwargs,
+        )
+        engine = EDMSamplerEngine(patching=patching, **kwargs)
+        for _ in range(2):
+            result = engine(net, latents, img_lr, randn_like=_generator_randn_like(1))
+            assert torch.equal(result, expected)
+            buffer = engine._x.data_ptr()
+        # The state buffers are reused by the next calls
+        engine(net, latents, img_lr)
+        assert engine._x.data_ptr() == buffer
+
+
+@import_or_fail("cftime")
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_sampler_engine_euler(device, pytestconfig):
+    from physicsnemo.utils.diffusion import EDMSamplerEngine, deterministic_sampler
+
+    torch.manual_seed(0)
+
+    net = MockNet().to(device)
+    latents = torch.randn(2, 3, 32, 32, device=device)
+    img_lr = torch.randn(2, 3, 32, 32, device=device)
+    mean_hr = torch.randn(1, 3, 32, 32, device=device)
+
+    with torch.no_grad():
+        expected = deterministic_sampler(
+            net,
+            latents,
+            img_lr,
+            mean_hr=mean_hr,
+            num_steps=6,
+            sigma_min=0.002,
+            sigma_max=800,
+            solver="euler",
+        )
+        engine = EDMSamplerEngine(num_steps=6, solver="euler")
+        result = engine(net, latents, img_lr, mean_hr=mean_hr)
+
+    assert result.dtype == latents.dtype
+    assert torch.allclose(result, expected.to(result.dtype), rtol=1e-4, atol=1e-4)
+
+
+@import_or_fail("cftime")
+@pytest.mark.parametrize(
+    "device,capture",
+    [("cpu", "compile"), ("cuda:0", "compile"), ("cuda:0", "cuda_graph")],
+)
+def test_sampler_engine_capture(device, capture, pytestconfig):
+    from physicsnemo.utils.diffusion import EDMSamplerEngine
+
+    torch._dynamo.reset()
+    torch.manual_seed(0)
+
+    net = MockNet().to(device)
+    latents = torch.randn(2, 3, 32, 32, device=device)
+    img_lr = torch.randn(2, 3, 32, 32, device=device)
+
+    with torch.inference_mode():
+        expected = EDMSamplerEngine(num_steps=4)(net, latents, img_lr)
+        engine = EDMSamplerEngine(num_steps=4, capture=capture)
+        for _ in range(2):
+            result = engine(net, latents, img_lr)
+            assert torch.allclose(result, expected, rtol=1e-5, atol=1e-5)
+
+
+@import_or_fail("cftime")
+def test_sampler_engine_validation(pytestconfig):
+    from physicsnemo.utils.diffusion import EDMSamplerEngine
+
+    with pytest.raises(ValueError, match="Unknown solver"):
+        EDMSamplerEngine(solver="rk4")
+    with pytest.raises(ValueError, match="Unknown capture"):
+        EDMSamplerEngine(capture="graph")
+    with pytest.raises(ValueError, match="GridPatching2D"):
+        EDMSamplerEngine(patching=object())
+
+    net = MockNet()
+    latents = torch.randn(2, 3, 32, 32)
+    with pytest.raises(ValueError, match="batch size"):
+        EDMSamplerEngine()(net, latents, torch.randn(1, 3, 32, 32))
+    with pytest.raises(ValueError, match="CUDA"):
+        EDMSamplerEngine(capture="cuda_graph")(net, latents, torch.randn_like(latents))
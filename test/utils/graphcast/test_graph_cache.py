@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+import pytest
+import torch
+from pytest_utils import import_or_fail
+
+
+@import_or_fail(["torch_geometric", "sklearn"])
+@pytest.mark.parametrize("multimesh", [True, False])
+def test_graph_cache(multimesh, tmp_path, pytestconfig):
+    """Test that a cached graph topology matches a freshly built one."""
+
+    from physicsnemo.utils.graphcast.graph import Graph
+
+    latitudes = torch.linspace(-90, 90, steps=19)
+    longitudes = torch.linspace(-180, 180, steps=37)[1:]
+    lat_lon_grid = torch.stack(
+        torch.meshgrid(latitudes, longitudes, indexing="ij"), dim=-1
+    )
+
+    graph = Graph(lat_lon_grid, mesh_level=2, multimesh=multimesh)
+    g2m_src, g2m_dst = graph._g2m_edges()
+    m2g_src, m2g_dst = graph._m2g_edges()
+    assert len(m2g_src) == len(m2g_dst) == 3 * lat_lon_grid.shape[0] * 36
+
+    built = Graph(lat_lon_grid, mesh_level=2, multimesh=multimesh, cache_dir=tmp_path)
+    cached = Graph(
+        lat_lon_grid,
+        mesh_level=2,
+        multimesh=multimesh,
+        backend="pyg",
+        cache_dir=tmp_path,
+    )
+    assert len([path for path in tmp_path.iterdir() if path.is_dir()]) == 1
+    assert isinstance(cached.mesh_vertices, np.memmap)
+
+    for other in (built, cached):
+        np.testing.assert_array_equal(other.mesh_src, graph.mesh_src)
+        np.testing.assert_array_equal(other.mesh_dst, graph.mesh_dst)
+        np.testing.assert_array_equal(other.mesh_faces, graph.mesh_faces)
+        np.testing.assert_array_equal(other.mesh_vertices, graph.mesh_vertices)
+        np.testing.assert_array_equal(other.g2m_src, g2m_src)
+        np.testing.assert_array_equal(other.g2m_dst, g2m_dst)
+        np.testing.assert_array_equal(other.m2g_src, m2g_src)
+        np.testing.assert_array_equal(other.m2g_dst, m2g_dst)
+
+    # A different mesh is a different entry
+    Graph(lat_lon_grid, mesh_level=1, multimesh=multimesh, cache_dir=tmp_path)
+    assert len([path for path in tmp_path.iterdir() if path.is_dir()]) == 2
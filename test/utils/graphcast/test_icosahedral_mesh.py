@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: Copyright (c) 2023 - 2025 NVIDIA CORPORATION & AFFILIATES.
+# SPDX-FileCopyrightText: All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import numpy as np
+
+from physicsnemo.utils.graphcast.icosahedral_mesh import (
+    TriangularMesh,
+    _two_split_unit_sphere_triangle_faces,
+    get_hierarchy_of_triangular_meshes_for_sphere,
+    get_icosahedron,
+)
+
+
+def _reference_split(triangular_mesh: TriangularMesh) -> TriangularMesh:
+    """Splits one face at a time, creating child vertices on first use."""
+    vertices = list(triangular_mesh.vertices)
+    child_index = {}
+
+    def get_child(ind_a, ind_b):
+        key = tuple(sorted((ind_a, ind_b)))
+        if key not in child_index:
+            position = triangular_mesh.vertices[[ind_a, ind_b]].mean(0)
+            position /= np.linalg.norm(position)
+            child_index[key] = len(vertices)
+            vertices.append(position)
+        return child_index[key]
+
+    faces = []
+    for ind1, ind2, ind3 in triangular_mesh.faces:
+        ind12 = get_child(ind1, ind2)
+        ind23 = get_child(ind2, ind3)
+        ind31 = get_child(ind3, ind1)
+        faces.extend(
+            [
+                [ind1, ind12, ind31],
+                [ind12, ind2, ind23],
+                [ind31, ind23, ind3],
+                [ind12, ind23, ind31],
+            ]
+        )
+    return TriangularMesh(
+        vertices=np.array(vertices), faces=np.array(faces, dtype=np.int32)
+    )
+
+
+def test_two_split_matches_reference():
+    """Test that the vectorized refinement is identical to face-by-face splitting."""
+    mesh = get_icosahedron()
+    for _ in range(4):
+        expected = _reference_split(mesh)
+        mesh = _two_split_unit_sphere_triangle_faces(mesh)
+        np.testing.assert_array_equal(mesh.faces, expected.faces)
+        np.testing.assert_array_equal(mesh.vertices, expected.vertices)
+        assert mesh.vertices.dtype == expected.vertices.dtype
+        assert mesh.faces.dtype == np.int32
+
+
+def test_hierarchy_of_meshes():
+    """Test the sizes and the unit norm of the mesh hierarchy."""
+    meshes = get_hierarchy_of_triangular_meshes_for_sphere(splits=3)
+    assert len(meshes) == 4
+    for level, mesh in enumerate(meshes):
+        assert mesh.vertices.shape == (10 * 4**level + 2, 3)
+        assert mesh.faces.shape == (20 * 4**level, 3)
+        np.testing.assert_allclose(
+            np.linalg.norm(mesh.vertices, axis=-1), 1.0, rtol=1e-6
+        )
+        # Coarser vertices are kept as a prefix of the finer ones
+        if level > 0:
+            np.testing.assert_array_equal(
+                mesh.vertices[: meshes[level - 1].vertices.shape[0]],
+                meshes[level - 1].vertices,
+            )
@@ -17,7 +17,7 @@
 import pytest
 import torch
 
-from physicsnemo.utils.neighbors import knn
+from physicsnemo.utils.neighbors import KNNIndexCache, build_index, knn
 from physicsnemo.utils.neighbors.knn._cuml_impl import knn_impl as knn_cuml
 from physicsnemo.utils.neighbors.knn._scipy_impl import knn_impl as knn_scipy
 from physicsnemo.utils.version_check import check_min_version
@@ -190,5 +190,98 @@ def test_knn_comparison(device):
     assert torch.allclose(sorted_dist_cuml, sorted_dist_torch, atol=1e-5)
 
 
+@pytest.mark.parametrize("device", ["cuda", "cpu"])
+@pytest.mark.parametrize("backend", ["cuml", "torch", "scipy"])
+@pytest.mark.parametrize("query_batch_size", [None, 7])
+def test_knn_index(device, backend, query_batch_size):
+    if backend == "cuml":
+        if device == "cpu" or not check_min_version("cuml", "24.0.0", hard_fail=False):
+            pytest.skip("cuml not available")
+    if backend == "scipy":
+        if device == "cuda" or not check_min_version("scipy", "1.7.0", hard_fail=False):
+            pytest.skip("scipy not available")
+    if device == "cuda" and not torch.cuda.is_available():
+        pytest.skip("CUDA not available")
+
+    points = torch.randn(97, 3, device=device)
+    index = build_index(points, backend=backend, query_batch_size=query_batch_size)
+    assert index.backend == backend
+
+    # The same index answers several query batches:
+    for n_queries, k in [(23, 5), (4, 1)]:
+        queries = torch.randn(n_queries, 3, device=device)
+        indices, distances = index.query(queries, k)
+        ref_indices, ref_distances = knn(points, queries, k, backend="torch")
+
+        assert indices.shape == (n_queries, k)
+        assert distances.shape == (n_queries, k)
+        assert torch.allclose(
+            torch.sort(distances, dim=1)[0],
+            torch.sort(ref_distances, dim=1)[0],
+            atol=1e-5,
+        )
+
+    with pytest.raises(ValueError):
+        index.query(torch.randn(3, 3, device=device, dtype=torch.float64), 2)
+
+
+def test_knn_scipy_workers():
+    if not check_min_version("scipy", "1.7.0", hard_fail=False):
+        pytest.skip("scipy not available")
+
+    points = torch.randn(211, 3)
+    queries = torch.randn(37, 3)
+
+    indices_serial, distances_serial = knn(points, queries, 4, backend="scipy")
+    indices_parallel, distances_parallel = knn(
+        points, queries, 4, backend="scipy", workers=-1
+    )
+    assert torch.equal(indices_serial, indices_parallel)
+    assert torch.allclose(distances_serial, distances_parallel)
+
+    index = build_index(points, backend="scipy", workers=-1)
+    indices_index, distances_index = index.query(queries, 4)
+    assert torch.equal(indices_serial, indices_index)
+    assert torch.allclose(distances_serial, distances_index)
+
+
+def test_knn_index_cache():
+    points = torch.randn(61, 3)
+    queries = torch.randn(11, 3)
+
+    cache = KNNIndexCache(max_size=2)
+
+    indices, distances = knn(points, queries, 3, cache=cache)
+    ref_indices, ref_distances = knn(points, queries, 3)
+    assert torch.equal(indices, ref_indices)
+    assert torch.allclose(distances, ref_distances)
+    assert len(cache) == 1
+
+    # Identical content reuses the same index:
+    index = cache.get(points)
+    assert cache.get(points.clone()) is index
+    assert len(cache) == 1
+
+    # The number of query threads does not split entries:
+    scipy_indices, _ = knn(points, queries, 3, backend="scipy", workers=2, cache=cache)
+    scipy_index = cache.get(points, backend="scipy")
+    knn(points, queries, 3, backend="scipy", workers=1, cache=cache)
+    assert cache.get(points, backend="scipy") is scipy_index
+    assert torch.equal(scipy_indices, ref_indices)
+    cache.clear()
+    cache.get(points)
+
+    # Least recently used entries are evicted beyond max_size:
+    cache.get(points + 1)
+    cache.get(points + 2)
+    assert len(cache) == 2
+    assert cache.key(points) not in cache
+
+    assert cache.evict(cache.key(points + 2))
+    assert not cache.evict(cache.key(points + 2))
+    cache.clear()
+    assert len(cache) == 0
+
+
 if __name__ == "__main__":
     test_knn(device="cuda", k=5, backend="cuml", dtype=torch.bfloat16)
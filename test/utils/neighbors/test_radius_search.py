@@ -17,7 +17,11 @@
 import pytest
 import torch
 
-from physicsnemo.utils.neighbors import radius_search
+from physicsnemo.utils.neighbors import (
+    radius_search,
+    radius_search_blocks,
+    radius_search_csr,
+)
 from physicsnemo.utils.neighbors.radius_search._warp_impl import (
     radius_search_impl as radius_search_warp,
 )
@@ -368,3 +372,104 @@ def test_radius_search_gradients(device, max_points):
     )
 
     # assert torch.allclose(qrs_grad_warp, qrs_grad_torch, atol=1e-5), "Query gradients do not match"
+
+
+def _csr_to_pairs(offsets, indices, distances):
+    """Turn CSR neighbors into a sorted list of (query, point, distance)."""
+    query_ids = torch.repeat_interleave(
+        torch.arange(offsets.shape[0] - 1, device=offsets.device), torch.diff(offsets)
+    )
+    order = torch.argsort(query_ids * (indices.max() + 1) + indices)
+    return query_ids[order], indices[order], distances[order]
+
+
+@pytest.mark.parametrize("device", ["cpu", "cuda"])
+@pytest.mark.parametrize("use_grid", [True, False])
+@pytest.mark.parametrize("memory_budget", [2**12, 2**28])
+def test_radius_search_chunked(device, use_grid, memory_budget):
+    if device == "cuda" and not torch.cuda.is_available():
+        pytest.skip("CUDA not available")
+
+    torch.manual_seed(0)
+    points = torch.rand(1500, 3, device=device)
+    # Some queries fall outside of the point cloud bounding box:
+    queries = torch.rand(400, 3, device=device) * 1.2 - 0.1
+    radius = 0.11
+
+    ref_indices, ref_dists = radius_search(
+        points, queries, radius, return_dists=True, backend="torch"
+    )
+    ref_order = torch.argsort(ref_indices[0] * points.shape[0] + ref_indices[1])
+
+    offsets, indices, distances = radius_search_csr(
+        points, queries, radius, memory_budget=memory_budget, use_grid=use_grid
+    )
+    assert offsets.shape == (queries.shape[0] + 1,)
+    assert offsets[-1] == indices.shape[0]
+
+    query_ids, point_ids, dists = _csr_to_pairs(offsets, indices, distances)
+    assert torch.equal(query_ids, ref_indices[0][ref_order])
+    assert torch.equal(point_ids, ref_indices[1][ref_order])
+    assert torch.allclose(dists, ref_dists[ref_order], atol=1e-6)
+
+    # The streamed blocks cover every query once, in order:
+    blocks = list(
+        radius_search_blocks(
+            points, queries, radius, memory_budget=memory_budget, use_grid=use_grid
+        )
+    )
+    if memory_budget == 2**12:
+        assert len(blocks) > 1
+    next_query = 0
+    for block in blocks:
+        assert block.query_start == next_query
+        assert block.offsets[-1] == block.indices.shape[0]
+        next_query += block.offsets.shape[0] - 1
+    assert next_query == queries.shape[0]
+
+
+def test_radius_search_chunked_errors():
+    points = torch.rand(10, 3)
+    with pytest.raises(ValueError):
+        radius_search_csr(points, points, -1.0)
+    with pytest.raises(ValueError):
+        radius_search_csr(points, points, 0.1, memory_budget=0)
+    with pytest.raises(ValueError):
+        radius_search_csr(points, points.double(), 0.1)
+
+    # No points gives empty neighborhoods:
+    offsets, indices, _ = radius_search_csr(torch.empty(0, 3), points, 0.1)
+    assert torch.equal(offsets, torch.zeros(11, dtype=torch.int64))
+    assert indices.shape == (0,)
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_radius_graph_csr(dim):
+    """The grid radius graph matches a dense distance matrix, per scene."""
+    from physicsnemo.utils.neighbors import radius_graph_csr
+
+    torch.manual_seed(0)
+    radius = 0.1
+    points = torch.rand(900, dim)
+    batch = torch.repeat_interleave(torch.arange(3), torch.tensor([200, 300, 400]))
+
+    # A tiny budget forces many blocks:
+    offsets, indices, distances = radius_graph_csr(
+        points, radius, batch=batch, memory_budget=4096
+    )
+    assert offsets.shape == (901,)
+
+    dense = torch.cdist(points, points, compute_mode="donot_use_mm_for_euclid_dist")
+    mask = (dense <= radius) & (batch[:, None] == batch[None, :])
+    expected_rows, expected_cols = torch.nonzero(mask, as_tuple=True)
+    rows = torch.repeat_interleave(torch.arange(900), offsets.diff())
+    assert torch.equal(rows, expected_rows)
+    assert torch.equal(indices, expected_cols)
+    assert torch.allclose(distances, dense[rows, indices])
+
+    empty_offsets, empty_indices, _ = radius_graph_csr(points[:0], radius)
+    assert empty_offsets.tolist() == [0]
+    assert empty_indices.numel() == 0
+
+    with pytest.raises(ValueError):
+        radius_graph_csr(points, radius, batch=batch[:10])
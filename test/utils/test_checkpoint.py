@@ -219,3 +219,103 @@ def test_compiled_model_checkpointing(
     new_output = uncompiled_model(sample_input).detach().cpu()
 
     assert torch.allclose(original_output, new_output, rtol=rtol, atol=atol)
+
+
+@pytest.mark.parametrize("async_save", [False, True])
+def test_sharded_checkpointing(tmp_path, async_save):
+    """Sharded checkpoints restore models, optimizer and training state."""
+
+    from physicsnemo.launch.utils import (
+        load_checkpoint,
+        save_checkpoint,
+        wait_for_checkpoint,
+    )
+
+    DistributedManager.initialize()
+
+    def _training_objects(lr):
+        model = FullyConnected(
+            in_features=4, out_features=4, num_layers=2, layer_size=8
+        )
+        torch_model = nn.Sequential(nn.Linear(4, 8), nn.ReLU(), nn.Linear(8, 4))
+        optimizer = torch.optim.Adam(
+            [*model.parameters(), *torch_model.parameters()], lr=lr
+        )
+        scheduler = torch.optim.lr_scheduler.StepLR(optimizer, step_size=1)
+        return model, torch_model, optimizer, scheduler
+
+    model, torch_model, optimizer, scheduler = _training_objects(1e-3)
+    torch_model(model(torch.randn(2, 4))).sum().backward()
+    optimizer.step()
+    scheduler.step()
+
+    save_checkpoint(
+        tmp_path.as_posix(),
+        models=[model, torch_model],
+        optimizer=optimizer,
+        scheduler=scheduler,
+        epoch=2,
+        metadata={"model_type": "MLP"},
+        sharded=True,
+        async_save=async_save,
+    )
+    wait_for_checkpoint()
+    assert (tmp_path / "checkpoint.sharded.2" / ".metadata").exists()
+
+    new_model, new_torch_model, new_optimizer, new_scheduler = _training_objects(1.0)
+    metadata_dict = {}
+    epoch = load_checkpoint(
+        tmp_path.as_posix(),
+        models=[new_model, new_torch_model],
+        optimizer=new_optimizer,
+        scheduler=new_scheduler,
+        metadata_dict=metadata_dict,
+    )
+    assert epoch == 2
+    assert metadata_dict == {"model_type": "MLP"}
+    assert new_scheduler.last_epoch == scheduler.last_epoch
+    for param, new_param in zip(
+        [*model.parameters(), *torch_model.parameters()],
+        [*new_model.parameters(), *new_torch_model.parameters()],
+    ):
+        assert torch.equal(param, new_param)
+        assert torch.equal(
+            optimizer.state[param]["exp_avg"], new_optimizer.state[new_param]["exp_avg"]
+        )
+    assert new_optimizer.param_groups[0]["lr"] == optimizer.param_groups[0]["lr"]
+
+    with pytest.raises(ValueError):
+        save_checkpoint(tmp_path.as_posix(), models=[model], async_save=True)
+
+
+def test_mixed_checkpoint_indices(tmp_path):
+    """Sharded and non-sharded checkpoints share one index sequence."""
+
+    from physicsnemo.launch.utils import load_checkpoint, save_checkpoint
+
+    DistributedManager.initialize()
+
+    def _model(value):
+        model = nn.Linear(4, 4)
+        nn.init.constant_(model.weight, value)
+        return model
+
+    save_checkpoint(tmp_path.as_posix(), models=_model(0.0), epoch=3)
+    save_checkpoint(tmp_path.as_posix(), models=_model(1.0), sharded=True)
+    assert (tmp_path / "checkpoint.sharded.4" / ".metadata").exists()
+
+    # The sharded checkpoint is the latest one
+    model = _model(-1.0)
+    assert load_checkpoint(tmp_path.as_posix(), models=model) == 0
+    assert torch.all(model.weight == 1.0)
+
+    # A newer non-sharded checkpoint wins over the sharded one
+    save_checkpoint(tmp_path.as_posix(), models=_model(2.0), epoch=None)
+    assert (tmp_path / "Linear.0.5.pt").exists()
+    model = _model(-1.0)
+    load_checkpoint(tmp_path.as_posix(), models=model)
+    assert torch.all(model.weight == 2.0)
+
+    # Older checkpoints can still be loaded by index
+    load_checkpoint(tmp_path.as_posix(), models=model, epoch=4)
+    assert torch.all(model.weight == 1.0)
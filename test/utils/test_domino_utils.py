@@ -38,7 +38,9 @@ from physicsnemo.utils.domino.utils import (
     normalize,
     pad,
     pad_inp,
+    pad_ragged,
     shuffle_array,
+    shuffle_array_batched,
     shuffle_array_without_sampling,
     standardize,
     unnormalize,
@@ -159,6 +161,31 @@ def test_shuffle_array():
     assert len(torch.unique(indices)) == 2  # No duplicates
 
 
+def test_pad_ragged():
+    """Test pad_ragged function with docstring example."""
+    padded, valid = pad_ragged([torch.ones(2, 3), torch.ones(1, 3)])
+    assert padded.shape == (2, 2, 3)
+    assert valid.tolist() == [[True, True], [True, False]]
+    assert bool((padded[1, 1] == 0).all())
+
+
+def test_shuffle_array_batched():
+    """Test shuffle_array_batched never selects masked or zero weight entries."""
+    torch.manual_seed(42)
+    data, valid = pad_ragged([torch.arange(10), torch.arange(6)])
+    weights = torch.ones(data.shape, dtype=torch.float32)
+    weights[0, :3] = 0.0
+    subset, indices = shuffle_array_batched(data, 5, valid, weights=weights)
+    assert subset.shape == (2, 5)
+    assert torch.equal(subset, torch.gather(data, 1, indices))
+    assert bool((indices[0] >= 3).all())
+    assert bool((indices[1] < 6).all())
+    assert all(len(torch.unique(row)) == 5 for row in indices)
+
+    with pytest.raises(ValueError):
+        shuffle_array_batched(data, 7, valid)
+
+
 def test_shuffle_array_without_sampling():
     """Test shuffle_array_without_sampling function with docstring example."""
     torch.manual_seed(42)  # For reproducible results
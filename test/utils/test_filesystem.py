@@ -114,3 +114,164 @@ def test_ngc_model_file_invalid():
     package = filesystem.Package(test_url, seperator="/")
     with pytest.raises(ValueError):
         package.get("dlwp_cubesphere.zip")
+
+
+def test_download_cache(tmp_path: Path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    remote = tmp_path / "remote.bin"
+    data = os.urandom(10_000)
+    remote.write_bytes(data)
+    path = remote.as_posix()
+
+    reads = []
+    read_range = filesystem._read_range
+
+    def _counting_read_range(path, start, end):
+        reads.append(start)
+        return read_range(path, start, end)
+
+    monkeypatch.setattr(filesystem, "_read_range", _counting_read_range)
+    cache = filesystem.DownloadCache(tmp_path / "cache", chunk_size=1024)
+
+    # Concurrent requests download the file once, in chunks
+    with ThreadPoolExecutor(4) as executor:
+        paths = list(executor.map(lambda _: cache.get(path), range(4)))
+    assert len(set(paths)) == 1
+    assert Path(paths[0]).read_bytes() == data
+    assert len(reads) == 10
+
+    # Overwriting the remote file creates a new entry
+    data = os.urandom(10_000)
+    remote.write_bytes(data)
+    os.utime(remote, (0, 0))
+    new_path = cache.get(path, sha256=hashlib.sha256(data).hexdigest())
+    assert new_path != paths[0]
+    assert Path(new_path).read_bytes() == data
+
+    # Downloads resume after a failure
+    cache.clear()
+    reads.clear()
+
+    def _failing_read_range(path, start, end):
+        if start >= 5 * 1024:
+            raise IOError("Connection reset")
+        return _counting_read_range(path, start, end)
+
+    monkeypatch.setattr(filesystem, "_read_range", _failing_read_range)
+    with pytest.raises(IOError):
+        cache.get(path)
+    assert len(cache._entries()) == 0
+
+    monkeypatch.setattr(filesystem, "_read_range", _counting_read_range)
+    reads.clear()
+    assert Path(cache.get(path)).read_bytes() == data
+    assert sorted(reads) == [i * 1024 for i in range(5, 10)]
+
+    # Integrity check
+    cache.clear()
+    with pytest.raises(IOError):
+        cache.get(path, sha256="0" * 64)
+    assert len(cache._entries()) == 0
+
+    # LRU eviction
+    cache = filesystem.DownloadCache(tmp_path / "lru", max_size=25_000, chunk_size=4096)
+    files = []
+    for i in range(3):
+        remote = tmp_path / f"remote_{i}.bin"
+        remote.write_bytes(os.urandom(10_000))
+        files.append(remote.as_posix())
+    first = cache.get(files[0])
+    second = cache.get(files[1])
+    os.utime(first, (1, 1))
+    os.utime(second, (2, 2))
+    cache.get(files[2])
+    assert not Path(first).exists()
+    assert Path(second).exists()
+    assert cache.size() <= 25_000
+
+
+def test_download_cache_offline(tmp_path: Path, monkeypatch):
+    import requests
+
+    url = "https://example.com/model.bin"
+    versions = [os.urandom(3000), os.urandom(3000)]
+    remote = {"version": 0}
+
+    class _Response:
+        status_code = 200
+
+        def __init__(self):
+            self.headers = {
+                "Content-Length": "3000",
+                "Accept-Ranges": "bytes",
+                "ETag": str(remote["version"]),
+            }
+
+        def raise_for_status(self):
+            pass
+
+    def _read_range(path, start, end):
+        return versions[remote["version"]][start:end]
+
+    monkeypatch.setattr(filesystem.requests, "head", lambda *a, **kw: _Response())
+    monkeypatch.setattr(filesystem, "_read_range", _read_range)
+    cache = filesystem.DownloadCache(tmp_path / "downloads", chunk_size=1024)
+    cache.get(url)
+    remote["version"] = 1
+    latest = cache.get(url)
+
+    # Without network, the latest downloaded version is opened from the cache
+    def _unreachable(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("Name or service not known")
+
+    monkeypatch.setattr(filesystem.requests, "head", _unreachable)
+    assert cache.get(url) == latest
+    assert Path(cache.get(url)).read_bytes() == versions[1]
+    assert filesystem._download_cached(url, local_cache_path=str(tmp_path)) == latest
+
+    # Files that are not cached still raise
+    with pytest.raises(requests.exceptions.ConnectionError):
+        cache.get("https://example.com/other.bin")
+    cache.clear()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        cache.get(url)
+
+
+def test_download_cache_head_rejected(tmp_path: Path):
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    data = os.urandom(5000)
+
+    class _Handler(BaseHTTPRequestHandler):
+        # Like a presigned URL, which is only signed for GET
+        def do_HEAD(self):
+            self.send_response(403)
+            self.end_headers()
+
+        def do_GET(self):
+            if self.path != "/model.bin":
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/model.bin"
+        path = filesystem._download_cached(url, local_cache_path=str(tmp_path))
+        assert Path(path).read_bytes() == data
+        cache = filesystem.DownloadCache(tmp_path / "downloads")
+        assert Path(cache.get(url)).read_bytes() == data
+    finally:
+        server.shutdown()
+        server.server_close()
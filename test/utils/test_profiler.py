@@ -260,3 +260,25 @@ def test_state_enum_ge_operator():
     assert state_enum.ENABLED >= state_enum.ENABLED
     assert state_enum.INITIALIZED >= state_enum.INITIALIZED
     assert state_enum.FINALIZED >= state_enum.FINALIZED
+
+
+def test_import_time_report():
+    from physicsnemo.utils.profiling.import_time import (
+        format_import_time_report,
+        import_time_report,
+    )
+
+    entries = import_time_report("json", top=None)
+    names = [entry.name for entry in entries]
+    assert "json" in names
+    assert all(entry.cumulative_us >= entry.self_us for entry in entries)
+    cumulative = [entry.cumulative_us for entry in entries]
+    assert cumulative == sorted(cumulative, reverse=True)
+
+    entries = import_time_report("json", top=2, prefix="json.")
+    assert len(entries) <= 2
+    assert all(entry.name.startswith("json.") for entry in entries)
+    assert format_import_time_report(entries).startswith("module")
+
+    with pytest.raises(RuntimeError):
+        import_time_report("physicsnemo_missing_module")
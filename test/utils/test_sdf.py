@@ -110,3 +110,72 @@ def test_sdf(pytestconfig, dtype, device):
         ),
         atol=1e-7,
     )
+
+
+@import_or_fail("warp")
+@pytest.mark.parametrize("dtype", [torch.float32, torch.float64])
+def test_sdf_handle_matches_function(pytestconfig, dtype):
+    from physicsnemo.utils.sdf import SignedDistanceField, signed_distance_field
+
+    mesh_vertices = tet_verts().reshape(-1, 3).to(dtype)
+    mesh_indices = torch.arange(12, dtype=torch.int32)
+
+    sdf_handle = SignedDistanceField(
+        mesh_vertices, mesh_indices, use_sign_winding_number=True
+    )
+    assert sdf_handle.num_faces == 4
+
+    # Query several batches, of different shapes, against the same BVH:
+    for shape in [(2, 3), (5, 7, 3)]:
+        input_points = torch.rand(shape, dtype=dtype) * 2 - 0.5
+        sdf, hit = sdf_handle(input_points)
+        ref_sdf, ref_hit = signed_distance_field(
+            mesh_vertices,
+            mesh_indices,
+            input_points,
+            use_sign_winding_number=True,
+        )
+        assert sdf.shape == shape[:-1]
+        assert hit.shape == shape
+        assert sdf.dtype == dtype
+        assert torch.allclose(sdf, ref_sdf)
+        assert torch.allclose(hit, ref_hit)
+
+
+@import_or_fail("warp")
+def test_sdf_cache(pytestconfig):
+    from physicsnemo.utils.sdf import SignedDistanceFieldCache
+
+    mesh_vertices = tet_verts().reshape(-1, 3)
+    mesh_indices = torch.arange(12, dtype=torch.int32)
+
+    cache = SignedDistanceFieldCache(max_size=2)
+
+    # Identical content hits the same entry, even from a different tensor:
+    handle = cache.get(mesh_vertices, mesh_indices)
+    assert cache.get(mesh_vertices.clone(), mesh_indices.clone()) is handle
+    assert len(cache) == 1
+
+    # The winding number flag is part of the key:
+    winding_handle = cache.get(mesh_vertices, mesh_indices, True)
+    assert winding_handle is not handle
+    assert len(cache) == 2
+
+    # Touch the first entry, then insert a third mesh: the winding entry
+    # is the least recently used and is evicted.
+    cache.get(mesh_vertices, mesh_indices)
+    cache.get(mesh_vertices * 2, mesh_indices)
+    assert len(cache) == 2
+    assert cache.key(mesh_vertices, mesh_indices, True) not in cache
+    assert cache.key(mesh_vertices, mesh_indices) in cache
+
+    # Explicit eviction:
+    assert cache.evict(cache.key(mesh_vertices, mesh_indices))
+    assert not cache.evict(cache.key(mesh_vertices, mesh_indices))
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        SignedDistanceFieldCache(max_size=0)